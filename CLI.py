@@ -35,13 +35,11 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Only what every command needs is imported here; each command imports the
+# services it uses, so short commands (info, list-builds) start quickly
 from classes.project_data.project_data import ProjectData
-from classes.mod_builder import ModBuilder
 from services.project_serializer import ProjectSerializer
-from services.compilation_service import CompilationService, CompilationResult
-from services.iso_service import ISOService, ISOResult
-from services.emulator_service import EmulatorService, InjectionResult, EMULATOR_CONFIGS
-from services.pid_cache_service import PIDCacheService
+from services.build_profiler_service import BuildProfiler
 from functions.verbose_print import verbose_print
 from path_helper import get_application_directory
 
@@ -423,9 +421,21 @@ class ModToolCLI:
         
         print("=" * 60)
     
+    def _write_build_profile(self, profiler: BuildProfiler, project_data: ProjectData, command: str):
+        """Print the stage timing table and save the Chrome trace for --profile"""
+        if not profiler.enabled:
+            return
+
+        trace_path = os.path.join(project_data.GetProjectFolder(), ".config", "output",
+                                  f"build_profile_{command}.json")
+        print("")
+        print(profiler.get_summary())
+        if profiler.write_trace(trace_path):
+            self.logger.info(f"Build profile: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
     # ==================== Commands ====================
     
-    def cmd_compile(self, project_name: str, build_name: Optional[str] = None) -> int:
+    def cmd_compile(self, project_name: str, build_name: Optional[str] = None, profile: bool = False) -> int:
         """Compile project sources"""
         self.logger.header("COMPILE")
         
@@ -448,6 +458,9 @@ class ModToolCLI:
         self.logger.info(f"Build: {current_build.GetBuildName()}")
         self.logger.info(f"Platform: {current_build.GetPlatform()}")
 
+        from classes.mod_builder import ModBuilder
+        from services.compilation_service import CompilationService
+
         # Create compilation service with verbose mode
         mod_builder = ModBuilder(tool_dir=self.tool_dir)
         compilation_service = CompilationService(project_data, mod_builder, verbose=self.logger.verbose, no_warnings=self.logger.no_warnings)
@@ -455,12 +468,15 @@ class ModToolCLI:
         # CompilationService now prints directly to console, so we don't need callbacks
         compilation_service.on_progress = lambda msg: None
         compilation_service.on_error = lambda msg: None
+        profiler = BuildProfiler(enabled=profile)
+        compilation_service.profiler = profiler
         
         # Compile
         print("")  # Blank line before compilation output
         start_time = time.perf_counter()
         result = compilation_service.compile_project()
         elapsed_time = time.perf_counter() - start_time
+        self._write_build_profile(profiler, project_data, "compile")
         
         if result.success:
             # Show size analysis
@@ -501,7 +517,7 @@ class ModToolCLI:
             return 1
 
     
-    def cmd_build(self, project_name: str, build_name: Optional[str] = None) -> int:
+    def cmd_build(self, project_name: str, build_name: Optional[str] = None, profile: bool = False) -> int:
         """Full build: compile + patch + build ISO"""
         self.logger.header("BUILD")
         
@@ -527,17 +543,25 @@ class ModToolCLI:
         self.logger.info("")
         self.logger.info("[1/3] Compiling...")
 
+        from classes.mod_builder import ModBuilder
+        from services.compilation_service import CompilationService
+        from services.iso_service import ISOService
+
         mod_builder = ModBuilder(tool_dir=self.tool_dir)
         compilation_service = CompilationService(project_data, mod_builder, verbose=self.logger.verbose, no_warnings=self.logger.no_warnings)
         compilation_service.on_progress = lambda msg: None
         compilation_service.on_error = lambda msg: None
+        profiler = BuildProfiler(enabled=profile)
+        compilation_service.profiler = profiler
         
         import time
         start_time = time.perf_counter()
-        compile_result = compilation_service.compile_project()
+        with profiler.stage("Compile project"):
+            compile_result = compilation_service.compile_project()
         elapsed_compile = time.perf_counter() - start_time
         
         if not compile_result.success:
+            self._write_build_profile(profiler, project_data, "build")
             self.logger.error("Compilation failed")
             return 1
         
@@ -562,9 +586,12 @@ class ModToolCLI:
         self.logger.info("[2/3] Building ISO...")
 
         iso_service = ISOService(project_data, verbose=self.logger.verbose, tool_dir=self.tool_dir)
+        iso_service.profiler = profiler
         start_iso = time.perf_counter()
-        build_result = iso_service.full_build()
+        with profiler.stage("Full ISO build"):
+            build_result = iso_service.full_build()
         elapsed_iso = time.perf_counter() - start_iso
+        self._write_build_profile(profiler, project_data, "build")
 
         if not build_result.success:
             self.logger.error(f"Build failed: {build_result.message}")
@@ -617,6 +644,7 @@ class ModToolCLI:
         self.logger.info(f"Platform: {current_build.GetPlatform()}")
 
         # Create ISO service
+        from services.iso_service import ISOService
         iso_service = ISOService(project_data, verbose=self.logger.verbose, tool_dir=self.tool_dir)
 
         # If no original file provided, check if we need to prompt
@@ -690,6 +718,9 @@ class ModToolCLI:
         self.logger.info(f"Build: {current_build.GetBuildName()}")
         self.logger.info(f"Platform: {current_build.GetPlatform()}")
 
+        from services.emulator_service import EmulatorService, EMULATOR_CONFIGS
+        from services.pid_cache_service import PIDCacheService
+
         # Initialize PID cache service
         pid_cache = PIDCacheService(project_data.GetProjectFolder())
 
@@ -815,6 +846,7 @@ class ModToolCLI:
             os.path.join(project_folder, ".config", "output", "bin_files"),
             os.path.join(project_folder, ".config", "output", "memory_map"),
             os.path.join(project_folder, ".config", "output", "iso_build"),  # Persistent build directories
+            os.path.join(project_folder, ".config", "object_store"),  # Shared object store
         ]
         
         # Files to clean
@@ -862,6 +894,14 @@ class ModToolCLI:
             except Exception as e:
                 self.logger.warning(f"Could not clear build cache: {e}")
 
+        # Clear stored scan results for this build
+        from services.scan_index_service import ScanIndexService
+        scan_index = ScanIndexService.for_project(project_data)
+        if scan_index is not None and os.path.isdir(scan_index.index_dir):
+            scan_index.clear()
+            self.logger.debug("Cleared scan index")
+            files_removed += 1
+
         if files_removed > 0:
             self.logger.success(f"Cleaned {files_removed} artifact(s)")
         else:
@@ -1102,6 +1142,7 @@ Examples:
 Examples with Arguments:
   mod_utility.exe compile MyProject --build=NTSC-U
   mod_utility.exe build MyProject --build=NTSC-U
+  mod_utility.exe build MyProject --profile   (per-stage timing + trace in .config/output/)
   mod_utility.exe inject MyProject duckstation
   mod_utility.exe inject MyProject dolphin --build=NTSC-U
 
@@ -1137,6 +1178,7 @@ def modtool_main():
     compile_parser.add_argument('-q', '--quiet', action='store_true', help='Quiet mode')
     compile_parser.add_argument('--no-color', action='store_true', help='Disable colors')
     compile_parser.add_argument('--no-warnings', action='store_true', help='Suppress compiler warnings (errors still shown)')
+    compile_parser.add_argument('--profile', action='store_true', help='Time each build stage and write a Chrome trace to .config/output/')
 
     # Build command
     build_parser = subparsers.add_parser('build', help='Full build (compile + ISO)')
@@ -1146,6 +1188,7 @@ def modtool_main():
     build_parser.add_argument('-q', '--quiet', action='store_true', help='Quiet mode')
     build_parser.add_argument('--no-color', action='store_true', help='Disable colors')
     build_parser.add_argument('--no-warnings', action='store_true', help='Suppress compiler warnings (errors still shown)')
+    build_parser.add_argument('--profile', action='store_true', help='Time each build stage and write a Chrome trace to .config/output/')
 
     # Xdelta command
     xdelta_parser = subparsers.add_parser('xdelta', help='Generate xdelta patch')
@@ -1334,10 +1377,10 @@ def modtool_main():
     else:
         try:
             if args.command == 'compile':
-                return cli.cmd_compile(args.project, args.build)
+                return cli.cmd_compile(args.project, args.build, getattr(args, 'profile', False))
 
             elif args.command == 'build':
-                return cli.cmd_build(args.project, args.build)
+                return cli.cmd_build(args.project, args.build, getattr(args, 'profile', False))
 
             elif args.command == 'xdelta':
                 return cli.cmd_xdelta(args.project, args.original, args.build)
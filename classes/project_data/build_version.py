@@ -11,7 +11,7 @@ from classes.injection_targets.binary_patch import BinaryPatch
 from classes.exteneded_base_classes.file_path import FilePathStr
 from classes.injection_targets.multipatch_asm import MultiPatchASM
 from functions.verbose_print import verbose_print
-from services.section_parser_service import SectionParserService, SectionInfo
+from services.section_parser_service import SectionParserService, SectionInfo, SectionAddressIndex
 
 class BuildVersion:
     def __init__(self):
@@ -197,10 +197,11 @@ class BuildVersion:
         if file_name in self.external_file_full_paths:
             del self.external_file_full_paths[file_name]
             
-    def BuildSectionMapForFile(self, filename: str) -> bool:
+    def BuildSectionMapForFile(self, filename: str, scan_index=None) -> bool:
         """
         Build section map for an executable file.
         Returns True on success, False if sections couldn't be parsed.
+        scan_index: Optional ScanIndexService to reuse the map of an unchanged file.
         """
         # Find the file path
         file_path = self.FindFileInGameFolder(filename)
@@ -212,7 +213,7 @@ class BuildVersion:
         platform = self.GetPlatform()
         
         # Parse sections
-        sections = SectionParserService.parse_executable_sections(file_path, platform)
+        sections = SectionParserService.parse_executable_sections(file_path, platform, scan_index)
         
         if not sections:
             print(f"No sections found for {filename}")
@@ -227,6 +228,12 @@ class BuildVersion:
 
         return True
         
+    def GetAddressIndex(self, filename: str) -> Optional[SectionAddressIndex]:
+        """Bisect-backed memory <-> file offset lookup for a file's section map, or None without one"""
+        if filename not in self.section_maps:
+            return None
+        return SectionAddressIndex.for_sections(self.section_maps[filename])
+
     def GetFileOffsetForAddress(self, filename: str, memory_address: int) -> Optional[int]:
         """
         Get the file offset for a specific memory address.
@@ -677,11 +684,11 @@ class BuildVersion:
         return False
     
     def _calculate_ps2_offset(self) -> Optional[str]:
-        """Calculate PS2 ELF offset using ee-objdump. First checks if section map is already cached."""
+        """Calculate PS2 ELF offset from its section headers. First checks if section map is already cached."""
         if not self.main_executable:
             return None
 
-        # Check if section map already exists (avoid running objdump again)
+        # Check if section map already exists
         if self.main_executable in self.section_maps:
             sections = self.section_maps[self.main_executable]
             if sections:
@@ -689,70 +696,22 @@ class BuildVersion:
                 verbose_print(f" Using cached section map for PS2 offset: 0x{offset:X}")
                 return f"{offset:X}"
 
-        # No cached section map - run objdump
-        # Find the executable file
+        # No cached section map - read the ELF headers
         exe_path = self.FindFileInGameFolder(self.main_executable)
         if not exe_path or not os.path.exists(exe_path):
             return None
 
-        import subprocess
-        tool_dir = os.getcwd()
-        objdump_path = os.path.join(tool_dir, "prereq", "PS2ee", "bin", "ee-objdump.exe")
-
-        if not os.path.exists(objdump_path):
-            print(f" Warning: ee-objdump not found at {objdump_path}")
-            return None
-
-        try:
-            result = subprocess.run(
-                [objdump_path, exe_path, "-x"],
-                shell=False,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=tool_dir,
-                timeout=10
-            )
-            
-            if "Idx Name" not in result.stdout:
-                return None
-            
-            # Parse the first section
-            lines = result.stdout.split("Idx Name")[1].split("\n")
-            objdump_section_0 = None
-            for line in lines[1:]:
-                if line.strip() and not line.startswith("Idx"):
-                    objdump_section_0 = line
-                    break
-            
-            if not objdump_section_0:
-                return None
-            
-            objdump_section_0_list = objdump_section_0.split()
-            
-            if len(objdump_section_0_list) >= 7:
-                vma = int(objdump_section_0_list[3], base=16)
-                file_off = int(objdump_section_0_list[5], base=16)
-                offset = vma - file_off
-            elif len(objdump_section_0_list) >= 6:
-                vma = int(objdump_section_0_list[3], base=16)
-                file_off = int(objdump_section_0_list[4], base=16)
-                offset = vma - file_off
-            else:
-                return None
-            
-            return f"{offset:X}"
-            
-        except Exception as e:
-            print(f" Could not calculate PS2 offset: {e}")
+        sections = SectionParserService.parse_executable_sections(exe_path, "PS2")
+        if not sections:
             return None
+        return f"{sections[0].offset_diff:X}"
 
     def _calculate_gamecube_wii_offset(self) -> Optional[str]:
-        """Calculate GameCube/Wii DOL offset using doltool. First checks if section map is already cached."""
+        """Calculate GameCube/Wii DOL offset from its header. First checks if section map is already cached."""
         if not self.main_executable:
             return None
 
-        # Check if section map already exists (avoid running doltool again)
+        # Check if section map already exists
         if self.main_executable in self.section_maps:
             sections = self.section_maps[self.main_executable]
             # Find first text section (GameCube/Wii uses first text section)
@@ -762,52 +721,13 @@ class BuildVersion:
                 verbose_print(f" Using cached section map for GC/Wii offset: 0x{offset:X}")
                 return f"{offset:X}"
 
-        # No cached section map - run doltool
-        # Find the executable file
+        # No cached section map - read the DOL header
         exe_path = self.FindFileInGameFolder(self.main_executable)
         if not exe_path or not os.path.exists(exe_path):
             return None
 
-        import subprocess
-        tool_dir = os.getcwd()
-        doltool_path = os.path.join(tool_dir, "prereq", "doltool", "doltool.exe")
-
-        if not os.path.exists(doltool_path):
-            print(f" Warning: doltool not found at {doltool_path}")
+        sections = SectionParserService.parse_executable_sections(exe_path, self.GetPlatform())
+        text_sections = [s for s in sections if s.section_type == "text"]
+        if not text_sections:
             return None
-
-        try:
-            result = subprocess.run(
-                [doltool_path, "-i", exe_path],
-                shell=False,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=tool_dir,
-                timeout=10
-            )
-            
-            if "Text Section  1" not in result.stdout:
-                return None
-            
-            # Parse Text Section 1
-            doltool_section_1 = result.stdout.split("Text Section  1:")[1]
-            doltool_section_1_list = doltool_section_1.split()
-            
-            disk_area = int(doltool_section_1_list[0].split('=')[1], base=16)
-            memory_area_str = doltool_section_1_list[1].split('=')[1]
-            
-            # Remove 0x80 prefix if present
-            if memory_area_str.lower().startswith("0x80"):
-                memory_area_str = "0x" + memory_area_str[4:]
-            elif memory_area_str.lower().startswith("80"):
-                memory_area_str = "0x" + memory_area_str[2:]
-            
-            memory_area = int(memory_area_str, base=16)
-            offset = memory_area - disk_area
-            
-            return f"{offset:X}"
-            
-        except Exception as e:
-            print(f" Could not calculate GC/Wii offset: {e}")
-            return None
\ No newline at end of file
+        return f"{text_sections[0].offset_diff:X}"
\ No newline at end of file
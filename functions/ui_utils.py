@@ -2,7 +2,6 @@
 """UI utility functions for DearPyGui and other UI operations"""
 
 import re
-import dearpygui.dearpygui as dpg
 
 
 def get_all_listbox_items(user_data):
@@ -15,6 +14,8 @@ def get_all_listbox_items(user_data):
     Returns:
         List of all items in the listbox
     """
+    import dearpygui.dearpygui as dpg
+
     listbox_id = user_data
     config = dpg.get_item_configuration(listbox_id)
     all_items = config.get('items', [])
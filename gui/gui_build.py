@@ -1729,6 +1729,7 @@ def callback_generate_gc_ar(sender, app_data, current_project_data: ProjectData)
 
     try:
         code_and_name = service.generate_gc_action_replay()
+        verbose_print(service.get_encoding_report())
         codes_only = _codes_strip_name(code_and_name)
         dpg.set_value("compiler_output_textbox", codes_only)
 
@@ -1757,6 +1758,7 @@ def callback_generate_wii_ar(sender, app_data, current_project_data: ProjectData
 
     try:
         code_and_name = service.generate_gc_action_replay()
+        verbose_print(service.get_encoding_report())
         codes_only = _codes_strip_name(code_and_name)
         dpg.set_value("compiler_output_textbox", codes_only)
 
@@ -1786,6 +1788,7 @@ def callback_generate_gc_gecko(sender, app_data, current_project_data: ProjectDa
     try:
         # CheatCodeService should default to one_shot=True internally
         code_and_name = service.generate_gc_gecko()
+        verbose_print(service.get_encoding_report())
         codes_only = _codes_strip_name(code_and_name)
         
         #generate seperate non one-shot version for .gct file. Strangely doesn't work on console if one shot?
@@ -1868,6 +1871,7 @@ def callback_generate_wii_gecko(sender, app_data, current_project_data: ProjectD
     try:
         # CheatCodeService should default to one_shot=True internally
         code_and_name = service.generate_wii_gecko()
+        verbose_print(service.get_encoding_report())
         codes_only = _codes_strip_name(code_and_name)
         
         ok, count, max_lines = check_gecko_length(codes_only, GECKO_MAX_LINES)
@@ -10,6 +10,10 @@ from gui import gui_messagebox as messagebox
 from classes.project_data.project_data import ProjectData
 from classes.injection_targets.code_cave import Codecave
 from dpg.widget_themes import SetLastItemsTheme
+from gui.gui_loading_indicator import LoadingIndicator
+from services.padding_scanner_service import PaddingScannerService
+from services.string_extraction_service import StringExtractionService, count_format_specifiers, has_debug_keyword
+from services.scan_index_service import ScanIndexService
 
 class CodecaveCandidate:
     """Represents a potential codecave location"""
@@ -42,26 +46,13 @@ def _is_printf_debug_string(text: str) -> tuple[bool, int, bool]:
 
     NOTE: We deliberately do NOT treat file paths as debug strings anymore.
     """
-    import re
-
-    text_lower = text.lower()
-
-    # Match patterns like: %s, %d, %5d, %.2f, %08x, %ld, %lld, %p, etc.
-    printf_pattern = r'%[-+ 0#]*(?:\d+|\*)?(?:\.(?:\d+|\*))?(?:hh|h|l|ll|j|z|t|L)?[sdioxXufFeEgGaAcpn%]'
-    format_specs = re.findall(printf_pattern, text)
-    format_count = len([f for f in format_specs if f != '%%'])  # Exclude literal %%
-
-    # Check for error/debug keywords
-    debug_keywords = [
-        'error', 'fail', 'warning', 'assert', 'debug', 'printf', 'log',
-        'exception', 'fatal', 'panic', 'abort', 'trace', 'interrupt', 'timeout'
-    ]
-    has_debug_keyword = any(keyword in text_lower for keyword in debug_keywords)
+    format_count = count_format_specifiers(text)
+    has_keyword = has_debug_keyword(text)
 
     # It's a debug-ish string if it has printf format specifiers OR debug keywords
-    is_debug = (format_count > 0) or has_debug_keyword
+    is_debug = (format_count > 0) or has_keyword
 
-    return is_debug, format_count, has_debug_keyword
+    return is_debug, format_count, has_keyword
 
 def show_codecave_finder_window(sender, app_data, current_project_data: ProjectData):
     """Show the codecave finder tool window"""
@@ -146,6 +137,27 @@ def _create_padding_finder_tab(current_project_data: ProjectData, game_files: Li
         )
         dpg.add_text("(Only show codecaves larger than this)")
 
+    dpg.add_spacer(height=5)
+
+    # Fill pattern and alignment
+    with dpg.group(horizontal=True):
+        dpg.add_text("Fill Pattern:")
+        dpg.add_combo(
+            items=list(PaddingScannerService.FILL_PATTERNS.keys()),
+            default_value="0x00",
+            tag="codecave_finder_fill_combo",
+            width=200
+        )
+        dpg.add_text("Alignment:")
+        dpg.add_input_int(
+            tag="codecave_finder_alignment",
+            default_value=4,
+            width=100,
+            min_value=1,
+            min_clamped=True
+        )
+        dpg.add_text("(Trim codecaves to this boundary)")
+
     dpg.add_spacer(height=10)
 
     # Scan button
@@ -326,67 +338,72 @@ def _on_scan_clicked(sender, app_data, current_project_data: ProjectData):
         messagebox.showerror("File Not Found", f"Could not find file: {filename}")
         return
 
-    # Scan for codecaves
-    try:
-        candidates = _scan_file_for_codecaves(file_path, min_size)
-
-        if not candidates:
-            dpg.set_value("codecave_finder_status", "No codecaves found")
-            messagebox.showinfo("No Results",
-                f"No empty space found larger than {min_size} bytes.\n\n"
-                "Try lowering the minimum size.")
-            return
-
-        # Calculate memory addresses
-        _calculate_memory_addresses(candidates, filename, current_project_data)
-
-        # Display results
-        _display_results(candidates, filename, current_project_data, file_path)
-
-        dpg.set_value("codecave_finder_status", f"Found {len(candidates)} padding group(s)")
-
-    except Exception as e:
-        import traceback
-        dpg.set_value("codecave_finder_status", "Scan failed")
-        messagebox.showerror("Scan Error", f"Error scanning file:\n\n{str(e)}\n\n{traceback.format_exc()}")
-
-def _scan_file_for_codecaves(file_path: str, min_size: int) -> List[CodecaveCandidate]:
+    fill = PaddingScannerService.FILL_PATTERNS.get(dpg.get_value("codecave_finder_fill_combo"), b'\x00')
+    alignment = dpg.get_value("codecave_finder_alignment")
+
+    dpg.set_value("codecave_finder_status", "Scanning...")
+    LoadingIndicator.show(f"Scanning {filename}...", allow_cancel=True)
+
+    def on_scan_progress(progress: float):
+        LoadingIndicator.update_message(f"Scanning {filename}... {progress * 100:.0f}%")
+
+    # Scan for codecaves off the UI thread
+    def scan_async():
+        try:
+            candidates = _scan_file_for_codecaves(
+                file_path, min_size, fill, alignment,
+                progress_callback=on_scan_progress,
+                cancel_check=LoadingIndicator.is_cancelled,
+                scan_index=ScanIndexService.for_project(current_project_data)
+            )
+            LoadingIndicator.hide()
+
+            if candidates is None:
+                dpg.set_value("codecave_finder_status", "Scan cancelled")
+                return
+
+            if not candidates:
+                dpg.set_value("codecave_finder_status", "No codecaves found")
+                messagebox.showinfo("No Results",
+                    f"No empty space found larger than {min_size} bytes.\n\n"
+                    "Try lowering the minimum size.")
+                return
+
+            # Calculate memory addresses
+            _calculate_memory_addresses(candidates, filename, current_project_data)
+
+            # Display results
+            _display_results(candidates, filename, current_project_data, file_path)
+
+            dpg.set_value("codecave_finder_status", f"Found {len(candidates)} padding group(s)")
+
+        except Exception as e:
+            import traceback
+            LoadingIndicator.hide()
+            dpg.set_value("codecave_finder_status", "Scan failed")
+            messagebox.showerror("Scan Error", f"Error scanning file:\n\n{str(e)}\n\n{traceback.format_exc()}")
+
+    import threading
+    thread = threading.Thread(target=scan_async, daemon=True)
+    thread.start()
+
+def _scan_file_for_codecaves(file_path: str, min_size: int, fill: bytes = b'\x00', alignment: int = 1,
+                             progress_callback=None, cancel_check=None,
+                             scan_index: Optional[ScanIndexService] = None) -> Optional[List[CodecaveCandidate]]:
     """
-    Scan a file for contiguous blocks of null bytes (0x00).
-    Returns list of candidates sorted by size (largest first).
+    Scan a file for contiguous blocks of fill bytes (0x00 by default).
+    Returns list of candidates sorted by size (largest first), or None if cancelled.
     """
-    candidates = []
-
-    with open(file_path, 'rb') as f:
-        file_data = f.read()
-
-    file_size = len(file_data)
-
-    # Track current run of null bytes
-    run_start = None
-    run_length = 0
-
-    for i in range(file_size):
-        byte = file_data[i]
-
-        if byte == 0x00:
-            # Start or continue a run
-            if run_start is None:
-                run_start = i
-                run_length = 1
-            else:
-                run_length += 1
-        else:
-            # End of run
-            if run_start is not None and run_length >= min_size:
-                candidates.append(CodecaveCandidate(run_start, run_length))
-
-            run_start = None
-            run_length = 0
+    runs = PaddingScannerService().scan_file(
+        file_path, min_size, fill, alignment,
+        progress_callback=progress_callback,
+        cancel_check=cancel_check,
+        scan_index=scan_index
+    )
+    if runs is None:
+        return None
 
-    # Check final run
-    if run_start is not None and run_length >= min_size:
-        candidates.append(CodecaveCandidate(run_start, run_length))
+    candidates = [CodecaveCandidate(run.file_offset, run.size) for run in runs]
 
     # Sort by size (largest first)
     candidates.sort(key=lambda c: c.size, reverse=True)
@@ -406,19 +423,12 @@ def _calculate_memory_addresses(candidates: List[CodecaveCandidate],
     has_section_map = filename in current_build.section_maps
 
     if has_section_map:
-        sections = current_build.section_maps[filename]
-
-        for candidate in candidates:
-            # Find which section this file offset belongs to
-            for section in sections:
-                section_file_start = section.file_offset
-                section_file_end = section.file_offset + section.size
-
-                if section_file_start <= candidate.file_offset < section_file_end:
-                    # Calculate memory address
-                    offset_within_section = candidate.file_offset - section.file_offset
-                    candidate.memory_address = section.mem_start + offset_within_section
-                    break
+        address_index = current_build.GetAddressIndex(filename)
+        memory_addresses = address_index.file_to_memory_many([c.file_offset for c in candidates])
+
+        for candidate, memory_address in zip(candidates, memory_addresses):
+            if memory_address is not None:
+                candidate.memory_address = memory_address
     else:
         # Fallback: Use file offset
         file_offset_str = current_build.GetInjectionFileOffset(filename)
@@ -843,7 +853,7 @@ def _on_debug_string_scan_clicked(sender, app_data, current_project_data: Projec
 
     # Scan for debug string groups
     try:
-        groups = _scan_file_for_debug_string_groups(file_path)
+        groups = _scan_file_for_debug_string_groups(file_path, ScanIndexService.for_project(current_project_data))
 
         if not groups:
             dpg.set_value("debug_string_finder_status", "No debug string groups found")
@@ -871,56 +881,23 @@ def _on_debug_string_scan_clicked(sender, app_data, current_project_data: Projec
         dpg.set_value("debug_string_finder_status", "Scan failed")
         messagebox.showerror("Scan Error", f"Error scanning file:\n\n{str(e)}\n\n{traceback.format_exc()}")
 
-def _scan_file_for_debug_string_groups(file_path: str) -> List[DebugStringGroup]:
+def _scan_file_for_debug_string_groups(file_path: str, scan_index: Optional[ScanIndexService] = None) -> List[DebugStringGroup]:
     """
     Scan a file for continuous groups of null-terminated strings.
     Returns list of groups sorted by:
       1. Whether they contain at least one debug/printf-style string
       2. Size (largest first)
     """
-    with open(file_path, 'rb') as f:
-        file_data = f.read()
-
-    file_size = len(file_data)
-
     # First, find all individual strings
-    all_strings = []
-    current_string = []
-    string_start = None
-    min_length = 4  # Minimum string length to consider
-
-    i = 0
-    while i < file_size:
-        byte = file_data[i]
-
-        # Printable ASCII range (plus common whitespace)
-        if (32 <= byte <= 126) or byte in [9, 10, 13]:  # Tab, LF, CR
-            if string_start is None:
-                string_start = i
-            current_string.append(byte)
-            i += 1
-        elif byte == 0x00:
-            # NULL TERMINATOR
-            if current_string and len(current_string) >= min_length:
-                try:
-                    text = bytes(current_string).decode('ascii', errors='ignore')
-                    all_strings.append({
-                        'offset': string_start,
-                        'text': text,
-                        'length': len(current_string) + 1,  # Include null terminator
-                        'end_pos': i + 1
-                    })
-                except Exception:
-                    pass
-
-            current_string = []
-            string_start = None
-            i += 1
-        else:
-            # Non-printable, non-null
-            current_string = []
-            string_start = None
-            i += 1
+    all_strings = [
+        {
+            'offset': string.file_offset,
+            'text': string.text,
+            'length': string.length,  # Include null terminator
+            'end_pos': string.end_offset
+        }
+        for string in StringExtractionService().extract_from_file(file_path, min_length=4, scan_index=scan_index)
+    ]
 
     # Now group contiguous strings together
     if not all_strings:
@@ -1016,19 +993,12 @@ def _calculate_debug_string_memory_addresses(groups: List[DebugStringGroup], fil
     has_section_map = filename in current_build.section_maps
 
     if has_section_map:
-        sections = current_build.section_maps[filename]
-
-        # Find which section this file offset belongs to
-        for group in groups:
-            for section in sections:
-                section_file_start = section.file_offset
-                section_file_end = section.file_offset + section.size
-
-                if section_file_start <= group.start_offset < section_file_end:
-                    # Calculate memory address
-                    offset_within_section = group.start_offset - section.file_offset
-                    group.memory_address = section.mem_start + offset_within_section
-                    break
+        address_index = current_build.GetAddressIndex(filename)
+        memory_addresses = address_index.file_to_memory_many([g.start_offset for g in groups])
+
+        for group, memory_address in zip(groups, memory_addresses):
+            if memory_address is not None:
+                group.memory_address = memory_address
     else:
         # Fallback: Use file offset
         file_offset_str = current_build.GetInjectionFileOffset(filename)
@@ -4,12 +4,17 @@ Emulator Tools - Runtime memory analysis and verification
 
 import dearpygui.dearpygui as dpg
 import os
+import time
 import threading
 from typing import List, Optional, Dict
 from gui import gui_messagebox as messagebox
 from classes.project_data.project_data import ProjectData
 from services.emulator_service import EmulatorService
 from services.emulator_connection_manager import get_emulator_manager
+from services.ram_snapshot_service import RamSnapshotService
+from services.codecave_monitor_service import (
+    CodecaveMonitor, CaveWrite, MONITOR_INTERVALS, DEFAULT_MONITOR_INTERVAL
+)
 from gui.gui_loading_indicator import LoadingIndicator
 from services.project_serializer import ProjectSerializer
 
@@ -216,6 +221,13 @@ def _create_codecave_verification_tab(current_project_data: ProjectData):
             width=150,
             height=30
         )
+        dpg.add_combo(
+            items=list(MONITOR_INTERVALS),
+            default_value=DEFAULT_MONITOR_INTERVAL,
+            tag="codecave_monitor_interval_combo",
+            label="Poll rate",
+            width=110
+        )
         dpg.add_text("Not monitoring", tag="codecave_monitor_status", color=(150, 150, 150))
 
     dpg.add_spacer(height=10)
@@ -331,15 +343,24 @@ def _create_memory_verification_tab(current_project_data: ProjectData):
 
 
     # Verify/Search button (label changes based on mode)
-    dpg.add_button(
-        tag="offset_search_button",
-        label="Verify / Find File Offset",
-        callback=lambda: _perform_offset_search(current_project_data),
-        width=200,
-        height=30,
-        show=True,
-        enabled=True
-    )
+    with dpg.group(horizontal=True):
+        dpg.add_button(
+            tag="offset_search_button",
+            label="Verify / Find File Offset",
+            callback=lambda: _perform_offset_search(current_project_data),
+            width=200,
+            height=30,
+            show=True,
+            enabled=True
+        )
+        dpg.add_button(
+            tag="ram_snapshot_refresh_button",
+            label="Refresh RAM Snapshot",
+            callback=_refresh_ram_snapshot,
+            width=170,
+            height=30
+        )
+        dpg.add_text("No RAM snapshot (the next search reads RAM)", tag="ram_snapshot_status", color=(150, 150, 150))
 
     dpg.add_spacer(height=10)
     dpg.add_separator()
@@ -362,6 +383,8 @@ def _create_memory_verification_tab(current_project_data: ProjectData):
         dpg.add_text("  3. Click 'Verify' to compare file data with memory", color=(150, 150, 150))
         dpg.add_text("  4. If data doesn't match, memory will automatically be searched for correct location",
                     color=(150, 150, 150))
+        dpg.add_text("  5. Searches reuse one RAM snapshot; click 'Refresh RAM Snapshot' after the game loads new data",
+                    color=(150, 150, 150))
 
     # Initialize item combo with Codecaves (default selection)
     _on_verify_type_changed(current_project_data)
@@ -678,7 +701,6 @@ def _find_memory_offset_from_file(current_project_data: ProjectData):
 
             # Search for this pattern in memory
             LoadingIndicator.update_message("Searching for pattern in memory...")
-            emu_service = EmulatorService(current_project_data)
 
             # If pattern is small, expand it with surrounding context
             search_pattern = file_data
@@ -701,8 +723,10 @@ def _find_memory_offset_from_file(current_project_data: ProjectData):
                 except Exception:
                     pass  # Use original pattern if expansion fails
 
-            matches = _search_memory(emu_service, _emulator_connection.handle, _emulator_connection.main_ram,
-                                    search_pattern, _emulator_connection.emu_info)
+            patterns = [search_pattern, file_data] if search_pattern != file_data else [file_data]
+            found = _search_memory(_emulator_connection.handle, _emulator_connection.main_ram,
+                                   patterns, _emulator_connection.emu_info)
+            matches, pattern_offset_in_search, used_context = _pick_search_matches(found, pattern_offset_in_search)
 
             LoadingIndicator.hide()
             dpg.delete_item("memory_verify_results", children_only=True)
@@ -718,6 +742,9 @@ def _find_memory_offset_from_file(current_project_data: ProjectData):
             _add_verify_result(f"File Data: {hex_preview}", (200, 200, 200))
             _add_verify_result("", (255, 255, 255))
 
+            if matches and not used_context:
+                _add_verify_result("Surrounding file data not found; showing matches of the data alone", (255, 200, 100))
+
             if matches is None:
                 _add_verify_result("Search cancelled by user", (255, 200, 100))
             elif not matches:
@@ -954,7 +981,7 @@ def _connect_to_emulator(current_project_data: ProjectData):
             emu_service = EmulatorService(current_project_data)
 
             # Establish connection (will be cached)
-            handle, main_ram, kernel32 = _get_or_establish_connection(emulator_name, emu_service)
+            handle, main_ram, _backend = _get_or_establish_connection(emulator_name, emu_service)
 
             # Hide loading indicator
             LoadingIndicator.hide()
@@ -1062,7 +1089,7 @@ def _scan_all_codecaves(current_project_data: ProjectData):
             emu_service = EmulatorService(current_project_data)
 
             # Get or establish cached connection
-            handle, main_ram, kernel32 = _get_or_establish_connection(emulator_name, emu_service)
+            handle, main_ram, _backend = _get_or_establish_connection(emulator_name, emu_service)
 
             if not handle or not main_ram:
                 LoadingIndicator.hide()
@@ -1147,80 +1174,51 @@ def _add_verify_result(text: str, color: tuple):
     """Add a result line to the memory verification results window"""
     dpg.add_text(text, color=color, parent="memory_verify_results", wrap=900)
 
-def _search_memory(emu_service: EmulatorService, handle, main_ram: int, pattern: bytes, emu_info) -> List[int]:
-    """Search memory for a byte pattern and return list of matching addresses.
-    Returns None if search was cancelled."""
-    matches = []
-
-    # Determine RAM size based on emulator
-    if emu_info.name == "Dolphin":
-        ram_size = 0x1800000  # 24 MB for GameCube
-    elif emu_info.name == "PCSX2":
-        ram_size = 0x2000000  # 32 MB for PS2
-    elif emu_info.name == "Duckstation":
-        ram_size = 0x200000   # 2 MB for PS1
+def _update_ram_snapshot_status():
+    """Show the age of the cached RAM snapshot in the verification tab"""
+    if not dpg.does_item_exist("ram_snapshot_status"):
+        return
+    emu_info = _emulator_connection.emu_info
+    snapshot = RamSnapshotService.get_cached(emu_info.name) if emu_info else None
+    if snapshot is None:
+        dpg.set_value("ram_snapshot_status", "No RAM snapshot (the next search reads RAM)")
     else:
-        ram_size = 0x2000000  # Default 32 MB
-
-    # Search in chunks to avoid reading too much at once
-    chunk_size = 1024 * 1024  # 1 MB chunks
-    pattern_len = len(pattern)
-    total_chunks = (ram_size + chunk_size - 1) // chunk_size
-
-    # Initialize PINE for PS2 if needed
-    pine_ipc = None
-    if emu_info.name == "PCSX2":
-        try:
-            import sys
-            from path_helper import get_application_directory
-            pine_path = os.path.join(get_application_directory(), 'prereq', 'pine')
-            if pine_path not in sys.path:
-                sys.path.insert(0, pine_path)
-            import prereq.pine.pcsx2_ipc as pcsx2_ipc
-
-            if pcsx2_ipc.init():
-                pine_ipc = pcsx2_ipc
-        except Exception as e:
-            print(f"PINE initialization failed for search: {e}")
-
-    for chunk_num, offset in enumerate(range(0, ram_size, chunk_size)):
-        # Check for cancellation
+        taken = time.strftime("%H:%M:%S", time.localtime(snapshot.taken_at))
+        dpg.set_value("ram_snapshot_status", f"Searching RAM snapshot taken at {taken}")
+
+def _refresh_ram_snapshot():
+    """Drop the cached RAM snapshot so the next search reads RAM again"""
+    RamSnapshotService.invalidate()
+    _update_ram_snapshot_status()
+
+def _search_memory(handle, main_ram: int, patterns: List[bytes], emu_info) -> Optional[List[List[int]]]:
+    """Search RAM for several byte patterns at once and return each one's matching addresses.
+    Searches the cached RAM snapshot (taken first if needed) instead of re-reading RAM.
+    Returns None if reading RAM was cancelled."""
+    def progress(done: int, total: int) -> bool:
         if LoadingIndicator.is_cancelled():
-            return None
-
-        # Update progress
-        LoadingIndicator.update_message(f"Searching memory... {chunk_num}/{total_chunks} chunks")
-
-        # Read chunk with overlap to catch patterns at chunk boundaries
-        read_size = min(chunk_size + pattern_len, ram_size - offset)
-
-        # Use PINE for PS2, otherwise Windows API
-        if pine_ipc:
-            try:
-                chunk_data = pine_ipc.read_bytes(offset, read_size)
-                if chunk_data:
-                    chunk_data = bytes(chunk_data)
-            except Exception:
-                chunk_data = None
-        else:
-            chunk_data = emu_service._read_memory(handle, main_ram + offset, read_size)
-
-        if chunk_data is None:
-            continue
-
-        # Search for pattern in this chunk
-        pos = 0
-        while True:
-            pos = chunk_data.find(pattern, pos)
-            if pos == -1:
-                break
-
-            # Found a match
-            match_address = main_ram + offset + pos
-            matches.append(match_address)
-            pos += 1
-
-    return matches
+            return False
+        LoadingIndicator.update_message(f"Reading emulator RAM... {done}/{total} chunks")
+        return True
+
+    snapshot = RamSnapshotService.get_snapshot(emu_info.name, handle, main_ram, progress=progress)
+    if snapshot is None:
+        return None
+    _update_ram_snapshot_status()
+
+    LoadingIndicator.update_message("Searching memory...")
+    return [[main_ram + offset for offset in offsets] for offsets in snapshot.search(patterns)]
+
+def _pick_search_matches(found: Optional[List[List[int]]], pattern_offset_in_search: int):
+    """
+    (matches, pattern offset, used context) from searching [pattern with context, pattern]:
+    the matches with surrounding context, or of the data alone if the context wasn't found
+    """
+    if found is None:
+        return None, pattern_offset_in_search, True
+    if found[0] or len(found) == 1:
+        return found[0], pattern_offset_in_search, True
+    return found[1], 0, False
 
 def _verify_memory_mapping(current_project_data: ProjectData):
     """Verify that file offset maps correctly to memory (runs in background thread with loading indicator)"""
@@ -1250,7 +1248,7 @@ def _verify_memory_mapping(current_project_data: ProjectData):
             emu_service = EmulatorService(current_project_data)
 
             # Get or establish cached connection
-            handle, main_ram, kernel32 = _get_or_establish_connection(emulator_name, emu_service)
+            handle, main_ram, _backend = _get_or_establish_connection(emulator_name, emu_service)
 
             if not handle or not main_ram:
                 LoadingIndicator.hide()
@@ -1399,31 +1397,16 @@ def _verify_memory_mapping(current_project_data: ProjectData):
 
             if emu_info and emu_info.name == "PCSX2":
                 # Use PINE for PS2
-                try:
-                    import sys
-                    from path_helper import get_application_directory
-                    pine_path = os.path.join(get_application_directory(), 'prereq', 'pine')
-                    if pine_path not in sys.path:
-                        sys.path.insert(0, pine_path)
-                    import prereq.pine.pcsx2_ipc as pcsx2_ipc
-
-                    # Initialize PINE
-                    if not pcsx2_ipc.init():
-                        LoadingIndicator.hide()
-                        dpg.delete_item("memory_verify_results", children_only=True)
-                        _add_verify_result("ERROR: Could not connect to PCSX2 via PINE", (255, 100, 100))
-                        return
+                from services.pine_client_service import get_pine_client
+                pine_client = get_pine_client()
 
-                    # Read via PINE
-                    actual_data = pcsx2_ipc.read_bytes(offset, len(expected_data))
-                    if actual_data:
-                        actual_data = bytes(actual_data)
-
-                except Exception as e:
+                if not pine_client.is_available():
                     LoadingIndicator.hide()
                     dpg.delete_item("memory_verify_results", children_only=True)
-                    _add_verify_result(f"ERROR: PINE read failed: {e}", (255, 100, 100))
+                    _add_verify_result("ERROR: Could not connect to PCSX2 via PINE", (255, 100, 100))
                     return
+
+                actual_data = pine_client.read_bytes(offset, len(expected_data))
             else:
                 # Use standard Windows API for other emulators
                 target_address = main_ram + offset
@@ -1500,12 +1483,17 @@ def _verify_memory_mapping(current_project_data: ProjectData):
                         _add_verify_result(f"Could not read context, searching with original pattern: {e}", (255, 200, 100))
 
                 # Search entire RAM for the pattern
-                matches = _search_memory(emu_service, handle, main_ram, search_pattern, _emulator_connection.emu_info)
+                patterns = [search_pattern, expected_data] if search_pattern != expected_data else [expected_data]
+                found = _search_memory(handle, main_ram, patterns, _emulator_connection.emu_info)
+                matches, pattern_offset_in_search, used_context = _pick_search_matches(found, pattern_offset_in_search)
 
                 # Hide loading indicator after search
                 LoadingIndicator.hide()
                 _add_verify_result("", (255, 255, 255))  # Spacer
 
+                if matches and not used_context:
+                    _add_verify_result("Surrounding file data not found; showing matches of the data alone", (255, 200, 100))
+
                 # Check if search was cancelled
                 if matches is None:
                     _add_verify_result("Search cancelled by user", (255, 200, 100))
@@ -1586,12 +1574,44 @@ def _verify_memory_mapping(current_project_data: ProjectData):
 # Global monitoring state
 _codecave_monitor_active = False
 _codecave_monitor_thread = None
-_codecave_snapshots: Dict[str, bytes] = {}
-_codecave_alerted: Dict[str, bool] = {}  
+_codecave_monitor: Optional[CodecaveMonitor] = None
+_codecave_alerted: Dict[str, bool] = {}
+
+# How often the monitor checks the emulator is still running while polling faster
+_CONNECTION_CHECK_INTERVAL = 0.5
+
+def _describe_cave_write(base_offset: int, write: CaveWrite) -> List[str]:
+    """Addresses a write changed, e.g. ["0x80123456", ...] (first 10)"""
+    return [f"0x80{base_offset + offset:06X}" for offset in write.offsets[:10]]
+
+def _show_codecave_rows(monitor: CodecaveMonitor, base_offsets: Dict[str, int], memory_addrs: Dict[str, str]):
+    """Rebuild the results table from the monitor's snapshots and write history"""
+    children = dpg.get_item_children("codecave_verification_table", slot=1)
+    if children:
+        for child in children:
+            dpg.delete_item(child)
+
+    for name, cave in monitor.caves.items():
+        write = cave.last_write
+        if write is None:
+            _add_codecave_result(name, memory_addrs[name], f"{cave.size:X}", "OK", "No writes detected", (100, 255, 100))
+            continue
+
+        changed_addresses = _describe_cave_write(base_offsets[name], write)
+        if len(changed_addresses) == 1:
+            details = f"Write detected at {changed_addresses[0]}"
+        elif len(changed_addresses) <= 5:
+            details = f"Writes at: {', '.join(changed_addresses)}"
+        else:
+            details = f"{write.changed_bytes} bytes changed (first: {changed_addresses[0]})"
+        if cave.write_count > 1:
+            details += f" - {cave.write_count} writes seen"
+
+        _add_codecave_result(name, memory_addrs[name], f"{cave.size:X}", "WRITTEN!", details, (255, 100, 100))
 
 def _start_codecave_monitoring(current_project_data: ProjectData):
     """Start continuous monitoring of all codecaves"""
-    global _codecave_monitor_active, _codecave_monitor_thread, _codecave_snapshots
+    global _codecave_monitor_active, _codecave_monitor_thread, _codecave_monitor, _codecave_alerted
 
     if _codecave_monitor_active:
         return
@@ -1619,14 +1639,19 @@ def _start_codecave_monitoring(current_project_data: ProjectData):
     dpg.set_value("codecave_monitor_status", "Starting monitoring...")
     dpg.configure_item("codecave_monitor_status", color=(255, 200, 100))
 
+    interval_label = dpg.get_value("codecave_monitor_interval_combo")
+    interval = MONITOR_INTERVALS.get(interval_label, MONITOR_INTERVALS[DEFAULT_MONITOR_INTERVAL])
+
     # Start monitoring
     _codecave_monitor_active = True
-    _codecave_snapshots = {}
+    _codecave_monitor = None
     _codecave_alerted = {}
 
     def monitor_loop():
+        global _codecave_monitor
         try:
-            emu_service = EmulatorService(current_project_data)
+            from services.memory_utils import read_process_memory_many
+
             current_build = current_project_data.GetCurrentBuildVersion()
             codecaves = current_build.GetCodeCaves()
 
@@ -1635,9 +1660,13 @@ def _start_codecave_monitoring(current_project_data: ProjectData):
                 _stop_codecave_monitoring()
                 return
 
-            # Take initial snapshots
-            dpg.set_value("codecave_monitor_status", f"Monitoring {len(codecaves)} codecaves...")
-            dpg.configure_item("codecave_monitor_status", color=(100, 255, 100))
+            handle = _emulator_connection.handle
+            main_ram = _emulator_connection.main_ram
+
+            # Every cave is read in one batched call per poll
+            monitor = CodecaveMonitor(lambda requests: read_process_memory_many(handle, requests))
+            base_offsets: Dict[str, int] = {}
+            memory_addrs: Dict[str, str] = {}
 
             for codecave in codecaves:
                 memory_addr = codecave.GetMemoryAddress()
@@ -1648,119 +1677,65 @@ def _start_codecave_monitoring(current_project_data: ProjectData):
 
                 # Calculate target address
                 offset = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
-                target_address = _emulator_connection.main_ram + offset
+                monitor.add_cave(codecave.GetName(), main_ram + offset, size)
+                base_offsets[codecave.GetName()] = offset
+                memory_addrs[codecave.GetName()] = memory_addr
 
-                # Read initial snapshot
-                snapshot = emu_service._read_memory(_emulator_connection.handle, target_address, size)
-                if snapshot:
-                    _codecave_snapshots[codecave.GetName()] = snapshot
+            # Take initial snapshots
+            for cave in monitor.take_snapshots():
+                _add_codecave_result(cave.name, memory_addrs[cave.name], f"{cave.size:X}", "MONITORING", "No writes detected", (100, 200, 255))
+            _codecave_monitor = monitor
 
-                    # Add to table - show initial status
-                    _add_codecave_result(codecave.GetName(), memory_addr, f"{size:X}", "MONITORING", "No writes detected", (100, 200, 255))
+            dpg.set_value("codecave_monitor_status", f"Monitoring {len(monitor.caves)} codecaves ({interval_label.lower()})...")
+            dpg.configure_item("codecave_monitor_status", color=(100, 255, 100))
 
             # Continuous monitoring loop
+            next_poll = time.perf_counter()
+            last_connection_check = next_poll
             while _codecave_monitor_active:
-                import time
-                time.sleep(0.5)  # Check every 500ms
+                next_poll += interval
+                delay = next_poll - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind (slow read or a dialog was open); don't burst to catch up
+                    next_poll = time.perf_counter()
+
+                if next_poll - last_connection_check >= _CONNECTION_CHECK_INTERVAL:
+                    last_connection_check = next_poll
+                    if not _emulator_connection.validate():
+                        dpg.set_value("codecave_monitor_status", "Connection lost")
+                        dpg.configure_item("codecave_monitor_status", color=(255, 100, 100))
+                        _stop_codecave_monitoring()
+                        break
 
-                if not _emulator_connection.validate():
-                    dpg.set_value("codecave_monitor_status", "Connection lost")
-                    dpg.configure_item("codecave_monitor_status", color=(255, 100, 100))
-                    _stop_codecave_monitoring()
-                    break
+                writes = monitor.poll()
+                if not writes or not _codecave_monitor_active:
+                    continue
 
-                # Check each codecave for changes
-                for codecave in codecaves:
-                    if not _codecave_monitor_active:
-                        break
+                _show_codecave_rows(monitor, base_offsets, memory_addrs)
 
-                    name = codecave.GetName()
-                    if name not in _codecave_snapshots:
+                for cave, write in writes:
+                    # Alert user with exact addresses (ONLY ONCE per codecave)
+                    if _codecave_alerted.get(cave.name):
                         continue
+                    _codecave_alerted[cave.name] = True
 
-                    memory_addr = codecave.GetMemoryAddress()
-                    offset = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
-                    target_address = _emulator_connection.main_ram + offset
-                    size = codecave.GetSizeAsInt()
-
-                    # Read current memory
-                    current_data = emu_service._read_memory(_emulator_connection.handle, target_address, size)
+                    dpg.set_value("codecave_monitor_status", f"WRITE DETECTED in {cave.name}!")
+                    dpg.configure_item("codecave_monitor_status", color=(255, 100, 100))
 
-                    if current_data is None:
-                        continue
+                    changed_addresses = _describe_cave_write(base_offsets[cave.name], write)
+                    if len(changed_addresses) == 1:
+                        addr_info = f"Address written: {changed_addresses[0]}"
+                    elif len(changed_addresses) <= 5:
+                        addr_info = f"Addresses written:\n" + "\n".join(changed_addresses)
+                    else:
+                        addr_info = f"{write.changed_bytes} bytes changed\nFirst address: {changed_addresses[0]}"
 
-                    # Compare with snapshot
-                    if current_data != _codecave_snapshots[name]:
-                        # Check if we've already alerted for this codecave
-                        if name not in _codecave_alerted or not _codecave_alerted[name]:
-                            # FIRST TIME DETECTING CHANGE! Find exact byte offset(s) that changed
-                            old_snapshot = _codecave_snapshots[name]
-                            changed_offsets = []
-                            for i in range(min(len(current_data), len(old_snapshot))):
-                                if current_data[i] != old_snapshot[i]:
-                                    changed_offsets.append(i)
-
-                            # Calculate exact memory addresses that were written
-                            base_offset = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
-                            changed_addresses = [f"0x80{base_offset + off:06X}" for off in changed_offsets[:10]]  # Show first 10
-
-                            dpg.set_value("codecave_monitor_status", f"WRITE DETECTED in {name}!")
-                            dpg.configure_item("codecave_monitor_status", color=(255, 100, 100))
-
-                            # Update table row to show change
-                            children = dpg.get_item_children("codecave_verification_table", slot=1)
-                            if children:
-                                for child in children:
-                                    dpg.delete_item(child)
-
-                            # Re-add all rows with updated status
-                            for cc in codecaves:
-                                cc_name = cc.GetName()
-                                cc_addr = cc.GetMemoryAddress()
-                                cc_size = cc.GetSizeAsInt()
-
-                                if cc_name in _codecave_snapshots:
-                                    if cc_name == name:
-                                        # This one changed - show exact addresses
-                                        if len(changed_addresses) == 1:
-                                            details = f"Write detected at {changed_addresses[0]}"
-                                        elif len(changed_addresses) <= 5:
-                                            details = f"Writes at: {', '.join(changed_addresses)}"
-                                        else:
-                                            details = f"{len(changed_offsets)} bytes changed (first: {changed_addresses[0]})"
-
-                                        _add_codecave_result(cc_name, cc_addr, f"{cc_size:X}",
-                                                            "WRITTEN!",
-                                                            details,
-                                                            (255, 100, 100))
-                                    else:
-                                        # Check if this one was previously alerted
-                                        if cc_name in _codecave_alerted and _codecave_alerted[cc_name]:
-                                            _add_codecave_result(cc_name, cc_addr, f"{cc_size:X}",
-                                                                "WRITTEN!", "Write detected earlier", (255, 100, 100))
-                                        else:
-                                            # Still clean
-                                            _add_codecave_result(cc_name, cc_addr, f"{cc_size:X}",
-                                                                "OK", "No writes detected", (100, 255, 100))
-
-                            # Alert user with exact addresses (ONLY ONCE)
-                            if len(changed_addresses) == 1:
-                                addr_info = f"Address written: {changed_addresses[0]}"
-                            elif len(changed_addresses) <= 5:
-                                addr_info = f"Addresses written:\n" + "\n".join(changed_addresses)
-                            else:
-                                addr_info = f"{len(changed_offsets)} bytes changed\nFirst address: {changed_addresses[0]}"
-
-                            messagebox.showwarning("Codecave Write Detected!",
-                                f"Codecave '{name}' was written to during gameplay!\n\n"
-                                f"This codecave may not be safe to use.\n\n"
-                                f"{addr_info}\n")
-
-                            # Mark this codecave as alerted
-                            _codecave_alerted[name] = True
-
-                        # Update snapshot (always update, even if already alerted)
-                        _codecave_snapshots[name] = current_data
+                    messagebox.showwarning("Codecave Write Detected!",
+                        f"Codecave '{cave.name}' was written to during gameplay!\n\n"
+                        f"This codecave may not be safe to use.\n\n"
+                        f"{addr_info}\n")
 
         except Exception as e:
             import traceback
@@ -1844,8 +1819,9 @@ def _fill_codecaves_with_pattern(current_project_data: ProjectData):
                 if success:
                     filled_count += 1
                     # Update snapshot if monitoring is active
-                    if _codecave_monitor_active and codecave.GetName() in _codecave_snapshots:
-                        _codecave_snapshots[codecave.GetName()] = pattern
+                    cave = _codecave_monitor.get_cave(codecave.GetName()) if _codecave_monitor_active and _codecave_monitor else None
+                    if cave:
+                        cave.rebase(pattern)
 
             LoadingIndicator.hide()
 
@@ -3,6 +3,7 @@ from dpg.widget_themes import *
 
 from classes.project_data.project_data import *
 from gui.gui_main_project_callbacks import *
+from services.scan_index_service import ScanIndexService
 
 def CreateGameFilesGui(current_project_data):
     # Check if in single file mode
@@ -455,7 +456,7 @@ def _auto_build_section_map_if_supported(current_project_data: ProjectData, file
     
     # Build section map
     print(f"  Building section map for {filename}...")
-    success = current_build.BuildSectionMapForFile(filename)
+    success = current_build.BuildSectionMapForFile(filename, ScanIndexService.for_project(current_project_data))
     
     if success:
         section_count = len(current_build.section_maps[filename])
@@ -494,7 +495,7 @@ def callback_build_section_map_for_file(sender, app_data, user_data):
     print(f"\nBuilding section map for: {filename}")
     
     # Build the section map
-    success = current_build.BuildSectionMapForFile(filename)
+    success = current_build.BuildSectionMapForFile(filename, ScanIndexService.for_project(current_project_data))
     
     if success:
         from gui import gui_messagebox as messagebox
@@ -8,6 +8,7 @@ from tkinter import filedialog
 from services.project_serializer import ProjectSerializer
 from services.iso_service import ISOService
 from services.ghidra_pattern_service import GhidraPatternService
+from services.scan_index_service import ScanIndexService
 from gui.gui_loading_indicator import LoadingIndicator
 from gui.gui_build import refresh_build_panel_ui, update_build_button_label
 from gui.gui_prereq_prompt import check_and_prompt_prereqs
@@ -46,7 +47,7 @@ def _scan_for_os_library_functions(current_project_data: ProjectData):
 
     try:
         service = GhidraPatternService()
-        symbols = service.scan_executable(platform, exe_path)
+        symbols = service.scan_executable(platform, exe_path, ScanIndexService.for_project(current_project_data))
 
         if symbols:
             print(f"Found {len(symbols)} OS library functions")
@@ -856,6 +857,7 @@ def callback_clean_build(_, __, current_project_data: ProjectData):
         os.path.join(project_folder, '.config', 'output', 'bin_files'),
         os.path.join(project_folder, '.config', 'output', 'memory_map'),
         os.path.join(project_folder, '.config', 'output', 'iso_build'),
+        os.path.join(project_folder, '.config', 'object_store'),
     ]
 
     # Files to clean
@@ -895,6 +897,12 @@ def callback_clean_build(_, __, current_project_data: ProjectData):
             except Exception as e:
                 print(f"Could not remove {file_path}: {e}")
 
+    # Clear stored scan results for this build
+    scan_index = ScanIndexService.for_project(current_project_data)
+    if scan_index is not None and os.path.isdir(scan_index.index_dir):
+        scan_index.clear()
+        files_removed += 1
+
     if files_removed > 0:
         messagebox.showinfo("Clean Complete", f"Cleaned {files_removed} artifact(s).\n\nNext compile will rebuild all files.")
     else:
@@ -2,6 +2,7 @@ import dearpygui.dearpygui as dpg
 from typing import Optional
 from classes.project_data.project_data import ProjectData
 from services.memory_watch_service import MemoryWatchService, WatchEntry, DataType
+from services.value_scan_service import ScanCompare
 from services.symbol_map_parser_service import SymbolParserService
 from services.emulator_service import EmulatorService
 from services.emulator_connection_manager import get_emulator_manager
@@ -9,6 +10,26 @@ from functions.verbose_print import verbose_print
 import os
 import threading
 
+# Value scan choices (label -> value); colors can't be compared, so they aren't offered
+_VALUE_SCAN_TYPES = {
+    "u8 (byte)": DataType.BYTE_UNSIGNED,
+    "s8 (signed byte)": DataType.BYTE_SIGNED,
+    "u16 (short)": DataType.SHORT_UNSIGNED,
+    "s16 (signed short)": DataType.SHORT_SIGNED,
+    "u32 (int)": DataType.INT_UNSIGNED,
+    "s32 (signed int)": DataType.INT_SIGNED,
+    "float": DataType.FLOAT,
+}
+_VALUE_SCAN_COMPARES = {
+    "Exact value": ScanCompare.EXACT,
+    "Unknown initial value": ScanCompare.UNKNOWN,
+    "Changed": ScanCompare.CHANGED,
+    "Unchanged": ScanCompare.UNCHANGED,
+    "Increased": ScanCompare.INCREASED,
+    "Decreased": ScanCompare.DECREASED,
+}
+VALUE_SCAN_RESULT_LIMIT = 200
+
 # Add this to gui_memory_watch.py at the module level
 
 # Global memory watch service instance
@@ -76,6 +97,8 @@ class MemoryWatchWindow:
         self.symbol_watches: list = []  # List of (symbol, entry, row_tags)
         self.all_symbols: list = []  # Store all symbols for filtering
         self.current_filter: str = "all"  # Current filter: "all", "game", or "mod"
+        self.value_scanner = None  # ValueScanner of the current scan session
+        self.value_scan_running = False
 
         # Loading modals
         self.loading_modal_tag = "memory_watch_loading_modal"
@@ -165,6 +188,10 @@ class MemoryWatchWindow:
                 # Symbols Tab
                 with dpg.tab(label="Symbols"):
                     self._create_symbols_tab()
+
+                # Value Scan Tab
+                with dpg.tab(label="Value Scan"):
+                    self._create_value_scan_tab()
         
         # Create loading modal
         self._create_loading_modal()
@@ -341,6 +368,66 @@ class MemoryWatchWindow:
         # Scrollable symbol list
         with dpg.child_window(tag="symbol_watch_list", height=-1, border=True):
             pass
+
+    def _create_value_scan_tab(self):
+        """Create the value scan tab"""
+        dpg.add_text("Find a value's address by scanning RAM, then narrowing as it changes in game:")
+
+        with dpg.group(horizontal=True):
+            dpg.add_text("Type:")
+            dpg.add_combo(
+                tag="value_scan_type_combo",
+                items=list(_VALUE_SCAN_TYPES),
+                default_value="u32 (int)",
+                width=150
+            )
+
+            dpg.add_text("  Scan:")
+            dpg.add_combo(
+                tag="value_scan_compare_combo",
+                items=list(_VALUE_SCAN_COMPARES),
+                default_value="Exact value",
+                width=180
+            )
+
+            dpg.add_text("  Value:")
+            dpg.add_input_text(
+                tag="value_scan_value_input",
+                width=150,
+                hint="100, 0x64, 1.5"
+            )
+
+        with dpg.group(horizontal=True):
+            dpg.add_button(label="First Scan", tag="value_scan_first_button",
+                           callback=lambda: self._run_value_scan(first=True), width=100)
+            dpg.add_button(label="Next Scan", tag="value_scan_next_button",
+                           callback=lambda: self._run_value_scan(first=False), enabled=False, width=100)
+            dpg.add_button(label="Reset", callback=self._reset_value_scan, width=60)
+            dpg.add_spacer(width=10)
+            dpg.add_text("", tag="value_scan_status_text")
+
+        dpg.add_separator()
+        dpg.add_spacer(height=10)
+
+        # Result list header
+        with dpg.table(header_row=False, borders_innerH=False, borders_outerH=False,
+                      borders_innerV=False, borders_outerV=False):
+            dpg.add_table_column(width_fixed=True, init_width_or_weight=120)  # Address
+            dpg.add_table_column(width_fixed=True, init_width_or_weight=150)  # Value
+            dpg.add_table_column(width_fixed=True, init_width_or_weight=150)  # Previous
+            dpg.add_table_column(width_fixed=True, init_width_or_weight=100)  # Actions
+
+            with dpg.table_row():
+                dpg.add_text("Address")
+                dpg.add_text("Value")
+                dpg.add_text("Previous")
+                dpg.add_text("Actions")
+
+        dpg.add_separator()
+
+        # Scrollable result list
+        with dpg.child_window(tag="value_scan_results", height=-1, border=True):
+            pass
     
     def _scan_emulators(self):
         """Scan for available emulators using centralized manager"""
@@ -659,6 +746,105 @@ class MemoryWatchWindow:
         if entry.data_type.is_color and self.watch_service.main_ram_address:
             self._immediate_read_value(entry)
 
+    def _run_value_scan(self, first: bool):
+        """Run a first or next scan in the background"""
+        if self.value_scan_running:
+            return
+
+        compare = _VALUE_SCAN_COMPARES[dpg.get_value("value_scan_compare_combo")]
+        data_type = _VALUE_SCAN_TYPES[dpg.get_value("value_scan_type_combo")]
+
+        if first or self.value_scanner is None:
+            scanner = self.watch_service.create_value_scanner(data_type)
+            if scanner is None:
+                dpg.set_value("value_scan_status_text", "Connect to an emulator first")
+                return
+        else:
+            scanner = self.value_scanner
+
+        value = None
+        if compare.needs_value:
+            value = scanner.parse_value(dpg.get_value("value_scan_value_input"))
+            if value is None:
+                dpg.set_value("value_scan_status_text", f"Enter a valid {data_type.value} value")
+                return
+
+        self.value_scan_running = True
+        dpg.configure_item("value_scan_first_button", enabled=False)
+        dpg.configure_item("value_scan_next_button", enabled=False)
+        dpg.set_value("value_scan_status_text", "Scanning...")
+
+        def scan_thread():
+            if first:
+                count = scanner.first_scan(compare, value)
+            else:
+                count = scanner.next_scan(compare, value)
+            hits = scanner.results(VALUE_SCAN_RESULT_LIMIT) if count is not None else []
+
+            self.value_scanner = scanner if scanner.scan_count else None
+            self.value_scan_running = False
+            dpg.configure_item("value_scan_first_button", enabled=True)
+            dpg.configure_item("value_scan_next_button", enabled=self.value_scanner is not None)
+            # The type is fixed once a scan session has started
+            dpg.configure_item("value_scan_type_combo", enabled=self.value_scanner is None)
+
+            if count is None:
+                dpg.set_value("value_scan_status_text", f"'{compare.value}' scan failed (see console)")
+                return
+            dpg.set_value("value_scan_status_text",
+                          f"Scan {scanner.scan_count}: {count:,} address(es) in {scanner.last_scan_ms:.0f} ms")
+            self._show_value_scan_results(scanner.data_type, hits, count)
+
+        thread = threading.Thread(target=scan_thread, daemon=True)
+        thread.start()
+
+    def _reset_value_scan(self):
+        """Drop the current scan session"""
+        if self.value_scan_running:
+            return
+        self.value_scanner = None
+        dpg.configure_item("value_scan_next_button", enabled=False)
+        dpg.configure_item("value_scan_type_combo", enabled=True)
+        dpg.set_value("value_scan_status_text", "")
+        dpg.delete_item("value_scan_results", children_only=True)
+
+    def _show_value_scan_results(self, data_type: DataType, hits: list, count: int):
+        """Fill the result list with the first hits"""
+        dpg.delete_item("value_scan_results", children_only=True)
+
+        def format_value(value):
+            if value is None:
+                return "---"
+            return f"{value:.6g}" if data_type == DataType.FLOAT else str(value)
+
+        with dpg.table(parent="value_scan_results", header_row=False, borders_innerH=False,
+                       borders_outerH=False, borders_innerV=False, borders_outerV=False):
+            dpg.add_table_column(width_fixed=True, init_width_or_weight=120)
+            dpg.add_table_column(width_fixed=True, init_width_or_weight=150)
+            dpg.add_table_column(width_fixed=True, init_width_or_weight=150)
+            dpg.add_table_column(width_fixed=True, init_width_or_weight=100)
+
+            for hit in hits:
+                with dpg.table_row():
+                    dpg.add_text(f"0x{hit.address:08X}")
+                    dpg.add_text(format_value(hit.value))
+                    dpg.add_text(format_value(hit.previous))
+                    dpg.add_button(
+                        label="Watch",
+                        callback=lambda s, a, u: self._watch_value_scan_hit(u, data_type),
+                        user_data=hit,
+                        width=60
+                    )
+
+        if count > len(hits):
+            dpg.add_text(f"Showing the first {len(hits)} of {count:,}; narrow the scan to see the rest",
+                         parent="value_scan_results", color=(255, 255, 100))
+
+    def _watch_value_scan_hit(self, hit, data_type: DataType):
+        """Add a scan result to the manual watch list"""
+        entry = self.watch_service.add_watch(hit.address, data_type)
+        self._add_manual_watch_row(entry)
+
     def _remove_manual_watch(self, entry: WatchEntry, row_tag: str):
         """Remove a manual watch"""
         self.watch_service.remove_watch(entry)
@@ -686,7 +872,7 @@ class MemoryWatchWindow:
         # Check if we need to rebuild (switching to/from color types, or changing alpha support)
         needs_rebuild = (old_type.is_color != new_type.is_color) or (old_type.has_alpha != new_type.has_alpha)
         
-        entry.data_type = new_type
+        self.watch_service.set_watch_type(entry, new_type)
         verbose_print(f"Changed {entry.name} type to {new_type_str}")
         
         # If switching to/from color types or changing alpha support, rebuild the row
@@ -1504,24 +1690,29 @@ class MemoryWatchWindow:
     
     def _filter_symbols(self):
         """Filter symbols by search text"""
-        filter_text = dpg.get_value("symbol_filter_input").lower()
+        filter_text = dpg.get_value("symbol_filter_input")
+        if self.symbol_parser is None:
+            return
+        matching_ids = {id(symbol) for symbol in self.symbol_parser.index.matching(filter_text)}
         
         for symbol, entry, tags in self.symbol_watches:
-            if filter_text in symbol.name.lower():
+            if id(symbol) in matching_ids:
                 dpg.show_item(tags['row'])
             else:
                 dpg.hide_item(tags['row'])
     
     def _on_watch_update(self, entries):
-        """Called when watch values update"""
-        # Update manual watches
-        for entry, tags in self.manual_watches:
-            dec_val = entry.format_value()
-            hex_val = entry.format_hex()
-            
-            # Update text
-            dpg.set_value(tags['dec'], dec_val)
-            dpg.set_value(tags['hex'], hex_val)
+        """Called with the watches whose value or change highlight changed since the last update"""
+        tags_by_entry = {id(entry): tags for entry, tags in self.manual_watches}
+        tags_by_entry.update({id(entry): tags for _, entry, tags in self.symbol_watches if entry is not None})
+
+        for entry in entries:
+            tags = tags_by_entry.get(id(entry))
+            if tags is None:
+                continue  # Removed while the poll was running
+
+            dpg.set_value(tags['dec'], entry.format_value())
+            dpg.set_value(tags['hex'], entry.format_hex())
             
             # Update color swatch for color types
             if entry.data_type.is_color:
@@ -1540,32 +1731,6 @@ class MemoryWatchWindow:
             else:
                 dpg.configure_item(tags['dec'], color=(255, 255, 255))
                 dpg.configure_item(tags['hex'], color=(255, 255, 255))
-        
-        # Update symbol watches
-        for symbol, entry, tags in self.symbol_watches:
-            if entry is not None:
-                dec_val = entry.format_value()
-                hex_val = entry.format_hex()
-                
-                dpg.set_value(tags['dec'], dec_val)
-                dpg.set_value(tags['hex'], hex_val)
-                
-                # Update color swatch for color types
-                if entry.data_type.is_color:
-                    if dpg.does_item_exist(tags.get('color_swatch', '')):
-                        if entry.data_type.has_alpha and entry.rgba_value is not None:
-                            r, g, b, a = entry.rgba_value
-                            dpg.configure_item(tags['color_swatch'], default_value=(r, g, b, a))
-                        elif entry.rgb_value is not None:
-                            r, g, b = entry.rgb_value
-                            dpg.configure_item(tags['color_swatch'], default_value=(r, g, b, 255))
-                
-                if entry.has_changed:
-                    dpg.configure_item(tags['dec'], color=(255, 255, 100))
-                    dpg.configure_item(tags['hex'], color=(255, 255, 100))
-                else:
-                    dpg.configure_item(tags['dec'], color=(255, 255, 255))
-                    dpg.configure_item(tags['hex'], color=(255, 255, 255))
     
     def _on_watch_error(self, error_msg: str):
         """Called when watch encounters an error"""
@@ -1608,6 +1773,9 @@ class MemoryWatchWindow:
         # Reset symbol parser
         self.symbol_parser = None
 
+        # Drop the value scan session
+        self.value_scanner = None
+
         # Reset emulator selection
         self.available_emulators = []
         self.emu_service = None
@@ -25,6 +25,7 @@ from services.project_serializer import ProjectSerializer
 from services.iso_service import ISOService
 from services.template_service import TemplateService
 from services.ghidra_pattern_service import GhidraPatternService
+from services.scan_index_service import ScanIndexService
 from gui.gui_loading_indicator import LoadingIndicator
 from gui.gui_prereq_prompt import check_and_prompt_prereqs
 from functions.verbose_print import verbose_print
@@ -846,7 +847,7 @@ def _scan_for_ghidra_patterns(project_data: ProjectData):
     # Scan for patterns
     try:
         service = GhidraPatternService()
-        symbols = service.scan_executable(platform, exe_path)
+        symbols = service.scan_executable(platform, exe_path, ScanIndexService.for_project(project_data))
 
         if symbols:
             print(f"Found {len(symbols)} OS library functions")
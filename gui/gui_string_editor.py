@@ -9,6 +9,10 @@ from typing import List, Optional, Tuple
 from gui import gui_messagebox as messagebox
 from classes.project_data.project_data import ProjectData
 from classes.injection_targets.binary_patch import BinaryPatch
+from services.string_extraction_service import (
+    StringExtractionService, PYTHON_CODECS, count_format_specifiers, has_debug_keyword, has_file_path
+)
+from services.scan_index_service import ScanIndexService
 
 class GameString:
     """Represents a string found in a game file"""
@@ -27,28 +31,10 @@ def _is_printf_debug_string(text: str) -> tuple[bool, int]:
     Check if a string is likely a printf format string, file path, or error message.
     Returns (is_debug, format_spec_count) where format_spec_count is number of printf format specifiers.
     """
-    import re
-
-    text_lower = text.lower()
-
-    # Count printf format specifiers (%s, %d, %x, %c, %f, %p, %u, %i, %n, %ld, %lld, etc.)
-    # Match patterns like: %s, %d, %5d, %.2f, %08x, %ld, %lld, %p, etc.
-    printf_pattern = r'%[-+ 0#]*(?:\d+|\*)?(?:\.(?:\d+|\*))?(?:hh|h|l|ll|j|z|t|L)?[sdioxXufFeEgGaAcpn%]'
-    format_specs = re.findall(printf_pattern, text)
-    format_count = len([f for f in format_specs if f != '%%'])  # Exclude literal %
-
-    # Check for file paths (/, \, or file extensions)
-    has_file_path = ('/' in text or '\\' in text or
-                     '.c' in text_lower or '.cpp' in text_lower or '.h' in text_lower or
-                     '.cc' in text_lower or '.cxx' in text_lower or '.hpp' in text_lower)
-
-    # Check for error/debug keywords
-    debug_keywords = ['error', 'fail', 'warning', 'assert', 'debug', 'printf', 'log',
-                      'exception', 'fatal', 'panic', 'abort', 'trace', 'interrupt', 'timeout']
-    has_debug_keyword = any(keyword in text_lower for keyword in debug_keywords)
+    format_count = count_format_specifiers(text)
 
     # It's a printf/debug string if it has ANY of these characteristics
-    is_debug = format_count > 0 or has_file_path or has_debug_keyword
+    is_debug = format_count > 0 or has_file_path(text) or has_debug_keyword(text)
 
     return is_debug, format_count
 
@@ -117,6 +103,11 @@ def show_string_editor_window(sender, app_data, current_project_data: ProjectDat
                 tag="string_editor_include_unicode",
                 default_value=False
             )
+            dpg.add_checkbox(
+                label="Include Shift-JIS",
+                tag="string_editor_include_shift_jis",
+                default_value=False
+            )
             dpg.add_spacer(width=20)
             dpg.add_text("", tag="string_editor_status", color=(150, 150, 150))
 
@@ -260,6 +251,7 @@ def _on_scan_strings_clicked(current_project_data: ProjectData):
     filename = dpg.get_value("string_editor_file_combo")
     min_length = dpg.get_value("string_editor_min_length")
     include_unicode = dpg.get_value("string_editor_include_unicode")
+    include_shift_jis = dpg.get_value("string_editor_include_shift_jis")
 
     if not filename or filename == "No files found":
         messagebox.showerror("No File", "Please select a file to scan")
@@ -281,8 +273,9 @@ def _on_scan_strings_clicked(current_project_data: ProjectData):
 
     # Scan for strings
     try:
-        print(f"Starting scan of {file_path} with min_length={min_length}, include_unicode={include_unicode}")
-        _scanned_strings = _scan_file_for_strings(file_path, min_length, include_unicode)
+        print(f"Starting scan of {file_path} with min_length={min_length}, include_unicode={include_unicode}, include_shift_jis={include_shift_jis}")
+        _scanned_strings = _scan_file_for_strings(file_path, min_length, include_unicode, include_shift_jis,
+                                                  ScanIndexService.for_project(current_project_data))
         print(f"Scan complete, found {len(_scanned_strings)} strings")
 
         if not _scanned_strings:
@@ -322,98 +315,27 @@ def _on_scan_strings_clicked(current_project_data: ProjectData):
         dpg.set_value("string_editor_status", "Scan failed")
         messagebox.showerror("Scan Error", f"Error scanning file:\n\n{str(e)}\n\n{traceback.format_exc()}")
 
-def _scan_file_for_strings(file_path: str, min_length: int, include_unicode: bool) -> List[GameString]:
+def _scan_file_for_strings(file_path: str, min_length: int, include_unicode: bool,
+                           include_shift_jis: bool = False,
+                           scan_index: Optional[ScanIndexService] = None) -> List[GameString]:
     """
-    Scan a binary file for null-terminated ASCII (and optionally UTF-16) strings.
+    Scan a binary file for null-terminated ASCII (and optionally UTF-16 / Shift-JIS) strings.
     Returns list of found strings with their offsets.
-    Fast state machine similar to codecave finder.
+    Results are cached by the extraction service (and the project's scan index, if given),
+    so rescanning an unchanged file is instant.
     """
     strings = []
 
-    with open(file_path, 'rb') as f:
-        file_data = f.read()
-
-    file_size = len(file_data)
-
-    # Scan for ASCII null-terminated strings
-    current_string = []
-    string_start = None
-
-    i = 0
-    while i < file_size:
-        byte = file_data[i]
-
-        # Printable ASCII range (plus common whitespace)
-        if (32 <= byte <= 126) or byte in [9, 10, 13]:  # Tab, LF, CR
-            if string_start is None:
-                string_start = i
-            current_string.append(byte)
-            i += 1
-        elif byte == 0x00:
-            # NULL TERMINATOR - only save string if we found a null byte
-            if current_string and len(current_string) >= min_length:
-                try:
-                    text = bytes(current_string).decode('ascii', errors='ignore')
-                    # Length includes null terminator
-                    game_string = GameString(string_start, text, len(current_string) + 1, "ascii")
-                    # Categorize the string
-                    is_debug, format_count = _is_printf_debug_string(text)
-                    game_string.is_printf_debug = is_debug
-                    game_string.format_spec_count = format_count
-                    strings.append(game_string)
-                except:
-                    pass
-
-            current_string = []
-            string_start = None
-            i += 1
-        else:
-            # Non-null, non-printable byte - reset without saving
-            current_string = []
-            string_start = None
-            i += 1
-
-    # Don't save final string if not null-terminated
-
-    # Scan for UTF-16 LE null-terminated strings if requested
-    if include_unicode:
-        current_string = []
-        string_start = None
-
-        i = 0
-        while i < file_size - 1:
-            # UTF-16 LE: printable char followed by 0x00
-            byte1 = file_data[i]
-            byte2 = file_data[i + 1]
-
-            if 32 <= byte1 <= 126 and byte2 == 0:
-                if string_start is None:
-                    string_start = i
-                current_string.append(byte1)
-                current_string.append(byte2)
-                i += 2
-            elif byte1 == 0 and byte2 == 0:
-                # Double null terminator for UTF-16
-                if current_string and len(current_string) // 2 >= min_length:
-                    try:
-                        text = bytes(current_string).decode('utf-16-le', errors='ignore')
-                        game_string = GameString(string_start, text, len(current_string) + 2, "utf-16")
-                        # Categorize the string
-                        is_debug, format_count = _is_printf_debug_string(text)
-                        game_string.is_printf_debug = is_debug
-                        game_string.format_spec_count = format_count
-                        strings.append(game_string)
-                    except:
-                        pass
-
-                current_string = []
-                string_start = None
-                i += 2
-            else:
-                # Not a valid UTF-16 sequence - reset
-                current_string = []
-                string_start = None
-                i += 1
+    extracted_strings = StringExtractionService().extract_from_file(
+        file_path, min_length, include_unicode, include_shift_jis, scan_index
+    )
+    for extracted in extracted_strings:
+        game_string = GameString(extracted.file_offset, extracted.text, extracted.length, extracted.encoding)
+        # Categorize the string
+        is_debug, format_count = _is_printf_debug_string(extracted.text)
+        game_string.is_printf_debug = is_debug
+        game_string.format_spec_count = format_count
+        strings.append(game_string)
 
     return strings
 
@@ -425,25 +347,18 @@ def _calculate_memory_addresses(strings: List[GameString], filename: str, curren
     has_section_map = filename in current_build.section_maps
 
     if has_section_map:
-        sections = current_build.section_maps[filename]
-
-        for string in strings:
-            # Find which section this file offset belongs to
-            for section in sections:
-                # Calculate if this file offset is within this section's file range
-                section_file_start = section.file_offset
-                section_file_end = section.file_offset + section.size
-
-                if section_file_start <= string.file_offset < section_file_end:
-                    # Calculate memory address
-                    offset_within_section = string.file_offset - section.file_offset
-                    string.memory_address = section.mem_start + offset_within_section
-
-                    # Get section info (type/name)
-                    section_info = current_build.GetSectionInfoForAddress(filename, string.memory_address)
-                    if section_info:
-                        string.section = section_info['type']
-                    break
+        address_index = current_build.GetAddressIndex(filename)
+        file_sections = address_index.find_many_by_file_offset([s.file_offset for s in strings])
+
+        for string, file_section in zip(strings, file_sections):
+            if file_section is None:
+                continue
+            string.memory_address = string.file_offset + file_section.offset_diff
+
+            # Get section info (type/name)
+            section = address_index.find_by_memory(string.memory_address)
+            if section:
+                string.section = section.section_type
     else:
         # Fallback: Use file offset
         file_offset_str = current_build.GetInjectionFileOffset(filename)
@@ -679,10 +594,7 @@ def _on_save_string_patch(sender, app_data, user_data):
 
     # Encode new string
     try:
-        if string.encoding == "utf-16":
-            new_bytes = new_text.encode('utf-16-le')
-        else:
-            new_bytes = new_text.encode('ascii')
+        new_bytes = new_text.encode(PYTHON_CODECS.get(string.encoding, 'ascii'))
     except Exception as e:
         dpg.set_value(f"{window_tag}_warning", f"Error: Invalid characters for {string.encoding}")
         return
@@ -0,0 +1,215 @@
+"""
+Build Profiler Service
+Records per-stage and per-subprocess timing for the build pipeline and writes it
+as a Chrome trace (open in chrome://tracing or https://ui.perfetto.dev)
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+if sys.platform != "win32":
+    import resource
+
+
+class BuildProfiler:
+    """
+    Collects trace events while enabled; when disabled every call is a no-op,
+    so services can always wrap their stages without checking a flag.
+
+    Stages record wall time, this process's CPU time and child process CPU time.
+    Subprocesses record wall time and, where it can be measured exactly, their CPU time.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[Dict] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        # Trace thread ids: the thread that created the profiler is 0, workers follow
+        self._thread_ids: Dict[int, int] = {threading.get_ident(): 0}
+
+        # Child CPU seconds recorded per process (Windows has no RUSAGE_CHILDREN)
+        self._recorded_child_cpu = 0.0
+        # Used to tell whether a subprocess overlapped another one
+        self._active_subprocesses = 0
+        self._subprocess_epoch = 0
+
+    # ==================== RECORDING ====================
+
+    def stage(self, name: str, **args):
+        """Context manager timing a pipeline stage"""
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name, args)
+
+    @contextmanager
+    def _stage(self, name: str, args: Dict):
+        start = self._now_us()
+        cpu_start = time.process_time()
+        child_cpu_start = self._get_child_cpu_seconds()
+        try:
+            yield
+        finally:
+            args = dict(args)
+            args["cpu_ms"] = round((time.process_time() - cpu_start) * 1000, 3)
+            args["subprocess_cpu_ms"] = round((self._get_child_cpu_seconds() - child_cpu_start) * 1000, 3)
+            self._add_event(name, "stage", start, self._now_us() - start, args)
+
+    def run(self, name: str, cmd: List[str], timeout: Optional[float] = None, input=None,
+            capture_output: bool = False, check: bool = False, **popen_kwargs) -> subprocess.CompletedProcess:
+        """
+        Drop-in for subprocess.run(cmd, ...) that records the call.
+        Raises subprocess.TimeoutExpired / CalledProcessError like subprocess.run.
+        """
+        if not self.enabled:
+            return subprocess.run(cmd, timeout=timeout, input=input, capture_output=capture_output,
+                                  check=check, **popen_kwargs)
+
+        if capture_output:
+            popen_kwargs["stdout"] = subprocess.PIPE
+            popen_kwargs["stderr"] = subprocess.PIPE
+        if input is not None:
+            popen_kwargs["stdin"] = subprocess.PIPE
+
+        with self._lock:
+            measurable = self._active_subprocesses == 0
+            self._active_subprocesses += 1
+            self._subprocess_epoch += 1
+            start_epoch = self._subprocess_epoch
+
+        child_cpu_start = self._get_rusage_children_seconds()
+        start = self._now_us()
+        returncode = None
+        cpu_seconds = None
+        try:
+            with subprocess.Popen(cmd, **popen_kwargs) as process:
+                try:
+                    stdout, stderr = process.communicate(input, timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.communicate()
+                    raise
+                returncode = process.returncode
+                if sys.platform == "win32":
+                    cpu_seconds = self._get_windows_process_cpu_seconds(process)
+        finally:
+            with self._lock:
+                measurable = measurable and self._subprocess_epoch == start_epoch
+                self._active_subprocesses -= 1
+                if sys.platform == "win32":
+                    self._recorded_child_cpu += cpu_seconds or 0.0
+                elif measurable:
+                    cpu_seconds = self._get_rusage_children_seconds() - child_cpu_start
+
+            args = {"cmd": " ".join(os.path.basename(str(cmd[0])) if i == 0 else str(part)
+                                    for i, part in enumerate(cmd))[:500],
+                    "returncode": returncode}
+            if cpu_seconds is not None:
+                args["cpu_ms"] = round(cpu_seconds * 1000, 3)
+            self._add_event(name, "subprocess", start, self._now_us() - start, args)
+
+        if check and returncode:
+            raise subprocess.CalledProcessError(returncode, process.args, stdout, stderr)
+        return subprocess.CompletedProcess(process.args, returncode, stdout, stderr)
+
+    # ==================== OUTPUT ====================
+
+    def write_trace(self, output_path: str) -> bool:
+        """Write collected events as a Chrome trace JSON file"""
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            events = list(self.events)
+            thread_names = [
+                {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                 "args": {"name": "main" if tid == 0 else f"worker {tid}"}}
+                for tid in sorted(self._thread_ids.values())
+            ]
+
+        try:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, 'w') as f:
+                json.dump({"traceEvents": thread_names + events, "displayTimeUnit": "ms"}, f, indent=1)
+            return True
+        except Exception as e:
+            print(f"Could not write build profile: {e}")
+            return False
+
+    def get_summary(self) -> str:
+        """Per-stage table plus totals for each kind of subprocess"""
+        with self._lock:
+            events = list(self.events)
+
+        lines = [f"{'Stage':<40} {'Wall ms':>10} {'CPU ms':>10} {'Child CPU ms':>13}"]
+        for event in sorted((e for e in events if e["cat"] == "stage" and e["tid"] == 0), key=lambda e: e["ts"]):
+            lines.append(f"{event['name']:<40} {event['dur'] / 1000:>10.1f} "
+                         f"{event['args']['cpu_ms']:>10.1f} {event['args']['subprocess_cpu_ms']:>13.1f}")
+
+        totals: Dict[str, List[float]] = {}
+        for event in events:
+            if event["cat"] == "subprocess":
+                total = totals.setdefault(event["name"], [0, 0.0])
+                total[0] += 1
+                total[1] += event["dur"] / 1000
+        if totals:
+            lines.append("")
+            lines.append(f"{'Subprocess':<40} {'Count':>10} {'Wall ms':>10}")
+            for name, (count, wall_ms) in sorted(totals.items(), key=lambda item: -item[1][1]):
+                lines.append(f"{name:<40} {count:>10} {wall_ms:>10.1f}")
+
+        return "\n".join(lines)
+
+    # ==================== HELPERS ====================
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _add_event(self, name: str, category: str, start_us: float, duration_us: float, args: Dict):
+        with self._lock:
+            thread_id = self._thread_ids.setdefault(threading.get_ident(), len(self._thread_ids))
+            self.events.append({
+                "name": name, "cat": category, "ph": "X",
+                "ts": round(start_us, 3), "dur": round(duration_us, 3),
+                "pid": self._pid, "tid": thread_id, "args": args,
+            })
+
+    def _get_child_cpu_seconds(self) -> float:
+        if sys.platform == "win32":
+            with self._lock:
+                return self._recorded_child_cpu
+        return self._get_rusage_children_seconds()
+
+    @staticmethod
+    def _get_rusage_children_seconds() -> float:
+        if sys.platform == "win32":
+            return 0.0
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
+
+    @staticmethod
+    def _get_windows_process_cpu_seconds(process: subprocess.Popen) -> Optional[float]:
+        """User + kernel time of a finished process whose handle is still open"""
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            times = [wintypes.FILETIME() for _ in range(4)]
+            ok = ctypes.windll.kernel32.GetProcessTimes(
+                wintypes.HANDLE(int(process._handle)), *(ctypes.byref(t) for t in times)
+            )
+            if not ok:
+                return None
+            kernel, user = times[2], times[3]
+            # FILETIME is in 100ns units
+            return (((kernel.dwHighDateTime << 32) | kernel.dwLowDateTime) +
+                    ((user.dwHighDateTime << 32) | user.dwLowDateTime)) / 10_000_000
+        except Exception:
+            return None
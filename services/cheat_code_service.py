@@ -6,6 +6,10 @@ from typing import Dict, List, Optional
 
 from classes.project_data.project_data import ProjectData
 from services.game_metadata_service import GameMetadataService
+from services.patch_plan_service import PatchPlanService, PatchPlan, changed_spans
+from services.cheat_encoder_service import (
+    CheatEncoderService, EncodedSection, gecko_encode_offset, ar_write_prefix
+)
 import shutil
 
 _HEX_CHARS = set("0123456789abcdefABCDEF")
@@ -98,6 +102,11 @@ class CheatCodeService:
         self.bin_output_dir = os.path.join(
             self.project_folder, ".config", "output", "bin_files"
         )
+        self._patch_plan_service = PatchPlanService(project_data)
+        self._patch_plan: Optional[PatchPlan] = None
+        self.encoder = CheatEncoderService()
+        # Per-section results of the last Gecko / AR generation
+        self.last_encoding: List[EncodedSection] = []
 
     # -------------------------------------------------------------------------
     # Internal helpers
@@ -147,16 +156,64 @@ class CheatCodeService:
 
     def _read_bin(self, name: str) -> Optional[bytes]:
         """
-        Read the compiled binary for a section/patch (name.bin in bin_files).
+        Compiled binary for a section/patch (name.bin in bin_files), taken
+        from the build's patch plan so each .bin is read once per service.
 
         Returns:
             bytes or None if file missing.
         """
-        path = os.path.join(self.bin_output_dir, f"{name}.bin")
-        if not os.path.isfile(path):
+        return self._get_patch_plan().get_data(name)
+
+    def _get_patch_plan(self) -> PatchPlan:
+        if self._patch_plan is None:
+            self._patch_plan = self._patch_plan_service.build_plan()
+        return self._patch_plan
+
+    def _read_vanilla_bytes(self, name: str, length: int) -> Optional[bytes]:
+        """Bytes a target overwrites in the unmodified game, or None if unknown"""
+        entry = self._get_patch_plan().get_entry(name)
+        if entry is None:
             return None
-        with open(path, "rb") as f:
-            return f.read()
+        return self._patch_plan_service.read_vanilla_bytes(entry.target, length)
+
+    def _iter_changed_chunks(self, name: str, base_addr: int, data: bytes,
+                             skip_vanilla_bytes: bool, align: int = 1, merge_gap: Optional[int] = None):
+        """
+        Yield (address, bytes) for the parts of data that differ from the vanilla
+        game, widened to multiples of align (the code's write size) and joined
+        across gaps shorter than merge_gap (default: align). With
+        skip_vanilla_bytes=False, the whole of data is one chunk.
+        """
+        baseline = self._read_vanilla_bytes(name, len(data)) if skip_vanilla_bytes else None
+        merge_gap = align if merge_gap is None else merge_gap
+        for offset, length in changed_spans(data, baseline, merge_gap=merge_gap, align=align):
+            yield base_addr + offset, data[offset:offset + length]
+
+    def _encode_sections(self, gecko: bool, ignore_codecaves: bool, skip_vanilla_bytes: bool) -> List[EncodedSection]:
+        """Encode every injection target (sorted by name) and remember the result for the report"""
+        sections: List[EncodedSection] = []
+        for kind, name, addr_str in self._iter_injection_targets():
+            if ignore_codecaves and kind == "codecave":
+                continue
+
+            data = self._read_bin(name)
+            if not data:
+                continue
+
+            base_addr = self._normalize_address(addr_str)
+            baseline = self._read_vanilla_bytes(name, len(data)) if skip_vanilla_bytes else None
+            if gecko:
+                sections.append(self.encoder.encode_gecko(name, base_addr, data, baseline))
+            else:
+                sections.append(self.encoder.encode_action_replay(name, base_addr, data, baseline))
+
+        sections.sort(key=lambda section: section.name)
+        self.last_encoding = sections
+        return sections
+
+    def get_encoding_report(self) -> str:
+        """Line counts and estimated handler cost per section of the last Gecko / AR codes"""
+        return self.encoder.format_report(self.last_encoding)
 
     def _to_le_hex(self, chunk: bytes, width: int) -> str:
         """
@@ -171,7 +228,7 @@ class CheatCodeService:
     #
     #! PS1: GameShark-style codes
     #
-    def generate_ps1_gameshark(self, ignore_codecaves: bool = False) -> str:
+    def generate_ps1_gameshark(self, ignore_codecaves: bool = False, skip_vanilla_bytes: bool = True) -> str:
         """
         Generate PS1 GameShark-style codes from the current project.
 
@@ -181,6 +238,8 @@ class CheatCodeService:
 
         Args:
             ignore_codecaves: if True, codecaves are skipped.
+            skip_vanilla_bytes: if True, halfwords that already match the
+                                vanilla game are not written.
 
         Returns:
             Cheat code block as a string.
@@ -200,15 +259,16 @@ class CheatCodeService:
 
             base_addr = self._normalize_address(addr_str)
 
-            for i in range(0, len(data), chunk_size):
-                chunk = data[i:i + chunk_size]
-                le_hex = self._to_le_hex(chunk, chunk_size)
-                if not le_hex:
-                    continue
+            for span_addr, span in self._iter_changed_chunks(name, base_addr, data, skip_vanilla_bytes, chunk_size):
+                for i in range(0, len(span), chunk_size):
+                    chunk = span[i:i + chunk_size]
+                    le_hex = self._to_le_hex(chunk, chunk_size)
+                    if not le_hex:
+                        continue
 
-                addr_hex = f"{base_addr + i:08X}"
-                code_line = f"{addr_hex} {le_hex}"
-                chunks.setdefault(name, []).append(code_line)
+                    addr_hex = f"{span_addr + i:08X}"
+                    code_line = f"{addr_hex} {le_hex}"
+                    chunks.setdefault(name, []).append(code_line)
 
         build_name = self.project_data.GetCurrentBuildVersionName()
         lines: List[str] = []
@@ -221,7 +281,8 @@ class CheatCodeService:
     #
     #! PS2
     #
-    def generate_ps2_ps2rd(self, ignore_codecaves: bool = False, include_mastercode: bool = True, one_shot: bool = False) -> str:
+    def generate_ps2_ps2rd(self, ignore_codecaves: bool = False, include_mastercode: bool = True, one_shot: bool = False,
+                           skip_vanilla_bytes: bool = True) -> str:
         """
         Generate PS2RD-style 32-bit write codes: 20AAAAAA VVVVVVVV
 
@@ -232,6 +293,8 @@ class CheatCodeService:
             one_shot: if True, wrap all patch writes in a run-once block
                       using a 32-bit conditional on FLAG_ADDR_PS2 == 0,
                       then set FLAG_ADDR_PS2 = 1.
+            skip_vanilla_bytes: if True, words that already match the
+                                vanilla game are not written.
 
         Returns:
             PS2RD code block as a string.
@@ -252,17 +315,18 @@ class CheatCodeService:
 
             base_addr = self._normalize_address(addr_str)
 
-            for i in range(0, len(data), chunk_size):
-                chunk = data[i:i + chunk_size]
-                le_hex = self._to_le_hex(chunk, 4)
-                if not le_hex:
-                    continue
+            for span_addr, span in self._iter_changed_chunks(name, base_addr, data, skip_vanilla_bytes, chunk_size):
+                for i in range(0, len(span), chunk_size):
+                    chunk = span[i:i + chunk_size]
+                    le_hex = self._to_le_hex(chunk, 4)
+                    if not le_hex:
+                        continue
 
-                # PS2RD: left side is 8 hex digits: 2-digit code type + 6-digit address field
-                # Use lower 24 bits of the EE address as offset
-                addr_field = (base_addr + i) & 0x00FFFFFF
-                code_line = f"20{addr_field:06X} {le_hex}"
-                chunks.setdefault(name, []).append(code_line)
+                    # PS2RD: left side is 8 hex digits: 2-digit code type + 6-digit address field
+                    # Use lower 24 bits of the EE address as offset
+                    addr_field = (span_addr + i) & 0x00FFFFFF
+                    code_line = f"20{addr_field:06X} {le_hex}"
+                    chunks.setdefault(name, []).append(code_line)
 
         build = self.project_data.GetCurrentBuildVersion()
 
@@ -344,12 +408,14 @@ class CheatCodeService:
         """
         return None
 
-    def generate_ps2_pnach(self, ignore_codecaves: bool = False, one_shot: bool = True) -> str:
+    def generate_ps2_pnach(self, ignore_codecaves: bool = False, one_shot: bool = True,
+                           skip_vanilla_bytes: bool = True) -> str:
         """
         Generate a PCSX2 .pnach file for the current build.
         
         one_shot=True  -> place=0 (apply once at boot/startup)
         one_shot=False -> place=1 (apply every frame / vsync)
+        skip_vanilla_bytes=True -> bytes that already match the vanilla game are not patched
         """
         self._ensure_bin_dir()
 
@@ -372,42 +438,44 @@ class CheatCodeService:
             kinds[name] = kind
             base_addr = self._normalize_address(addr_str)
 
-            i = 0
-            n = len(data)
-            while i < n:
-                remaining = n - i
-                addr = base_addr + i
-
-                # Prefer aligned 32-bit writes, then 16-bit, then 8-bit
-                if remaining >= 4 and (addr & 3) == 0:
-                    # 32-bit (use same endian correction as PS2RD)
-                    chunk = data[i:i + 4]
-                    hex_word = self._to_le_hex(chunk, 4).upper()
-                    dtype = "word"
-                    value_str = hex_word
-                    size = 4
-
-                elif remaining >= 2 and (addr & 1) == 0:
-                    # 16-bit
-                    chunk = data[i:i + 2]
-                    hex_half = self._to_le_hex(chunk, 2).upper()
-                    dtype = "short"
-                    value_str = f"0000{hex_half}"
-                    size = 2
-
-                else:
-                    # 8-bit
-                    chunk = data[i:i + 1]
-                    hex_byte = self._to_le_hex(chunk, 1).upper()
-                    dtype = "byte"
-                    value_str = f"000000{hex_byte}"
-                    size = 1
-
-                addr_hex = f"{addr:08X}"
-                line = f"patch={place},EE,{addr_hex},{dtype},{value_str}"
-                patches.setdefault(name, []).append(line)
-
-                i += size
+            # Nearby changed bytes are joined so they can share a word/short patch
+            for span_addr, span in self._iter_changed_chunks(name, base_addr, data, skip_vanilla_bytes, merge_gap=4):
+                i = 0
+                n = len(span)
+                while i < n:
+                    remaining = n - i
+                    addr = span_addr + i
+
+                    # Prefer aligned 32-bit writes, then 16-bit, then 8-bit
+                    if remaining >= 4 and (addr & 3) == 0:
+                        # 32-bit (use same endian correction as PS2RD)
+                        chunk = span[i:i + 4]
+                        hex_word = self._to_le_hex(chunk, 4).upper()
+                        dtype = "word"
+                        value_str = hex_word
+                        size = 4
+
+                    elif remaining >= 2 and (addr & 1) == 0:
+                        # 16-bit
+                        chunk = span[i:i + 2]
+                        hex_half = self._to_le_hex(chunk, 2).upper()
+                        dtype = "short"
+                        value_str = f"0000{hex_half}"
+                        size = 2
+
+                    else:
+                        # 8-bit
+                        chunk = span[i:i + 1]
+                        hex_byte = self._to_le_hex(chunk, 1).upper()
+                        dtype = "byte"
+                        value_str = f"000000{hex_byte}"
+                        size = 1
+
+                    addr_hex = f"{addr:08X}"
+                    line = f"patch={place},EE,{addr_hex},{dtype},{value_str}"
+                    patches.setdefault(name, []).append(line)
+
+                    i += size
 
         # Header
         build = self.project_data.GetCurrentBuildVersion()
@@ -471,25 +539,15 @@ class CheatCodeService:
                 0x80xxxxxx -> 04rrrrrr
                 0x81xxxxxx -> 05rrrrrr
         """
-        hi = (addr >> 24) & 0xFF
-
-        # Base for 0x80 region
-        if size_bytes == 1:
-            base = 0x00
-        elif size_bytes == 2:
-            base = 0x02
-        else:
-            base = 0x04
-
-        # 0x81 region uses the "+1" variant (01/03/05)
-        if hi == 0x81:
-            base += 1
+        return ar_write_prefix(addr, size_bytes)
 
-        return f"{base:02X}"
-
-    def _generate_action_replay_ram_writes(self, platform_label: str, ignore_codecaves: bool = False, one_shot: bool = True) -> str:
+    def _generate_action_replay_ram_writes(self, platform_label: str, ignore_codecaves: bool = False, one_shot: bool = True,
+                                           skip_vanilla_bytes: bool = True) -> str:
         """
-        Generate Action Replay codes for GC/Wii using only RAM write types:
+        Generate Action Replay codes for GC/Wii using only RAM write types
+        (runs of repeated bytes/halfwords become a single fill write).
+        If skip_vanilla_bytes=True, bytes that already match the vanilla
+        game file are not written.
         If one_shot=True (default), all patch writes are wrapped in:
             - A 32-bit "If Equal, All until.." conditional
             - (all patch writes)
@@ -499,48 +557,7 @@ class CheatCodeService:
         """
         self._ensure_bin_dir()
 
-        codes_by_name: Dict[str, List[str]] = {}
-
-        # Build per-section AR write codes
-        for kind, name, addr_str in self._iter_injection_targets():
-            if ignore_codecaves and kind == "codecave":
-                continue
-
-            data = self._read_bin(name)
-            if not data:
-                continue
-
-            base_addr = self._normalize_address(addr_str)
-            i = 0
-            n = len(data)
-
-            while i < n:
-                remaining = n - i
-                addr = base_addr + i
-                rrrrrr = addr & 0x00FFFFFF
-
-                if remaining >= 4:
-                    # 32-bit write
-                    word = int.from_bytes(data[i:i + 4], byteorder="big")
-                    prefix = self._choose_ar_write_prefix(addr, 4)
-                    code_line = f"{prefix}{rrrrrr:06X} {word:08X}"
-                    i += 4
-
-                elif remaining >= 2:
-                    # 16-bit write
-                    half = int.from_bytes(data[i:i + 2], byteorder="big")
-                    prefix = self._choose_ar_write_prefix(addr, 2)
-                    code_line = f"{prefix}{rrrrrr:06X} 0000{half:04X}"
-                    i += 2
-
-                else:
-                    # 8-bit write
-                    b = data[i]
-                    prefix = self._choose_ar_write_prefix(addr, 1)
-                    code_line = f"{prefix}{rrrrrr:06X} 000000{b:02X}"
-                    i += 1
-
-                codes_by_name.setdefault(name, []).append(code_line)
+        sections = self._encode_sections(False, ignore_codecaves, skip_vanilla_bytes)
 
         # Build header
         build = self.project_data.GetCurrentBuildVersion()
@@ -558,8 +575,8 @@ class CheatCodeService:
 
         # Flatten all code lines
         all_codes: List[str] = []
-        for name in sorted(codes_by_name.keys()):
-            all_codes.extend(codes_by_name[name])
+        for section in sections:
+            all_codes.extend(section.lines)
 
         lines: List[str] = []
         lines.append(f"\"{title}\"")
@@ -603,55 +620,44 @@ class CheatCodeService:
 
         return "\n".join(lines) + "\n"
 
-    def generate_gc_action_replay(self, ignore_codecaves: bool = False, one_shot: bool = True) -> str:
+    def generate_gc_action_replay(self, ignore_codecaves: bool = False, one_shot: bool = True,
+                                  skip_vanilla_bytes: bool = True) -> str:
         """Generate GameCube Action Replay codes."""
         return self._generate_action_replay_ram_writes(
             platform_label="GameCube",
             ignore_codecaves=ignore_codecaves,
             one_shot=one_shot,
+            skip_vanilla_bytes=skip_vanilla_bytes,
         )
 
     def generate_wii_action_replay(
-        self, ignore_codecaves: bool = False, one_shot: bool = True) -> str:
+        self, ignore_codecaves: bool = False, one_shot: bool = True, skip_vanilla_bytes: bool = True) -> str:
         """Generate Wii Action Replay codes"""
         return self._generate_action_replay_ram_writes(
             platform_label="Wii",
             ignore_codecaves=ignore_codecaves,
             one_shot=one_shot,
+            skip_vanilla_bytes=skip_vanilla_bytes,
         )
         
     def _gecko_encode_offset(self, addr: int, base_codetype: int) -> tuple[int, int]:
         """Convert a full RAM address into 24-bit offset for Gecko."""
-        BA = 0x80000000
-        if addr < BA or addr > BA + 0x1FFFFFF:
-            raise ValueError(
-                f"Gecko: address 0x{addr:08X} out of supported range "
-                f"(0x{BA:08X} - 0x{BA + 0x1FFFFFF:08X})"
-            )
-
-        off = addr - BA  # 25-bit offset
-
-        if off >= 0x01000000:
-            codetype = base_codetype + 1
-            offset24 = off - 0x01000000
-        else:
-            codetype = base_codetype
-            offset24 = off
-
-        if offset24 < 0 or offset24 > 0xFFFFFF:
-            raise ValueError(
-                f"Gecko: encoded offset out of range: 0x{offset24:06X}"
-            )
-
-        return codetype, offset24
+        return gecko_encode_offset(addr, base_codetype)
     
-    def _generate_gecko_ram_writes(self, platform_label: str, ignore_codecaves: bool = False, one_shot: bool = True) -> str:
+    def _generate_gecko_ram_writes(self, platform_label: str, ignore_codecaves: bool = False, one_shot: bool = True,
+                                   skip_vanilla_bytes: bool = True) -> str:
         """
-        Generate Gecko codes for GC/Wii using direct RAM write codetypes:
-            32-bit write:
-                04______ XXXXXXXX   (ba + ______)
-                
-        We default ba to 0x80000000.
+        Generate Gecko codes for GC/Wii using RAM write codetypes:
+            32/16/8-bit write:  04/02/00______ XXXXXXXX   (ba + ______)
+            fill:               00/02______ YYYYXXXX      (repeated byte/halfword)
+            serial write:       08______ XXXXXXXX + 2NNN0004 00000000 (repeated word)
+            string write:       06______ YYYYYYYY + data lines
+
+        We default ba to 0x80000000. See CheatEncoderService for how each
+        section is split between them.
+
+        If skip_vanilla_bytes=True, bytes that already match the vanilla
+        game file are not written.
 
         If one_shot=True:
             Wrap the entire patch in:
@@ -664,50 +670,7 @@ class CheatCodeService:
 
         self._ensure_bin_dir()
 
-        codes_by_name: Dict[str, List[str]] = {}
-
-        # --- Build per-section Gecko write codes ---
-        for kind, name, addr_str in self._iter_injection_targets():
-            if ignore_codecaves and kind == "codecave":
-                continue
-
-            data = self._read_bin(name)
-            if not data:
-                continue
-
-            base_addr = self._normalize_address(addr_str)
-            i = 0
-            n = len(data)
-
-            while i < n:
-                remaining = n - i
-                addr = base_addr + i
-
-                # Prefer aligned, larger writes when possible
-                if remaining >= 4 and (addr & 3) == 0:
-                    # 32-bit write
-                    word = int.from_bytes(data[i:i + 4], byteorder="big")
-                    ct, off24 = self._gecko_encode_offset(addr, 0x04)
-                    code_line = f"{ct:02X}{off24:06X} {word:08X}"
-                    i += 4
-
-                elif remaining >= 2 and (addr & 1) == 0:
-                    # 16-bit write, count=0 (one halfword)
-                    half = int.from_bytes(data[i:i + 2], byteorder="big")
-                    ct, off24 = self._gecko_encode_offset(addr, 0x02)
-                    # YYYY = 0000 → write once
-                    code_line = f"{ct:02X}{off24:06X} 0000{half:04X}"
-                    i += 2
-
-                else:
-                    # 8-bit write, count=0 (one byte)
-                    b = data[i]
-                    ct, off24 = self._gecko_encode_offset(addr, 0x00)
-                    # YYYY = 0000, middle byte is 00, last byte is value
-                    code_line = f"{ct:02X}{off24:06X} 000000{b:02X}"
-                    i += 1
-
-                codes_by_name.setdefault(name, []).append(code_line)
+        sections = self._encode_sections(True, ignore_codecaves, skip_vanilla_bytes)
 
         # --- Build header (same style as AR) ---
         build = self.project_data.GetCurrentBuildVersion()
@@ -725,8 +688,8 @@ class CheatCodeService:
 
         # Flatten all code lines
         all_codes: List[str] = []
-        for name in sorted(codes_by_name.keys()):
-            all_codes.extend(codes_by_name[name])
+        for section in sections:
+            all_codes.extend(section.lines)
 
         lines: List[str] = []
         lines.append(f"\"{title}\"")
@@ -766,22 +729,26 @@ class CheatCodeService:
 
         return "\n".join(lines) + "\n"
     
-    def generate_gc_gecko(self, ignore_codecaves: bool = False, one_shot: bool = True) -> str:
+    def generate_gc_gecko(self, ignore_codecaves: bool = False, one_shot: bool = True,
+                          skip_vanilla_bytes: bool = True) -> str:
         """
         Generate GameCube Gecko codes for current build."""
         return self._generate_gecko_ram_writes(
             platform_label="GameCube",
             ignore_codecaves=ignore_codecaves,
             one_shot=one_shot,
+            skip_vanilla_bytes=skip_vanilla_bytes,
         )
 
-    def generate_wii_gecko(self,ignore_codecaves: bool = False,one_shot: bool = True) -> str:
+    def generate_wii_gecko(self,ignore_codecaves: bool = False,one_shot: bool = True,
+                           skip_vanilla_bytes: bool = True) -> str:
         """
         Generate Wii Gecko codes for current build."""
         return self._generate_gecko_ram_writes(
             platform_label="Wii",
             ignore_codecaves=ignore_codecaves,
             one_shot=one_shot,
+            skip_vanilla_bytes=skip_vanilla_bytes,
         )
         
 
@@ -0,0 +1,289 @@
+"""
+Cheat Encoder Service
+Turns a section's bytes into a short list of Gecko / Action Replay RAM write codes,
+using fill, serial and string write codetypes for runs instead of one line per word
+"""
+
+from typing import List, Optional, Tuple
+
+from services.patch_plan_service import changed_spans
+
+GECKO_BASE_ADDRESS = 0x80000000
+
+# Unchanged bytes between two changed runs are rewritten anyway when the gap is
+# shorter than this, since starting a new code costs at least one line
+GECKO_MERGE_GAP = 8
+AR_MERGE_GAP = 4
+
+# Shortest runs worth a fill / serial code instead of literal writes
+MIN_BYTE_FILL = 8
+MIN_HALFWORD_FILL = 8
+MIN_WORD_SERIAL = 24
+
+# Largest repeat counts the codetypes can encode
+GECKO_MAX_BYTE_FILL = 0x10000
+GECKO_MAX_HALFWORD_FILL = 0x10000
+GECKO_MAX_WORD_SERIAL = 0x1000
+AR_MAX_BYTE_FILL = 0x1000000
+AR_MAX_HALFWORD_FILL = 0x10000
+
+# Rough relative cost for the code handler: one unit per code line it decodes,
+# plus a fraction per memory store it performs
+HANDLER_LINE_COST = 1.0
+HANDLER_STORE_COST = 0.25
+
+
+def gecko_encode_offset(addr: int, base_codetype: int) -> Tuple[int, int]:
+    """Convert a full RAM address into (codetype, 24-bit offset) for Gecko."""
+    if addr < GECKO_BASE_ADDRESS or addr > GECKO_BASE_ADDRESS + 0x1FFFFFF:
+        raise ValueError(
+            f"Gecko: address 0x{addr:08X} out of supported range "
+            f"(0x{GECKO_BASE_ADDRESS:08X} - 0x{GECKO_BASE_ADDRESS + 0x1FFFFFF:08X})"
+        )
+
+    off = addr - GECKO_BASE_ADDRESS  # 25-bit offset
+    if off >= 0x01000000:
+        return base_codetype + 1, off - 0x01000000
+    return base_codetype, off
+
+
+def ar_write_prefix(addr: int, size_bytes: int) -> str:
+    """
+    First byte of an AR RAM write code: 00/02/04 for 8/16/32-bit writes
+    to 0x80xxxxxx, 01/03/05 for 0x81xxxxxx.
+    """
+    base = {1: 0x00, 2: 0x02}.get(size_bytes, 0x04)
+    if ((addr >> 24) & 0xFF) == 0x81:
+        base += 1
+    return f"{base:02X}"
+
+
+class EncodedSection:
+    """Codes for one section plus the numbers shown in the encoding report"""
+
+    def __init__(self, name: str, source_bytes: int):
+        self.name = name
+        self.source_bytes = source_bytes
+        self.skipped_bytes = 0  # Already matching the vanilla file
+        self.lines: List[str] = []
+        self.stores = 0  # Individual memory writes the handler performs
+        self.naive_lines = 0  # One write per word, as the old encoder produced
+
+    @property
+    def estimated_cost(self) -> float:
+        return len(self.lines) * HANDLER_LINE_COST + self.stores * HANDLER_STORE_COST
+
+    def __repr__(self):
+        return f"EncodedSection({self.name}, lines={len(self.lines)}, was={self.naive_lines})"
+
+
+class CheatEncoderService:
+    """
+    Splits each section into the runs that differ from the vanilla file, then
+    covers each run greedily with the cheapest codes:
+      - repeated bytes / halfwords: one fill line (Gecko 00/02, AR 00/02 with a count)
+      - repeated words: Gecko 08 serial write (two lines); AR has no plain equivalent
+      - everything else: direct 32/16/8-bit writes, or a Gecko 06 string write
+        when that takes fewer lines
+    """
+
+    # ==================== RUN PLANNING ====================
+
+    @staticmethod
+    def _repeat_length(data: bytes, start: int, unit: int, limit: int) -> int:
+        """Bytes from start covered by repeating data[start:start + unit], in whole units"""
+        end = len(data) - (len(data) - start) % unit
+        value = data[start:start + unit]
+        pos = start + unit
+        while pos < end and pos - start < limit * unit and data[pos:pos + unit] == value:
+            pos += unit
+        return min(pos - start, limit * unit)
+
+    def _plan(self, addr: int, data: bytes, gecko: bool) -> List[Tuple[str, int, int]]:
+        """
+        Cover data with ("byte"|"half"|"word"|"literal", offset, length) pieces.
+        Fills are taken wherever they beat literal writes.
+        """
+        max_byte = GECKO_MAX_BYTE_FILL if gecko else AR_MAX_BYTE_FILL
+        max_half = GECKO_MAX_HALFWORD_FILL if gecko else AR_MAX_HALFWORD_FILL
+
+        pieces: List[Tuple[str, int, int]] = []
+        literal_start = 0
+        i = 0
+        n = len(data)
+        while i < n:
+            best_kind, best_length = None, 0
+
+            length = self._repeat_length(data, i, 1, max_byte)
+            if length >= MIN_BYTE_FILL:
+                best_kind, best_length = "byte", length
+
+            if (addr + i) % 2 == 0 and n - i >= MIN_HALFWORD_FILL:
+                length = self._repeat_length(data, i, 2, max_half)
+                if length >= MIN_HALFWORD_FILL and length > best_length:
+                    best_kind, best_length = "half", length
+
+            if gecko and (addr + i) % 4 == 0 and n - i >= MIN_WORD_SERIAL:
+                length = self._repeat_length(data, i, 4, GECKO_MAX_WORD_SERIAL)
+                if length >= MIN_WORD_SERIAL and length > best_length:
+                    best_kind, best_length = "word", length
+
+            if best_kind is None:
+                i += 1
+                continue
+
+            if i > literal_start:
+                pieces.append(("literal", literal_start, i - literal_start))
+            pieces.append((best_kind, i, best_length))
+            i += best_length
+            literal_start = i
+
+        if n > literal_start:
+            pieces.append(("literal", literal_start, n - literal_start))
+        return pieces
+
+    @staticmethod
+    def _direct_writes(addr: int, data: bytes) -> List[Tuple[int, int, int]]:
+        """(address, size, value) for aligned 32-bit writes, falling back to 16/8-bit"""
+        writes = []
+        i = 0
+        n = len(data)
+        while i < n:
+            address = addr + i
+            if n - i >= 4 and address % 4 == 0:
+                size = 4
+            elif n - i >= 2 and address % 2 == 0:
+                size = 2
+            else:
+                size = 1
+            writes.append((address, size, int.from_bytes(data[i:i + size], byteorder="big")))
+            i += size
+        return writes
+
+    # ==================== GECKO ====================
+
+    def encode_gecko(self, name: str, base_addr: int, data: bytes,
+                     baseline: Optional[bytes] = None) -> EncodedSection:
+        """
+        Gecko codes writing data at base_addr.
+
+        Args:
+            baseline: Bytes currently at base_addr in the vanilla file; matching
+                      bytes are left out
+        """
+        section = EncodedSection(name, len(data))
+        section.naive_lines = len(self._direct_writes(base_addr, data))
+
+        runs = changed_spans(data, baseline, GECKO_MERGE_GAP)
+        section.skipped_bytes = len(data) - sum(length for _, length in runs)
+
+        for run_offset, run_length in runs:
+            run = data[run_offset:run_offset + run_length]
+            run_addr = base_addr + run_offset
+            for kind, offset, length in self._plan(run_addr, run, gecko=True):
+                addr = run_addr + offset
+                piece = run[offset:offset + length]
+
+                if kind == "byte":
+                    ct, off24 = gecko_encode_offset(addr, 0x00)
+                    section.lines.append(f"{ct:02X}{off24:06X} {length - 1:04X}00{piece[0]:02X}")
+                    section.stores += length
+
+                elif kind == "half":
+                    ct, off24 = gecko_encode_offset(addr, 0x02)
+                    section.lines.append(f"{ct:02X}{off24:06X} {length // 2 - 1:04X}{piece[:2].hex().upper()}")
+                    section.stores += length // 2
+
+                elif kind == "word":
+                    # 08 serial write: T=2 (32-bit), NNN additional writes, 4-byte address step, no value step
+                    ct, off24 = gecko_encode_offset(addr, 0x08)
+                    section.lines.append(f"{ct:02X}{off24:06X} {piece[:4].hex().upper()}")
+                    section.lines.append(f"2{length // 4 - 1:03X}0004 00000000")
+                    section.stores += length // 4
+
+                else:
+                    self._encode_gecko_literal(section, addr, piece)
+
+        return section
+
+    def _encode_gecko_literal(self, section: EncodedSection, addr: int, data: bytes):
+        writes = self._direct_writes(addr, data)
+        string_lines = 1 + (len(data) + 7) // 8
+
+        if string_lines < len(writes):
+            # 06 string write: byte count, then the bytes padded to whole lines
+            ct, off24 = gecko_encode_offset(addr, 0x06)
+            section.lines.append(f"{ct:02X}{off24:06X} {len(data):08X}")
+            padded = data + b'\x00' * (-len(data) % 8)
+            for i in range(0, len(padded), 8):
+                section.lines.append(f"{padded[i:i + 4].hex().upper()} {padded[i + 4:i + 8].hex().upper()}")
+            section.stores += len(data)
+            return
+
+        for address, size, value in writes:
+            if size == 4:
+                ct, off24 = gecko_encode_offset(address, 0x04)
+                section.lines.append(f"{ct:02X}{off24:06X} {value:08X}")
+            elif size == 2:
+                ct, off24 = gecko_encode_offset(address, 0x02)
+                section.lines.append(f"{ct:02X}{off24:06X} 0000{value:04X}")
+            else:
+                ct, off24 = gecko_encode_offset(address, 0x00)
+                section.lines.append(f"{ct:02X}{off24:06X} 000000{value:02X}")
+            section.stores += 1
+
+    # ==================== ACTION REPLAY ====================
+
+    def encode_action_replay(self, name: str, base_addr: int, data: bytes,
+                             baseline: Optional[bytes] = None) -> EncodedSection:
+        """
+        Action Replay codes writing data at base_addr. Byte and halfword runs
+        use the repeat count of the 8/16-bit write codes; everything else is
+        direct writes.
+        """
+        section = EncodedSection(name, len(data))
+        section.naive_lines = len(self._direct_writes(base_addr, data))
+
+        runs = changed_spans(data, baseline, AR_MERGE_GAP)
+        section.skipped_bytes = len(data) - sum(length for _, length in runs)
+
+        for run_offset, run_length in runs:
+            run = data[run_offset:run_offset + run_length]
+            run_addr = base_addr + run_offset
+            for kind, offset, length in self._plan(run_addr, run, gecko=False):
+                addr = run_addr + offset
+                piece = run[offset:offset + length]
+                rrrrrr = addr & 0x00FFFFFF
+
+                if kind == "byte":
+                    prefix = ar_write_prefix(addr, 1)
+                    section.lines.append(f"{prefix}{rrrrrr:06X} {length - 1:06X}{piece[0]:02X}")
+                    section.stores += length
+
+                elif kind == "half":
+                    prefix = ar_write_prefix(addr, 2)
+                    section.lines.append(f"{prefix}{rrrrrr:06X} {length // 2 - 1:04X}{piece[:2].hex().upper()}")
+                    section.stores += length // 2
+
+                else:
+                    for address, size, value in self._direct_writes(addr, piece):
+                        prefix = ar_write_prefix(address, size)
+                        # Repeat count in the unused high bits stays 0 (write once)
+                        section.lines.append(f"{prefix}{address & 0x00FFFFFF:06X} {value:08X}")
+                        section.stores += 1
+
+        return section
+
+    # ==================== REPORT ====================
+
+    @staticmethod
+    def format_report(sections: List[EncodedSection]) -> str:
+        """Per-section table of bytes, lines (compact vs one-write-per-word) and handler cost"""
+        lines = [f"{'Section':<32} {'Bytes':>7} {'Skipped':>8} {'Lines':>6} {'Was':>6} {'Est. cost':>10}"]
+        for section in sections:
+            lines.append(f"{section.name:<32} {section.source_bytes:>7} {section.skipped_bytes:>8} "
+                         f"{len(section.lines):>6} {section.naive_lines:>6} {section.estimated_cost:>10.1f}")
+        lines.append(f"{'Total':<32} {sum(s.source_bytes for s in sections):>7} "
+                     f"{sum(s.skipped_bytes for s in sections):>8} {sum(len(s.lines) for s in sections):>6} "
+                     f"{sum(s.naive_lines for s in sections):>6} {sum(s.estimated_cost for s in sections):>10.1f}")
+        return "\n".join(lines)
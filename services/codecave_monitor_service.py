@@ -0,0 +1,180 @@
+"""
+Codecave Monitor Service
+Keeps a snapshot of each codecave's memory and reports exactly which bytes the
+game wrote between polls, with a short write history per cave
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from functions.verbose_print import verbose_print
+
+# Caves are compared page by page; only pages that differ are diffed and copied
+CODECAVE_PAGE_SIZE = 0x100
+
+# Writes remembered per cave (oldest are dropped)
+WRITE_HISTORY_LENGTH = 32
+
+FRAME_INTERVAL = 1 / 60
+
+# Poll interval choices shown in the monitor tab (label -> seconds)
+MONITOR_INTERVALS = {
+    "Every frame": FRAME_INTERVAL,
+    "50 ms": 0.05,
+    "100 ms": 0.1,
+    "250 ms": 0.25,
+    "500 ms": 0.5,
+    "1 s": 1.0,
+}
+DEFAULT_MONITOR_INTERVAL = "500 ms"
+
+# Block size diff_spans compares before looking for individual changed bytes
+DIFF_BLOCK_SIZE = 0x1000
+
+# Maps every non-zero byte to 1, so runs can be found with bytes.find (memchr)
+_NONZERO_TO_ONE = bytes([0]) + bytes([1]) * 255
+
+
+def diff_spans(old: bytes, new: bytes) -> List[Tuple[int, int]]:
+    """
+    (offset, length) runs where old and new differ, over their common length.
+    Equal blocks are skipped with a plain comparison; differing blocks are XORed
+    as integers and their non-zero runs found with find, so Python only loops
+    once per run, never per byte.
+    """
+    length = min(len(old), len(new))
+    spans: List[Tuple[int, int]] = []
+    for block in range(0, length, DIFF_BLOCK_SIZE):
+        end = min(block + DIFF_BLOCK_SIZE, length)
+        old_block = old[block:end]
+        new_block = new[block:end]
+        if old_block == new_block:
+            continue
+        xored = (int.from_bytes(old_block, "little") ^ int.from_bytes(new_block, "little")).to_bytes(end - block, "little")
+        flags = xored.translate(_NONZERO_TO_ONE)
+        run_start = flags.find(1)
+        while run_start != -1:
+            run_end = flags.find(0, run_start)
+            if run_end == -1:
+                run_end = len(flags)
+            start = block + run_start
+            # Join runs split by the block boundary
+            if spans and spans[-1][0] + spans[-1][1] == start:
+                spans[-1] = (spans[-1][0], spans[-1][1] + run_end - run_start)
+            else:
+                spans.append((start, run_end - run_start))
+            run_start = flags.find(1, run_end)
+    return spans
+
+
+class CaveWrite:
+    """One detected write: when it was seen and the (offset, before, after) runs that changed"""
+
+    def __init__(self, timestamp: float, changes: List[Tuple[int, bytes, bytes]]):
+        self.timestamp = timestamp
+        self.changes = changes
+
+    @property
+    def changed_bytes(self) -> int:
+        return sum(len(after) for _, _, after in self.changes)
+
+    @property
+    def offsets(self) -> List[int]:
+        """Offset of every changed byte within the cave"""
+        return [offset + i for offset, before, after in self.changes
+                for i in range(len(after)) if before[i] != after[i]]
+
+    def __repr__(self):
+        return f"CaveWrite({len(self.changes)} run(s), {self.changed_bytes} bytes)"
+
+
+class CaveSnapshot:
+    """Last known contents of one codecave, plus the writes seen so far"""
+
+    def __init__(self, name: str, address: int, size: int, history_length: int = WRITE_HISTORY_LENGTH):
+        self.name = name
+        self.address = address  # Host address of the cave's first byte
+        self.size = size
+        self.data: Optional[bytearray] = None
+        self.history: Deque[CaveWrite] = deque(maxlen=history_length)
+        self.write_count = 0  # Including writes that fell out of history
+
+    @property
+    def last_write(self) -> Optional[CaveWrite]:
+        return self.history[-1] if self.history else None
+
+    def update(self, current: bytes, page_size: int = CODECAVE_PAGE_SIZE) -> Optional[CaveWrite]:
+        """Compare current memory with the snapshot and take it as the new snapshot"""
+        if self.data is None:
+            self.data = bytearray(current)
+            return None
+        if current == self.data:
+            return None
+
+        changes = []
+        for page in range(0, min(len(current), len(self.data)), page_size):
+            old_page = self.data[page:page + page_size]
+            new_page = current[page:page + page_size]
+            if old_page == new_page:
+                continue
+            for offset, length in diff_spans(old_page, new_page):
+                start = page + offset
+                changes.append((start, bytes(old_page[offset:offset + length]), new_page[offset:offset + length]))
+            self.data[page:page + page_size] = new_page
+
+        if not changes:
+            return None
+        write = CaveWrite(time.time(), changes)
+        self.history.append(write)
+        self.write_count += 1
+        return write
+
+    def rebase(self, data: bytes):
+        """Take data as the snapshot without recording a write (after our own writes)"""
+        self.data = bytearray(data)
+
+
+class CodecaveMonitor:
+    """
+    Polls a set of codecaves through read_many([(address, size), ...]), which
+    reads every cave in one batched call (see read_process_memory_many)
+    """
+
+    def __init__(self, read_many: Callable[[Sequence[Tuple[int, int]]], List[Optional[bytes]]],
+                 page_size: int = CODECAVE_PAGE_SIZE, history_length: int = WRITE_HISTORY_LENGTH):
+        self.read_many = read_many
+        self.page_size = page_size
+        self.history_length = history_length
+        self.caves: Dict[str, CaveSnapshot] = {}
+
+    def add_cave(self, name: str, address: int, size: int) -> CaveSnapshot:
+        cave = CaveSnapshot(name, address, size, self.history_length)
+        self.caves[name] = cave
+        return cave
+
+    def get_cave(self, name: str) -> Optional[CaveSnapshot]:
+        return self.caves.get(name)
+
+    def take_snapshots(self) -> List[CaveSnapshot]:
+        """Read every cave once; caves that can't be read are dropped. Returns the rest."""
+        caves = list(self.caves.values())
+        for cave, data in zip(caves, self.read_many([(cave.address, cave.size) for cave in caves])):
+            if data is None:
+                verbose_print(f"Codecave monitor: could not read '{cave.name}', not monitoring it")
+                del self.caves[cave.name]
+            else:
+                cave.rebase(data)
+        return list(self.caves.values())
+
+    def poll(self) -> List[Tuple[CaveSnapshot, CaveWrite]]:
+        """Read every cave and return the ones written since the last poll"""
+        caves = list(self.caves.values())
+        writes = []
+        for cave, data in zip(caves, self.read_many([(cave.address, cave.size) for cave in caves])):
+            if data is None:
+                continue
+            write = cave.update(data, self.page_size)
+            if write is not None:
+                writes.append((cave, write))
+        return writes
@@ -4,6 +4,9 @@ import os
 import re
 import subprocess
 import json
+import hashlib
+import shutil
+import threading
 import multiprocessing
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Tuple, Optional, Callable, Dict
@@ -13,31 +16,46 @@ from classes.mod_builder import ModBuilder
 from classes.injection_targets.hook import Hook
 from functions.print_wrapper import *
 from functions.verbose_print import verbose_print
+from services.build_profiler_service import BuildProfiler
+
+# Matches the "target:" separator of a depfile rule (skips Windows drive letters)
+DEPFILE_TARGET_PATTERN = re.compile(r'(?<!\\):(?![\\/])\s*')
 
 class BuildCache:
-    """Manages build cache for incremental compilation"""
+    """
+    Manages build cache for incremental compilation.
+
+    Each object file is keyed on a content hash of its source, a hash of the
+    exact compiler command, and the content hashes of every header the
+    translation unit actually included (read from the GCC -MD depfile).
+    File hashes are memoized against (mtime, size), so unchanged files are
+    never re-read, and a checkout that only bumps mtimes rebuilds nothing.
+    """
+
+    CACHE_VERSION = 2
 
     def __init__(self, cache_path: str):
         self.cache_path = cache_path
         self.data = self._load_cache()
+        self._hash_lock = threading.Lock()
 
     def _load_cache(self) -> dict:
         """Load existing cache or return empty cache"""
         if os.path.exists(self.cache_path):
             try:
                 with open(self.cache_path, 'r') as f:
-                    return json.load(f)
+                    data = json.load(f)
+                if data.get("version") != self.CACHE_VERSION:
+                    return self._empty_cache()
+                return data
             except:
                 return self._empty_cache()
         return self._empty_cache()
 
     def _empty_cache(self) -> dict:
         return {
-            "last_compiler_flags": "",
-            "last_platform": "",
-            "last_build_name": "",
-            "last_build_index": -1,
-            "last_include_dir_mtime": 0.0,
+            "version": self.CACHE_VERSION,
+            "hashes": {},
             "files": {}
         }
 
@@ -53,61 +71,240 @@ class BuildCache:
         if os.path.exists(self.cache_path):
             os.remove(self.cache_path)
 
+    # ==================== CONTENT HASHING ====================
+
+    def get_file_hash(self, file_path: str) -> Optional[str]:
+        """
+        Get the content hash of a file, re-reading it only when its
+        mtime or size differs from the memoized entry.
+        Returns None if the file doesn't exist.
+        """
+        file_path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        with self._hash_lock:
+            entry = self.data["hashes"].get(file_path)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                return entry["hash"]
+
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+        with self._hash_lock:
+            self.data["hashes"][file_path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": digest
+            }
+        return digest
+
+    @staticmethod
+    def hash_command(command: List[str]) -> str:
+        """Hash the exact compiler command line"""
+        return hashlib.sha256("\0".join(command).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def parse_depfile(dep_path: str) -> List[str]:
+        """
+        Parse a GCC Make-style depfile and return the prerequisite paths
+        (the source itself plus every included header).
+        """
+        if not os.path.exists(dep_path):
+            return []
+
+        with open(dep_path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+
+        # Join line continuations
+        text = text.replace('\\\r\n', ' ').replace('\\\n', ' ')
+
+        dependencies = []
+        for line in text.splitlines():
+            # Skip phony targets for headers ("header.h:") and empty lines
+            colon = DEPFILE_TARGET_PATTERN.search(line)
+            if not colon:
+                continue
+            prerequisites = line[colon.end():]
+
+            # Split on unescaped whitespace, then unescape "\ " in paths
+            for token in re.split(r'(?<!\\)\s+', prerequisites.strip()):
+                if token:
+                    dependencies.append(os.path.abspath(token.replace('\\ ', ' ').replace('$$', '$')))
+
+        return list(dict.fromkeys(dependencies))
+
+    # ==================== PER-FILE ENTRIES ====================
+
     def get_file_info(self, source_path: str) -> Optional[dict]:
         """Get cached info for a source file"""
         return self.data.get("files", {}).get(source_path)
 
-    def set_file_info(self, source_path: str, source_mtime: float, obj_file: str, obj_mtime: float):
-        """Update cached info for a source file"""
-        if "files" not in self.data:
-            self.data["files"] = {}
+    def set_file_info(self, source_path: str, command_hash: str, obj_file: str, dependencies: List[str]):
+        """Update cached info for a source file after a successful compile"""
+        dependency_hashes = {}
+        for dep_path in dependencies:
+            dep_hash = self.get_file_hash(dep_path)
+            if dep_hash is not None:
+                dependency_hashes[dep_path] = dep_hash
+
         self.data["files"][source_path] = {
-            "source_mtime": source_mtime,
+            "source_hash": self.get_file_hash(source_path),
+            "command_hash": command_hash,
             "obj_file": obj_file,
-            "obj_mtime": obj_mtime
+            "dependencies": dependency_hashes
         }
 
-    def build_config_changed(self, compiler_flags: str, platform: str, build_name: str, build_index: int) -> bool:
-        """Check if build configuration changed since last build"""
-        return (
-            self.data.get("last_compiler_flags") != compiler_flags or
-            self.data.get("last_platform") != platform or
-            self.data.get("last_build_name") != build_name or
-            self.data.get("last_build_index") != build_index
-        )
+    def needs_rebuild(self, source_path: str, command_hash: str, obj_file_path: str) -> Tuple[bool, str]:
+        """
+        Check whether a source file needs recompiling.
+        Returns (should_compile, reason).
+        """
+        info = self.get_file_info(source_path)
+        if info is None:
+            return True, "not in build cache"
+
+        if not os.path.exists(obj_file_path):
+            return True, "object file doesn't exist"
+
+        if info.get("command_hash") != command_hash:
+            return True, "compiler command changed"
+
+        if info.get("source_hash") != self.get_file_hash(source_path):
+            return True, "source file changed"
+
+        for dep_path, dep_hash in info.get("dependencies", {}).items():
+            if self.get_file_hash(dep_path) != dep_hash:
+                return True, f"{os.path.basename(dep_path)} changed"
+
+        return False, ""
+
+    def prune(self, source_paths: List[str]):
+        """Drop entries for sources that are no longer part of the build"""
+        keep = set(source_paths)
+        self.data["files"] = {
+            path: info for path, info in self.data["files"].items() if path in keep
+        }
+
+        referenced = set(keep)
+        for info in self.data["files"].values():
+            referenced.update(info.get("dependencies", {}).keys())
+        self.data["hashes"] = {
+            path: entry for path, entry in self.data["hashes"].items() if path in referenced
+        }
+
+class ObjectStore:
+    """
+    Content-addressed store of compiled object files, shared by every build version.
+
+    Objects are keyed on the preprocessed source plus the compiler flags, so
+    switching between builds (NTSC-U, PAL, ...) and back reuses the objects
+    compiled earlier instead of recompiling. Entries are evicted least
+    recently used first once the store grows past max_size_bytes.
+    """
+
+    DEFAULT_MAX_SIZE_BYTES = 256 * 1024 * 1024
 
-    def update_build_config(self, compiler_flags: str, platform: str, build_name: str, build_index: int):
-        """Update build configuration in cache"""
-        self.data["last_compiler_flags"] = compiler_flags
-        self.data["last_platform"] = platform
-        self.data["last_build_name"] = build_name
-        self.data["last_build_index"] = build_index
-
-    def get_newest_include_mtime(self, include_dir: str) -> float:
-        """Get the newest modification time of any file in include directory"""
-        if not os.path.exists(include_dir):
-            return 0.0
-
-        newest_mtime = 0.0
-        for root, _, files in os.walk(include_dir):
-            for file in files:
-                if file.endswith(('.h', '.hpp')):
-                    file_path = os.path.join(root, file)
-                    mtime = os.path.getmtime(file_path)
-                    newest_mtime = max(newest_mtime, mtime)
-
-        return newest_mtime
-
-    def include_dir_changed(self, include_dir: str) -> bool:
-        """Check if any header file changed since last build"""
-        current_mtime = self.get_newest_include_mtime(include_dir)
-        last_mtime = self.data.get("last_include_dir_mtime", 0.0)
-
-        if current_mtime > last_mtime:
-            # Update cached include dir mtime
-            self.data["last_include_dir_mtime"] = current_mtime
+    def __init__(self, store_dir: str, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES):
+        self.store_dir = store_dir
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(flags: List[str], source_content: bytes) -> str:
+        """Build a store key from the compiler flags and (preprocessed) source"""
+        hasher = hashlib.sha256()
+        hasher.update("\0".join(flags).encode('utf-8'))
+        hasher.update(b"\0\0")
+        hasher.update(source_content)
+        return hasher.hexdigest()
+
+    def _entry_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.store_dir, key[:2], key + extension)
+
+    def fetch(self, key: str, obj_file_path: str, depfile_path: str) -> bool:
+        """
+        Copy a stored object (and its depfile) into place.
+        Returns True on a cache hit.
+        """
+        stored_obj = self._entry_path(key, ".o")
+        if not os.path.exists(stored_obj):
+            return False
+
+        try:
+            shutil.copyfile(stored_obj, obj_file_path)
+            stored_dep = self._entry_path(key, ".d")
+            if os.path.exists(stored_dep):
+                shutil.copyfile(stored_dep, depfile_path)
+            # Mark as recently used for LRU eviction
+            os.utime(stored_obj)
             return True
-        return False
+        except OSError:
+            return False
+
+    def put(self, key: str, obj_file_path: str, depfile_path: str):
+        """Add a freshly compiled object (and its depfile) to the store"""
+        stored_obj = self._entry_path(key, ".o")
+        try:
+            os.makedirs(os.path.dirname(stored_obj), exist_ok=True)
+            if os.path.exists(depfile_path):
+                shutil.copyfile(depfile_path, self._entry_path(key, ".d"))
+
+            # Copy then rename, so a concurrent fetch never sees a partial object
+            temp_path = stored_obj + f".{threading.get_ident()}.tmp"
+            shutil.copyfile(obj_file_path, temp_path)
+            os.replace(temp_path, stored_obj)
+        except OSError as e:
+            verbose_print(f"Object store: could not store {os.path.basename(obj_file_path)}: {e}")
+
+    def evict(self):
+        """Delete least recently used objects until the store fits max_size_bytes"""
+        with self._lock:
+            if not os.path.exists(self.store_dir):
+                return
+
+            entries = []
+            total_size = 0
+            for root, _, files in os.walk(self.store_dir):
+                for file in files:
+                    if not file.endswith(".o"):
+                        continue
+                    obj_path = os.path.join(root, file)
+                    dep_path = os.path.splitext(obj_path)[0] + ".d"
+                    try:
+                        size = os.path.getsize(obj_path)
+                        if os.path.exists(dep_path):
+                            size += os.path.getsize(dep_path)
+                        entries.append((os.path.getmtime(obj_path), size, obj_path, dep_path))
+                    except OSError:
+                        continue
+                    total_size += size
+
+            if total_size <= self.max_size_bytes:
+                return
+
+            entries.sort()
+            for _, size, obj_path, dep_path in entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                for path in (obj_path, dep_path):
+                    try:
+                        if os.path.exists(path):
+                            os.remove(path)
+                    except OSError:
+                        pass
+                total_size -= size
+
+    def clear(self):
+        """Delete every stored object (for Clean builds)"""
+        with self._lock:
+            if os.path.exists(self.store_dir):
+                shutil.rmtree(self.store_dir, ignore_errors=True)
 
 class CompilationResult:
     """Represents the result of a compilation operation"""
@@ -270,6 +467,12 @@ class CompilationService:
         project_folder = self.project_data.GetProjectFolder()
         cache_path = os.path.join(project_folder, '.config', 'output', '.build_cache.json')
         self.build_cache = BuildCache(cache_path)
+
+        # Objects shared across build versions, so switching builds doesn't recompile
+        self.object_store = ObjectStore(os.path.join(project_folder, '.config', 'object_store'))
+
+        # Stage/subprocess timing (disabled unless a caller swaps in an enabled profiler)
+        self.profiler = BuildProfiler()
     
     def compile_project(self) -> CompilationResult:
         """Main compilation pipeline with auto-hook detection"""
@@ -290,7 +493,8 @@ class CompilationService:
             # Step 0: Scan for auto-hooks in C/C++ files
             if self.verbose:
                 self._log_progress("Scanning for auto-hooks...")
-            self.auto_hooks = self._scan_for_auto_hooks()
+            with self.profiler.stage("Scan auto-hooks"):
+                self.auto_hooks = self._scan_for_auto_hooks()
             
             if self.auto_hooks:
                 if self.verbose:
@@ -299,34 +503,41 @@ class CompilationService:
                 # Create hooks and ASM files
                 if self.verbose:
                     self._log_progress("Creating auto-generated hooks...")
-                validation_result = self._create_auto_hooks()
+                with self.profiler.stage("Create auto-hooks"):
+                    validation_result = self._create_auto_hooks()
                 if not validation_result.success:
                     return validation_result
             
             # NEW: Step 0.5: Process multi-patch ASM files
             if self.verbose:
                 self._log_progress("Processing multi-patch ASM files...")
-            multipatch_result = self._process_multipatches(hooks_to_cleanup)
+            with self.profiler.stage("Process multipatches"):
+                multipatch_result = self._process_multipatches(hooks_to_cleanup)
             if not multipatch_result.success:
                 return multipatch_result
             
             # Step 1: Validate environment
             if self.verbose:
                 self._log_progress("Validating compilation environment...")
-            if not self._validate_environment():
+            with self.profiler.stage("Validate environment"):
+                environment_valid = self._validate_environment()
+            if not environment_valid:
                 result.message = "Compilation environment validation failed"
                 return result
             
             # Step 2: Update linker script (now includes auto-generated hooks)
             if self.verbose:
                 self._log_progress("Generating linker script...")
-            if not self._update_linker_script():
+            with self.profiler.stage("Generate linker script"):
+                linker_script_updated = self._update_linker_script()
+            if not linker_script_updated:
                 result.message = "Failed to generate linker script"
                 return result
             
             # Step 3: Compile source files (with build name define)
             self._log_progress("Compiling...")
-            compile_result = self._compile_sources()
+            with self.profiler.stage("Compile sources"):
+                compile_result = self._compile_sources()
             if not compile_result.success:
                 result.message = compile_result.message
                 result.details = compile_result.details
@@ -336,7 +547,8 @@ class CompilationService:
             
             # Step 4: Link object files
             self._log_progress("Linking...")
-            link_result = self._link_objects(result.object_files)
+            with self.profiler.stage("Link"):
+                link_result = self._link_objects(result.object_files)
             if not link_result.success:
                 result.message = link_result.message
                 result.details = link_result.details
@@ -345,7 +557,8 @@ class CompilationService:
             
             # Step 5: Extract sections
             self._log_progress("Extracting...")
-            extract_result = self._extract_sections()
+            with self.profiler.stage("Extract sections"):
+                extract_result = self._extract_sections()
             if not extract_result.success:
                 result.message = extract_result.message
                 result.details = extract_result.details
@@ -354,7 +567,8 @@ class CompilationService:
             # Step 6: Copy binary patches
             if self.verbose:
                 self._log_progress("Copying binary patches...")
-            patch_result = self._copy_binary_patches()
+            with self.profiler.stage("Copy binary patches"):
+                patch_result = self._copy_binary_patches()
             if not patch_result.success:
                 result.message = patch_result.message
                 result.details = patch_result.details
@@ -727,48 +941,16 @@ class CompilationService:
             self._log_error(result.message)
             return result
 
-        # Get build configuration for incremental compilation
-        build_name = current_build.GetBuildName()
-        build_index = self.project_data.GetBuildVersionIndex()
-
-        # Get compiler flags (debug mode or user-defined)
-        if current_build.IsDebugMode():
-            user_compiler_flags = "-O0"
-        else:
-            user_compiler_flags = current_build.GetCompilerFlags()
-
-        # Construct full compiler flags string for comparison
-        # Note: -fno-exceptions and -fno-rtti are added per-file for C++ files only
-        compiler_flags_str = f"-g -ffreestanding -fno-builtin {user_compiler_flags}"
-
-        # Check if build configuration changed (forces full rebuild)
-        force_rebuild = self.build_cache.build_config_changed(
-            compiler_flags_str,
-            platform,
-            build_name,
-            build_index
-        )
-
-        if force_rebuild:
-            if self.verbose:
-                self._log_progress("  Build configuration changed - rebuilding all files")
-            # Update build config in cache
-            self.build_cache.update_build_config(compiler_flags_str, platform, build_name, build_index)
-
-        # Check if any header file changed (forces full rebuild)
-        include_dir = os.path.join(project_dir, "include")
-        if self.build_cache.include_dir_changed(include_dir):
-            force_rebuild = True
-            if self.verbose:
-                self._log_progress("  Header files changed - rebuilding all files")
-
         if self.verbose:
             self._log_progress(f"  Found {len(all_source_files)} source file(s) to compile")
 
-        # Determine which files need compilation (incremental build check)
+        # Determine which files need compilation (incremental build check).
+        # A file is rebuilt only if its source, its compiler command, or one of
+        # the headers it actually includes changed content.
         files_to_compile = []
         compiled_obj_files = []
         files_skipped = 0
+        command_hashes: Dict[str, str] = {}
 
         for src_file_path in all_source_files:
             src_file_path = os.path.abspath(src_file_path)
@@ -781,23 +963,12 @@ class CompilationService:
                 self._log_error(result.message)
                 return result
 
-            # Check if we can skip compilation (incremental build)
-            should_compile = force_rebuild
-            reason = ""
-
-            if not should_compile:
-                # Check if object file exists
-                if not os.path.exists(obj_file_path):
-                    should_compile = True
-                    reason = "object file doesn't exist"
-                else:
-                    # Check timestamps
-                    src_mtime = os.path.getmtime(src_file_path)
-                    obj_mtime = os.path.getmtime(obj_file_path)
+            compile_cmd = self._build_compile_command(src_file_path, obj_file_path, platform)
+            command_hashes[src_file_path] = BuildCache.hash_command(compile_cmd)
 
-                    if src_mtime > obj_mtime:
-                        should_compile = True
-                        reason = "source file newer than object file"
+            should_compile, reason = self.build_cache.needs_rebuild(
+                src_file_path, command_hashes[src_file_path], obj_file_path
+            )
 
             if should_compile:
                 files_to_compile.append((src_file_path, obj_file_path, reason))
@@ -824,7 +995,7 @@ class CompilationService:
                 compile_reason = f" ({reason})" if reason and self.verbose else ""
                 self._log_progress(f"  {src_filename}{compile_reason}")
 
-                compile_result = self._compile_single_file(src_file_path, obj_output_dir, platform)
+                compile_result = self._compile_or_restore(src_file_path, obj_output_dir, platform)
 
                 if not compile_result.success:
                     result.message = f"Failed to compile {src_filename}"
@@ -832,9 +1003,7 @@ class CompilationService:
                     return result
 
                 # Update cache
-                obj_mtime = os.path.getmtime(obj_file_path) if os.path.exists(obj_file_path) else 0.0
-                src_mtime = os.path.getmtime(src_file_path)
-                self.build_cache.set_file_info(src_file_path, src_mtime, obj_filename, obj_mtime)
+                self._record_compiled_file(src_file_path, obj_file_path, command_hashes[src_file_path])
 
                 compiled_obj_files.append(compile_result.message)
                 files_compiled += 1
@@ -851,7 +1020,7 @@ class CompilationService:
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 # Submit all compilation tasks
                 future_to_file = {
-                    executor.submit(self._compile_single_file, src_path, obj_output_dir, platform): (src_path, obj_path)
+                    executor.submit(self._compile_or_restore, src_path, obj_output_dir, platform): (src_path, obj_path)
                     for src_path, obj_path, _ in files_to_compile
                 }
 
@@ -872,9 +1041,7 @@ class CompilationService:
                             return result
 
                         # Update cache
-                        obj_mtime = os.path.getmtime(obj_file_path) if os.path.exists(obj_file_path) else 0.0
-                        src_mtime = os.path.getmtime(src_file_path)
-                        self.build_cache.set_file_info(src_file_path, src_mtime, obj_filename, obj_mtime)
+                        self._record_compiled_file(src_file_path, obj_file_path, command_hashes[src_file_path])
 
                         compiled_obj_files.append(compile_result.message)
                         files_compiled += 1
@@ -885,8 +1052,10 @@ class CompilationService:
                         executor.shutdown(wait=False, cancel_futures=True)
                         return result
 
-        # Save build cache
+        # Save build cache (dropping sources that left the build)
+        self.build_cache.prune(list(command_hashes.keys()))
         self.build_cache.save()
+        self.object_store.evict()
 
         # Log compilation statistics
         if files_skipped > 0:
@@ -897,31 +1066,121 @@ class CompilationService:
         result.message = f"Compiled {len(compiled_obj_files)} file(s)"
         return result
 
-    def _compile_single_file(self, src_file_path: str, output_dir: str, platform: str) -> CompilationResult:
-        """Compile a single file with build name as preprocessor define"""
-        result = CompilationResult(success=False)
+    def _record_compiled_file(self, src_file_path: str, obj_file_path: str, command_hash: str):
+        """Store a freshly compiled file in the build cache, with its header dependencies"""
+        dependencies = BuildCache.parse_depfile(self._get_depfile_path(obj_file_path))
+        self.build_cache.set_file_info(
+            src_file_path,
+            command_hash,
+            os.path.basename(obj_file_path),
+            [dep for dep in dependencies if dep != src_file_path]
+        )
 
+    def _get_object_store_key(self, src_file_path: str, compile_cmd: List[str]) -> Optional[str]:
+        """
+        Get the object store key for a source file: its preprocessed output
+        plus the compiler flags. Returns None if the file can't be preprocessed.
+        """
+        # Drop output paths so the key only depends on what affects the object's contents
+        output_args = {"-o", "-MF"}
+        flags = []
+        skip_next = False
+        for arg in compile_cmd:
+            if skip_next:
+                skip_next = False
+                continue
+            if arg in output_args:
+                skip_next = True
+                continue
+            if arg in ("-MD", src_file_path):
+                continue
+            flags.append(arg)
+
+        # Plain assembly isn't preprocessed, so its raw contents are the key
+        if src_file_path.endswith('.s'):
+            try:
+                with open(src_file_path, 'rb') as f:
+                    return ObjectStore.make_key(flags, f.read())
+            except OSError:
+                return None
+
+        preprocess_cmd = [arg for arg in flags if arg != "-c"] + ["-E", src_file_path]
+
+        try:
+            compiler_dir = os.path.dirname(compile_cmd[0])
+            env = os.environ.copy()
+            env["PATH"] = compiler_dir + os.pathsep + env.get("PATH", "")
+
+            process = self.profiler.run(
+                "Preprocess (object store key)",
+                preprocess_cmd,
+                shell=False,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=os.path.abspath(self.project_data.GetProjectFolder()),
+                env=env,
+            )
+        except Exception:
+            return None
+
+        if process.returncode != 0:
+            return None
+
+        return ObjectStore.make_key(flags, process.stdout)
+
+    def _compile_or_restore(self, src_file_path: str, output_dir: str, platform: str) -> CompilationResult:
+        """Reuse an identical object from the object store, or compile and store it"""
         src_file_path = os.path.abspath(src_file_path)
         output_dir = os.path.abspath(output_dir)
+        obj_filename = os.path.splitext(os.path.basename(src_file_path))[0] + ".o"
+        obj_file_path = os.path.join(output_dir, obj_filename)
+        depfile_path = self._get_depfile_path(obj_file_path)
 
-        src_filename = os.path.basename(src_file_path)
-        obj_filename = os.path.splitext(src_filename)[0] + ".o"
-        output_obj_path = os.path.abspath(os.path.join(output_dir, obj_filename))
+        with self.profiler.stage(os.path.basename(src_file_path)):
+            compile_cmd = self._build_compile_command(src_file_path, obj_file_path, platform)
+            store_key = self._get_object_store_key(src_file_path, compile_cmd)
 
-        compiler_path = self._get_compiler_path(platform)
-        project_dir = os.path.abspath(self.project_data.GetProjectFolder())
-        include_dir = os.path.abspath(os.path.join(project_dir, "include"))
+            if store_key and self.object_store.fetch(store_key, obj_file_path, depfile_path):
+                if self.verbose:
+                    self._log_progress(f"     Reused: {obj_filename} (object store)")
+                result = CompilationResult(success=True)
+                result.message = obj_filename
+                return result
 
-        os.makedirs(output_dir, exist_ok=True)
+            result = self._compile_single_file(src_file_path, output_dir, platform)
+
+            if result.success and store_key:
+                self.object_store.put(store_key, obj_file_path, depfile_path)
 
-        # Get build name for preprocessor define
+            return result
+
+    def _get_define_names(self, platform: str) -> Tuple[str, str]:
+        """Get the (build name, platform) preprocessor define names"""
         build_name = self.project_data.GetCurrentBuildVersion().GetBuildName()
 
         # Replace spaces/special chars with underscores
         safe_build_name = re.sub(r'[^A-Za-z0-9_]', '_', build_name).upper()
-
         safe_platform_name = re.sub(r'[^A-Za-z0-9_]', '_', platform).upper()
 
+        return safe_build_name, safe_platform_name
+
+    @staticmethod
+    def _get_depfile_path(obj_file_path: str) -> str:
+        """Get the GCC dependency file path written next to an object file"""
+        return os.path.splitext(obj_file_path)[0] + ".d"
+
+    def _build_compile_command(self, src_file_path: str, output_obj_path: str, platform: str) -> List[str]:
+        """
+        Build the exact GCC command line for one source file.
+        The build cache hashes this list, so anything that affects the object
+        file's contents must be part of it.
+        """
+        compiler_path = self._get_compiler_path(platform)
+        project_dir = os.path.abspath(self.project_data.GetProjectFolder())
+        include_dir = os.path.abspath(os.path.join(project_dir, "include"))
+
+        safe_build_name, safe_platform_name = self._get_define_names(platform)
+
         # Get build index
         build_index = self.project_data.GetBuildVersionIndex()
 
@@ -958,6 +1217,11 @@ class CompilationService:
         # So it's ok now!
         compile_cmd.append("-fdiagnostics-color=always")
 
+        # Write a depfile listing every header this file includes (for the build cache)
+        compile_cmd.extend([
+            "-MD",
+            "-MF", self._get_depfile_path(output_obj_path),
+        ])
 
         # Preprocessor defines
         compile_cmd.extend([
@@ -979,6 +1243,34 @@ class CompilationService:
         for flag in user_compiler_flags_list:
             compile_cmd.append(flag)
 
+        return compile_cmd
+
+    def _compile_single_file(self, src_file_path: str, output_dir: str, platform: str) -> CompilationResult:
+        """Compile a single file with build name as preprocessor define"""
+        result = CompilationResult(success=False)
+
+        src_file_path = os.path.abspath(src_file_path)
+        output_dir = os.path.abspath(output_dir)
+
+        src_filename = os.path.basename(src_file_path)
+        obj_filename = os.path.splitext(src_filename)[0] + ".o"
+        output_obj_path = os.path.abspath(os.path.join(output_dir, obj_filename))
+
+        compiler_path = self._get_compiler_path(platform)
+        project_dir = os.path.abspath(self.project_data.GetProjectFolder())
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        compile_cmd = self._build_compile_command(src_file_path, output_obj_path, platform)
+
+        # Remove any stale depfile so the cache never records old dependencies
+        depfile_path = self._get_depfile_path(output_obj_path)
+        if os.path.exists(depfile_path):
+            os.remove(depfile_path)
+
+        safe_build_name, safe_platform_name = self._get_define_names(platform)
+        build_index = self.project_data.GetBuildVersionIndex()
+
         if self.verbose:
             self._log_progress(f"    Build Version #define: {safe_build_name}, BUILD={build_index}")
             self._log_progress(f"    Platform #define: {safe_platform_name}, PLATFORM={safe_platform_name}")
@@ -989,7 +1281,8 @@ class CompilationService:
             env = os.environ.copy()
             env["PATH"] = compiler_dir + os.pathsep + env.get("PATH", "")
 
-            process = subprocess.run(
+            process = self.profiler.run(
+                "Compile",
                 compile_cmd,
                 shell=False,
                 text=True,
@@ -1184,6 +1477,7 @@ class CompilationService:
         if self.verbose:
             self._log_progress("Clearing build cache...")
         self.build_cache.clear()
+        self.object_store.clear()
 
     def _update_linker_script(self) -> bool:
         """Generate the linker script (includes auto-generated hooks)"""
@@ -1325,7 +1619,8 @@ class CompilationService:
                 "-nostartfiles",
             ]
             
-            process = subprocess.run(
+            process = self.profiler.run(
+                "Link",
                 link_cmd,
                 shell=False,
                 text=True,
@@ -1520,7 +1815,8 @@ class CompilationService:
                     output_bin_path
                 ]
 
-                process = subprocess.run(
+                process = self.profiler.run(
+                    "Objcopy",
                     extract_cmd,
                     shell=False,
                     text=True,
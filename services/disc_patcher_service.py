@@ -0,0 +1,366 @@
+"""
+Disc Patcher Service
+Updates a previously built disc image in place when only file contents changed,
+instead of rebuilding the whole image with the platform's ISO tooling
+"""
+
+import os
+import json
+import struct
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from functions.verbose_print import verbose_print
+
+LAYOUT_GAMECUBE = "gamecube"
+LAYOUT_ISO9660 = "iso9660"
+
+ISO9660_SECTOR_SIZE = 2048
+ISO9660_PVD_SECTOR = 16
+
+GAMECUBE_DOL_HEADER_SIZE = 0x100
+GAMECUBE_BOOT_DOL_PATHS = ("&&systemdata/start.dol", "main.dol")
+
+
+class DiscFileExtent:
+    """Where a file's bytes live inside a disc image"""
+
+    def __init__(self, path: str, offset: int, size: int, capacity: Optional[int] = None,
+                 size_field_offset: Optional[int] = None, self_sized: bool = False):
+        self.path = path
+        self.offset = offset
+        self.size = size
+        # Bytes available before the next known region (never less than size)
+        self.capacity = max(size, capacity if capacity is not None else size)
+        # Image offset of a big-endian u32 holding the file size, if it can be updated
+        self.size_field_offset = size_field_offset
+        # True for files whose size comes from their own header (the boot DOL)
+        self.self_sized = self_sized
+
+    def can_hold(self, new_size: int) -> bool:
+        if new_size == self.size:
+            return True
+        return new_size <= self.capacity and (self.size_field_offset is not None or self.self_sized)
+
+    def __repr__(self):
+        return f"DiscFileExtent({self.path}, offset=0x{self.offset:X}, size=0x{self.size:X}, capacity=0x{self.capacity:X})"
+
+
+class DiscPatcherService:
+    """
+    Remembers what went into the last full build of a disc image (a manifest of
+    per-file content hashes, plus a fingerprint of the extracted game folder so
+    changes to any other file are noticed). On the next build, changed files that still fit
+    their original extent are written straight into that image; anything that
+    would change the disc layout returns None so the caller does a full rebuild.
+    """
+
+    MANIFEST_VERSION = 2
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+
+    # ==================== MANIFEST ====================
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def fingerprint_tree(folder: str, exclude: Sequence[str] = ()) -> str:
+        """
+        Hash of the relative path, size and mtime of every file under folder.
+        Cheap (nothing is read), and changes whenever a file is added, removed or touched.
+        """
+        excluded = {os.path.normcase(os.path.abspath(path)) for path in exclude}
+        hasher = hashlib.sha256()
+        for root, dirs, names in os.walk(folder):
+            dirs[:] = sorted(name for name in dirs
+                             if os.path.normcase(os.path.abspath(os.path.join(root, name))) not in excluded)
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                relative = os.path.relpath(path, folder).replace(os.sep, '/')
+                hasher.update(f"{relative}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+        return hasher.hexdigest()
+
+    def record_build(self, image_path: str, layout: str, disc_files: Dict[str, str],
+                     source_tree: Optional[str] = None):
+        """
+        Record a fresh full build so the next build can patch it in place.
+
+        Args:
+            image_path: The disc image that was just built
+            layout: LAYOUT_GAMECUBE or LAYOUT_ISO9660
+            disc_files: {path on disc: local file whose contents went into the image}
+            source_tree: fingerprint_tree of the folder the image was built from
+        """
+        try:
+            files = {self._normalize(path): self.hash_file(local) for path, local in disc_files.items()}
+        except OSError as e:
+            verbose_print(f"Could not record disc manifest: {e}")
+            self.invalidate()
+            return
+        self._write_manifest(image_path, layout, files, source_tree)
+
+    def invalidate(self):
+        if os.path.exists(self.manifest_path):
+            try:
+                os.remove(self.manifest_path)
+            except OSError:
+                pass
+
+    def _load_manifest(self) -> Optional[Dict]:
+        if not os.path.exists(self.manifest_path):
+            return None
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except Exception:
+            return None
+        if manifest.get("version") != self.MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def _write_manifest(self, image_path: str, layout: str, files: Dict[str, str],
+                        source_tree: Optional[str] = None):
+        stat = os.stat(image_path)
+        manifest = {
+            "version": self.MANIFEST_VERSION,
+            "image": os.path.abspath(image_path),
+            "image_size": stat.st_size,
+            "image_mtime_ns": stat.st_mtime_ns,
+            "layout": layout,
+            "source_tree": source_tree,
+            "files": files,
+        }
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    # ==================== PATCHING ====================
+
+    def patch_image(self, image_path: str, layout: str, disc_files: Dict[str, str],
+                    source_tree: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Bring the last built image up to date by overwriting changed files in place.
+
+        Args:
+            image_path: The previously built disc image
+            layout: LAYOUT_GAMECUBE or LAYOUT_ISO9660
+            disc_files: {path on disc: local file with the contents it should now have}
+            source_tree: fingerprint_tree of the folder the image is built from
+
+        Returns:
+            Disc paths that were rewritten (empty if already up to date),
+            or None if a full rebuild is needed
+        """
+        manifest = self._load_manifest()
+        if manifest is None:
+            verbose_print("Disc patcher: no manifest from a previous full build")
+            return None
+
+        if (manifest.get("layout") != layout
+                or manifest.get("image") != os.path.abspath(image_path)
+                or not os.path.exists(image_path)):
+            verbose_print("Disc patcher: previous image missing or built differently")
+            return None
+
+        stat = os.stat(image_path)
+        if stat.st_size != manifest.get("image_size") or stat.st_mtime_ns != manifest.get("image_mtime_ns"):
+            verbose_print("Disc patcher: image was modified outside the build")
+            return None
+
+        if source_tree != manifest.get("source_tree"):
+            verbose_print("Disc patcher: files in the game folder changed since the last full build")
+            return None
+
+        files = {self._normalize(path): local for path, local in disc_files.items()}
+        if set(files) != set(manifest["files"]):
+            verbose_print("Disc patcher: set of modified/new files changed")
+            return None
+
+        try:
+            new_hashes = {path: self.hash_file(local) for path, local in files.items()}
+        except OSError as e:
+            verbose_print(f"Disc patcher: could not read file: {e}")
+            return None
+
+        changed = [path for path, file_hash in new_hashes.items() if manifest["files"][path] != file_hash]
+        if not changed:
+            return []
+
+        layout_map = self.read_layout(image_path, layout)
+        if layout_map is None:
+            verbose_print("Disc patcher: could not read image layout")
+            return None
+
+        writes: List[Tuple[DiscFileExtent, str]] = []
+        for path in changed:
+            extent = layout_map.get(path)
+            if extent is None:
+                verbose_print(f"Disc patcher: {path} not found in image")
+                return None
+            new_size = os.path.getsize(files[path])
+            if not extent.can_hold(new_size):
+                verbose_print(f"Disc patcher: {path} no longer fits its extent (0x{new_size:X} > 0x{extent.size:X})")
+                return None
+            writes.append((extent, files[path]))
+
+        # A failure part way through leaves the image inconsistent, so drop the
+        # manifest first; the next build then falls back to a full rebuild
+        self.invalidate()
+
+        with open(image_path, 'r+b') as image:
+            for extent, local in writes:
+                with open(local, 'rb') as f:
+                    data = f.read()
+                image.seek(extent.offset)
+                image.write(data)
+                if len(data) < extent.size:
+                    image.write(b'\x00' * (extent.size - len(data)))
+                if extent.size_field_offset is not None and len(data) != extent.size:
+                    image.seek(extent.size_field_offset)
+                    image.write(struct.pack(">I", len(data)))
+                verbose_print(f"  Rewrote {extent.path} at 0x{extent.offset:X} ({len(data)} bytes)")
+
+        self._write_manifest(image_path, layout, new_hashes, source_tree)
+        return changed
+
+    # ==================== LAYOUT READERS ====================
+
+    @staticmethod
+    def read_layout(image_path: str, layout: str) -> Optional[Dict[str, DiscFileExtent]]:
+        try:
+            with open(image_path, 'rb') as f:
+                if layout == LAYOUT_GAMECUBE:
+                    return DiscPatcherService._read_gamecube_layout(f)
+                if layout == LAYOUT_ISO9660:
+                    return DiscPatcherService._read_iso9660_layout(f)
+        except (OSError, struct.error, UnicodeDecodeError, ValueError) as e:
+            verbose_print(f"Disc patcher: error reading {layout} layout: {e}")
+        return None
+
+    @staticmethod
+    def _read_gamecube_layout(f) -> Optional[Dict[str, DiscFileExtent]]:
+        """Boot DOL plus every file in the FST"""
+        f.seek(0, os.SEEK_END)
+        image_size = f.tell()
+
+        f.seek(0x420)
+        dol_offset, fst_offset, fst_size = struct.unpack(">III", f.read(12))
+        if not dol_offset or not fst_offset or fst_offset + fst_size > image_size:
+            return None
+
+        # DOL size: furthest end of any text/data section
+        f.seek(dol_offset)
+        dol_header = f.read(GAMECUBE_DOL_HEADER_SIZE)
+        section_offsets = struct.unpack(">18I", dol_header[0x00:0x48])
+        section_sizes = struct.unpack(">18I", dol_header[0x90:0xD8])
+        dol_size = max(
+            [GAMECUBE_DOL_HEADER_SIZE] +
+            [offset + size for offset, size in zip(section_offsets, section_sizes) if size]
+        )
+
+        f.seek(fst_offset)
+        fst = f.read(fst_size)
+        entry_count = struct.unpack_from(">I", fst, 8)[0]
+        string_table = fst[entry_count * 12:]
+
+        extents: List[DiscFileExtent] = []
+        dir_stack: List[Tuple[str, int]] = []  # (path prefix, index of first entry after this dir)
+        prefix = ""
+        for index in range(1, entry_count):
+            while dir_stack and index >= dir_stack[-1][1]:
+                dir_stack.pop()
+                prefix = dir_stack[-1][0] if dir_stack else ""
+
+            word0, word1, word2 = struct.unpack_from(">III", fst, index * 12)
+            name_offset = word0 & 0x00FFFFFF
+            name_end = string_table.index(b'\x00', name_offset)
+            name = string_table[name_offset:name_end].decode('shift_jis', errors='replace')
+
+            if word0 >> 24:
+                prefix = f"{prefix}{name}/"
+                dir_stack.append((prefix, word2))
+            else:
+                extents.append(DiscFileExtent(
+                    f"{prefix}{name}", word1, word2,
+                    size_field_offset=fst_offset + index * 12 + 8
+                ))
+
+        files = {DiscPatcherService._normalize(extent.path): extent for extent in extents}
+
+        boot_dol = DiscFileExtent("&&SystemData/Start.dol", dol_offset, dol_size, self_sized=True)
+        for path in GAMECUBE_BOOT_DOL_PATHS:
+            files.setdefault(path, boot_dol)
+
+        # Capacity of each region is the gap up to the next known region
+        region_starts = sorted({extent.offset for extent in extents} | {dol_offset, fst_offset, image_size})
+        for extent in extents + [boot_dol]:
+            later = [start for start in region_starts if start > extent.offset]
+            extent.capacity = max(extent.size, (later[0] if later else image_size) - extent.offset)
+
+        return files
+
+    @staticmethod
+    def _read_iso9660_layout(f) -> Optional[Dict[str, DiscFileExtent]]:
+        """Every file reachable from the primary volume descriptor's root directory"""
+        f.seek(ISO9660_PVD_SECTOR * ISO9660_SECTOR_SIZE)
+        pvd = f.read(ISO9660_SECTOR_SIZE)
+        if pvd[0] != 1 or pvd[1:6] != b"CD001":
+            return None
+
+        block_size = struct.unpack_from("<H", pvd, 128)[0]
+        root_record = pvd[156:156 + 34]
+
+        files: Dict[str, DiscFileExtent] = {}
+        pending = [("", struct.unpack_from("<I", root_record, 2)[0], struct.unpack_from("<I", root_record, 10)[0])]
+        visited = set()
+
+        while pending:
+            prefix, extent_lba, extent_size = pending.pop()
+            if extent_lba in visited:
+                continue
+            visited.add(extent_lba)
+
+            f.seek(extent_lba * block_size)
+            directory = f.read(extent_size)
+            pos = 0
+            while pos < len(directory):
+                record_length = directory[pos]
+                if record_length == 0:
+                    # Records never span sectors; skip the rest of this one
+                    pos = (pos // block_size + 1) * block_size
+                    continue
+
+                record = directory[pos:pos + record_length]
+                pos += record_length
+
+                name_length = record[32]
+                name_bytes = record[33:33 + name_length]
+                if name_bytes in (b'\x00', b'\x01'):
+                    continue
+
+                lba = struct.unpack_from("<I", record, 2)[0]
+                size = struct.unpack_from("<I", record, 10)[0]
+                name = name_bytes.decode('ascii', errors='replace').split(';')[0].rstrip('.')
+
+                if record[25] & 0x02:
+                    pending.append((f"{prefix}{name}/", lba, size))
+                else:
+                    path = f"{prefix}{name}"
+                    files[DiscPatcherService._normalize(path)] = DiscFileExtent(path, lba * block_size, size)
+
+        return files
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return path.replace('\\', '/').strip('/').lower()
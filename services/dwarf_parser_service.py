@@ -1,8 +1,14 @@
 # services/dwarf_parser_service.py
 
 import os
+import json
+import bisect
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, astuple
 
 try:
     from elftools.elf.elffile import ELFFile
@@ -71,15 +77,134 @@ class FunctionInfo:
         return f"Function({self.name} @ 0x{self.start_address:08X}-0x{self.end_address:08X})"
 
 
+# Line table and functions are cached next to the ELF as <elf>.dwarf_index.json
+DWARF_INDEX_SUFFIX = ".dwarf_index.json"
+DWARF_INDEX_VERSION = 1
+
+
+class LineTable:
+    """
+    Every line program row flattened into parallel arrays sorted by start address,
+    so the rows covering an address are found with bisect.
+    """
+
+    def __init__(self, files: List[str], starts, ends, file_ids, lines, columns, order):
+        self.files = files
+        self.starts = array('Q', starts)
+        self.ends = array('Q', ends)
+        self.file_ids = array('l', file_ids)
+        self.lines = array('l', lines)
+        self.columns = array('l', columns)
+        # Position of each row in the per-file listing, to return matches in that order
+        self.order = array('l', order)
+
+        # Running maximum of end addresses: rows before the first index whose
+        # max end exceeds an address can't contain it
+        self._max_ends = array('Q')
+        max_end = 0
+        for end in self.ends:
+            max_end = max(max_end, end)
+            self._max_ends.append(max_end)
+
+    @classmethod
+    def from_line_programs(cls, line_programs: Dict[str, List[SourceLine]]) -> "LineTable":
+        files = list(line_programs)
+        rows = []
+        for file_id, file_path in enumerate(files):
+            for line in line_programs[file_path]:
+                rows.append((line.asm_address, line.asm_address_end, file_id, line.line_number, line.column, len(rows)))
+        rows.sort()
+        columns = list(zip(*rows)) if rows else [()] * 6
+        return cls(files, *columns)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _row(self, i: int) -> SourceLine:
+        return SourceLine(self.files[self.file_ids[i]], self.lines[i], self.starts[i], self.ends[i], self.columns[i])
+
+    def lookup(self, address: int) -> List[SourceLine]:
+        """Rows whose [start, end) range holds the address"""
+        high = bisect.bisect_right(self.starts, address)
+        low = bisect.bisect_right(self._max_ends, address, 0, high)
+        matches = [i for i in range(low, high) if address < self.ends[i]]
+        matches.sort(key=self.order.__getitem__)
+        return [self._row(i) for i in matches]
+
+    def to_line_programs(self) -> Dict[str, List[SourceLine]]:
+        """Rebuild the per-file listing (same order as get_line_program produced it)"""
+        line_programs: Dict[str, List[SourceLine]] = {file_path: [] for file_path in self.files}
+        for i in sorted(range(len(self.starts)), key=self.order.__getitem__):
+            line_programs[self.files[self.file_ids[i]]].append(self._row(i))
+        return line_programs
+
+    def to_dict(self) -> Dict:
+        return {
+            "files": self.files,
+            "starts": self.starts.tolist(), "ends": self.ends.tolist(),
+            "file_ids": self.file_ids.tolist(), "lines": self.lines.tolist(),
+            "columns": self.columns.tolist(), "order": self.order.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LineTable":
+        return cls(data["files"], data["starts"], data["ends"], data["file_ids"],
+                   data["lines"], data["columns"], data["order"])
+
+
+class FunctionIndex:
+    """Functions sorted by start address with a running maximum of end addresses"""
+
+    def __init__(self, functions: List[FunctionInfo]):
+        # (start, position in DIE order) so the first function in DIE order wins overlaps
+        self._sorted = sorted(range(len(functions)), key=lambda i: (functions[i].start_address, i))
+        self._functions = functions
+        self._starts = [functions[i].start_address for i in self._sorted]
+        self._max_ends = []
+        max_end = None
+        for i in self._sorted:
+            end = functions[i].end_address
+            max_end = end if max_end is None else max(max_end, end)
+            self._max_ends.append(max_end)
+
+    def lookup(self, address: int) -> Optional[FunctionInfo]:
+        high = bisect.bisect_right(self._starts, address)
+        low = bisect.bisect_right(self._max_ends, address, 0, high)
+        candidates = [self._sorted[k] for k in range(low, high)
+                      if address < self._functions[self._sorted[k]].end_address]
+        return self._functions[min(candidates)] if candidates else None
+
+
+class CompilationUnitIndex:
+    """Functions, line rows and globals of a single compilation unit"""
+
+    def __init__(self, functions: List[FunctionInfo], line_programs: Dict[str, List[SourceLine]],
+                 global_variables: List[Variable]):
+        self.functions = functions
+        self.function_index = FunctionIndex(functions)
+        self.line_table = LineTable.from_line_programs(line_programs)
+        self.global_variables = global_variables
+
+
 class DWARFParser:
-    """Parse DWARF debug information from ELF files"""
+    """
+    Parse DWARF debug information from ELF files.
+
+    Address lookups only parse the compilation unit that .debug_aranges says
+    covers the address (kept in a small LRU) until the full index is available,
+    either from the on-disk cache or after a full walk (which prefetch() runs
+    on a background thread).
+    """
 
-    def __init__(self, elf_path: str):
+    MAX_CACHED_CUS = 16
+
+    def __init__(self, elf_path: str, prefetch: bool = False):
         """
         Initialize DWARF parser for an ELF file.
 
         Args:
             elf_path: Path to ELF file with debug symbols (-g)
+            prefetch: Build the full index on a background thread right away
         """
         if not PYELFTOOLS_AVAILABLE:
             raise ImportError("pyelftools is required for DWARF parsing. Install with: pip install pyelftools")
@@ -92,6 +217,22 @@ class DWARFParser:
         self.dwarf_info = None
         self._line_program_cache: Dict[str, List[SourceLine]] = {}
         self._function_cache: List[FunctionInfo] = []
+        self._line_table: Optional[LineTable] = None
+        self._function_index: Optional[FunctionIndex] = None
+        self._elf_hash: Optional[str] = None
+        self._index_cache_checked = False
+        self._global_variables: Optional[List[Variable]] = None
+
+        # Parsed CUs by offset, for lookups made before the full index exists
+        self._cu_cache: "OrderedDict[int, CompilationUnitIndex]" = OrderedDict()
+        self._aranges = None
+        self._aranges_loaded = False
+
+        # pyelftools reads from one shared stream, so on-demand DWARF access is serialized.
+        # The full index walk opens its own stream instead and only holds _index_lock.
+        self._lock = threading.RLock()
+        self._index_lock = threading.Lock()
+        self._prefetch_thread: Optional[threading.Thread] = None
 
         # Open ELF file
         try:
@@ -106,6 +247,9 @@ class DWARFParser:
         except Exception as e:
             raise RuntimeError(f"Failed to parse ELF file: {e}")
 
+        if prefetch:
+            self.prefetch()
+
     def get_line_program(self) -> Dict[str, List[SourceLine]]:
         """
         Extract line number program from DWARF .debug_line section.
@@ -113,67 +257,75 @@ class DWARFParser:
         Returns:
             Dictionary mapping source file paths to list of SourceLine objects
         """
-        if self._line_program_cache:
-            return self._line_program_cache
-
+        if not self._line_program_cache:
+            self._ensure_index()
+            if not self._line_program_cache:
+                self._line_program_cache = self._line_table.to_line_programs()
+        return self._line_program_cache
+
+    def _walk_line_programs(self, dwarf_info) -> Dict[str, List[SourceLine]]:
+        """Run every CU's line number program"""
         line_programs: Dict[str, List[SourceLine]] = {}
 
         # Iterate through all compilation units
-        for cu in self.dwarf_info.iter_CUs():
-            # Get line program for this compilation unit
-            line_program = self.dwarf_info.line_program_for_CU(cu)
-            if line_program is None:
-                continue
+        for cu in dwarf_info.iter_CUs():
+            self._walk_cu_line_program(cu, line_programs)
 
-            # Process line program entries
-            prev_entry = None
-
-            for entry in line_program.get_entries():
-                # Skip entries with no state
-                if entry.state is None:
-                    continue
-
-                state = entry.state
-
-                # Get source file
-                file_entry = line_program['file_entry'][state.file - 1]
-                file_path = file_entry.name.decode('utf-8', errors='ignore')
-
-                # Make file path absolute if possible
-                dir_index = file_entry.dir_index
-                if dir_index != 0:
-                    dir_entry = line_program['include_directory'][dir_index - 1]
-                    dir_path = dir_entry.decode('utf-8', errors='ignore')
-                    file_path = os.path.join(dir_path, file_path)
-
-                # Normalize path
-                file_path = os.path.normpath(file_path)
-
-                # Create SourceLine entry
-                # Note: We need to wait for the next entry to determine the end address
-                if prev_entry is not None:
-                    prev_state = prev_entry.state
-                    prev_file = line_program['file_entry'][prev_state.file - 1].name.decode('utf-8', errors='ignore')
-
-                    # Same file: create entry for previous line
-                    if prev_file == file_entry.name.decode('utf-8', errors='ignore'):
-                        source_line = SourceLine(
-                            file_path=file_path,
-                            line_number=prev_state.line,
-                            asm_address=prev_state.address,
-                            asm_address_end=state.address,  # End is start of next line
-                            column=prev_state.column
-                        )
-
-                        if file_path not in line_programs:
-                            line_programs[file_path] = []
-                        line_programs[file_path].append(source_line)
-
-                prev_entry = entry
-
-        self._line_program_cache = line_programs
         return line_programs
 
+    def _walk_cu_line_program(self, cu, line_programs: Dict[str, List[SourceLine]]):
+        """Add one CU's line rows to line_programs"""
+        # Get line program for this compilation unit
+        line_program = cu.dwarfinfo.line_program_for_CU(cu)
+        if line_program is None:
+            return
+
+        # Process line program entries
+        prev_entry = None
+
+        for entry in line_program.get_entries():
+            # Skip entries with no state
+            if entry.state is None:
+                continue
+
+            state = entry.state
+
+            # Get source file
+            file_entry = line_program['file_entry'][state.file - 1]
+            file_path = file_entry.name.decode('utf-8', errors='ignore')
+
+            # Make file path absolute if possible
+            dir_index = file_entry.dir_index
+            if dir_index != 0:
+                dir_entry = line_program['include_directory'][dir_index - 1]
+                dir_path = dir_entry.decode('utf-8', errors='ignore')
+                file_path = os.path.join(dir_path, file_path)
+
+            # Normalize path
+            file_path = os.path.normpath(file_path)
+
+            # Create SourceLine entry
+            # Note: We need to wait for the next entry to determine the end address
+            if prev_entry is not None:
+                prev_state = prev_entry.state
+                prev_file = line_program['file_entry'][prev_state.file - 1].name.decode('utf-8', errors='ignore')
+
+                # Same file: create entry for previous line
+                if prev_file == file_entry.name.decode('utf-8', errors='ignore'):
+                    source_line = SourceLine(
+                        file_path=file_path,
+                        line_number=prev_state.line,
+                        asm_address=prev_state.address,
+                        asm_address_end=state.address,  # End is start of next line
+                        column=prev_state.column
+                    )
+
+                    if file_path not in line_programs:
+                        line_programs[file_path] = []
+                    line_programs[file_path].append(source_line)
+
+            prev_entry = entry
+
     def get_source_lines_for_address(self, address: int) -> List[SourceLine]:
         """
         Find C source lines that map to a specific assembly address.
@@ -184,15 +336,16 @@ class DWARFParser:
         Returns:
             List of SourceLine objects containing this address
         """
-        line_programs = self.get_line_program()
+        if not self._has_full_index():
+            cu_index = self._get_cu_index_for_address(address)
+            if cu_index is not None or self._get_aranges() is not None:
+                return cu_index.line_table.lookup(address) if cu_index else []
+        return self.get_line_table().lookup(address)
 
-        matching_lines = []
-        for file_path, lines in line_programs.items():
-            for line in lines:
-                if line.asm_address <= address < line.asm_address_end:
-                    matching_lines.append(line)
-
-        return matching_lines
+    def get_line_table(self) -> LineTable:
+        """Address-sorted line table, loaded from the index cache when the ELF is unchanged"""
+        self._ensure_index()
+        return self._line_table
 
     def get_address_for_line(self, file: str, line_number: int) -> List[int]:
         """
@@ -229,19 +382,20 @@ class DWARFParser:
         Returns:
             List of FunctionInfo objects
         """
-        if self._function_cache:
-            return self._function_cache
+        self._ensure_index()
+        return self._function_cache
 
+    def _walk_functions(self, dwarf_info) -> List[FunctionInfo]:
+        """Walk every CU's DIE tree for subprograms"""
         functions = []
 
         # Iterate through all compilation units
-        for cu in self.dwarf_info.iter_CUs():
+        for cu in dwarf_info.iter_CUs():
             top_die = cu.get_top_DIE()
 
             # Recursively find all function DIEs
             self._extract_functions_from_die(top_die, functions)
 
-        self._function_cache = functions
         return functions
 
     def _extract_functions_from_die(self, die: DIE, functions: List[FunctionInfo]):
@@ -280,7 +434,7 @@ class DWARFParser:
                     if decl_file and decl_line:
                         # Resolve file index to file path
                         cu = die.cu
-                        line_program = self.dwarf_info.line_program_for_CU(cu)
+                        line_program = die.dwarfinfo.line_program_for_CU(cu)
                         if line_program:
                             file_entry = line_program['file_entry'][decl_file.value - 1]
                             source_file = file_entry.name.decode('utf-8', errors='ignore')
@@ -550,17 +704,25 @@ class DWARFParser:
         Returns:
             List of Variable objects for global variables
         """
-        global_vars = []
+        if self._global_variables is None:
+            with self._lock:
+                global_vars = []
+                for cu in self.dwarf_info.iter_CUs():
+                    global_vars.extend(self._get_cu_global_variables(cu))
+                self._global_variables = global_vars
 
-        for cu in self.dwarf_info.iter_CUs():
-            top_die = cu.get_top_DIE()
+        return self._global_variables
 
-            # Look for global variables at top level
-            for child in top_die.iter_children():
-                if child.tag == 'DW_TAG_variable':
-                    var = self._extract_variable_from_die(child, is_parameter=False)
-                    if var:
-                        global_vars.append(var)
+    def _get_cu_global_variables(self, cu) -> List[Variable]:
+        global_vars = []
+        top_die = cu.get_top_DIE()
+
+        # Look for global variables at top level
+        for child in top_die.iter_children():
+            if child.tag == 'DW_TAG_variable':
+                var = self._extract_variable_from_die(child, is_parameter=False)
+                if var:
+                    global_vars.append(var)
 
         return global_vars
 
@@ -574,18 +736,168 @@ class DWARFParser:
         Returns:
             FunctionInfo if found, None otherwise
         """
-        functions = self.get_functions()
+        if not self._has_full_index():
+            cu_index = self._get_cu_index_for_address(address)
+            if cu_index is not None or self._get_aranges() is not None:
+                return cu_index.function_index.lookup(address) if cu_index else None
+
+        if self._function_index is None:
+            self._function_index = FunctionIndex(self.get_functions())
+        return self._function_index.lookup(address)
+
+    # ==================== LAZY PER-CU LOADING ====================
+
+    def prefetch(self):
+        """Build the full index on a background thread (no-op if already built or running)"""
+        if self._line_table is not None or (self._prefetch_thread and self._prefetch_thread.is_alive()):
+            return
 
-        for func in functions:
-            if func.start_address <= address < func.end_address:
-                return func
+        def run():
+            try:
+                self._ensure_index()
+            except Exception as e:
+                print(f"Warning: DWARF prefetch failed: {e}")
+
+        self._prefetch_thread = threading.Thread(target=run, daemon=True)
+        self._prefetch_thread.start()
+
+    def _has_full_index(self) -> bool:
+        """True once the full index is in memory; loads the on-disk cache on first call"""
+        if self._line_table is not None:
+            return True
+        if not self._index_cache_checked:
+            with self._lock:
+                if self._line_table is None and not self._index_cache_checked:
+                    self._load_index()
+                self._index_cache_checked = True
+        return self._line_table is not None
+
+    def _get_aranges(self):
+        """.debug_aranges table, or None if the ELF has none"""
+        if not self._aranges_loaded:
+            with self._lock:
+                try:
+                    self._aranges = self.dwarf_info.get_aranges()
+                except Exception as e:
+                    print(f"Warning: Could not read .debug_aranges: {e}")
+                    self._aranges = None
+                self._aranges_loaded = True
+        return self._aranges
+
+    def _get_cu_index_for_address(self, address: int) -> Optional[CompilationUnitIndex]:
+        """Parse (or reuse) only the CU whose aranges cover the address"""
+        aranges = self._get_aranges()
+        if aranges is None:
+            return None
+
+        with self._lock:
+            cu_offset = aranges.cu_offset_at_addr(address)
+            if cu_offset is None:
+                return None
 
-        return None
+            cu_index = self._cu_cache.get(cu_offset)
+            if cu_index is not None:
+                self._cu_cache.move_to_end(cu_offset)
+                return cu_index
+
+            cu = self.dwarf_info.get_CU_at(cu_offset)
+            functions: List[FunctionInfo] = []
+            self._extract_functions_from_die(cu.get_top_DIE(), functions)
+            line_programs: Dict[str, List[SourceLine]] = {}
+            self._walk_cu_line_program(cu, line_programs)
+            cu_index = CompilationUnitIndex(functions, line_programs, self._get_cu_global_variables(cu))
+
+            self._cu_cache[cu_offset] = cu_index
+            while len(self._cu_cache) > self.MAX_CACHED_CUS:
+                self._cu_cache.popitem(last=False)
+            return cu_index
+
+    # ==================== INDEX CACHE ====================
+
+    def _get_index_path(self) -> str:
+        return f"{self.elf_path}{DWARF_INDEX_SUFFIX}"
+
+    def _get_elf_hash(self) -> str:
+        if self._elf_hash is None:
+            hasher = hashlib.sha256()
+            with open(self.elf_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(block)
+            self._elf_hash = hasher.hexdigest()
+        return self._elf_hash
+
+    def _ensure_index(self):
+        """Line table and functions, from the cache or by walking the DWARF info once"""
+        if self._line_table is not None:
+            return
+
+        with self._index_lock:
+            if self._line_table is not None or self._load_index():
+                return
+
+            # Walk on a private stream so per-CU lookups keep using the shared one meanwhile
+            with open(self.elf_path, 'rb') as stream:
+                dwarf_info = ELFFile(stream).get_dwarf_info()
+                line_programs = self._walk_line_programs(dwarf_info)
+                functions = self._walk_functions(dwarf_info)
+
+            with self._lock:
+                self._function_cache = functions
+                self._line_program_cache = line_programs
+                self._line_table = LineTable.from_line_programs(line_programs)
+                self._cu_cache.clear()
+            self._save_index()
+
+    def _load_index(self) -> bool:
+        """Load the line table and functions cached for this exact ELF; False if there is none"""
+        index_path = self._get_index_path()
+        if not os.path.exists(index_path):
+            return False
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") != DWARF_INDEX_VERSION or index.get("elf_hash") != self._get_elf_hash():
+                return False
+
+            # Functions first: a set _line_table is what marks the index as complete
+            self._function_cache = [
+                FunctionInfo(name, start, end, source_file, line_number,
+                             [Variable(*fields) for fields in parameters],
+                             [Variable(*fields) for fields in local_variables])
+                for name, start, end, source_file, line_number, parameters, local_variables in index["functions"]
+            ]
+            self._line_table = LineTable.from_dict(index["line_table"])
+            return True
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable DWARF index: {e}")
+            return False
+
+    def _save_index(self):
+        """Cache the line table and functions for the next time this ELF is opened"""
+        index = {
+            "version": DWARF_INDEX_VERSION,
+            "elf_hash": self._get_elf_hash(),
+            "line_table": self._line_table.to_dict(),
+            "functions": [
+                [func.name, func.start_address, func.end_address, func.source_file, func.line_number,
+                 [astuple(var) for var in func.parameters], [astuple(var) for var in func.local_variables]]
+                for func in self._function_cache
+            ],
+        }
+        index_path = self._get_index_path()
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(index, separators=(',', ':')))
+            os.replace(temp_path, index_path)
+        except Exception as e:
+            print(f"Warning: Could not write DWARF index: {e}")
 
     def close(self):
-        """Close ELF file handle"""
-        if self.elf_file and hasattr(self.elf_file, 'stream'):
-            self.elf_file.stream.close()
+        """Close ELF file handle (a running prefetch reads its own stream and closes that itself)"""
+        with self._lock:
+            if self.elf_file and hasattr(self.elf_file, 'stream'):
+                self.elf_file.stream.close()
 
     def __enter__(self):
         return self
@@ -5,9 +5,10 @@ Manages emulator scanning and connections across the entire application
 
 import threading
 from typing import Optional, List, Callable, Dict
+import sys
 from services.emulator_service import EmulatorService, EMULATOR_CONFIGS
+from services.memory_backend_service import get_memory_backend
 from functions.verbose_print import verbose_print
-import ctypes
 import psutil
 
 
@@ -16,18 +17,15 @@ class EmulatorConnection:
     def __init__(self):
         self.emulator_name: Optional[str] = None
         self.main_ram: Optional[int] = None
-        self.handle: Optional[int] = None
-        self.kernel32 = None
+        self.handle = None
+        self.backend = None  # MemoryBackend the handle belongs to
         self.emu_info = None
         self.is_valid = False
 
     def reset(self):
         """Reset connection state"""
-        if self.handle and self.kernel32:
-            try:
-                self.kernel32.CloseHandle(self.handle)
-            except:
-                pass
+        if self.handle and self.backend:
+            self.backend.close_process(self.handle)
         self.emulator_name = None
         self.main_ram = None
         self.handle = None
@@ -36,20 +34,14 @@ class EmulatorConnection:
 
     def validate(self) -> bool:
         """Check if connection is still valid"""
-        if not self.handle or not self.kernel32:
+        if not self.handle or not self.backend:
             return False
 
-        exit_code = ctypes.c_ulong()
-        if self.kernel32.GetExitCodeProcess(self.handle, ctypes.byref(exit_code)):
-            STILL_ACTIVE = 259
-            if exit_code.value == STILL_ACTIVE:
-                return True
+        if self.backend.is_process_alive(self.handle):
+            return True
 
         # Handle is no longer valid
-        try:
-            self.kernel32.CloseHandle(self.handle)
-        except:
-            pass
+        self.backend.close_process(self.handle)
         self.handle = None
         self.is_valid = False
         return False
@@ -157,9 +149,10 @@ class EmulatorConnectionManager:
 
         return available
 
-    def get_or_establish_connection(self, emulator_name: str) -> tuple[Optional[int], Optional[int], Optional[int]]:
+    def get_or_establish_connection(self, emulator_name: str) -> tuple:
         """
-        Get or establish emulator connection. Returns (handle, main_ram, kernel32).
+        Get or establish emulator connection. Returns (handle, main_ram, backend),
+        where backend is the MemoryBackend that handle belongs to.
         Caches connection for instant reuse and notifies listeners.
         """
         if not self.current_project_data:
@@ -172,7 +165,7 @@ class EmulatorConnectionManager:
             # Reusing cached connection
             return (self.connection.handle,
                     self.connection.main_ram,
-                    self.connection.kernel32)
+                    self.connection.backend)
 
         # Need to establish new connection
         if emulator_name not in EMULATOR_CONFIGS:
@@ -181,15 +174,7 @@ class EmulatorConnectionManager:
         emu_info = EMULATOR_CONFIGS[emulator_name]
         emu_service = EmulatorService(self.current_project_data)
 
-        # Setup kernel32
-        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-
-        # Get process handle
-        PROCESS_VM_OPERATION = 0x8
-        PROCESS_VM_READ = 0x10
-        PROCESS_VM_WRITE = 0x20
-        PROCESS_QUERY_INFORMATION = 0x0400
-        PROCESS_ACCESS = PROCESS_VM_OPERATION | PROCESS_VM_READ | PROCESS_VM_WRITE | PROCESS_QUERY_INFORMATION
+        backend = get_memory_backend()
 
         # Try to use cached PID first
         pid = None
@@ -213,13 +198,17 @@ class EmulatorConnectionManager:
             self.cached_pids[emulator_name] = pid
             verbose_print(f"[EmulatorManager] Cached new PID {pid} for {emulator_name}")
 
-        handle = kernel32.OpenProcess(PROCESS_ACCESS, False, pid)
+        handle = backend.open_process(pid)
         if not handle:
             return (None, None, None)
 
         # Get main RAM address
         main_ram = None
-        if emu_info.name == "Dolphin":
+        if sys.platform != "win32":
+            # The Windows lookups below walk kernel32 memory regions; other
+            # platforms find the guest RAM mapping through the backend
+            main_ram = backend.find_emulator_ram(pid, emu_info.name)
+        elif emu_info.name == "Dolphin":
             main_ram = emu_service._get_dolphin_base_address()
         elif emu_info.name == "PCSX2":
             from services.pcsx2_service import set_ee_base_address_ctypes
@@ -231,21 +220,21 @@ class EmulatorConnectionManager:
             main_ram = emu_service._get_main_ram_address(handle, emu_info)
 
         if main_ram is None or main_ram == 0:
-            kernel32.CloseHandle(handle)
+            backend.close_process(handle)
             return (None, None, None)
 
         # Cache the connection
         self.connection.emulator_name = emulator_name
         self.connection.main_ram = main_ram
         self.connection.handle = handle
-        self.connection.kernel32 = kernel32
+        self.connection.backend = backend
         self.connection.emu_info = emu_info
         self.connection.is_valid = True
 
         # Notify listeners of successful connection
         self._notify_connection_changed(True, emulator_name)
 
-        return (handle, main_ram, kernel32)
+        return (handle, main_ram, backend)
 
     def get_current_connection(self) -> Optional[EmulatorConnection]:
         """Get the current connection if valid, otherwise None"""
@@ -1,3 +1,4 @@
+import sys
 import ctypes
 import ctypes.wintypes
 import psutil
@@ -7,11 +8,12 @@ import requests
 from typing import List, Tuple, Optional, Dict, Any
 from classes.project_data.project_data import ProjectData
 from services.pcsx2_service import set_ee_base_address_ctypes
+from services.patch_plan_service import PatchPlanService, changed_spans, merge_spans
 from services.duckstation_service import *
-from path_helper import get_application_directory
 
 # Import consolidated memory operations
 from services.memory_utils import read_process_memory, write_process_memory
+from services.memory_backend_service import get_memory_backend
 
 # Windows API constants
 PROCESS_ALL_ACCESS = 0x1F0FFF
@@ -27,8 +29,16 @@ HMODULE = ctypes.wintypes.HMODULE
 LPSTR = ctypes.c_char_p
 MAX_PATH = 260
 
-kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-psapi = ctypes.WinDLL('psapi', use_last_error=True)
+# Unchanged bytes between two changed spans are written anyway when the gap is
+# shorter than this, since every span costs a separate memory write / PINE call
+INJECTION_MERGE_GAP = 64
+
+if sys.platform == "win32":
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    psapi = ctypes.WinDLL('psapi', use_last_error=True)
+else:
+    kernel32 = None
+    psapi = None
 
 
 class EmulatorInfo:
@@ -136,9 +146,15 @@ class InjectionResult:
 
 class EmulatorService:
     """Handles injection of compiled code into running emulators"""
+
+    # (emulator name, target name) -> bytes injected last time this session
+    _last_injected: Dict[Tuple[str, str], bytes] = {}
     
-    def __init__(self, project_data: ProjectData):
+    def __init__(self, project_data: ProjectData, minimal_writes: bool = True):
         self.project_data = project_data
+        # Only write bytes that differ from the vanilla game (or from the last injection)
+        self.minimal_writes = minimal_writes
+        self._patch_plan_service = PatchPlanService(project_data)
         
     def get_available_emulators(self) -> List[str]:
         """Get list of currently running emulators that match the project's platform"""
@@ -211,7 +227,7 @@ class EmulatorService:
         manager.set_project_data(self.project_data)
 
         # Get or establish connection (uses cached PID if available)
-        handle, main_ram, kernel32 = manager.get_or_establish_connection(emulator_name)
+        handle, main_ram, _backend = manager.get_or_establish_connection(emulator_name)
 
         if not handle or not main_ram:
             return InjectionResult(False,
@@ -270,20 +286,17 @@ class EmulatorService:
                 if pid is None:
                     return InjectionResult(False, "Could not find PCSX2 process")
 
-                # Use specific access rights for memory operations
-                PROCESS_ACCESS = (PROCESS_VM_OPERATION | PROCESS_VM_READ |
-                                 PROCESS_VM_WRITE | PROCESS_QUERY_INFORMATION)
-                handle = kernel32.OpenProcess(PROCESS_ACCESS, False, pid)
+                backend = get_memory_backend()
+                handle = backend.open_process(pid)
                 if not handle:
-                    error_code = ctypes.windll.kernel32.GetLastError()
                     return InjectionResult(False,
-                        f"Could not open PCSX2 process (error {error_code}). "
+                        "Could not open PCSX2 process. "
                         "Try running as Administrator.")
 
                 try:
                     return self._perform_injection(handle, main_ram, emu_info.name)
                 finally:
-                    kernel32.CloseHandle(handle)
+                    backend.close_process(handle)
                     
             if emu_info.name == "Duckstation":
                 main_ram = None
@@ -302,20 +315,17 @@ class EmulatorService:
                 if pid is None:
                     return InjectionResult(False, "Could not find Duckstation process")
                 
-                # Use specific access rights for memory operations
-                PROCESS_ACCESS = (PROCESS_VM_OPERATION | PROCESS_VM_READ | 
-                                 PROCESS_VM_WRITE | PROCESS_QUERY_INFORMATION)
-                handle = kernel32.OpenProcess(PROCESS_ACCESS, False, pid)
+                backend = get_memory_backend()
+                handle = backend.open_process(pid)
                 if not handle:
-                    error_code = ctypes.windll.kernel32.GetLastError()
                     return InjectionResult(False, 
-                        f"Could not open Duckstation process (error {error_code}). "
+                        "Could not open Duckstation process. "
                         "Try running as Administrator.")
                 
                 try:
                     return self._perform_injection(handle, main_ram, emu_info.name)
                 finally:
-                    kernel32.CloseHandle(handle)
+                    backend.close_process(handle)
             
             # Special handling for Dolphin - use memory engine
             elif emu_info.name == "Dolphin":
@@ -337,7 +347,8 @@ class EmulatorService:
                 if pid is None:
                     return InjectionResult(False, f"Could not find {emu_info.name} process")
                 
-                handle = kernel32.OpenProcess(PROCESS_ALL_ACCESS, False, pid)
+                backend = get_memory_backend()
+                handle = backend.open_process(pid)
                 if not handle:
                     return InjectionResult(False, f"Could not open {emu_info.name} process")
                 
@@ -351,7 +362,7 @@ class EmulatorService:
 
                     return result
                 finally:
-                    kernel32.CloseHandle(handle)
+                    backend.close_process(handle)
             
             else:
                 # Standard process for other emulators
@@ -361,7 +372,8 @@ class EmulatorService:
                     return InjectionResult(False, f"Could not find {emu_info.name} process")
                 
                 # Open process handle
-                handle = kernel32.OpenProcess(PROCESS_ALL_ACCESS, False, pid)
+                backend = get_memory_backend()
+                handle = backend.open_process(pid)
                 if not handle:
                     return InjectionResult(False, f"Could not open {emu_info.name} process")
                 
@@ -377,7 +389,7 @@ class EmulatorService:
                     return self._perform_injection(handle, main_ram, emu_info.name)
                     
                 finally:
-                    kernel32.CloseHandle(handle)
+                    backend.close_process(handle)
         
         except Exception as e:
             import traceback
@@ -414,10 +426,12 @@ class EmulatorService:
             offset = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
             target_address = main_ram + offset
             
-            success = self._write_memory(
-                handle, 
-                target_address, 
-                bin_data[codecave.GetName()]
+            success = self._write_target(
+                lambda address, data: self._write_memory(handle, address, data),
+                target_address,
+                codecave,
+                bin_data[codecave.GetName()],
+                emulator_name
             )
             
             if success:
@@ -441,10 +455,12 @@ class EmulatorService:
             offset = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
             target_address = main_ram + offset
             
-            success = self._write_memory(
-                handle,
+            success = self._write_target(
+                lambda address, data: self._write_memory(handle, address, data),
                 target_address,
-                bin_data[hook.GetName()]
+                hook,
+                bin_data[hook.GetName()],
+                emulator_name
             )
             
             if success:
@@ -468,10 +484,12 @@ class EmulatorService:
             offset = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
             target_address = main_ram + offset
             
-            success = self._write_memory(
-                handle,
+            success = self._write_target(
+                lambda address, data: self._write_memory(handle, address, data),
                 target_address,
-                bin_data[patch.GetName()]
+                patch,
+                bin_data[patch.GetName()],
+                emulator_name
             )
             
             if success:
@@ -493,269 +511,104 @@ class EmulatorService:
         This refreshes the recompiler cache for full-speed execution.
         Falls back to standard memory write if PINE fails.
 
+        Every codecave, hook and patch is written in one PINE batch.
+
         Args:
             verbose: If True, print detailed debug information
         """
         try:
             print("\n====== Starting PINE injection attempt ======")
 
-            # Import PINE wrapper
-            import sys
-            pine_path = os.path.join(get_application_directory(), 'prereq', 'pine')
-
-            if verbose:
-                print(f"[PINE DEBUG] Calculated PINE path: {pine_path}")
-                print(f"[PINE DEBUG] PINE path exists: {os.path.exists(pine_path)}")
-
-            if pine_path not in sys.path:
-                sys.path.insert(0, pine_path)
-                if verbose:
-                    print(f"[PINE DEBUG] Added PINE path to sys.path")
+            from services.pine_client_service import get_pine_client, pine_socket_address
+            client = get_pine_client()
 
             if verbose:
-                print(f"[PINE DEBUG] Attempting to import pcsx2_ipc module...")
+                print(f"[PINE DEBUG] Connecting to PINE slot {client.slot} at {pine_socket_address(client.slot)[1]}...")
 
-            import prereq.pine.pcsx2_ipc as pcsx2_ipc
-
-            if verbose:
-                print(f"[PINE DEBUG] Successfully imported pcsx2_ipc module")
-
-            # Initialize PINE IPC
-            if verbose:
-                print("[PINE DEBUG] Calling pcsx2_ipc.init()...")
-
-            init_result = pcsx2_ipc.init()
-
-            if verbose:
-                print(f"[PINE DEBUG] pcsx2_ipc.init() returned: {init_result}")
-
-            if not init_result:
-                error_code = pcsx2_ipc.get_last_error()
-                error_names = {0: "NoError", 1: "ErrorNotConnected", 2: "ErrorTimeout"}
-                error_name = error_names.get(error_code, f"Unknown({error_code})")
-
-                if verbose:
-                    print(f"[PINE DEBUG] PINE initialization failed with error code: {error_code} ({error_name})")
-
-                print(f"PCSX2 PINE Injection Failed: {error_name}")
+            if not client.is_available():
+                print("PCSX2 PINE Injection Failed: ErrorNotConnected")
                 return None  # Signal fallback
 
             if verbose:
-                print("[PINE DEBUG] PINE initialization successful!")
-
-            try:
-                # Load compiled binaries
-                if verbose:
-                    print("[PINE DEBUG] Loading compiled binaries...")
+                print("[PINE DEBUG] PINE connection successful!")
 
-                bin_data = self._load_compiled_binaries()
-
-                if verbose:
-                    print(f"[PINE DEBUG] Loaded {len(bin_data)} binary files")
-                    print(f"[PINE DEBUG] Binary files loaded: {list(bin_data.keys())}")
-                    for name, data in bin_data.items():
-                        print(f"[PINE DEBUG]   {name}: {len(data)} bytes")
+            bin_data = self._load_compiled_binaries()
 
-                if not bin_data:
-                    if verbose:
-                        print("[PINE DEBUG] No compiled binaries found, shutting down PINE")
-                    pcsx2_ipc.shutdown()
-                    return InjectionResult(False, "No compiled binaries found. Compile project first.")
+            if verbose:
+                print(f"[PINE DEBUG] Loaded {len(bin_data)} binary files")
+                for name, data in bin_data.items():
+                    print(f"[PINE DEBUG]   {name}: {len(data)} bytes")
 
-                injection_count = 0
-                failed_count = 0
+            if not bin_data:
+                return InjectionResult(False, "No compiled binaries found. Compile project first.")
 
-                # Inject codecaves
-                codecaves = self.project_data.GetCurrentBuildVersion().GetEnabledCodeCaves()
+            current_build = self.project_data.GetCurrentBuildVersion()
+            all_targets = [
+                ("codecave", "codecaves", current_build.GetEnabledCodeCaves()),
+                ("hook", "hooks", current_build.GetEnabledHooks()),
+                ("patch", "patches", current_build.GetEnabledBinaryPatches()),
+            ]
 
+            # (kind, target, memory address string, PS2 address, data) in injection order
+            items = []
+            for kind, plural, targets in all_targets:
                 if verbose:
-                    print(f"[PINE DEBUG] Processing {len(codecaves)} codecaves...")
+                    print(f"[PINE DEBUG] Processing {len(targets)} {plural}...")
 
-                for codecave in codecaves:
-                    codecave_name = codecave.GetName()
-
-                    if verbose:
-                        print(f"[PINE DEBUG] Processing codecave: {codecave_name}")
-
-                    if codecave_name not in bin_data:
+                for target in targets:
+                    name = target.GetName()
+                    if name not in bin_data:
                         if verbose:
-                            print(f"[PINE DEBUG]   Skipping - no binary found for '{codecave_name}'")
+                            print(f"[PINE DEBUG]   Skipping - no binary found for '{name}'")
                         continue
 
-                    memory_addr = codecave.GetMemoryAddress()
+                    memory_addr = target.GetMemoryAddress()
                     if not memory_addr:
                         if verbose:
-                            print(f"[PINE DEBUG]   Skipping - no memory address set for '{codecave_name}'")
+                            print(f"[PINE DEBUG]   Skipping - no memory address set for '{name}'")
                         continue
 
                     # Convert "80123456" to PS2 address (remove 0x80 prefix)
                     ps2_address = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
-                    data_size = len(bin_data[codecave_name])
-
-                    if verbose:
-                        print(f"[PINE DEBUG]   Memory address: {memory_addr} -> PS2 address: 0x{ps2_address:X}")
-                        print(f"[PINE DEBUG]   Data size: {data_size} bytes")
-                        print(f"[PINE DEBUG]   Calling pcsx2_ipc.write_bytes(0x{ps2_address:X}, {data_size} bytes)...")
-
-                    # Write via PINE
-                    success = pcsx2_ipc.write_bytes(ps2_address, bin_data[codecave_name])
-
-                    if verbose:
-                        print(f"[PINE DEBUG]   write_bytes returned: {success}")
-
-                    if success:
-                        print(f"Injecting codecave '{codecave_name}' at 0x{memory_addr} size {data_size} bytes")
-                        injection_count += 1
-                    else:
-                        error_code = pcsx2_ipc.get_last_error()
-                        if verbose:
-                            print(f"[PINE DEBUG]   Injection failed! Error code: {error_code}")
-                        print(f"Failed to inject codecave '{codecave_name}'")
-                        failed_count += 1
-
-                # Inject hooks
-                hooks = self.project_data.GetCurrentBuildVersion().GetEnabledHooks()
-
-                if verbose:
-                    print(f"[PINE DEBUG] Processing {len(hooks)} hooks...")
-
-                for hook in hooks:
-                    hook_name = hook.GetName()
-
-                    if verbose:
-                        print(f"[PINE DEBUG] Processing hook: {hook_name}")
-
-                    if hook_name not in bin_data:
-                        if verbose:
-                            print(f"[PINE DEBUG]   Skipping - no binary found for '{hook_name}'")
-                        continue
-
-                    memory_addr = hook.GetMemoryAddress()
-                    if not memory_addr:
-                        if verbose:
-                            print(f"[PINE DEBUG]   Skipping - no memory address set for '{hook_name}'")
-                        continue
-
-                    ps2_address = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
-                    data_size = len(bin_data[hook_name])
-
-                    if verbose:
-                        print(f"[PINE DEBUG]   Memory address: {memory_addr} -> PS2 address: 0x{ps2_address:X}")
-                        print(f"[PINE DEBUG]   Data size: {data_size} bytes")
-                        print(f"[PINE DEBUG]   Calling pcsx2_ipc.write_bytes(0x{ps2_address:X}, {data_size} bytes)...")
-
-                    success = pcsx2_ipc.write_bytes(ps2_address, bin_data[hook_name])
-
-                    if verbose:
-                        print(f"[PINE DEBUG]   write_bytes returned: {success}")
-
-                    if success:
-                        print(f"Injecting hook '{hook_name}' at 0x{memory_addr} size {data_size} bytes")
-                        injection_count += 1
-                    else:
-                        error_code = pcsx2_ipc.get_last_error()
-                        if verbose:
-                            print(f"[PINE DEBUG]   Injection failed! Error code: {error_code}")
-                        print(f"Failed to inject hook '{hook_name}'")
-                        failed_count += 1
-
-                # Inject binary patches
-                patches = self.project_data.GetCurrentBuildVersion().GetEnabledBinaryPatches()
-
-                if verbose:
-                    print(f"[PINE DEBUG] Processing {len(patches)} patches...")
-
-                for patch in patches:
-                    patch_name = patch.GetName()
-
-                    if verbose:
-                        print(f"[PINE DEBUG] Processing patch: {patch_name}")
-
-                    if patch_name not in bin_data:
-                        if verbose:
-                            print(f"[PINE DEBUG]   Skipping - no binary found for '{patch_name}'")
-                        continue
-
-                    memory_addr = patch.GetMemoryAddress()
-                    if not memory_addr:
-                        if verbose:
-                            print(f"[PINE DEBUG]   Skipping - no memory address set for '{patch_name}'")
-                        continue
-
-                    ps2_address = int(memory_addr.removeprefix("0x").removeprefix("80"), 16)
-                    data_size = len(bin_data[patch_name])
-
-                    if verbose:
-                        print(f"[PINE DEBUG]   Memory address: {memory_addr} -> PS2 address: 0x{ps2_address:X}")
-                        print(f"[PINE DEBUG]   Data size: {data_size} bytes")
-                        print(f"[PINE DEBUG]   Calling pcsx2_ipc.write_bytes(0x{ps2_address:X}, {data_size} bytes)...")
-
-                    success = pcsx2_ipc.write_bytes(ps2_address, bin_data[patch_name])
+                    items.append((kind, target, memory_addr, ps2_address, bin_data[name]))
 
                     if verbose:
-                        print(f"[PINE DEBUG]   write_bytes returned: {success}")
-
-                    if success:
-                        print(f"Injecting patch '{patch_name}' at 0x{memory_addr} size {data_size} bytes")
-                        injection_count += 1
-                    else:
-                        error_code = pcsx2_ipc.get_last_error()
-                        if verbose:
-                            print(f"[PINE DEBUG]   Injection failed! Error code: {error_code}")
-                        print(f"Failed to inject patch '{patch_name}'")
-                        failed_count += 1
-
-                # Cleanup
-                if verbose:
-                    print(f"[PINE DEBUG] Injection complete. Success: {injection_count}, Failed: {failed_count}")
-                    print("[PINE DEBUG] Calling pcsx2_ipc.shutdown()...")
-
-                pcsx2_ipc.shutdown()
-
-                if verbose:
-                    print("[PINE DEBUG] PINE shutdown complete")
+                        print(f"[PINE DEBUG]   {name}: {memory_addr} -> PS2 address 0x{ps2_address:X}, "
+                              f"{len(bin_data[name])} bytes")
 
-                if failed_count > 0:
-                    if verbose:
-                        print(f"[PINE DEBUG] Returning failure result (had {failed_count} failures)")
-                    print(f"\nPCSX2 PINE Injection Failed: {failed_count} item(s) failed to inject")
-                    return InjectionResult(False, f"PINE injection completed with {failed_count} failure(s)")
-
-                if verbose:
-                    print(f"[PINE DEBUG] Returning success result ({injection_count} items injected)")
+            messages_before = client.messages_sent
+            results = self._write_targets_batched(
+                client, [(ps2_address, target, data) for _, target, _, ps2_address, data in items], "PCSX2"
+            )
 
-                print(f"\nPCSX2 PINE Injection Successful! {injection_count} item(s) injected")
-                return InjectionResult(True, f"Successfully injected {injection_count} item(s) via PINE protocol!")
+            if verbose:
+                print(f"[PINE DEBUG] Batch sent in {client.messages_sent - messages_before} PINE message(s)")
+
+            injection_count = 0
+            failed_count = 0
+            for (kind, target, memory_addr, _, data), success in zip(items, results):
+                if success:
+                    print(f"Injecting {kind} '{target.GetName()}' at 0x{memory_addr} size {len(data)} bytes")
+                    injection_count += 1
+                else:
+                    print(f"Failed to inject {kind} '{target.GetName()}'")
+                    failed_count += 1
 
-            except Exception as e:
-                if verbose:
-                    print(f"[PINE DEBUG] Exception during PINE injection: {e}")
-                    print(f"[PINE DEBUG] Exception type: {type(e).__name__}")
-                    import traceback
-                    print(f"[PINE DEBUG] Traceback:\n{traceback.format_exc()}")
-                    print("[PINE DEBUG] Shutting down PINE after exception...")
-
-                pcsx2_ipc.shutdown()
-                print(f"PCSX2 PINE Injection Failed: {e}")
-                return None  # Signal fallback
+            if failed_count > 0:
+                print(f"\nPCSX2 PINE Injection Failed: {failed_count} item(s) failed to inject")
+                return InjectionResult(False, f"PINE injection completed with {failed_count} failure(s)")
 
-        except ImportError as e:
-            if verbose:
-                print(f"[PINE DEBUG] ImportError while importing PINE module: {e}")
-                print(f"[PINE DEBUG] Exception type: {type(e).__name__}")
-                import traceback
-                print(f"[PINE DEBUG] Traceback:\n{traceback.format_exc()}")
+            print(f"\nPCSX2 PINE Injection Successful! {injection_count} item(s) injected")
+            return InjectionResult(True, f"Successfully injected {injection_count} item(s) via PINE protocol!")
 
-            print(f"PCSX2 PINE Injection Failed: PINE module not available ({e})")
-            return None  # Signal fallback
         except Exception as e:
             if verbose:
-                print(f"[PINE DEBUG] Exception during PINE initialization: {e}")
+                print(f"[PINE DEBUG] Exception during PINE injection: {e}")
                 print(f"[PINE DEBUG] Exception type: {type(e).__name__}")
                 import traceback
                 print(f"[PINE DEBUG] Traceback:\n{traceback.format_exc()}")
 
-            print(f"PCSX2 PINE Injection Failed: Initialization error ({e})")
+            print(f"PCSX2 PINE Injection Failed: {e}")
             return None  # Signal fallback
 
 
@@ -945,6 +798,69 @@ class EmulatorService:
         """Write data to process memory - delegates to consolidated memory_utils"""
         return write_process_memory(handle, address, data)
     
+    def _get_injection_spans(self, target, data: bytes, emulator_name: str) -> List[Tuple[int, int]]:
+        """
+        (offset, length) spans of a target's data that need writing: bytes that
+        differ from the vanilla game, plus bytes an earlier injection this session
+        changed (they may now have to go back to their vanilla value)
+        """
+        if not self.minimal_writes:
+            return [(0, len(data))] if data else []
+
+        vanilla = self._patch_plan_service.read_vanilla_bytes(target, len(data))
+        spans = changed_spans(data, vanilla)
+
+        previous = self._last_injected.get((emulator_name, target.GetName()))
+        if previous is not None and vanilla is not None:
+            spans += changed_spans(previous[:len(data)], vanilla)
+
+        return merge_spans(spans, INJECTION_MERGE_GAP, limit=len(data))
+
+    def _write_target(self, write, address: int, target, data: bytes, emulator_name: str) -> bool:
+        """
+        Write a target's data at address through write(address, bytes) -> bool,
+        skipping spans that already hold the right bytes
+        """
+        spans = self._get_injection_spans(target, data, emulator_name)
+        for offset, length in spans:
+            if not write(address + offset, data[offset:offset + length]):
+                return False
+
+        self._record_injected(target, data, spans, emulator_name)
+        return True
+
+    def _write_targets_batched(self, client, writes: List[Tuple[int, object, bytes]], emulator_name: str) -> List[bool]:
+        """
+        _write_target for many (address, target, data) at once through a PineClient:
+        every span of every target goes into one batch, so the whole injection
+        takes a few IPC messages instead of one request per section
+        """
+        batch = client.batch()
+        queued = []
+        for address, target, data in writes:
+            spans = self._get_injection_spans(target, data, emulator_name)
+            futures = [batch.write(address + offset, data[offset:offset + length]) for offset, length in spans]
+            queued.append((address, target, data, spans, futures))
+        batch.submit()
+
+        results = []
+        for address, target, data, spans, futures in queued:
+            success = all(client.wait(future) for future in futures)
+            if not success and len(writes) > 1:
+                # A failed command fails its whole message; retry alone so one
+                # bad target doesn't take the others sharing its message down
+                success = self._write_target(client.write_bytes, address, target, data, emulator_name)
+            elif success:
+                self._record_injected(target, data, spans, emulator_name)
+            results.append(success)
+        return results
+
+    def _record_injected(self, target, data: bytes, spans: List[Tuple[int, int]], emulator_name: str):
+        self._last_injected[(emulator_name, target.GetName())] = data
+        written = sum(length for _, length in spans)
+        if written < len(data):
+            print(f"   Wrote {written} of {len(data)} bytes for '{target.GetName()}' (rest matches the original game)")
+
     def _load_compiled_binaries(self) -> Dict[str, bytes]:
         """Load all compiled .bin files from output directory"""
         project_folder = self.project_data.GetProjectFolder()
@@ -988,6 +904,10 @@ class EmulatorService:
         from functions.PE import find_export_rva
         from functions.verbose_print import verbose_print
 
+        # Only Windows builds of Dolphin export the symbol (PE executable)
+        if sys.platform != "win32":
+            return
+
         try:
             # Get the Dolphin executable path using psutil
             proc = psutil.Process(pid)
@@ -4,19 +4,39 @@ Scans executables for Ghidra OS library function patterns and adds them to symbo
 """
 
 import os
+import mmap
+import struct
+import hashlib
 import xml.etree.ElementTree as ET
 from typing import List, Dict, Optional, Tuple
+from services.multi_pattern_scanner import MaskedPattern, MultiPatternScanner, ScanStats, INSTRUCTION_ALIGNMENT
+from services.scan_index_service import ScanIndexService, CATEGORY_PATTERN_HITS
+from functions.verbose_print import verbose_print
+
+# Compiled pattern database (written next to each pattern XML)
+#   header:  magic, format version, SHA-256 of the source XML, pattern count
+#   records: label length, pattern length, label (UTF-8), pattern bytes, mask bytes
+PATTERN_DB_EXTENSION = ".patterndb"
+PATTERN_DB_MAGIC = b"GPDB"
+PATTERN_DB_VERSION = 1
+PATTERN_DB_HEADER = struct.Struct("<4sH32sI")
+PATTERN_DB_RECORD = struct.Struct("<HH")
 
 
 class GhidraPattern:
     """Represents a single Ghidra pattern"""
 
-    def __init__(self, label: str, pattern_bytes: bytes):
+    def __init__(self, label: str, pattern_bytes: bytes, mask: Optional[bytes] = None):
         self.label = label
         self.pattern_bytes = pattern_bytes
+        # Per-byte mask: 0xFF = must match, 0x00 = wildcard, other = only those bits must match
+        self.mask = mask if mask is not None else b'\xff' * len(pattern_bytes)
+
+    def to_masked_pattern(self) -> MaskedPattern:
+        return MaskedPattern(self.label, self.pattern_bytes, self.mask)
 
     def __repr__(self):
-        return f"GhidraPattern(label={self.label}, bytes={self.pattern_bytes.hex()})"
+        return f"GhidraPattern(label={self.label}, bytes={self.pattern_bytes.hex()}, mask={self.mask.hex()})"
 
 
 class GhidraPatternService:
@@ -29,16 +49,23 @@ class GhidraPatternService:
         "possiblefuncstart",  # Too generic
     ]
 
+    # Patterns already loaded this session, keyed by XML path -> (XML hash, patterns)
+    _loaded_patterns: Dict[str, Tuple[bytes, List[GhidraPattern]]] = {}
+
     def __init__(self):
         self.patterns_dir = os.path.join("prereq", "ghidra-patterns")
 
-    def scan_executable(self, platform: str, executable_path: str) -> List[Tuple[str, int]]:
+        # Timing/hit statistics from the most recent scan_executable call
+        self.last_scan_stats: Optional[ScanStats] = None
+
+    def scan_executable(self, platform: str, executable_path: str, scan_index=None) -> List[Tuple[str, int]]:
         """
         Scan an executable for OS library function patterns.
 
         Args:
             platform: Platform name ("PS1" or "PS2")
             executable_path: Path to the executable to scan
+            scan_index: Optional ScanIndexService to reuse hits for an unchanged executable
 
         Returns:
             List of tuples (function_name, address)
@@ -50,35 +77,46 @@ class GhidraPatternService:
             print(f"No patterns loaded for platform {platform}")
             return []
 
-        # Read executable file
-        try:
-            with open(executable_path, 'rb') as f:
-                executable_data = f.read()
-        except Exception as e:
-            print(f"Error reading executable {executable_path}: {e}")
-            return []
+        # Skip nothing-burger patterns
+        patterns = [
+            pattern for pattern in patterns
+            if not any(skip in pattern.label for skip in self.SKIP_PATTERNS)
+        ]
+        masked_patterns = [pattern.to_masked_pattern() for pattern in patterns]
+
+        index_params = f"ghidra:{platform}:{ScanIndexService.make_pattern_key(masked_patterns)}"
+        hits = None
+        if scan_index is not None:
+            hits = scan_index.get(executable_path, CATEGORY_PATTERN_HITS, index_params)
+
+        if hits is None:
+            # Read executable file
+            try:
+                with open(executable_path, 'rb') as f:
+                    executable_data = f.read()
+            except Exception as e:
+                print(f"Error reading executable {executable_path}: {e}")
+                return []
+
+            # Scan for every pattern in a single pass (functions start word-aligned)
+            scanner = MultiPatternScanner(masked_patterns, alignment=INSTRUCTION_ALIGNMENT)
+            scan_result = scanner.scan(executable_data, first_only=True)
+            self.last_scan_stats = scan_result.stats
+            verbose_print(f"Pattern scan: {scan_result.stats}")
+
+            hits = [
+                [pattern.label, offset]
+                for index, pattern in enumerate(patterns)
+                for offset in scan_result.matches.get(index, [])
+            ]
+            if scan_index is not None:
+                scan_index.put(executable_path, CATEGORY_PATTERN_HITS, index_params, hits)
 
-        # Scan for patterns
         found_symbols = []
-
-        for pattern in patterns:
-            # Skip nothing-burger patterns
-            if any(skip in pattern.label for skip in self.SKIP_PATTERNS):
-                continue
-
-            # Find all occurrences of this pattern
-            offset = 0
-            while True:
-                idx = executable_data.find(pattern.pattern_bytes, offset)
-                if idx == -1:
-                    break
-
-                # Calculate address (platform-specific base address + offset)
-                address = self._calculate_address(platform, idx)
-                found_symbols.append((pattern.label, address))
-
-                # Move past this match to find duplicates
-                offset = idx + 1
+        for label, offset in hits:
+            # Calculate address (platform-specific base address + offset)
+            address = self._calculate_address(platform, offset)
+            found_symbols.append((label, address))
 
         # Remove duplicates (keep first occurrence of each symbol)
         seen_labels = set()
@@ -429,11 +467,83 @@ class GhidraPatternService:
             return []
 
         try:
-            return self._parse_pattern_file(pattern_file_path)
+            return self._load_pattern_database(pattern_file_path)
         except Exception as e:
             print(f"Error parsing pattern file {pattern_file_path}: {e}")
             return []
 
+    # ==================== COMPILED PATTERN DATABASE ====================
+
+    def _load_pattern_database(self, xml_path: str) -> List[GhidraPattern]:
+        """
+        Load the patterns for a Ghidra XML file, using its compiled database.
+        The database is rebuilt whenever the XML's hash no longer matches.
+        """
+        with open(xml_path, 'rb') as f:
+            xml_hash = hashlib.sha256(f.read()).digest()
+
+        cached = self._loaded_patterns.get(xml_path)
+        if cached and cached[0] == xml_hash:
+            return cached[1]
+
+        db_path = os.path.splitext(xml_path)[0] + PATTERN_DB_EXTENSION
+        patterns = self._read_pattern_database(db_path, xml_hash)
+
+        if patterns is None:
+            patterns = self._parse_pattern_file(xml_path)
+            try:
+                self._write_pattern_database(db_path, xml_hash, patterns)
+            except OSError as e:
+                print(f"Could not write pattern database {db_path}: {e}")
+
+        self._loaded_patterns[xml_path] = (xml_hash, patterns)
+        return patterns
+
+    def _read_pattern_database(self, db_path: str, xml_hash: bytes) -> Optional[List[GhidraPattern]]:
+        """Memory-map a compiled pattern database. Returns None if missing, stale or corrupt."""
+        if not os.path.exists(db_path) or os.path.getsize(db_path) < PATTERN_DB_HEADER.size:
+            return None
+
+        try:
+            with open(db_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as db:
+                magic, version, db_xml_hash, count = PATTERN_DB_HEADER.unpack_from(db, 0)
+                if magic != PATTERN_DB_MAGIC or version != PATTERN_DB_VERSION or db_xml_hash != xml_hash:
+                    return None
+
+                patterns = []
+                offset = PATTERN_DB_HEADER.size
+                for _ in range(count):
+                    label_length, pattern_length = PATTERN_DB_RECORD.unpack_from(db, offset)
+                    offset += PATTERN_DB_RECORD.size
+                    label = db[offset:offset + label_length].decode('utf-8')
+                    offset += label_length
+                    pattern_bytes = db[offset:offset + pattern_length]
+                    offset += pattern_length
+                    mask = db[offset:offset + pattern_length]
+                    offset += pattern_length
+                    patterns.append(GhidraPattern(label, pattern_bytes, mask))
+
+                return patterns
+        except (OSError, ValueError, struct.error, UnicodeDecodeError) as e:
+            print(f"Ignoring unreadable pattern database {db_path}: {e}")
+            return None
+
+    def _write_pattern_database(self, db_path: str, xml_hash: bytes, patterns: List[GhidraPattern]):
+        """Write patterns to a compiled pattern database"""
+        chunks = [PATTERN_DB_HEADER.pack(PATTERN_DB_MAGIC, PATTERN_DB_VERSION, xml_hash, len(patterns))]
+        for pattern in patterns:
+            label = pattern.label.encode('utf-8')
+            chunks.append(PATTERN_DB_RECORD.pack(len(label), len(pattern.pattern_bytes)))
+            chunks.append(label)
+            chunks.append(pattern.pattern_bytes)
+            chunks.append(pattern.mask)
+
+        # Write to a temp file first so a partial database is never picked up
+        temp_path = db_path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(b''.join(chunks))
+        os.replace(temp_path, db_path)
+
     def _parse_pattern_file(self, file_path: str) -> List[GhidraPattern]:
         """Parse a Ghidra pattern XML file"""
 
@@ -454,50 +564,63 @@ class GhidraPatternService:
                     # Get pattern data
                     data_elem = pattern_elem.find('data')
                     if data_elem is not None and data_elem.text:
-                        pattern_bytes = self._parse_pattern_data(data_elem.text)
+                        parsed = self._parse_pattern_data(data_elem.text)
 
-                        if pattern_bytes:
-                            patterns.append(GhidraPattern(label, pattern_bytes))
+                        if parsed:
+                            pattern_bytes, mask = parsed
+                            patterns.append(GhidraPattern(label, pattern_bytes, mask))
 
         except Exception as e:
             print(f"Error parsing XML file {file_path}: {e}")
 
         return patterns
 
-    def _parse_pattern_data(self, data_text: str) -> Optional[bytes]:
-        """Parse pattern data string into bytes"""
+    def _parse_pattern_data(self, data_text: str) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Parse Ghidra pattern data into (pattern bytes, mask).
+
+        Tokens are either hex ("0x27bd..e0", '.' = wildcard nibble) or
+        binary ("100111..", '.' = wildcard bit), written in byte order.
+        Returns None if the data is malformed or entirely wildcards.
+        """
 
         try:
             # Remove comments
             if '<!--' in data_text:
                 data_text = data_text.split('<!--')[0]
 
-            # Split by whitespace and parse hex values
-            hex_values = data_text.strip().split()
-
-            byte_list = []
-            for hex_val in hex_values:
-                hex_val = hex_val.strip()
-
-                # Skip wildcards and complex patterns for now
-                if '.' in hex_val or 'x' not in hex_val.lower():
-                    continue
+            # Flatten every token into (value bit, mask bit) pairs
+            value_bits = []
+            mask_bits = []
+            for token in data_text.split():
+                if token.startswith('0x') or token.startswith('0X'):
+                    for nibble in token[2:]:
+                        if nibble == '.':
+                            value_bits.extend('0000')
+                            mask_bits.extend('0000')
+                        else:
+                            value_bits.extend(format(int(nibble, 16), '04b'))
+                            mask_bits.extend('1111')
+                else:
+                    for bit in token:
+                        if bit not in '01.':
+                            return None
+                        value_bits.append('0' if bit == '.' else bit)
+                        mask_bits.append('0' if bit == '.' else '1')
+
+            if not value_bits or len(value_bits) % 8 != 0:
+                return None
 
-                # Parse hex byte (e.g., "0xa0" or "0xA0")
-                if hex_val.startswith('0x') or hex_val.startswith('0X'):
-                    try:
-                        byte_val = int(hex_val, 16)
-                        byte_list.append(byte_val)
-                    except ValueError:
-                        # Skip unparseable values
-                        pass
+            byte_count = len(value_bits) // 8
+            pattern_bytes = int(''.join(value_bits), 2).to_bytes(byte_count, 'big')
+            mask = int(''.join(mask_bits), 2).to_bytes(byte_count, 'big')
 
-            if byte_list:
-                return bytes(byte_list)
-            else:
+            if not any(mask):
                 return None
 
-        except Exception:
+            return pattern_bytes, mask
+
+        except ValueError:
             return None
 
     def _calculate_address(self, platform: str, file_offset: int) -> int:
@@ -4,9 +4,12 @@ import shutil
 from typing import Optional
 from pathlib import Path
 from classes.project_data.project_data import ProjectData
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, Tuple
 from functions.print_wrapper import print_error
 from functions.verbose_print import verbose_print
+from services.patch_plan_service import PatchPlanService
+from services.disc_patcher_service import DiscPatcherService, LAYOUT_GAMECUBE, LAYOUT_ISO9660
+from services.build_profiler_service import BuildProfiler
 
 import xml.etree.ElementTree as ET
 
@@ -64,6 +67,9 @@ class ISOService:
             'dolphintool': os.path.join(self.tool_dir, 'prereq', 'DolphinTool', 'DolphinTool.exe'),
             'xdelta': os.path.join(self.tool_dir, 'prereq', 'xdelta', 'xdelta.exe'),
         }
+
+        # Stage/subprocess timing (disabled unless a caller swaps in an enabled profiler)
+        self.profiler = BuildProfiler()
         
     def _log_progress(self, message: str):
         """Short/normal messages (always printed)."""
@@ -819,7 +825,8 @@ class ISOService:
         try:
             self._log_verbose("\nStarting mkpsxiso...")
             
-            result = subprocess.run(
+            result = self.profiler.run(
+                "mkpsxiso",
                 cmd,
                 shell=False,
                 text=True,
@@ -1214,7 +1221,8 @@ class ISOService:
 
         try:
             self._log_verbose("\nStarting ps2iso...")
-            result = subprocess.run(
+            result = self.profiler.run(
+                "ps2iso",
                 cmd,
                 shell=False,
                 text=True,
@@ -1434,7 +1442,8 @@ class ISOService:
         self._log_verbose(f"Command: {' '.join(cmd)}")
         
         try:
-            result = subprocess.run(
+            result = self.profiler.run(
+                "gc-fst",
                 cmd,
                 shell=False,
                 text=True,
@@ -1631,7 +1640,8 @@ class ISOService:
         self._log_verbose(f"gc-fst command: {' '.join(cmd_gcfst)}")
         
         try:
-            result = subprocess.run(
+            result = self.profiler.run(
+                "gc-fst",
                 cmd_gcfst,
                 shell=False,
                 text=True,
@@ -1707,7 +1717,8 @@ class ISOService:
         self._log_verbose(f"WIT command: {' '.join(cmd_wit)}")
         
         try:
-            result = subprocess.run(
+            result = self.profiler.run(
+                "wit",
                 cmd_wit,
                 shell=False,
                 text=True,
@@ -2055,7 +2066,8 @@ class ISOService:
         self._log_verbose(f"Command: {' '.join(cmd)}")
         
         try:
-            result = subprocess.run(
+            result = self.profiler.run(
+                "wit",
                 cmd,
                 shell=False,
                 text=True,
@@ -2254,15 +2266,18 @@ class ISOService:
         build_dir = os.path.join(project_folder, 'build')
         os.makedirs(build_dir, exist_ok=True)
 
-        bin_output_dir = os.path.join(project_folder, '.config', 'output', 'bin_files')
-
         injection_files = current_build.GetInjectionFiles()
 
         if not injection_files:
             return ISOResult(False, "No injection files set")
 
         self._log_progress(f"Found {len(injection_files)} file(s) to patch")
-        
+
+        # Read every compiled .bin once and resolve all offsets up front
+        plan = PatchPlanService(self.project_data).build_plan()
+        for warning in plan.warnings:
+            self._log_verbose(f" Warning: {warning}")
+
         patched_files = []
 
         for file_name in injection_files:
@@ -2271,7 +2286,6 @@ class ISOService:
             self._log_verbose(f"Patching: {file_name}")
             self._log_verbose(f"{'='*60}")
             original_file_path = current_build.FindFileInGameFolder(file_name)
-            self._log_verbose(f"test {original_file_path}")
 
             if not original_file_path or not os.path.exists(original_file_path):
                 self._log_error(f"Could not find {file_name} in game folder, skipping")
@@ -2285,181 +2299,21 @@ class ISOService:
             patched_file_path = os.path.join(build_dir, f"patched_{base_filename}")
             
             try:
-                with open(original_file_path, 'rb') as f:
-                    file_data = bytearray(f.read())
-                
-                patches_applied = 0
-                
-                for codecave in current_build.GetEnabledCodeCaves():
-                    # Skip memory-only codecaves when patching
-                    if codecave.IsMemoryOnly():
-                        continue
-
-                    target_file = codecave.GetInjectionFile()
-                    if target_file != file_name:
-                        continue
-                    
-                    bin_file = os.path.join(bin_output_dir, f"{codecave.GetName()}.bin")
-                    
-                    if not os.path.exists(bin_file):
-                        self._log_verbose(f" Warning: Binary not found for codecave '{codecave.GetName()}'")
-                        continue
-                    
-                    with open(bin_file, 'rb') as f:
-                        patch_data = f.read()
-                    
-                    file_address = codecave.GetInjectionFileAddress()
-                    memory_address = int(codecave.GetMemoryAddress(), 16)
-                    # file_address = current_build.GetFileOffsetForAddress(
-                    #     codecave.GetInjectionFile(),
-                    #     memory_address
-                    # )
-
-                    if file_address is None:
-                        self._log_error(f"Could not find file offset for codecave '{codecave.GetName()}' at 0x{memory_address:X}")
-                        continue
-                    
-                    if not file_address or file_address == "None" or file_address == "":
-                        self._log_verbose(f" Warning: No injection file address set for codecave '{codecave.GetName()}'. Skipping.")
-                        continue
-                    
-                    try:
-                        if isinstance(file_address, str):
-                            if file_address.startswith('0x') or file_address.startswith('0X'):
-                                file_address = file_address[2:]
-                            file_address = int(file_address, 16)
-                        elif isinstance(file_address, int):
-                            pass
-                        else:
-                            self._log_verbose(f" Warning: Invalid address type for codecave '{codecave.GetName()}': {type(file_address)}. Skipping.")
-                            continue
-                    except ValueError:
-                        self._log_verbose(f" Warning: Invalid address format for codecave '{codecave.GetName()}': '{file_address}'. Skipping.")
-                        continue
-                    
-                    if file_address < 0 or file_address >= len(file_data):
-                        self._log_verbose(f" Warning: Address 0x{file_address:X} out of bounds for codecave '{codecave.GetName()}'. Skipping.")
-                        continue
-                    
-                    if file_address + len(patch_data) > len(file_data):
-                        self._log_verbose(f" Warning: Patch for codecave '{codecave.GetName()}' would overflow file. Skipping.")
-                        continue
-                    
-                    file_data[file_address:file_address + len(patch_data)] = patch_data
-                    patches_applied += 1
-                    self._log_verbose(f"  Patched codecave '{codecave.GetName()}' at 0x{file_address:X} ({len(patch_data)} bytes)")
-                
-                for hook in current_build.GetEnabledHooks():
-                    target_file = hook.GetInjectionFile()
-                    if target_file != file_name:
-                        continue
-                    
-                    bin_file = os.path.join(bin_output_dir, f"{hook.GetName()}.bin")
-                    
-                    if not os.path.exists(bin_file):
-                        self._log_verbose(f" Warning: Binary not found for hook '{hook.GetName()}'")
-                        continue
-                    
-                    with open(bin_file, 'rb') as f:
-                        patch_data = f.read()
-                    
-                    file_address = hook.GetInjectionFileAddress()
-                    memory_address = int(codecave.GetMemoryAddress(), 16)
-                    # file_address = current_build.GetFileOffsetForAddress(
-                    #     hook.GetInjectionFile(),
-                    #     memory_address
-                    # )
-
-                    if file_address is None:
-                        self._log_error(f"Could not find file offset for hook '{hook.GetName()}' at 0x{memory_address:X}")
-                        continue
-                    
-                    if not file_address or file_address == "None" or file_address == "":
-                        self._log_verbose(f" Warning: No injection file address set for hook '{hook.GetName()}'. Skipping.")
-                        continue
-                    
-                    try:
-                        if isinstance(file_address, str):
-                            if file_address.startswith('0x') or file_address.startswith('0X'):
-                                file_address = file_address[2:]
-                            file_address = int(file_address, 16)
-                        elif isinstance(file_address, int):
-                            pass
-                        else:
-                            self._log_verbose(f" Warning: Invalid address type for hook '{hook.GetName()}'. Skipping.")
-                            continue
-                    except ValueError:
-                        self._log_verbose(f" Warning: Invalid address format for hook '{hook.GetName()}': '{file_address}'. Skipping.")
-                        continue
-                    
-                    if file_address < 0 or file_address >= len(file_data):
-                        self._log_verbose(f" Warning: Address 0x{file_address:X} out of bounds for hook '{hook.GetName()}'. Skipping.")
-                        continue
-                    
-                    if file_address + len(patch_data) > len(file_data):
-                        self._log_verbose(f" Warning: Patch for hook '{hook.GetName()}' would overflow file. Skipping.")
-                        continue
-                    
-                    file_data[file_address:file_address + len(patch_data)] = patch_data
-                    patches_applied += 1
-                    self._log_verbose(f"  Patched hook '{hook.GetName()}' at 0x{file_address:X} ({len(patch_data)} bytes)")
-                
-                for patch in current_build.GetEnabledBinaryPatches():
-                    target_file = patch.GetInjectionFile()
-                    if target_file != file_name:
-                        continue
-                    
-                    bin_file = os.path.join(bin_output_dir, f"{patch.GetName()}.bin")
-                    
-                    if not os.path.exists(bin_file):
-                        self._log_verbose(f" Warning: Binary not found for patch '{patch.GetName()}'")
-                        continue
-                    
-                    with open(bin_file, 'rb') as f:
-                        patch_data = f.read()
-                    
-                    file_address = patch.GetInjectionFileAddress()
-                    
-                    if not file_address or file_address == "None" or file_address == "":
-                        self._log_verbose(f" Warning: No injection file address set for patch '{patch.GetName()}'. Skipping.")
-                        continue
-                    
-                    try:
-                        if isinstance(file_address, str):
-                            if file_address.startswith('0x') or file_address.startswith('0X'):
-                                file_address = file_address[2:]
-                            file_address = int(file_address, 16)
-                        elif isinstance(file_address, int):
-                            pass
-                        else:
-                            self._log_verbose(f" Warning: Invalid address type for patch '{patch.GetName()}'. Skipping.")
-                            continue
-                    except ValueError:
-                        self._log_verbose(f" Warning: Invalid address format for patch '{patch.GetName()}': '{file_address}'. Skipping.")
-                        continue
-                    
-                    if file_address < 0 or file_address >= len(file_data):
-                        self._log_verbose(f" Warning: Address out of bounds for patch '{patch.GetName()}'. Skipping.")
-                        continue
-                    
-                    if file_address + len(patch_data) > len(file_data):
-                        self._log_verbose(f" Warning: Patch '{patch.GetName()}' would overflow file. Skipping.")
-                        continue
-                    
-                    file_data[file_address:file_address + len(patch_data)] = patch_data
-                    patches_applied += 1
-                    self._log_verbose(f"  Patched binary patch '{patch.GetName()}' at 0x{file_address:X} ({len(patch_data)} bytes)")
+                # Copy the original, then write the patches in place through a memory map
+                shutil.copyfile(original_file_path, patched_file_path)
+                applied, warnings = plan.apply_to_file(file_name, patched_file_path)
+
+                for warning in warnings:
+                    self._log_verbose(f" Warning: {warning}")
+                for entry in applied:
+                    self._log_verbose(f"  Patched {entry.patch_type.lower()} '{entry.name}' at 0x{entry.file_offset:X} ({entry.size} bytes)")
                 
-                with open(patched_file_path, 'wb') as f:
-                    f.write(file_data)
-                
-                if patches_applied > 0:
+                if applied:
                     self._log_verbose(f" Patched file created: build/patched_{base_filename}")
-                    self._log_verbose(f"  Applied {patches_applied} patch(es)")
-                    patched_files.append(file_name)
+                    self._log_verbose(f"  Applied {len(applied)} patch(es)")
                 else:
                     self._log_verbose(f" No patches applied to {file_name}")
-                    patched_files.append(file_name)
+                patched_files.append(file_name)
                 
             except Exception as e:
                 import traceback
@@ -2521,7 +2375,8 @@ class ISOService:
 
         # Patch
         self._log_progress("\n[1/3] Patching executable with compiled code...")
-        patch_result = self.patch_executable()
+        with self.profiler.stage("Patch executable"):
+            patch_result = self.patch_executable()
         if not patch_result.success:
             return patch_result
 
@@ -2545,7 +2400,14 @@ class ISOService:
         # The rebuild works directly from the extracted files
 
         self._log_progress(f"\n[2/3] Rebuilding {platform} ISO...")
-        rebuild_result = self.rebuild_iso()
+        with self.profiler.stage("Incremental disc patch"):
+            rebuild_result = self._try_incremental_rebuild()
+        if rebuild_result is None:
+            with self.profiler.stage("Rebuild ISO", platform=platform):
+                rebuild_result = self.rebuild_iso()
+            if rebuild_result.success:
+                with self.profiler.stage("Record disc manifest"):
+                    self._record_disc_build()
 
         self._log_progress("\n" + "=" * 60)
         if rebuild_result.success:
@@ -2556,6 +2418,129 @@ class ISOService:
 
         return rebuild_result
 
+    # ==================== INCREMENTAL DISC PATCHING ====================
+
+    def _get_disc_patch_setup(self) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        """
+        For builds whose output image can be patched in place, returns
+        (output image path, layout, {path on disc: local file with its contents}).
+        PS1 (raw sectors with EDC/ECC), Wii (encrypted partitions) and compressed
+        formats always need a full rebuild, so they return None.
+        """
+        current_build = self.project_data.GetCurrentBuildVersion()
+        platform = current_build.GetPlatform()
+        output_format = current_build.GetOutputFormat() or "iso"
+
+        project_folder = self.project_data.GetProjectFolder()
+        build_name = current_build.GetBuildName()
+        build_dir = os.path.join(project_folder, 'build')
+
+        game_folder = current_build.GetGameFolder()
+        main_exe = current_build.GetMainExecutable()
+        if not game_folder or not main_exe:
+            return None
+
+        if platform == "Gamecube" and output_format in ("iso", "gcm"):
+            layout = LAYOUT_GAMECUBE
+            image_path = os.path.join(build_dir, f'ModdedGame_{build_name}.{output_format}')
+            disc_file_names = current_build.GetInjectionFiles()
+            new_file_targets = (current_build.GetEnabledCodeCaves() + current_build.GetEnabledHooks()
+                                + current_build.GetEnabledBinaryPatches())
+        elif platform == "PS2":
+            layout = LAYOUT_ISO9660
+            image_path = os.path.join(build_dir, f'ModdedGame_{build_name}.iso')
+            # _rebuild_ps2 only replaces the main executable and adds new codecave files
+            disc_file_names = [main_exe]
+            new_file_targets = current_build.GetEnabledCodeCaves()
+        else:
+            return None
+
+        disc_files: Dict[str, str] = {}
+
+        for file_name in disc_file_names:
+            original_path = current_build.FindFileInGameFolder(file_name)
+            if not original_path or os.path.relpath(original_path, game_folder).startswith('..'):
+                # External files aren't part of the disc image
+                continue
+
+            if platform == "Gamecube" and file_name.lower() == "start.dol":
+                disc_path = "&&SystemData/Start.dol"
+            else:
+                disc_path = os.path.relpath(original_path, game_folder)
+
+            patched_path = os.path.join(build_dir, f"patched_{os.path.basename(file_name)}")
+            disc_files[disc_path] = patched_path if os.path.exists(patched_path) else original_path
+
+        bin_output_dir = os.path.join(project_folder, '.config', 'output', 'bin_files')
+        for target in new_file_targets:
+            file_name = (target.GetInjectionFile() or "").strip()
+            if not target.IsNewFile() or not file_name or file_name.lower() == "none":
+                continue
+            bin_file = os.path.join(bin_output_dir, f"{target.GetName()}.bin")
+            if os.path.exists(bin_file):
+                disc_files[file_name] = bin_file
+
+        return image_path, layout, disc_files
+
+    def _fingerprint_game_folder(self) -> str:
+        """fingerprint_tree of the extracted game folder (without the project's build output)"""
+        project_folder = self.project_data.GetProjectFolder()
+        game_folder = self.project_data.GetCurrentBuildVersion().GetGameFolder()
+        return DiscPatcherService.fingerprint_tree(
+            game_folder, exclude=(os.path.join(project_folder, 'build'), os.path.join(project_folder, '.config'))
+        )
+
+    def _get_disc_patcher(self) -> DiscPatcherService:
+        project_folder = self.project_data.GetProjectFolder()
+        build_name = self.project_data.GetCurrentBuildVersion().GetBuildName()
+        return DiscPatcherService(
+            os.path.join(project_folder, '.config', 'output', 'iso_build', f'{build_name}.disc_manifest.json')
+        )
+
+    def _try_incremental_rebuild(self) -> Optional[ISOResult]:
+        """
+        Write changed files straight into the last built image when they still fit
+        their original extents. Returns None when a full rebuild is needed.
+        """
+        setup = self._get_disc_patch_setup()
+        if setup is None:
+            return None
+        image_path, layout, disc_files = setup
+
+        try:
+            rewritten = self._get_disc_patcher().patch_image(image_path, layout, disc_files,
+                                                             self._fingerprint_game_folder())
+        except Exception as e:
+            self._log_verbose(f"In-place disc patch failed, doing a full rebuild: {e}")
+            return None
+
+        if rewritten is None:
+            self._log_verbose("Disc layout changed or no previous image, doing a full rebuild")
+            return None
+
+        if rewritten:
+            self._log_progress(f"Patched {len(rewritten)} file(s) in place in the previous image:")
+            for disc_path in rewritten:
+                self._log_progress(f"  {disc_path}")
+        else:
+            self._log_progress("No disc files changed since the last build")
+
+        self._log_progress(f"\nOutput: {image_path}")
+        return ISOResult(True, "Disc image updated in place", image_path)
+
+    def _record_disc_build(self):
+        """Remember what went into a full rebuild so the next build can patch it in place"""
+        setup = self._get_disc_patch_setup()
+        if setup is None:
+            return
+        image_path, layout, disc_files = setup
+
+        disc_patcher = self._get_disc_patcher()
+        if os.path.exists(image_path):
+            disc_patcher.record_build(image_path, layout, disc_files, self._fingerprint_game_folder())
+        else:
+            disc_patcher.invalidate()
+
     def _add_ps1_new_files_to_xml(self, root, local_game_files: str):
         """Add new files to PS1 XML structure"""
         import xml.etree.ElementTree as ET
@@ -2719,7 +2704,8 @@ class ISOService:
             self._log_verbose(f"Adding: {filename}")
             
             try:
-                result = subprocess.run(
+                result = self.profiler.run(
+                    "gc-fst add",
                     add_cmd,
                     shell=False,
                     text=True,
@@ -0,0 +1,418 @@
+"""
+Memory Backend Service
+Platform layer for finding emulator processes and reading/writing their memory.
+Windows uses kernel32 (OpenProcess / ReadProcessMemory / WriteProcessMemory);
+Linux uses process_vm_readv / process_vm_writev, falling back to /proc/<pid>/mem.
+"""
+
+import os
+import sys
+import ctypes
+import ctypes.util
+import errno
+import threading
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from functions.verbose_print import verbose_print
+
+# Shared-memory mappings that hold guest RAM on Linux: emulator name (EmulatorInfo.name)
+# -> (substrings of the mapped file name, possible mapping sizes)
+LINUX_RAM_REGIONS = {
+    # Dolphin maps MEM1 from its /dev/shm arena as a 32 MB view at file offset 0
+    "Dolphin": (("dolphin-emu", "dolphinmem"), (0x2000000,)),
+    "PCSX2": (("pcsx2",), (0x2000000,)),
+    "Duckstation": (("duckstation",), (0x200000, 0x800000)),
+}
+
+
+class MemoryRegion:
+    """One mapping of a process's address space"""
+
+    def __init__(self, start: int, end: int, permissions: str, offset: int, path: str):
+        self.start = start
+        self.end = end
+        self.permissions = permissions  # e.g. "rw-s"
+        self.offset = offset  # Offset into the mapped file
+        self.path = path  # Mapped file / "[heap]" / "" for anonymous
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+    @property
+    def is_shared(self) -> bool:
+        return self.permissions.endswith("s")
+
+    def __repr__(self):
+        return f"MemoryRegion(0x{self.start:X}-0x{self.end:X} {self.permissions} {self.path})"
+
+
+class MemoryBackend:
+    """
+    Process discovery and memory access for one platform.
+
+    Handles returned by open_process are opaque: a kernel32 HANDLE on Windows,
+    a LinuxProcessHandle on Linux. read_many / write_many take a whole batch
+    of (scatter/gather) requests so backends can serve it in as few calls as
+    the platform allows.
+
+    This base class is the fallback for other platforms, where no process
+    can be opened.
+    """
+
+    name = "none"
+
+    # ---------- Processes ----------
+
+    def iter_processes(self) -> Iterator[Tuple[int, str]]:
+        """Yield (pid, executable name) for every running process"""
+        return iter(())
+
+    def find_pid(self, prefix: str) -> Optional[int]:
+        """First process whose name starts with prefix (case-insensitive)"""
+        prefix = prefix.lower()
+        for pid, name in self.iter_processes():
+            if name and name.lower().startswith(prefix):
+                return pid
+        return None
+
+    def open_process(self, pid: int):
+        """Handle for memory access, or None if the process can't be opened"""
+        return None
+
+    def close_process(self, handle):
+        pass
+
+    def is_process_alive(self, handle) -> bool:
+        return False
+
+    # ---------- Memory ----------
+
+    def read(self, handle, address: int, size: int) -> Optional[bytes]:
+        return None
+
+    def write(self, handle, address: int, data: bytes) -> bool:
+        return False
+
+    def read_many(self, handle, requests: Sequence[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """Read each (address, size); failed reads are None"""
+        return [self.read(handle, address, size) for address, size in requests]
+
+    def write_many(self, handle, writes: Sequence[Tuple[int, bytes]]) -> List[bool]:
+        """Write each (address, data); returns success per write"""
+        return [self.write(handle, address, data) for address, data in writes]
+
+    # ---------- Emulator RAM ----------
+
+    def iter_regions(self, pid: int) -> Iterator[MemoryRegion]:
+        return iter(())
+
+    def find_emulator_ram(self, pid: int, emulator_name: str) -> Optional[int]:
+        """Host address of the emulator's guest RAM, or None if this backend can't tell"""
+        return None
+
+
+class WindowsMemoryBackend(MemoryBackend):
+    """kernel32-based backend; handles are raw process HANDLEs"""
+
+    name = "windows"
+
+    PROCESS_VM_OPERATION = 0x8
+    PROCESS_VM_READ = 0x10
+    PROCESS_VM_WRITE = 0x20
+    PROCESS_QUERY_INFORMATION = 0x0400
+    PROCESS_ACCESS = PROCESS_VM_OPERATION | PROCESS_VM_READ | PROCESS_VM_WRITE | PROCESS_QUERY_INFORMATION
+    STILL_ACTIVE = 259
+
+    def __init__(self):
+        self.kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    def iter_processes(self) -> Iterator[Tuple[int, str]]:
+        from services.pid_service import iter_processes
+        return iter_processes()
+
+    def open_process(self, pid: int):
+        return self.kernel32.OpenProcess(self.PROCESS_ACCESS, False, pid) or None
+
+    def close_process(self, handle):
+        if handle:
+            try:
+                self.kernel32.CloseHandle(handle)
+            except Exception:
+                pass
+
+    def is_process_alive(self, handle) -> bool:
+        if not handle:
+            return False
+        exit_code = ctypes.c_ulong()
+        return bool(self.kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+                    and exit_code.value == self.STILL_ACTIVE)
+
+    def read(self, handle, address: int, size: int) -> Optional[bytes]:
+        from services.memory_utils import read_process_memory
+        return read_process_memory(handle, address, size)
+
+    def write(self, handle, address: int, data: bytes) -> bool:
+        from services.memory_utils import write_process_memory
+        return write_process_memory(handle, address, data)
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class LinuxProcessHandle:
+    """pid plus a lazily opened /proc/<pid>/mem file for the fallback path"""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.mem_fd: Optional[int] = None
+        self.mem_writable = False
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"LinuxProcessHandle(pid={self.pid})"
+
+
+class LinuxMemoryBackend(MemoryBackend):
+    """
+    process_vm_readv / process_vm_writev backend. Each batch is one syscall per
+    IOV_MAX requests; requests the syscall can't serve (e.g. read-only pages
+    for writes, or a kernel without the syscalls) fall back to /proc/<pid>/mem.
+    Both need ptrace access to the emulator (same user with
+    kernel.yama.ptrace_scope=0, or CAP_SYS_PTRACE).
+    """
+
+    name = "linux"
+
+    IOV_MAX = 1024
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._vm_readv = getattr(self._libc, "process_vm_readv", None)
+        self._vm_writev = getattr(self._libc, "process_vm_writev", None)
+        for func in (self._vm_readv, self._vm_writev):
+            if func is not None:
+                func.argtypes = [ctypes.c_int, ctypes.POINTER(_IOVec), ctypes.c_ulong,
+                                 ctypes.POINTER(_IOVec), ctypes.c_ulong, ctypes.c_ulong]
+                func.restype = ctypes.c_ssize_t
+        self._warned_permission = False
+
+    # ---------- Processes ----------
+
+    def iter_processes(self) -> Iterator[Tuple[int, str]]:
+        """Scan /proc; the name is argv[0]'s basename, or comm (15 chars max) without one"""
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            name = None
+            try:
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    argv0 = f.read(4096).split(b"\x00", 1)[0]
+                if argv0:
+                    name = os.path.basename(argv0.decode("utf-8", errors="replace"))
+                else:
+                    with open(f"/proc/{pid}/comm", "r") as f:
+                        name = f.read().strip()
+            except OSError:
+                continue
+            yield pid, name
+
+    def open_process(self, pid: int):
+        if not os.path.exists(f"/proc/{pid}"):
+            return None
+        return LinuxProcessHandle(pid)
+
+    def close_process(self, handle):
+        if handle is not None and handle.mem_fd is not None:
+            try:
+                os.close(handle.mem_fd)
+            except OSError:
+                pass
+            handle.mem_fd = None
+
+    def is_process_alive(self, handle) -> bool:
+        if handle is None:
+            return False
+        try:
+            with open(f"/proc/{handle.pid}/stat", "r") as f:
+                # State follows the parenthesised comm, which may itself contain spaces
+                state = f.read().rsplit(")", 1)[1].split()[0]
+            return state not in ("Z", "X")
+        except (OSError, IndexError):
+            return False
+
+    # ---------- Memory ----------
+
+    def read(self, handle, address: int, size: int) -> Optional[bytes]:
+        return self.read_many(handle, [(address, size)])[0]
+
+    def write(self, handle, address: int, data: bytes) -> bool:
+        return self.write_many(handle, [(address, data)])[0]
+
+    def read_many(self, handle, requests: Sequence[Tuple[int, int]]) -> List[Optional[bytes]]:
+        buffers = [ctypes.create_string_buffer(size) for _, size in requests]
+        done = self._transfer(self._vm_readv, handle, requests, buffers)
+
+        results: List[Optional[bytes]] = []
+        for (address, size), buffer, ok in zip(requests, buffers, done):
+            if not ok:
+                ok = self._proc_mem_read(handle, address, buffer)
+            results.append(buffer.raw if ok else None)
+        return results
+
+    def write_many(self, handle, writes: Sequence[Tuple[int, bytes]]) -> List[bool]:
+        requests = [(address, len(data)) for address, data in writes]
+        buffers = [ctypes.create_string_buffer(bytes(data), len(data)) for _, data in writes]
+        done = self._transfer(self._vm_writev, handle, requests, buffers)
+
+        # /proc/<pid>/mem can also write pages the process mapped read-only
+        return [ok or self._proc_mem_write(handle, address, data)
+                for (address, data), ok in zip(writes, done)]
+
+    def _transfer(self, func, handle, requests: Sequence[Tuple[int, int]], buffers) -> List[bool]:
+        """
+        Move requests through process_vm_readv/writev in IOV_MAX-sized batches.
+        The syscall stops at the first remote range it can't access, so after a
+        short transfer the failed request is marked and the rest is retried.
+        """
+        done = [False] * len(requests)
+        if func is None or handle is None:
+            return done
+
+        start = 0
+        while start < len(requests):
+            batch = range(start, min(start + self.IOV_MAX, len(requests)))
+            count = len(batch)
+            local = (_IOVec * count)()
+            remote = (_IOVec * count)()
+            for slot, i in enumerate(batch):
+                local[slot].iov_base = ctypes.addressof(buffers[i])
+                local[slot].iov_len = requests[i][1]
+                remote[slot].iov_base = requests[i][0]
+                remote[slot].iov_len = requests[i][1]
+
+            transferred = func(handle.pid, local, count, remote, count, 0)
+            if transferred < 0:
+                error = ctypes.get_errno()
+                if error in (errno.ENOSYS, errno.EPERM, errno.ESRCH):
+                    if error == errno.EPERM:
+                        self._warn_permission(handle)
+                    return done
+                # EFAULT etc. on the first range: skip it and carry on with the rest
+                start = batch[0] + 1
+                continue
+
+            # Mark whole requests covered by the transfer; a partial one counts as failed
+            i = batch[0]
+            while i < batch[-1] + 1 and transferred >= requests[i][1]:
+                transferred -= requests[i][1]
+                done[i] = True
+                i += 1
+            start = i if i > batch[-1] else i + 1
+        return done
+
+    def _open_proc_mem(self, handle, writable: bool) -> Optional[int]:
+        if handle.mem_fd is not None and (handle.mem_writable or not writable):
+            return handle.mem_fd
+        try:
+            fd = os.open(f"/proc/{handle.pid}/mem", os.O_RDWR if writable else os.O_RDONLY)
+        except OSError as e:
+            if e.errno in (errno.EACCES, errno.EPERM):
+                self._warn_permission(handle)
+            return None
+        if handle.mem_fd is not None:
+            os.close(handle.mem_fd)
+        handle.mem_fd = fd
+        handle.mem_writable = writable
+        return fd
+
+    def _proc_mem_read(self, handle, address: int, buffer) -> bool:
+        if handle is None:
+            return False
+        with handle.lock:
+            fd = self._open_proc_mem(handle, writable=False)
+            if fd is None:
+                return False
+            try:
+                data = os.pread(fd, len(buffer), address)
+            except (OSError, OverflowError):
+                return False
+        if len(data) != len(buffer):
+            return False
+        ctypes.memmove(buffer, data, len(data))
+        return True
+
+    def _proc_mem_write(self, handle, address: int, data: bytes) -> bool:
+        if handle is None:
+            return False
+        with handle.lock:
+            fd = self._open_proc_mem(handle, writable=True)
+            if fd is None:
+                return False
+            try:
+                return os.pwrite(fd, data, address) == len(data)
+            except (OSError, OverflowError):
+                return False
+
+    def _warn_permission(self, handle):
+        if not self._warned_permission:
+            self._warned_permission = True
+            print(f"Permission denied accessing memory of PID {handle.pid}.")
+            print("   Run as the emulator's user with kernel.yama.ptrace_scope=0, or grant CAP_SYS_PTRACE.")
+
+    # ---------- Emulator RAM ----------
+
+    def iter_regions(self, pid: int) -> Iterator[MemoryRegion]:
+        """Parse /proc/<pid>/maps"""
+        try:
+            with open(f"/proc/{pid}/maps", "r") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+
+        for line in lines:
+            parts = line.split(None, 5)
+            if len(parts) < 5:
+                continue
+            start, end = parts[0].split("-")
+            path = parts[5].strip() if len(parts) > 5 else ""
+            yield MemoryRegion(int(start, 16), int(end, 16), parts[1], int(parts[2], 16), path)
+
+    def find_emulator_ram(self, pid: int, emulator_name: str) -> Optional[int]:
+        """
+        First shared mapping at file offset 0 whose name matches the emulator
+        and whose size is one of its guest RAM sizes (see LINUX_RAM_REGIONS)
+        """
+        hints = LINUX_RAM_REGIONS.get(emulator_name)
+        if hints is None:
+            return None
+        names, sizes = hints
+
+        for region in self.iter_regions(pid):
+            path = region.path.lower()
+            if (region.is_shared and region.offset == 0 and region.size in sizes
+                    and any(name in path for name in names)):
+                verbose_print(f"Found {emulator_name} RAM mapping: {region}")
+                return region.start
+        return None
+
+
+_backend: Optional[MemoryBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_memory_backend() -> MemoryBackend:
+    """Backend for the current platform (created once)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if sys.platform == "win32":
+                    _backend = WindowsMemoryBackend()
+                elif sys.platform.startswith("linux"):
+                    _backend = LinuxMemoryBackend()
+                else:
+                    _backend = MemoryBackend()
+    return _backend
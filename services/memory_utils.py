@@ -1,15 +1,17 @@
 # services/memory_utils.py
 """
-Consolidated memory read/write utilities for Windows process memory operations.
+Consolidated memory read/write utilities for process memory operations.
 Used by emulator services (PCSX2, DuckStation, etc.) for memory access.
+On Windows these call kernel32 directly; elsewhere they go through the
+platform's MemoryBackend (see memory_backend_service).
 """
 
+import sys
 import ctypes
 import ctypes.wintypes
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
-# --- Windows API Definitions (Kernel32.dll) ---
-kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+IS_WINDOWS = sys.platform == "win32"
 
 # Define necessary Win32 types and constants
 SIZE_T = ctypes.c_size_t
@@ -18,33 +20,53 @@ HANDLE = ctypes.wintypes.HANDLE
 LPCVOID = ctypes.wintypes.LPCVOID
 LPVOID = ctypes.wintypes.LPVOID
 
-# Function Signatures for Process Memory Operations
-ReadProcessMemory = kernel32.ReadProcessMemory
-ReadProcessMemory.argtypes = [
-    HANDLE,      # hProcess
-    LPCVOID,     # lpBaseAddress
-    LPVOID,      # lpBuffer
-    SIZE_T,      # nSize
-    ctypes.POINTER(SIZE_T)  # lpNumberOfBytesRead
-]
-ReadProcessMemory.restype = ctypes.wintypes.BOOL
-
-WriteProcessMemory = kernel32.WriteProcessMemory
-WriteProcessMemory.argtypes = [
-    HANDLE,      # hProcess
-    LPVOID,      # lpBaseAddress
-    LPCVOID,     # lpBuffer
-    SIZE_T,      # nSize
-    ctypes.POINTER(SIZE_T)  # lpNumberOfBytesWritten
-]
-WriteProcessMemory.restype = ctypes.wintypes.BOOL
-
-VirtualQueryEx = kernel32.VirtualQueryEx
+if IS_WINDOWS:
+    # --- Windows API Definitions (Kernel32.dll) ---
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    # Function Signatures for Process Memory Operations
+    ReadProcessMemory = kernel32.ReadProcessMemory
+    ReadProcessMemory.argtypes = [
+        HANDLE,      # hProcess
+        LPCVOID,     # lpBaseAddress
+        LPVOID,      # lpBuffer
+        SIZE_T,      # nSize
+        ctypes.POINTER(SIZE_T)  # lpNumberOfBytesRead
+    ]
+    ReadProcessMemory.restype = ctypes.wintypes.BOOL
+
+    WriteProcessMemory = kernel32.WriteProcessMemory
+    WriteProcessMemory.argtypes = [
+        HANDLE,      # hProcess
+        LPVOID,      # lpBaseAddress
+        LPCVOID,     # lpBuffer
+        SIZE_T,      # nSize
+        ctypes.POINTER(SIZE_T)  # lpNumberOfBytesWritten
+    ]
+    WriteProcessMemory.restype = ctypes.wintypes.BOOL
+
+    VirtualQueryEx = kernel32.VirtualQueryEx
+
+
+def read_process_memory_many(handle, requests: Sequence[Tuple[int, int]]) -> List[Optional[bytes]]:
+    """
+    Read several (address, size) ranges in one batch (one process_vm_readv
+    call on Linux). Failed reads are None.
+    """
+    from services.memory_backend_service import get_memory_backend
+    return get_memory_backend().read_many(handle, requests)
+
+
+def write_process_memory_many(handle, writes: Sequence[Tuple[int, bytes]]) -> List[bool]:
+    """Write several (address, data) pairs in one batch; returns success per write"""
+    from services.memory_backend_service import get_memory_backend
+    return get_memory_backend().write_many(handle, writes)
 
 
 def read_process_memory(handle: HANDLE, address: int, size: int) -> Optional[bytes]:
     """
-    Read memory from a target process using Windows ReadProcessMemory API.
+    Read memory from a target process using Windows ReadProcessMemory API
+    (or the platform's memory backend elsewhere).
 
     Args:
         handle: Process handle (from OpenProcess)
@@ -54,6 +76,10 @@ def read_process_memory(handle: HANDLE, address: int, size: int) -> Optional[byt
     Returns:
         Raw bytes read from memory, or None if read fails
     """
+    if not IS_WINDOWS:
+        from services.memory_backend_service import get_memory_backend
+        return get_memory_backend().read(handle, address, size)
+
     try:
         # Create a buffer of the required size
         buffer = ctypes.create_string_buffer(size)
@@ -89,6 +115,10 @@ def write_process_memory(handle: int, address: int, data: bytes) -> bool:
     Returns:
         True if write succeeded, False otherwise
     """
+    if not IS_WINDOWS:
+        from services.memory_backend_service import get_memory_backend
+        return get_memory_backend().write(handle, address, data)
+
     size = len(data)
 
     # Query memory information to see if this region is valid
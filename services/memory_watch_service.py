@@ -1,6 +1,7 @@
 import time
 import threading
-import os
+import sys
+import struct
 from typing import List, Optional, Callable, Tuple
 from enum import Enum
 from functions.verbose_print import verbose_print
@@ -50,6 +51,30 @@ class DataType(Enum):
         return self in (DataType.RGBA, DataType.BGRA)
 
 
+# Watches closer together than this are read in one range (reading the gap is
+# cheaper than another ReadProcessMemory / PINE round-trip)
+WATCH_MERGE_GAP = 64
+WATCH_MAX_RANGE = 0x1000
+
+# Cached-segment addresses the watch accepts for main RAM (0x80000000 + offset)
+KSEG0_BASE = 0x80000000
+KSEG0_RAM_LIMIT = 0x2000000
+
+# struct codes for one watch; colors are unpacked as raw bytes and reordered
+_STRUCT_CODES = {
+    DataType.BYTE_SIGNED: "B", DataType.BYTE_UNSIGNED: "B",
+    DataType.SHORT_SIGNED: "H", DataType.SHORT_UNSIGNED: "H",
+    DataType.INT_SIGNED: "I", DataType.INT_UNSIGNED: "I", DataType.FLOAT: "I",
+    DataType.RGB: "3s", DataType.BGR: "3s", DataType.RGBA: "4s", DataType.BGRA: "4s",
+}
+
+# Byte index of each of (r, g, b[, a]) in a color watch
+_COLOR_ORDER = {
+    DataType.RGB: (0, 1, 2), DataType.RGBA: (0, 1, 2, 3),
+    DataType.BGR: (2, 1, 0), DataType.BGRA: (2, 1, 0, 3),
+}
+
+
 class WatchEntry:
     """Represents a single memory watch entry"""
 
@@ -68,6 +93,14 @@ class WatchEntry:
         self.previous_rgb_value: Optional[Tuple[int, int, int]] = None
         self.previous_rgba_value: Optional[Tuple[int, int, int, int]] = None
 
+        # State last passed to on_update (a new entry starts out shown as "---"),
+        # so only entries that changed are reported
+        self.reported_state = self.display_state
+
+    @property
+    def display_state(self) -> Tuple:
+        return self.current_value, self.rgb_value, self.rgba_value, self.has_changed
+
     def update_value(self, new_value: int):
         """Update with new value"""
         if self.current_value is not None:
@@ -165,6 +198,49 @@ class WatchEntry:
         return f"0x{self.current_value:0{width}X}"
 
 
+class WatchReadRange:
+    """
+    Watches close enough together to read with one memory read. Decoding is
+    one precompiled struct unpack per layer; watches that overlap an earlier
+    one go into another layer.
+    """
+
+    def __init__(self, start: int):
+        self.start = start
+        self.end = start
+        self.entries: List[Tuple[int, WatchEntry]] = []  # (offset, entry), by offset
+        self.layers: List[Tuple[struct.Struct, List[WatchEntry]]] = []
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+    def add(self, offset: int, entry: WatchEntry):
+        self.entries.append((offset, entry))
+        self.end = max(self.end, offset + entry.data_type.size)
+
+    def compile(self, big_endian: bool):
+        layers = []  # [format parts, entries, end offset]
+        for offset, entry in self.entries:
+            layer = next((layer for layer in layers if layer[2] <= offset), None)
+            if layer is None:
+                layer = [[], [], self.start]
+                layers.append(layer)
+            if offset > layer[2]:
+                layer[0].append(f"{offset - layer[2]}x")
+            layer[0].append(_STRUCT_CODES[entry.data_type])
+            layer[1].append(entry)
+            layer[2] = offset + entry.data_type.size
+
+        prefix = ">" if big_endian else "<"
+        self.layers = [(struct.Struct(prefix + "".join(parts)), entries) for parts, entries, _ in layers]
+
+    def decode(self, data: bytes):
+        """Yield (entry, raw value) for every watch in the range"""
+        for layout, entries in self.layers:
+            yield from zip(entries, layout.unpack_from(data))
+
+
 class MemoryWatchService:
     """Service for watching memory addresses in real-time"""
 
@@ -186,12 +262,16 @@ class MemoryWatchService:
 
         # Cached for fast I/O
         self._emu_info = None
-        self._kernel32 = None
+        self._backend = None  # MemoryBackend owning _process_handle
         self._process_handle = None
         
         # Connection validity flag
         self._connection_valid = False
 
+        # Watches grouped into ranges; rebuilt when watches or the emulator change
+        self._read_plan: Optional[List[WatchReadRange]] = None
+        self._read_plan_key: List[Tuple[int, DataType]] = []
+
     # ---------- Setup / teardown ----------
 
     def reset_connection(self):
@@ -203,12 +283,9 @@ class MemoryWatchService:
             self.stop()
         
         # Close existing handle
-        if self._process_handle and self._kernel32:
-            try:
-                self._kernel32.CloseHandle(self._process_handle)
-                print("Closed previous process handle")
-            except Exception as e:
-                print(f"Error closing handle: {e}")
+        if self._process_handle and self._backend:
+            self._backend.close_process(self._process_handle)
+            print("Closed previous process handle")
         
         # Clear all cached state
         self._process_handle = None
@@ -219,6 +296,7 @@ class MemoryWatchService:
         
         # Clear watches
         self.watch_entries.clear()
+        self._read_plan = None
         
         print("Connection state reset complete")
 
@@ -251,7 +329,7 @@ class MemoryWatchService:
             return False
 
         # Get or establish connection (uses cached PID if available)
-        handle, main_ram, kernel32 = manager.get_or_establish_connection(emulator_name)
+        handle, main_ram, backend = manager.get_or_establish_connection(emulator_name)
 
         if not handle or not main_ram:
             print(f"Could not connect to {emulator_name}")
@@ -263,29 +341,23 @@ class MemoryWatchService:
         self.emulator_name = emulator_name
         self.main_ram_address = main_ram
         self._process_handle = handle
-        self._kernel32 = kernel32
+        self._backend = backend
         self._connection_valid = True
+        self._read_plan = None
 
         print(f"Memory watch connected to {emulator_name} at 0x{self.main_ram_address:X}")
         return True
     
     def _validate_existing_connection(self) -> bool:
         """Check if the existing connection is still valid"""
-        if not self._process_handle or not self._kernel32:
+        if not self._process_handle or not self._backend:
             return False
         
-        import ctypes
-        exit_code = ctypes.c_ulong()
-        if self._kernel32.GetExitCodeProcess(self._process_handle, ctypes.byref(exit_code)):
-            STILL_ACTIVE = 259
-            if exit_code.value == STILL_ACTIVE:
-                return True
+        if self._backend.is_process_alive(self._process_handle):
+            return True
         
         # Handle is no longer valid
-        try:
-            self._kernel32.CloseHandle(self._process_handle)
-        except Exception:
-            pass
+        self._backend.close_process(self._process_handle)
         self._process_handle = None
         self._connection_valid = False
         return False
@@ -298,6 +370,14 @@ class MemoryWatchService:
         emu_info = self._emu_info
 
         try:
+            # Non-Windows: the backend finds the guest RAM mapping
+            if sys.platform != "win32":
+                pid = self.emulator_service._get_pid(emu_info.process_name)
+                base = self._ensure_backend().find_emulator_ram(pid, emu_info.name) if pid else None
+                if not base:
+                    print(f"Memory watch could not locate {emu_info.name} RAM mapping")
+                return base
+
             # PCSX2: use pcsx2_service
             if emu_info.name == "PCSX2":
                 from services.pcsx2_service import set_ee_base_address_ctypes
@@ -333,51 +413,43 @@ class MemoryWatchService:
                 return None
 
             # Others: open once, query, close
-            k32 = self._ensure_kernel32()
+            backend = self._ensure_backend()
             pid = self.emulator_service._get_pid(emu_info.process_name)
             if not pid:
                 return None
 
-            PROCESS_ALL_ACCESS = 0x1F0FFF
-            handle = k32.OpenProcess(PROCESS_ALL_ACCESS, False, pid)
+            handle = backend.open_process(pid)
             if not handle:
                 return None
 
             try:
                 return self.emulator_service._get_main_ram_address(handle, emu_info)
             finally:
-                k32.CloseHandle(handle)
+                backend.close_process(handle)
 
         except Exception as e:
             print(f"Error getting RAM address: {e}")
             return None
 
-    def _ensure_kernel32(self):
-        if self._kernel32 is None:
-            import ctypes
-            self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        return self._kernel32
+    def _ensure_backend(self):
+        if self._backend is None:
+            from services.memory_backend_service import get_memory_backend
+            self._backend = get_memory_backend()
+        return self._backend
 
-    def _ensure_process_handle(self) -> Optional[int]:
-        """Use a cached OpenProcess handle; reopen if needed."""
+    def _ensure_process_handle(self):
+        """Use a cached process handle; reopen if needed."""
         if not self.emulator_service or not self._emu_info:
             return None
 
-        import ctypes
-        k32 = self._ensure_kernel32()
+        backend = self._ensure_backend()
 
         # Validate existing handle
         if self._process_handle:
-            exit_code = ctypes.c_ulong()
-            if k32.GetExitCodeProcess(self._process_handle, ctypes.byref(exit_code)):
-                STILL_ACTIVE = 259
-                if exit_code.value == STILL_ACTIVE:
-                    return self._process_handle
+            if backend.is_process_alive(self._process_handle):
+                return self._process_handle
             # Handle is invalid - close it
-            try:
-                k32.CloseHandle(self._process_handle)
-            except Exception:
-                pass
+            backend.close_process(self._process_handle)
             self._process_handle = None
 
         # Open new handle
@@ -386,11 +458,9 @@ class MemoryWatchService:
             print(f"Could not find process: {self._emu_info.process_name}")
             return None
 
-        PROCESS_ALL_ACCESS = 0x1F0FFF
-        handle = k32.OpenProcess(PROCESS_ALL_ACCESS, False, pid)
+        handle = backend.open_process(pid)
         if not handle:
-            error = ctypes.get_last_error()
-            print(f"Could not open process (error {error})")
+            print(f"Could not open process {pid}")
             return None
 
         self._process_handle = handle
@@ -403,6 +473,7 @@ class MemoryWatchService:
         with self.lock:
             entry = WatchEntry(address, data_type, name)
             self.watch_entries.append(entry)
+            self._read_plan = None
             verbose_print(f"Added watch: {entry.name} ({data_type.value})")
             return entry
 
@@ -410,13 +481,40 @@ class MemoryWatchService:
         with self.lock:
             if entry in self.watch_entries:
                 self.watch_entries.remove(entry)
+                self._read_plan = None
                 print(f"Removed watch: {entry.name}")
 
+    def set_watch_type(self, entry: WatchEntry, data_type: DataType):
+        """Change a watch's type; the read plan is rebuilt for the new size"""
+        with self.lock:
+            entry.data_type = data_type
+            self._read_plan = None
+
     def clear_watches(self):
         with self.lock:
             self.watch_entries.clear()
+            self._read_plan = None
             print("Cleared all watches")
 
+    # ---------- Value scans ----------
+
+    def create_value_scanner(self, data_type: DataType):
+        """ValueScanner over this connection's main RAM, or None if not connected"""
+        from services.value_scan_service import ValueScanner
+        from services.ram_snapshot_service import RamSnapshotService
+
+        if not self._connection_valid or not self.main_ram_address:
+            print("Value scan: not connected to an emulator")
+            return None
+
+        def read_snapshot():
+            handle = self._ensure_process_handle()
+            if not handle:
+                return None
+            return RamSnapshotService.get_snapshot(self.emulator_name, handle, self.main_ram_address, refresh=True)
+
+        return ValueScanner(read_snapshot, data_type, self._is_big_endian_platform())
+
     # ---------- Poll loop ----------
 
     def start(self):
@@ -456,48 +554,124 @@ class MemoryWatchService:
     def _poll_loop(self):
         while self.is_running:
             try:
-                self._update_all_watches()
-                if self.on_update:
-                    with self.lock:
-                        entries_copy = list(self.watch_entries)
-                    self.on_update(entries_copy)
+                changed = self._update_all_watches()
+                if changed and self.on_update:
+                    self.on_update(changed)
             except Exception as e:
                 print(f"Poll error: {e}")
                 if self.on_error:
                     self.on_error(str(e))
             time.sleep(self.poll_interval)
 
-    def _update_all_watches(self):
+    def _update_all_watches(self) -> List[WatchEntry]:
+        """
+        Read every watch (one read per range of nearby watches) and return the
+        entries whose displayed value or change highlight differs from what
+        on_update was last given.
+        """
         if not self.main_ram_address or not self.emulator_service or not self._emu_info:
-            return
+            return []
 
         handle = self._ensure_process_handle()
         if not handle:
             if self.on_error:
                 self.on_error("Emulator not running")
             self.stop()
-            return
+            return []
+
+        with self.lock:
+            # Also rebuilt if a watch's address or type was changed in place
+            plan_key = [(entry.address, entry.data_type) for entry in self.watch_entries]
+            if self._read_plan is None or plan_key != self._read_plan_key:
+                self._read_plan = self._build_read_plan()
+                self._read_plan_key = plan_key
+            plan = self._read_plan
+
+        # Memory is read outside the lock so the UI can add/remove watches meanwhile
+        blocks = self._read_ranges(handle, plan)
 
+        changed = []
         with self.lock:
-            for entry in self.watch_entries:
-                if entry.data_type.is_color:
-                    color = self._read_color_value(handle, entry.address, entry.data_type)
-                    if color is not None:
-                        if entry.data_type.has_alpha:
-                            entry.update_rgba_value(*color)
-                        else:
-                            entry.update_rgb_value(*color)
+            for read_range, data in zip(plan, blocks):
+                if data is not None and len(data) == read_range.length:
+                    values = read_range.decode(data)
                 else:
-                    value = self._read_value(handle, entry.address, entry.data_type)
+                    # Range read failed (e.g. spans unmapped memory); try each watch alone
+                    values = ((entry, self._read_raw_value(handle, entry)) for _, entry in read_range.entries)
+
+                for entry, value in values:
                     if value is not None:
-                        entry.update_value(value)
+                        self._apply_raw_value(entry, value)
+                    state = entry.display_state
+                    if state != entry.reported_state:
+                        entry.reported_state = state
+                        changed.append(entry)
+        return changed
+
+    def _build_read_plan(self) -> List[WatchReadRange]:
+        """Group watches (sorted by offset) into ranges of at most WATCH_MAX_RANGE bytes"""
+        entries = sorted(((self._normalize_offset(entry.address), entry) for entry in self.watch_entries),
+                         key=lambda item: item[0])
+
+        plan: List[WatchReadRange] = []
+        for offset, entry in entries:
+            current = plan[-1] if plan else None
+            if (current is None or offset - current.end > WATCH_MERGE_GAP
+                    or offset + entry.data_type.size - current.start > WATCH_MAX_RANGE):
+                current = WatchReadRange(offset)
+                plan.append(current)
+            current.add(offset, entry)
+
+        big_endian = self._is_big_endian_platform()
+        for read_range in plan:
+            read_range.compile(big_endian)
+
+        verbose_print(f"Memory watch: {len(entries)} watch(es) in {len(plan)} read(s)")
+        return plan
+
+    def _read_ranges(self, handle, plan: List[WatchReadRange]) -> List[Optional[bytes]]:
+        if self._is_ps2():
+            # Every range goes out in one PINE message (or as few as the IPC buffer allows)
+            return self._get_pine_client().read_many([(read_range.start, read_range.length) for read_range in plan])
+        main_ram = self.main_ram_address
+        return self._ensure_backend().read_many(
+            handle, [(main_ram + read_range.start, read_range.length) for read_range in plan]
+        )
+
+    def _read_raw_value(self, handle, entry: WatchEntry):
+        """Single-watch fallback giving the same raw value WatchReadRange.decode would"""
+        if entry.data_type.is_color:
+            color = self._read_color_value(handle, entry.address, entry.data_type)
+            if color is None:
+                return None
+            raw = bytearray(len(color))
+            for component, index in zip(color, _COLOR_ORDER[entry.data_type]):
+                raw[index] = component
+            return bytes(raw)
+        return self._read_value(handle, entry.address, entry.data_type)
+
+    @staticmethod
+    def _apply_raw_value(entry: WatchEntry, value):
+        if entry.data_type.is_color:
+            color = tuple(value[index] for index in _COLOR_ORDER[entry.data_type])
+            if entry.data_type.has_alpha:
+                entry.update_rgba_value(*color)
+            else:
+                entry.update_rgb_value(*color)
+        else:
+            entry.update_value(value)
 
     # ---------- Low-level IO helpers ----------
 
-    def _normalize_offset(self, address: int) -> int:
-        addr_str = f"{address:X}"
-        if addr_str.startswith("80"):
-            return int(addr_str[2:], 16)
+    @staticmethod
+    def _normalize_offset(address: int) -> int:
+        """Strip a leading 0x80 byte (0x80123456 -> 0x123456)"""
+        # Full 32-bit cached addresses, including RAM past 16 MB (0x81xxxxxx)
+        if KSEG0_BASE <= address < KSEG0_BASE + KSEG0_RAM_LIMIT:
+            return address - KSEG0_BASE
+        shift = max(0, ((address.bit_length() + 3) // 4 - 2) * 4)
+        if address >> shift == 0x80:
+            return address & ((1 << shift) - 1)
         return address
 
     def _is_big_endian_platform(self) -> bool:
@@ -510,59 +684,24 @@ class MemoryWatchService:
         """Check if currently connected to PS2/PCSX2"""
         return self._emu_info and self._emu_info.name == "PCSX2"
 
-    def _get_pine_ipc(self):
-        """Get PINE IPC module (cached)"""
-        if not hasattr(self, '_pine_ipc'):
-            import sys
-            from path_helper import get_application_directory
-            pine_path = os.path.join(get_application_directory(), 'prereq', 'pine')
-            if pine_path not in sys.path:
-                sys.path.insert(0, pine_path)
-            import prereq.pine.pcsx2_ipc as pcsx2_ipc
-            self._pine_ipc = pcsx2_ipc
-        return self._pine_ipc
+    def _get_pine_client(self):
+        """PINE client for PCSX2 (shared per slot)"""
+        from services.pine_client_service import get_pine_client
+        return get_pine_client()
 
     def _read_memory_pine(self, ps2_address: int, size: int) -> Optional[bytes]:
         """Read memory using PINE protocol for PS2"""
-        try:
-            pine = self._get_pine_ipc()
-
-            # Initialize PINE if not already
-            if not hasattr(self, '_pine_initialized') or not self._pine_initialized:
-                if not pine.init():
-                    print(f"PINE initialization failed")
-                    return None
-                self._pine_initialized = True
-
-            # Read bytes via PINE
-            data = pine.read_bytes(ps2_address, size)
-            if data:
-                return bytes(data)
-            return None
-
-        except Exception as e:
-            print(f"PINE read error: {e}")
-            return None
+        data = self._get_pine_client().read_bytes(ps2_address, size)
+        if data is None:
+            verbose_print(f"PINE read failed at 0x{ps2_address:X} ({size} bytes)")
+        return data
 
     def _write_memory_pine(self, ps2_address: int, data: bytes) -> bool:
         """Write memory using PINE protocol for PS2"""
-        try:
-            pine = self._get_pine_ipc()
-
-            # Initialize PINE if not already
-            if not hasattr(self, '_pine_initialized') or not self._pine_initialized:
-                if not pine.init():
-                    print(f"PINE initialization failed")
-                    return False
-                self._pine_initialized = True
-
-            # Write bytes via PINE
-            success = pine.write_bytes(ps2_address, data)
-            return bool(success)
-
-        except Exception as e:
-            print(f"PINE write error: {e}")
-            return False
+        success = self._get_pine_client().write_bytes(ps2_address, data)
+        if not success:
+            print(f"PINE write failed at 0x{ps2_address:X} ({len(data)} bytes)")
+        return success
 
     def _read_value(self, handle: int, address: int, data_type: DataType) -> Optional[int]:
         if not self.main_ram_address:
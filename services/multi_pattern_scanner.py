@@ -0,0 +1,337 @@
+"""
+Multi-Pattern Scanner
+Finds every occurrence of many byte patterns (with wildcard/skip segments) in a single pass
+"""
+
+import re
+import sys
+import time
+from itertools import compress
+from typing import List, Dict, Optional, Tuple, Union
+
+# Fully fixed window lengths used to index patterns, longest first.
+# Longer anchors are rarer in the data, so produce fewer hits to verify.
+ANCHOR_SIZES = (8, 4)
+
+# Struct format used to read each anchor size as native-endian integers
+ANCHOR_FORMATS = {8: 'Q', 4: 'I'}
+
+# Anchor tables with at most this many entries are searched with bytes.find instead
+FIND_ANCHOR_LIMIT = 48
+
+# Alignment of MIPS/PowerPC instructions (pass to MultiPatternScanner for code patterns)
+INSTRUCTION_ALIGNMENT = 4
+
+# Instruction words that appear thousands of times in any executable, so make poor anchors
+COMMON_WORDS = {
+    b'\x00\x00\x00\x00',  # nop (MIPS) / padding
+    b'\x08\x00\xe0\x03',  # jr ra (MIPS LE)
+    b'\x4e\x80\x00\x20',  # blr (PowerPC)
+    b'\x60\x00\x00\x00',  # nop (PowerPC)
+    b'\xff\xff\xff\xff',  # fill
+}
+
+
+class MaskedPattern:
+    """
+    A byte pattern where each byte has a mask.
+    Mask 0xFF = byte must match exactly, 0x00 = wildcard, anything else = only masked bits must match.
+    """
+
+    def __init__(self, label: str, value: bytes, mask: Optional[bytes] = None):
+        if mask is None:
+            mask = b'\xff' * len(value)
+        if len(mask) != len(value):
+            raise ValueError(f"Pattern {label}: mask length {len(mask)} != value length {len(value)}")
+
+        self.label = label
+        self.value = bytes(b & m for b, m in zip(value, mask))
+        self.mask = bytes(mask)
+
+        # Split into fully fixed runs (compared as slices) and partially masked bytes
+        self.fixed_runs: List[Tuple[int, bytes]] = []
+        self.partial_bytes: List[Tuple[int, int, int]] = []
+        run_start = None
+        for i, m in enumerate(self.mask):
+            if m == 0xFF:
+                if run_start is None:
+                    run_start = i
+                continue
+            if run_start is not None:
+                self.fixed_runs.append((run_start, self.value[run_start:i]))
+                run_start = None
+            if m != 0x00:
+                self.partial_bytes.append((i, m, self.value[i]))
+        if run_start is not None:
+            self.fixed_runs.append((run_start, self.value[run_start:]))
+
+    @classmethod
+    def from_segments(cls, label: str, segments: List[Tuple[str, Union[bytes, int]]]) -> "MaskedPattern":
+        """Build from FlexiblePattern-style segments: ("bytes", b'...') / ("skip", n)"""
+        value = bytearray()
+        mask = bytearray()
+        for segment_type, segment_value in segments:
+            if segment_type == "bytes":
+                value.extend(segment_value)
+                mask.extend(b'\xff' * len(segment_value))
+            elif segment_type == "skip":
+                value.extend(b'\x00' * segment_value)
+                mask.extend(b'\x00' * segment_value)
+        return cls(label, bytes(value), bytes(mask))
+
+    def __len__(self):
+        return len(self.value)
+
+    def is_exact(self) -> bool:
+        """True if every byte must match (no wildcards)"""
+        return len(self.fixed_runs) == 1 and len(self.fixed_runs[0][1]) == len(self.value)
+
+    def matches_at(self, data: bytes, pos: int) -> bool:
+        """Check whether this pattern matches data at pos"""
+        if pos < 0 or pos + len(self.value) > len(data):
+            return False
+        for offset, run in self.fixed_runs:
+            if data[pos + offset:pos + offset + len(run)] != run:
+                return False
+        for offset, mask, value in self.partial_bytes:
+            if data[pos + offset] & mask != value:
+                return False
+        return True
+
+    def choose_anchor(self, step: int = 1) -> Optional[Tuple[int, int]]:
+        """
+        Pick the fully fixed window used to index this pattern, as (offset, size).
+        Only offsets that are multiples of step are considered. Prefers windows
+        with the most words outside COMMON_WORDS, then longer windows, then
+        windows with many distinct bytes. Returns None if the pattern has no
+        fully fixed window of any ANCHOR_SIZES length.
+        """
+        best_anchor = None
+        best_score = None
+        for size in ANCHOR_SIZES:
+            for run_offset, run in self.fixed_runs:
+                for i in range(0, len(run) - size + 1):
+                    if (run_offset + i) % step:
+                        continue
+                    window = run[i:i + size]
+                    uncommon_words = sum(window[j:j + 4] not in COMMON_WORDS for j in range(0, size, 4))
+                    score = (uncommon_words, size, len(set(window)), -window.count(0))
+                    if best_score is None or score > best_score:
+                        best_score = score
+                        best_anchor = (run_offset + i, size)
+        return best_anchor
+
+    def to_regex(self) -> bytes:
+        """Convert to an equivalent bytes regex (used for patterns too short/wild to anchor)"""
+        parts = []
+        for value, mask in zip(self.value, self.mask):
+            if mask == 0xFF:
+                parts.append(re.escape(bytes([value])))
+            elif mask == 0x00:
+                parts.append(b'.')
+            else:
+                allowed = [b for b in range(256) if b & mask == value]
+                parts.append(b'[' + b''.join(re.escape(bytes([b])) for b in allowed) + b']')
+        return b''.join(parts)
+
+    def __repr__(self):
+        return f"MaskedPattern(label={self.label}, len={len(self.value)})"
+
+
+class ScanStats:
+    """Timing and hit statistics for one scan"""
+
+    def __init__(self):
+        self.bytes_scanned = 0
+        self.pattern_count = 0
+        self.anchored_patterns = 0
+        self.fallback_patterns = 0
+        self.anchor_hits = 0
+        self.match_count = 0
+        self.index_seconds = 0.0
+        self.scan_seconds = 0.0
+        self.verify_seconds = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.index_seconds + self.scan_seconds + self.verify_seconds
+
+    def to_dict(self) -> Dict:
+        return {
+            "bytes_scanned": self.bytes_scanned,
+            "pattern_count": self.pattern_count,
+            "anchored_patterns": self.anchored_patterns,
+            "fallback_patterns": self.fallback_patterns,
+            "anchor_hits": self.anchor_hits,
+            "match_count": self.match_count,
+            "index_seconds": self.index_seconds,
+            "scan_seconds": self.scan_seconds,
+            "verify_seconds": self.verify_seconds,
+            "total_seconds": self.total_seconds,
+        }
+
+    def __str__(self):
+        mb = self.bytes_scanned / (1024 * 1024)
+        return (f"Scanned {mb:.2f} MB for {self.pattern_count} pattern(s): "
+                f"{self.match_count} match(es), {self.anchor_hits} anchor hit(s) "
+                f"in {self.total_seconds * 1000:.1f} ms "
+                f"(index {self.index_seconds * 1000:.1f} ms, scan {self.scan_seconds * 1000:.1f} ms, "
+                f"verify {self.verify_seconds * 1000:.1f} ms)")
+
+
+class ScanResult:
+    """Result of a multi-pattern scan"""
+
+    def __init__(self):
+        # pattern index -> sorted list of match offsets
+        self.matches: Dict[int, List[int]] = {}
+        self.stats = ScanStats()
+
+    def first_match(self, pattern_index: int) -> Optional[int]:
+        offsets = self.matches.get(pattern_index)
+        return offsets[0] if offsets else None
+
+
+class MultiPatternScanner:
+    """
+    Scans data for many MaskedPatterns in one pass.
+
+    Every pattern is indexed by one fully fixed 8- or 4-byte window (its anchor).
+    The data is read as native 64/32-bit integers at every alignment being
+    scanned, each integer is looked up in the anchor table (in C, via map),
+    and only anchor hits are verified against the full masked pattern.
+    Patterns without a fixed 4-byte window fall back to a compiled regex.
+    """
+
+    def __init__(self, patterns: List[MaskedPattern], alignment: int = 1):
+        """
+        Args:
+            patterns: Patterns to index
+            alignment: Only report matches starting at multiples of this
+                (use INSTRUCTION_ALIGNMENT for code patterns; it also scans 4x less)
+        """
+        self.patterns = patterns
+        self.alignment = alignment
+        self.index_seconds = 0.0
+
+        # anchor size -> {anchor integer: [(pattern index, anchor offset in pattern), ...]}
+        self._anchors: Dict[int, Dict[int, List[Tuple[int, int]]]] = {size: {} for size in ANCHOR_SIZES}
+        self._fallback: List[Tuple[int, "re.Pattern"]] = []
+        self._build_index()
+
+    def _build_index(self):
+        start = time.perf_counter()
+        step = INSTRUCTION_ALIGNMENT if self.alignment % INSTRUCTION_ALIGNMENT == 0 else 1
+        for index, pattern in enumerate(self.patterns):
+            if len(pattern) == 0 or not any(pattern.mask):
+                continue
+            anchor = pattern.choose_anchor(step)
+            if anchor is None:
+                self._fallback.append((index, re.compile(pattern.to_regex(), re.DOTALL)))
+                continue
+
+            anchor_offset, size = anchor
+            key = int.from_bytes(pattern.value[anchor_offset:anchor_offset + size], sys.byteorder)
+            self._anchors[size].setdefault(key, []).append((index, anchor_offset))
+        self.index_seconds = time.perf_counter() - start
+
+    def _collect_anchor_hits(self, data: bytes, size: int) -> List[Tuple[int, int]]:
+        """Find every position where an anchor of the given size occurs. Returns (position, key) pairs."""
+        table = self._anchors[size]
+        if not table:
+            return []
+
+        # A handful of anchors: bytes.find is faster than walking every integer
+        if len(table) <= FIND_ANCHOR_LIMIT:
+            hits = []
+            for key in table:
+                needle = key.to_bytes(size, sys.byteorder)
+                position = data.find(needle)
+                while position != -1:
+                    hits.append((position, key))
+                    position = data.find(needle, position + 1)
+            return hits
+
+        # Each integer view covers positions start, start + size, ...; one view per
+        # alignment offset we need to cover
+        step = INSTRUCTION_ALIGNMENT if self.alignment % INSTRUCTION_ALIGNMENT == 0 else 1
+        hits = []
+        is_anchor = table.__contains__
+        with memoryview(data) as view:
+            for view_start in range(0, size, step):
+                count = (len(data) - view_start) // size
+                if count <= 0:
+                    continue
+                with view[view_start:view_start + count * size].cast(ANCHOR_FORMATS[size]) as int_view:
+                    keys = int_view.tolist()
+                # compress/map keep the per-integer anchor lookup in C
+                flags = list(map(is_anchor, keys))
+                positions = compress(range(view_start, len(data), size), flags)
+                hits.extend(zip(positions, compress(keys, flags)))
+        return hits
+
+    def scan(self, data: bytes, first_only: bool = False) -> ScanResult:
+        """
+        Find all occurrences of every pattern in data.
+
+        Args:
+            data: Bytes to scan
+            first_only: Only keep each pattern's first (lowest offset) match
+
+        Returns:
+            ScanResult with per-pattern match offsets and timing stats
+        """
+        result = ScanResult()
+        stats = result.stats
+        stats.bytes_scanned = len(data)
+        stats.pattern_count = len(self.patterns)
+        stats.anchored_patterns = sum(len(entries) for table in self._anchors.values() for entries in table.values())
+        stats.fallback_patterns = len(self._fallback)
+        stats.index_seconds = self.index_seconds
+
+        # Pass 1: collect anchor hits
+        start = time.perf_counter()
+        hits_by_size = {size: self._collect_anchor_hits(data, size) for size in ANCHOR_SIZES}
+        stats.anchor_hits = sum(len(hits) for hits in hits_by_size.values())
+        stats.scan_seconds = time.perf_counter() - start
+
+        # Pass 2: verify candidates against their full masked pattern
+        start = time.perf_counter()
+        matches = result.matches
+        patterns = self.patterns
+        for size, hits in hits_by_size.items():
+            table = self._anchors[size]
+            if first_only:
+                # Visit hits in file order so matched patterns can be skipped early
+                hits.sort()
+            for position, key in hits:
+                for index, anchor_offset in table[key]:
+                    if first_only and index in matches:
+                        continue
+                    pattern_start = position - anchor_offset
+                    if pattern_start % self.alignment:
+                        continue
+                    if patterns[index].matches_at(data, pattern_start):
+                        matches.setdefault(index, []).append(pattern_start)
+
+        for index, regex in self._fallback:
+            pos = 0
+            while True:
+                match = regex.search(data, pos)
+                if match is None:
+                    break
+                pos = match.start() + 1
+                if match.start() % self.alignment:
+                    continue
+                matches.setdefault(index, []).append(match.start())
+                if first_only:
+                    break
+
+        for index in matches:
+            matches[index].sort()
+            if first_only:
+                del matches[index][1:]
+        stats.match_count = sum(len(offsets) for offsets in matches.values())
+        stats.verify_seconds = time.perf_counter() - start
+
+        return result
@@ -0,0 +1,149 @@
+"""
+Padding Scanner Service
+Finds runs of fill bytes (0x00, 0xFF, nop words) in game files for use as codecaves
+"""
+
+import re
+from typing import List, Optional, Callable, Dict
+
+from services.scan_index_service import CATEGORY_PADDING
+
+
+class PaddingRun:
+    """A contiguous run of fill bytes"""
+
+    def __init__(self, file_offset: int, size: int, fill: bytes):
+        self.file_offset = file_offset
+        self.size = size
+        self.fill = fill
+
+    @property
+    def end_offset(self) -> int:
+        return self.file_offset + self.size
+
+    def __repr__(self):
+        return f"PaddingRun(offset=0x{self.file_offset:X}, size=0x{self.size:X}, fill={self.fill.hex()})"
+
+
+class PaddingScannerService:
+    """
+    Scans data for runs of a fill pattern using a compiled regex, so the
+    byte-by-byte work happens in C. The data is processed in chunks to
+    report progress and allow cancellation from another thread.
+    """
+
+    # Fill patterns offered in the Codecave Finder
+    FILL_PATTERNS: Dict[str, bytes] = {
+        "0x00": b'\x00',
+        "0xFF": b'\xff',
+        "NOP (PowerPC 0x60000000)": b'\x60\x00\x00\x00',
+    }
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def scan_file(self, file_path: str, min_size: int, fill: bytes = b'\x00', alignment: int = 1,
+                  progress_callback: Optional[Callable[[float], None]] = None,
+                  cancel_check: Optional[Callable[[], bool]] = None,
+                  scan_index=None) -> Optional[List[PaddingRun]]:
+        """
+        Read a file and scan it. See scan_data.
+        With a ScanIndexService, results for unchanged files are loaded instead of rescanned.
+        """
+        params = f"{min_size}:{fill.hex()}:{alignment}"
+        if scan_index is not None:
+            indexed = scan_index.get(file_path, CATEGORY_PADDING, params)
+            if indexed is not None:
+                if progress_callback:
+                    progress_callback(1.0)
+                return [PaddingRun(offset, size, fill) for offset, size in indexed]
+
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        runs = self.scan_data(data, min_size, fill, alignment, progress_callback, cancel_check)
+
+        if runs is not None and scan_index is not None:
+            scan_index.put(file_path, CATEGORY_PADDING, params, [[run.file_offset, run.size] for run in runs])
+        return runs
+
+    def scan_data(self, data: bytes, min_size: int, fill: bytes = b'\x00', alignment: int = 1,
+                  progress_callback: Optional[Callable[[float], None]] = None,
+                  cancel_check: Optional[Callable[[], bool]] = None) -> Optional[List[PaddingRun]]:
+        """
+        Find every run of fill at least min_size bytes long (after alignment trimming).
+
+        Args:
+            data: Bytes to scan
+            min_size: Minimum run size in bytes
+            fill: Fill pattern (one byte, or a word such as a nop instruction)
+            alignment: Trim each run's start and end to multiples of this
+            progress_callback: Called with progress in [0, 1] after each chunk
+            cancel_check: Polled after each chunk; scanning stops if it returns True
+
+        Returns:
+            Runs in file order, or None if the scan was cancelled
+        """
+        if not fill:
+            raise ValueError("Fill pattern must not be empty")
+
+        fill_length = len(fill)
+        min_repeats = max(1, -(-min_size // fill_length))
+        run_pattern = re.compile(b'(?:' + re.escape(fill) + b'){%d,}' % min_repeats)
+        continuation_pattern = re.compile(b'(?:' + re.escape(fill) + b')*')
+
+        # Any qualifying run starting inside a chunk is fully visible within this overlap
+        overlap = min_repeats * fill_length
+
+        runs = []
+        data_length = len(data)
+        pos = 0
+        chunk_start = 0
+
+        while chunk_start < data_length:
+            chunk_end = min(chunk_start + self.CHUNK_SIZE, data_length)
+            search_end = min(chunk_end + overlap, data_length)
+
+            while True:
+                match = run_pattern.search(data, pos, search_end)
+                if match is None or match.start() >= chunk_end:
+                    break
+
+                # The run may continue past the searched window; a multi-byte fill
+                # out of phase with the window ends up to len(fill) - 1 bytes short of it
+                run_end = match.end()
+                if search_end - run_end < fill_length:
+                    run_end = continuation_pattern.match(data, run_end).end()
+
+                run = self._trim_run(match.start(), run_end, fill, alignment)
+                if run is not None and run.size >= min_size:
+                    runs.append(run)
+                pos = run_end
+
+            chunk_start = chunk_end
+            pos = max(pos, chunk_start)
+
+            if progress_callback:
+                progress_callback(chunk_start / data_length)
+            if cancel_check and cancel_check():
+                return None
+
+        return runs
+
+    def _trim_run(self, start: int, end: int, fill: bytes, alignment: int) -> Optional[PaddingRun]:
+        """
+        Shrink a run so it starts and ends on alignment boundaries.
+        Multi-byte fills keep their phase, so the trimmed run is still whole fill words.
+        """
+        fill_length = len(fill)
+        trimmed_start = start
+        while trimmed_start % alignment or (trimmed_start - start) % fill_length:
+            trimmed_start += 1
+            if trimmed_start >= end:
+                return None
+
+        trimmed_end = end - (end - trimmed_start) % fill_length
+        trimmed_end -= trimmed_end % alignment
+        if trimmed_end <= trimmed_start:
+            return None
+
+        return PaddingRun(trimmed_start, trimmed_end - trimmed_start, fill)
+
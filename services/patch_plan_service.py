@@ -0,0 +1,325 @@
+"""
+Patch Plan Service
+Builds the list of writes (file, offset, bytes, source target) for every enabled
+codecave, hook and binary patch in a build, shared by the ISO builder, the visual
+patcher and cheat code generation
+"""
+
+import os
+import mmap
+from typing import List, Dict, Optional, Tuple
+
+from classes.project_data.project_data import ProjectData
+from functions.verbose_print import verbose_print
+
+PATCH_TYPE_CODECAVE = "Codecave"
+PATCH_TYPE_HOOK = "Hook"
+PATCH_TYPE_BINARY_PATCH = "Binary Patch"
+
+
+def merge_spans(spans: List[Tuple[int, int]], merge_gap: int = 1, align: int = 1,
+                limit: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Sort (offset, length) spans, widen each to multiples of align, and join
+    spans separated by fewer than merge_gap bytes. Ends are clamped to limit.
+    """
+    merged: List[List[int]] = []
+    for offset, length in sorted(spans):
+        start = offset - offset % align
+        end = offset + length + (-(offset + length) % align)
+        if limit is not None:
+            end = min(end, limit)
+        if merged and start - merged[-1][1] < merge_gap:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end - start) for start, end in merged if end > start]
+
+
+def changed_spans(data: bytes, baseline: Optional[bytes], merge_gap: int = 1,
+                  align: int = 1) -> List[Tuple[int, int]]:
+    """
+    (offset, length) spans of data that differ from baseline (see merge_spans
+    for merge_gap and align). Bytes past the end of baseline always count as
+    changed; without a baseline the whole of data is one span.
+    """
+    if not data:
+        return []
+    if baseline is None:
+        return [(0, len(data))]
+
+    spans: List[Tuple[int, int]] = []
+    compared = min(len(data), len(baseline))
+    i = 0
+    while i < compared:
+        if data[i] == baseline[i]:
+            i += 1
+            continue
+        start = i
+        while i < compared and data[i] != baseline[i]:
+            i += 1
+        spans.append((start, i - start))
+
+    if len(data) > compared:
+        spans.append((compared, len(data) - compared))
+
+    return merge_spans(spans, merge_gap, align, len(data))
+
+
+class PatchEntry:
+    """A single compiled target and where its bytes go"""
+
+    def __init__(self, name: str, patch_type: str, target, data: bytes,
+                 file_name: Optional[str], file_offset: Optional[int],
+                 memory_address: Optional[int], allocated_size: int):
+        self.name = name
+        self.patch_type = patch_type  # "Codecave", "Hook", "Binary Patch"
+        self.target = target
+        self.data = data
+        self.file_name = file_name
+        self.file_offset = file_offset
+        self.memory_address = memory_address
+        self.allocated_size = allocated_size
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def end_offset(self) -> int:
+        return self.file_offset + len(self.data)
+
+    @property
+    def writes_to_file(self) -> bool:
+        """False for memory-only and new-file targets, and targets without a file offset"""
+        return (self.file_offset is not None
+                and not self.target.IsMemoryOnly()
+                and not self.target.IsNewFile())
+
+    def __repr__(self):
+        offset = f"0x{self.file_offset:X}" if self.file_offset is not None else "None"
+        return f"PatchEntry({self.patch_type} '{self.name}', file={self.file_name}, offset={offset}, size=0x{self.size:X})"
+
+
+class PatchPlan:
+    """
+    Every patch for a build, in application order (codecaves, hooks, then binary patches).
+    When two entries overlap, the later one wins, matching the order they are applied in.
+    """
+
+    def __init__(self, entries: List[PatchEntry], warnings: List[str]):
+        self.entries = entries
+        self.warnings = warnings
+        self._entries_by_name: Dict[str, PatchEntry] = {entry.name: entry for entry in entries}
+
+    def get_entry(self, name: str) -> Optional[PatchEntry]:
+        return self._entries_by_name.get(name)
+
+    def get_data(self, name: str) -> Optional[bytes]:
+        """Compiled bytes for a target, or None if it has no .bin"""
+        entry = self._entries_by_name.get(name)
+        return entry.data if entry else None
+
+    def get_file_entries(self, file_name: str) -> List[PatchEntry]:
+        """Entries written into an existing game file, in application order"""
+        return [entry for entry in self.entries if entry.file_name == file_name and entry.writes_to_file]
+
+    def find_overlaps(self, file_name: str) -> List[Tuple[PatchEntry, PatchEntry]]:
+        """Pairs of (earlier, later) entries whose byte ranges in the file intersect"""
+        order = {id(entry): index for index, entry in enumerate(self.entries)}
+        entries = sorted(
+            (entry for entry in self.get_file_entries(file_name) if entry.data),
+            key=lambda entry: entry.file_offset
+        )
+
+        overlaps = []
+        active: List[PatchEntry] = []
+        for entry in entries:
+            active = [other for other in active if other.end_offset > entry.file_offset]
+            for other in active:
+                pair = (other, entry) if order[id(other)] < order[id(entry)] else (entry, other)
+                overlaps.append(pair)
+            active.append(entry)
+        return overlaps
+
+    def apply_to_buffer(self, file_name: str, buffer: bytearray) -> Tuple[List[PatchEntry], List[str]]:
+        """
+        Write a file's entries into an in-memory copy of it.
+        Returns (applied entries, warnings for skipped entries).
+        """
+        applied = []
+        warnings = []
+        for entry in self.get_file_entries(file_name):
+            problem = self._check_bounds(entry, len(buffer))
+            if problem:
+                warnings.append(problem)
+                continue
+            buffer[entry.file_offset:entry.end_offset] = entry.data
+            applied.append(entry)
+        return applied, warnings
+
+    def apply_to_file(self, file_name: str, file_path: str) -> Tuple[List[PatchEntry], List[str]]:
+        """
+        Write a file's entries directly into file_path through a memory map,
+        so only the touched pages are read and written.
+        Returns (applied entries, warnings for skipped entries).
+        """
+        applied = []
+        warnings = []
+        entries = self.get_file_entries(file_name)
+        file_size = os.path.getsize(file_path)
+
+        writable = []
+        for entry in entries:
+            problem = self._check_bounds(entry, file_size)
+            if problem:
+                warnings.append(problem)
+            else:
+                writable.append(entry)
+
+        # mmap can't map an empty file, and there is nothing to write anyway
+        if not writable or file_size == 0:
+            return applied, warnings
+
+        with open(file_path, 'r+b') as f:
+            with mmap.mmap(f.fileno(), 0) as mapped:
+                for entry in writable:
+                    mapped[entry.file_offset:entry.end_offset] = entry.data
+                    applied.append(entry)
+                mapped.flush()
+
+        return applied, warnings
+
+    @staticmethod
+    def _check_bounds(entry: PatchEntry, file_size: int) -> Optional[str]:
+        if entry.file_offset < 0 or entry.file_offset >= file_size:
+            return f"Address 0x{entry.file_offset:X} out of bounds for {entry.patch_type.lower()} '{entry.name}'. Skipping."
+        if entry.end_offset > file_size:
+            return f"Patch for {entry.patch_type.lower()} '{entry.name}' would overflow file. Skipping."
+        return None
+
+
+class PatchPlanService:
+    """Builds a PatchPlan for the current build, reading each compiled .bin once"""
+
+    def __init__(self, project_data: ProjectData):
+        self.project_data = project_data
+        self.bin_output_dir = os.path.join(
+            self.project_data.GetProjectFolder(), '.config', 'output', 'bin_files'
+        )
+
+    def build_plan(self) -> PatchPlan:
+        current_build = self.project_data.GetCurrentBuildVersion()
+
+        entries: List[PatchEntry] = []
+        warnings: List[str] = []
+
+        all_targets = [
+            (current_build.GetEnabledCodeCaves(), PATCH_TYPE_CODECAVE),
+            (current_build.GetEnabledHooks(), PATCH_TYPE_HOOK),
+            (current_build.GetEnabledBinaryPatches(), PATCH_TYPE_BINARY_PATCH)
+        ]
+
+        for targets, patch_type in all_targets:
+            for target in targets:
+                name = target.GetName()
+                bin_file = os.path.join(self.bin_output_dir, f"{name}.bin")
+                if not os.path.isfile(bin_file):
+                    warnings.append(f"Binary not found for {patch_type.lower()} '{name}'")
+                    continue
+
+                with open(bin_file, 'rb') as f:
+                    data = f.read()
+
+                file_offset = None
+                if not target.IsMemoryOnly() and not target.IsNewFile():
+                    file_offset = self.parse_hex_address(target.GetInjectionFileAddress())
+                    if file_offset is None:
+                        warnings.append(f"No valid injection file address set for {patch_type.lower()} '{name}'. Skipping.")
+
+                try:
+                    allocated_size = target.GetSizeAsInt() if target.GetSize() else len(data)
+                except (ValueError, TypeError, AttributeError):
+                    allocated_size = len(data)
+
+                entries.append(PatchEntry(
+                    name=name,
+                    patch_type=patch_type,
+                    target=target,
+                    data=data,
+                    file_name=target.GetInjectionFile(),
+                    file_offset=file_offset,
+                    memory_address=self.parse_hex_address(target.GetMemoryAddress()),
+                    allocated_size=allocated_size
+                ))
+
+        plan = PatchPlan(entries, warnings)
+
+        for file_name in dict.fromkeys(entry.file_name for entry in entries if entry.writes_to_file):
+            for earlier, later in plan.find_overlaps(file_name):
+                warnings.append(
+                    f"Overlap in {file_name}: {earlier.patch_type.lower()} '{earlier.name}' "
+                    f"(0x{earlier.file_offset:X}-0x{earlier.end_offset:X}) and {later.patch_type.lower()} "
+                    f"'{later.name}' (0x{later.file_offset:X}-0x{later.end_offset:X}); '{later.name}' wins"
+                )
+
+        verbose_print(f"Patch plan: {len(entries)} target(s), {len(warnings)} warning(s)")
+        return plan
+
+    def read_vanilla_bytes(self, target, length: int) -> Optional[bytes]:
+        """
+        Up to length bytes the target overwrites, as they are in the unmodified game.
+
+        Targets with an injection file address are read from that file in the game
+        folder; memory-only targets are located in the main executable through its
+        section map. Returns None for new files, external files and addresses with
+        no file backing (bss, memory outside the executable). The result is shorter
+        than length when the target runs past the end of the file or section.
+        """
+        build = self.project_data.GetCurrentBuildVersion()
+        if target.IsNewFile():
+            return None
+
+        if target.IsMemoryOnly():
+            file_name = build.GetMainExecutable()
+            memory_address = self.parse_hex_address(target.GetMemoryAddress())
+            index = build.GetAddressIndex(file_name) if file_name and memory_address is not None else None
+            if index is None:
+                return None
+            if memory_address >= 0x80000000:
+                memory_address &= 0x00FFFFFF
+            section = index.find_by_memory(memory_address)
+            if section is None or section.section_type == "bss":
+                return None
+            file_offset = memory_address - section.offset_diff
+            length = min(length, section.mem_end - memory_address)
+        else:
+            file_name = target.GetInjectionFile()
+            file_offset = self.parse_hex_address(target.GetInjectionFileAddress())
+            if not file_name or file_offset is None:
+                return None
+
+        if build.GetInjectionFileType(file_name) != "disk":
+            return None
+        vanilla_path = build.FindFileInGameFolder(file_name)
+        if not vanilla_path:
+            return None
+
+        try:
+            with open(vanilla_path, 'rb') as f:
+                f.seek(file_offset)
+                return f.read(length)
+        except OSError:
+            return None
+
+    @staticmethod
+    def parse_hex_address(value) -> Optional[int]:
+        """Parse '80123456' / '0x80123456' / int, or None if unset or invalid"""
+        if isinstance(value, int):
+            return value
+        if not value or value == "None":
+            return None
+        try:
+            return int(str(value).strip(), 16)
+        except ValueError:
+            return None
@@ -3,6 +3,9 @@ from typing import Optional, Dict, List, Tuple, Union
 from classes.project_data.project_data import ProjectData
 from classes.injection_targets.hook import Hook
 from functions.verbose_print import verbose_print
+from services.multi_pattern_scanner import MaskedPattern, MultiPatternScanner
+from services.scan_index_service import ScanIndexService, CATEGORY_PATTERN_HITS
+from services.section_parser_service import SectionParserService
 
 class PatternMatch:
     """Represents a found pattern match"""
@@ -59,27 +62,15 @@ class FlexiblePattern:
         Search for this pattern in data.
         Returns the position where the pattern starts, or None if not found.
         """
-        # We need to search byte by byte since we have variable sections
-        # Start with the first segment to optimize
         if not self.segments or self.segments[0][0] != "bytes":
             return None
-        
-        first_bytes = self.segments[0][1]
-        search_pos = 0
-        
-        while True:
-            # Find the next occurrence of the first byte sequence
-            try:
-                search_pos = data.index(first_bytes, search_pos)
-            except ValueError:
-                return None  # Not found
-            
-            # Try to match the full pattern from this position
-            if self.match(data, search_pos) is not None:
-                return search_pos
-            
-            # Move to next position
-            search_pos += 1
+
+        scanner = MultiPatternScanner([self.to_masked_pattern()])
+        return scanner.scan(data, first_only=True).first_match(0)
+
+    def to_masked_pattern(self, label: str = "") -> MaskedPattern:
+        """Convert to a MaskedPattern (skips become wildcard bytes)"""
+        return MaskedPattern.from_segments(label, self.segments)
     
     def total_length(self) -> int:
         """Calculate the total length of the pattern including skips"""
@@ -228,25 +219,46 @@ class PatternService:
     def __init__(self, project_data: ProjectData):
         self.project_data = project_data
     
-    def _search_pattern(self, exe_data: bytes, pattern_info: Dict) -> Optional[int]:
+    def _to_masked_pattern(self, pattern_name: str, pattern_info: Dict) -> Optional[MaskedPattern]:
         """
-        Search for a pattern in executable data.
+        Convert a pattern definition to a MaskedPattern.
         Handles both simple byte patterns and flexible patterns.
-        Returns file offset if found, None otherwise.
         """
-        # Check if this is a flexible pattern
         if "pattern" in pattern_info:
-            flexible_pattern = pattern_info["pattern"]
-            return flexible_pattern.search(exe_data)
-        
-        # Simple byte pattern
+            return pattern_info["pattern"].to_masked_pattern(pattern_name)
         elif "bytes" in pattern_info:
-            pattern_bytes = pattern_info["bytes"]
-            if pattern_bytes in exe_data:
-                return exe_data.index(pattern_bytes)
-        
+            return MaskedPattern(pattern_name, pattern_info["bytes"])
         return None
-    
+
+    def _search_patterns(self, exe_data: bytes, patterns: Dict, exe_path: Optional[str] = None) -> Dict[str, int]:
+        """
+        Search for every pattern in executable data in a single pass.
+        Returns {pattern name: first file offset} for the patterns that were found.
+        If exe_path is given, hits are reused from the project's scan index when the file is unchanged.
+        """
+        names = []
+        masked_patterns = []
+        for pattern_name, pattern_info in patterns.items():
+            masked_pattern = self._to_masked_pattern(pattern_name, pattern_info)
+            if masked_pattern is not None:
+                names.append(pattern_name)
+                masked_patterns.append(masked_pattern)
+
+        scan_index = ScanIndexService.for_project(self.project_data) if exe_path else None
+        index_params = f"hooks:{ScanIndexService.make_pattern_key(masked_patterns)}"
+        if scan_index is not None:
+            found_offsets = scan_index.get(exe_path, CATEGORY_PATTERN_HITS, index_params)
+            if found_offsets is not None:
+                return found_offsets
+
+        scan_result = MultiPatternScanner(masked_patterns).scan(exe_data, first_only=True)
+        verbose_print(f"  {scan_result.stats}")
+
+        found_offsets = {names[index]: offsets[0] for index, offsets in scan_result.matches.items()}
+        if scan_index is not None:
+            scan_index.put(exe_path, CATEGORY_PATTERN_HITS, index_params, found_offsets)
+        return found_offsets
+
     def _get_pattern_length(self, pattern_info: Dict) -> int:
         """Get the length of a pattern (for calculating hook offset)"""
         if "pattern" in pattern_info:
@@ -319,10 +331,12 @@ class PatternService:
         
         print(f"Searching {len(patterns)} pattern(s)...")
         
-        # Search for patterns
+        # Search for all patterns in one pass
+        found_offsets = self._search_patterns(exe_data, patterns, exe_path)
+
         matches = []
         for pattern_name, pattern_info in patterns.items():
-            file_offset_match = self._search_pattern(exe_data, pattern_info)
+            file_offset_match = found_offsets.get(pattern_name)
             
             if file_offset_match is not None:
                 hook_file_offset = file_offset_match + pattern_info["hook_offset"]
@@ -421,11 +435,11 @@ class PatternService:
 
     def _find_ps2_offset(self, exe_path: str) -> int:
         """
-        Find PS2 ELF offset using ee-objdump.
+        Find PS2 ELF offset from its first section.
         Returns the difference between memory address and file offset.
         First checks if section map is already cached.
         """
-        # Check if section map already exists (avoid running objdump again)
+        # Check if section map already exists
         current_build = self.project_data.GetCurrentBuildVersion()
         main_exe = current_build.GetMainExecutable()
 
@@ -436,91 +450,22 @@ class PatternService:
                 print(f" Using cached section map for PS2 offset: 0x{offset:X}")
                 return offset
 
-        # No cached section map - run objdump
-        import subprocess
-
-        tool_dir = os.getcwd()
-        objdump_path = os.path.join(tool_dir, "prereq", "PS2ee", "bin", "ee-objdump.exe")
-
-        print(f"Looking for ee-objdump at: {objdump_path}")
-        print(f"Exists: {os.path.exists(objdump_path)}")
-
-        if not os.path.exists(objdump_path):
-            print(f" Warning: ee-objdump not found at {objdump_path}")
+        sections = SectionParserService.parse_executable_sections(exe_path, "PS2")
+        if not sections:
+            print(" Warning: Could not read PS2 ELF sections")
             return 0x100000
 
-        try:
-            print(f"Running ee-objdump on: {exe_path}")
-            
-            result = subprocess.run(
-                [objdump_path, exe_path, "-x"],
-                shell=False,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=tool_dir,
-                timeout=10
-            )
-            
-            print(f"ee-objdump return code: {result.returncode}")
-            
-            if result.stderr:
-                print(f"ee-objdump stderr: {result.stderr}")
-            
-            if "Idx Name" not in result.stdout:
-                print(f" Warning: Could not parse objdump output")
-                print(f"  Output preview: {result.stdout[:500]}")
-                return 0x100000
-            
-            lines = result.stdout.split("Idx Name")[1].split("\n")
-            print(f"Lines after 'Idx Name': {lines[:5]}")
-            
-            objdump_section_0 = None
-            for line in lines[1:]:
-                if line.strip() and not line.startswith("Idx"):
-                    objdump_section_0 = line
-                    break
-            
-            if not objdump_section_0:
-                print(" Warning: Could not find section 0")
-                return 0x100000
-            
-            objdump_section_0_list = objdump_section_0.split()
-            
-            print(f"  PS2 objdump section 0: {objdump_section_0_list}")
-            
-            if len(objdump_section_0_list) >= 7:
-                vma = int(objdump_section_0_list[3], base=16)
-                file_off = int(objdump_section_0_list[5], base=16)
-                offset = vma - file_off
-            elif len(objdump_section_0_list) >= 6:
-                vma = int(objdump_section_0_list[3], base=16)
-                file_off = int(objdump_section_0_list[4], base=16)
-                offset = vma - file_off
-            else:
-                print(f" Warning: Unknown ELF format (section list length: {len(objdump_section_0_list)})")
-                print(f"  Section list: {objdump_section_0_list}")
-                return 0x100000
-            
-            print(f" PS2 offset calculated: 0x{offset:X} (VMA: 0x{vma:X}, File: 0x{file_off:X})")
-            return offset
-            
-        except subprocess.TimeoutExpired:
-            print(" Warning: ee-objdump timed out")
-            return 0x100000
-        except Exception as e:
-            print(f" Warning: Failed to calculate PS2 offset: {e}")
-            import traceback
-            traceback.print_exc()
-            return 0x100000
+        offset = sections[0].offset_diff
+        print(f" PS2 offset calculated: 0x{offset:X} (VMA: 0x{sections[0].mem_start:X}, File: 0x{sections[0].file_offset:X})")
+        return offset
 
     def _find_gamecube_wii_offset(self, exe_path: str) -> int:
         """
-        Find GameCube/Wii DOL offset using doltool.
+        Find GameCube/Wii DOL offset from its first text section.
         Returns the difference between memory address and file offset.
         First checks if section map is already cached.
         """
-        # Check if section map already exists (avoid running doltool again)
+        # Check if section map already exists
         current_build = self.project_data.GetCurrentBuildVersion()
         main_exe = current_build.GetMainExecutable()
 
@@ -533,55 +478,15 @@ class PatternService:
                 print(f" Using cached section map for GC/Wii offset: 0x{offset:X}")
                 return offset
 
-        # No cached section map - run doltool
-        import subprocess
-
-        tool_dir = os.getcwd()
-        doltool_path = os.path.join(tool_dir, "prereq", "doltool", "doltool.exe")
-
-        if not os.path.exists(doltool_path):
-            print(f" Warning: doltool not found at {doltool_path}")
+        sections = SectionParserService.parse_executable_sections(exe_path, current_build.GetPlatform())
+        text_sections = [s for s in sections if s.section_type == "text"]
+        if not text_sections:
+            print(" Warning: Could not read DOL text sections")
             return 0x3000
 
-        try:
-            result = subprocess.run(
-                [doltool_path, "-i", exe_path],
-                shell=False,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=tool_dir
-            )
-            
-            if "Text Section  1" not in result.stdout:
-                print(f" Warning: Could not parse doltool output")
-                print(f"  stderr: {result.stderr}")
-                return 0x3000
-            
-            doltool_section_1 = result.stdout.split("Text Section  1:")[1]
-            doltool_section_1_list = doltool_section_1.split()
-
-            verbose_print(f"  GC/Wii doltool section: {doltool_section_1_list}")
-
-            disk_area = int(doltool_section_1_list[0].split('=')[1], base=16)
-            memory_area_str = doltool_section_1_list[1].split('=')[1]
-
-            if memory_area_str.lower().startswith("0x80"):
-                memory_area_str = "0x" + memory_area_str[4:]
-            elif memory_area_str.lower().startswith("80"):
-                memory_area_str = "0x" + memory_area_str[2:]
-
-            memory_area = int(memory_area_str, base=16)
-            offset = memory_area - disk_area
-
-            verbose_print(f" GC/Wii offset calculated: 0x{offset:X} (Mem: 0x{memory_area:X}, Disk: 0x{disk_area:X})")
-            return offset
-            
-        except Exception as e:
-            print(f" Warning: Failed to calculate GC/Wii offset: {e}")
-            import traceback
-            traceback.print_exc()
-            return 0x3000
+        offset = text_sections[0].offset_diff
+        verbose_print(f" GC/Wii offset calculated: 0x{offset:X} (Mem: 0x{text_sections[0].mem_start:X}, Disk: 0x{text_sections[0].file_offset:X})")
+        return offset
     
     def _calculate_memory_address(self, platform: str, file_offset: int, base_offset: int) -> int:
         """Calculate the in-memory address from file offset"""
@@ -749,27 +654,8 @@ class PatternService:
         """
         Validate that required tools are available for the platform.
         Returns (success, error_message)
+        Executable headers are parsed in-process, so no platform needs external tools.
         """
-        tool_dir = os.getcwd()
-        
-        if platform == "PS2":
-            objdump_path = os.path.join(tool_dir, "prereq", "PS2ee", "bin", "ee-objdump.exe")
-            if not os.path.exists(objdump_path):
-                return False, (
-                    "PS2 toolchain not found!\n\n"
-                    f"Expected: {objdump_path}\n\n"
-                    "Please ensure the PS2 toolchain is installed in prereq/PS2ee/"
-                )
-        
-        elif platform in ["Gamecube", "Wii"]:
-            doltool_path = os.path.join(tool_dir, "prereq", "doltool", "doltool.exe")
-            if not os.path.exists(doltool_path):
-                return False, (
-                    "DOL tool not found!\n\n"
-                    f"Expected: {doltool_path}\n\n"
-                    "Please ensure doltool is installed in prereq/doltool/"
-                )
-
         return True, ""
 
 
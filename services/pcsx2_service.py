@@ -1,3 +1,4 @@
+import sys
 import ctypes
 import ctypes.wintypes
 import psutil
@@ -13,45 +14,46 @@ from services.memory_utils import read_process_memory
 from functions.PE import find_export_rva
 
 # --- Windows API Definitions (Kernel32.dll) ---
-# Load kernel32 library
-kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-
-# Define necessary Win32 types and constants
-SIZE_T = ctypes.c_size_t
-DWORD = ctypes.wintypes.DWORD
-HANDLE = ctypes.wintypes.HANDLE
-LPCVOID = ctypes.wintypes.LPCVOID
-LPVOID = ctypes.wintypes.LPVOID
-
-# Define Access Rights for OpenProcess 
-PROCESS_VM_READ = 0x0010
-PROCESS_QUERY_INFORMATION = 0x0400
-PROCESS_ALL_ACCESS = (PROCESS_VM_READ | PROCESS_QUERY_INFORMATION)
-
-# Function Signatures for Process Handling
-OpenProcess = kernel32.OpenProcess
-OpenProcess.argtypes = [DWORD, ctypes.wintypes.BOOL, DWORD]
-OpenProcess.restype = HANDLE
-
-CloseHandle = kernel32.CloseHandle
-CloseHandle.argtypes = [HANDLE]
-CloseHandle.restype = ctypes.wintypes.BOOL
-
-ReadProcessMemory = kernel32.ReadProcessMemory
-ReadProcessMemory.argtypes = [
-    HANDLE,      # hProcess
-    LPCVOID,     # lpBaseAddress
-    LPVOID,      # lpBuffer
-    SIZE_T,      # nSize
-    ctypes.POINTER(SIZE_T)  # lpNumberOfBytesRead
-]
-ReadProcessMemory.restype = ctypes.wintypes.BOOL
-
-# Functions for Symbol Lookup
-LoadLibrary = kernel32.LoadLibraryW
-GetProcAddress = kernel32.GetProcAddress
-GetProcAddress.restype = ctypes.c_ulonglong # Use c_ulonglong for 64-bit RVA
-FreeLibrary = kernel32.FreeLibrary
+if sys.platform == "win32":
+    # Load kernel32 library
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    # Define necessary Win32 types and constants
+    SIZE_T = ctypes.c_size_t
+    DWORD = ctypes.wintypes.DWORD
+    HANDLE = ctypes.wintypes.HANDLE
+    LPCVOID = ctypes.wintypes.LPCVOID
+    LPVOID = ctypes.wintypes.LPVOID
+
+    # Define Access Rights for OpenProcess 
+    PROCESS_VM_READ = 0x0010
+    PROCESS_QUERY_INFORMATION = 0x0400
+    PROCESS_ALL_ACCESS = (PROCESS_VM_READ | PROCESS_QUERY_INFORMATION)
+
+    # Function Signatures for Process Handling
+    OpenProcess = kernel32.OpenProcess
+    OpenProcess.argtypes = [DWORD, ctypes.wintypes.BOOL, DWORD]
+    OpenProcess.restype = HANDLE
+
+    CloseHandle = kernel32.CloseHandle
+    CloseHandle.argtypes = [HANDLE]
+    CloseHandle.restype = ctypes.wintypes.BOOL
+
+    ReadProcessMemory = kernel32.ReadProcessMemory
+    ReadProcessMemory.argtypes = [
+        HANDLE,      # hProcess
+        LPCVOID,     # lpBaseAddress
+        LPVOID,      # lpBuffer
+        SIZE_T,      # nSize
+        ctypes.POINTER(SIZE_T)  # lpNumberOfBytesRead
+    ]
+    ReadProcessMemory.restype = ctypes.wintypes.BOOL
+
+    # Functions for Symbol Lookup
+    LoadLibrary = kernel32.LoadLibraryW
+    GetProcAddress = kernel32.GetProcAddress
+    GetProcAddress.restype = ctypes.c_ulonglong # Use c_ulonglong for 64-bit RVA
+    FreeLibrary = kernel32.FreeLibrary
 # -----------------------------------------------
 
 def find_pcsx2_pid() -> int | None:
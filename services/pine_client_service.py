@@ -0,0 +1,432 @@
+"""
+PINE Client Service
+Talks to PCSX2's PINE IPC server directly, packing many read/write commands into
+each IPC message instead of sending one request per value or section
+"""
+
+import os
+import sys
+import queue
+import socket
+import struct
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from functions.verbose_print import verbose_print
+
+PINE_DEFAULT_SLOT = 28011
+
+# Buffer sizes of the PCSX2 server; a message and its reply must each fit
+MAX_IPC_SIZE = 650000
+MAX_IPC_RETURN_SIZE = 450000
+
+MSG_READ8 = 0x00
+MSG_READ16 = 0x01
+MSG_READ32 = 0x02
+MSG_READ64 = 0x03
+MSG_WRITE8 = 0x04
+MSG_WRITE16 = 0x05
+MSG_WRITE32 = 0x06
+MSG_WRITE64 = 0x07
+MSG_VERSION = 0x08
+MSG_STATUS = 0x0F
+
+RESULT_OK = 0x00
+RESULT_FAIL = 0xFF
+
+EMU_STATUS_RUNNING = 0
+EMU_STATUS_PAUSED = 1
+EMU_STATUS_SHUTDOWN = 2
+
+_READ_OPCODES = {1: MSG_READ8, 2: MSG_READ16, 4: MSG_READ32, 8: MSG_READ64}
+_WRITE_OPCODES = {1: MSG_WRITE8, 2: MSG_WRITE16, 4: MSG_WRITE32, 8: MSG_WRITE64}
+
+_HEADER = struct.Struct("<I")
+_REPLY_HEADER = struct.Struct("<IB")
+
+
+def pine_socket_address(slot: int = PINE_DEFAULT_SLOT) -> Tuple[int, object]:
+    """
+    (socket family, address) of the PINE server for a slot: TCP on Windows,
+    a Unix socket (pcsx2.sock, or pcsx2.sock.<slot> for other slots) elsewhere
+    """
+    if sys.platform == "win32":
+        return socket.AF_INET, ("127.0.0.1", slot)
+
+    if sys.platform == "darwin":
+        directory = os.environ.get("TMPDIR", "/tmp")
+    else:
+        directory = os.environ.get("XDG_RUNTIME_DIR", "/tmp")
+    name = "pcsx2.sock" if slot == PINE_DEFAULT_SLOT else f"pcsx2.sock.{slot}"
+    return socket.AF_UNIX, os.path.join(directory, name)
+
+
+def _split_access(address: int, size: int) -> List[Tuple[int, int, int]]:
+    """
+    Cover [address, address + size) with naturally aligned accesses:
+    (address, access size, count) runs, using 64-bit accesses for the body
+    """
+    runs = []
+    end = address + size
+    while address < end:
+        if address % 8 == 0 and end - address >= 8:
+            count = (end - address) // 8
+            runs.append((address, 8, count))
+            address += count * 8
+            continue
+        for width in (4, 2, 1):
+            if address % width == 0 and end - address >= width:
+                runs.append((address, width, 1))
+                address += width
+                break
+    return runs
+
+
+def encode_pine_commands(opcode: int, address: int, width: int, count: int, data: Optional[bytes] = None) -> bytes:
+    """count same-width commands at consecutive addresses, encoded without a Python loop"""
+    arg_size = 5 + (width if data is not None else 0)
+    addresses = array("I", range(address, address + width * count, width))
+    if sys.byteorder == "big":
+        addresses.byteswap()
+    address_bytes = addresses.tobytes()
+
+    out = bytearray(arg_size * count)
+    out[0::arg_size] = bytes([opcode]) * count
+    for i in range(4):
+        out[1 + i::arg_size] = address_bytes[i::4]
+    if data is not None:
+        # Values are little-endian, like PS2 memory, so data bytes go in as they are
+        for i in range(width):
+            out[5 + i::arg_size] = data[i::width]
+    return bytes(out)
+
+
+class _PendingRead:
+    """A read split over one or more messages; resolves once every part arrived"""
+
+    def __init__(self, future: Future, size: int):
+        self.future = future
+        self.buffer = bytearray(size)
+        self.parts = 0
+        self.failed = False
+
+    def part_done(self, ok: bool):
+        self.parts -= 1
+        self.failed = self.failed or not ok
+        if self.parts == 0 and not self.future.done():
+            self.future.set_result(None if self.failed else bytes(self.buffer))
+
+
+class _PendingWrite:
+    def __init__(self, future: Future):
+        self.future = future
+        self.parts = 0
+        self.failed = False
+
+    def part_done(self, ok: bool):
+        self.parts -= 1
+        self.failed = self.failed or not ok
+        if self.parts == 0 and not self.future.done():
+            self.future.set_result(not self.failed)
+
+
+class _PineMessage:
+    """One IPC message: encoded commands plus where each reply byte goes"""
+
+    def __init__(self):
+        self.commands: List[bytes] = []
+        self.request_size = _HEADER.size
+        self.reply_size = _REPLY_HEADER.size
+        # (pending operation, destination offset or None, reply offset, length)
+        self.parts: List[Tuple[object, Optional[int], int, int]] = []
+
+    def fits(self, request_bytes: int, reply_bytes: int) -> bool:
+        return (self.request_size + request_bytes <= MAX_IPC_SIZE
+                and self.reply_size + reply_bytes <= MAX_IPC_RETURN_SIZE)
+
+    def encode(self) -> bytes:
+        return _HEADER.pack(self.request_size) + b"".join(self.commands)
+
+    def complete(self, reply: Optional[bytes]):
+        """Hand reply data (None if the message failed) to every operation in it"""
+        ok = reply is not None and len(reply) >= self.reply_size and reply[4] == RESULT_OK
+        for pending, destination, reply_offset, length in self.parts:
+            if ok and destination is not None:
+                pending.buffer[destination:destination + length] = reply[reply_offset:reply_offset + length]
+            pending.part_done(ok)
+
+
+class PineBatch:
+    """
+    Reads and writes queued for PineClient. Operations are packed into as few
+    IPC messages as the server's buffer sizes allow, in the order they were added.
+    """
+
+    def __init__(self, client: "PineClient"):
+        self.client = client
+        self._messages: List[_PineMessage] = [_PineMessage()]
+        self._submitted = False
+
+    def read(self, address: int, size: int) -> Future:
+        """Future resolving to the bytes at address, or None if the read failed"""
+        future = Future()
+        pending = _PendingRead(future, size)
+        if size <= 0:
+            future.set_result(b"")
+            return future
+
+        destination = 0
+        for run_address, width, count in _split_access(address, size):
+            while count:
+                message = self._message_for(5, width)
+                fit = min(count, (MAX_IPC_SIZE - message.request_size) // 5,
+                          (MAX_IPC_RETURN_SIZE - message.reply_size) // width)
+                message.commands.append(encode_pine_commands(_READ_OPCODES[width], run_address, width, fit))
+                message.parts.append((pending, destination, message.reply_size, fit * width))
+                message.request_size += 5 * fit
+                message.reply_size += fit * width
+                pending.parts += 1
+                run_address += fit * width
+                destination += fit * width
+                count -= fit
+        return future
+
+    def write(self, address: int, data: bytes) -> Future:
+        """Future resolving to True once data is written, False if the write failed"""
+        future = Future()
+        pending = _PendingWrite(future)
+        if not data:
+            future.set_result(True)
+            return future
+
+        source = 0
+        for run_address, width, count in _split_access(address, len(data)):
+            while count:
+                message = self._message_for(5 + width, 0)
+                fit = min(count, (MAX_IPC_SIZE - message.request_size) // (5 + width))
+                chunk = data[source:source + fit * width]
+                message.commands.append(encode_pine_commands(_WRITE_OPCODES[width], run_address, width, fit, chunk))
+                message.parts.append((pending, None, 0, 0))
+                message.request_size += (5 + width) * fit
+                pending.parts += 1
+                run_address += fit * width
+                source += fit * width
+                count -= fit
+        return future
+
+    def _message_for(self, request_bytes: int, reply_bytes: int) -> _PineMessage:
+        if not self._messages[-1].fits(request_bytes, reply_bytes):
+            self._messages.append(_PineMessage())
+        return self._messages[-1]
+
+    @property
+    def message_count(self) -> int:
+        return sum(1 for message in self._messages if message.parts)
+
+    def submit(self):
+        """Send the batch; futures resolve as replies come back"""
+        if self._submitted:
+            return
+        self._submitted = True
+        for message in self._messages:
+            if message.parts:
+                self.client._enqueue(message)
+
+
+class PineClient:
+    """
+    Connection to one PINE slot with a background I/O thread.
+
+    Messages go out one at a time in submission order: PCSX2 handles a single
+    message per read and drops anything queued behind it on the socket. The
+    pipelining comes from the thread instead; while it transfers one message
+    the caller is already encoding the next batch or using the last reply.
+    """
+
+    def __init__(self, slot: int = PINE_DEFAULT_SLOT, timeout: float = 5.0):
+        self.slot = slot
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._queue: "queue.Queue[Optional[_PineMessage]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.messages_sent = 0
+
+    # ---------- Public API ----------
+
+    def batch(self) -> PineBatch:
+        return PineBatch(self)
+
+    def wait(self, future: Future):
+        """Result of a batch future, or None if it did not resolve in time"""
+        try:
+            return future.result(timeout=self.timeout * 4)
+        except Exception:
+            return None
+
+    def read_bytes(self, address: int, size: int) -> Optional[bytes]:
+        batch = self.batch()
+        future = batch.read(address, size)
+        batch.submit()
+        return self.wait(future)
+
+    def write_bytes(self, address: int, data: bytes) -> bool:
+        batch = self.batch()
+        future = batch.write(address, data)
+        batch.submit()
+        return bool(self.wait(future))
+
+    def read_many(self, requests: Sequence[Tuple[int, int]]) -> List[Optional[bytes]]:
+        """Read each (address, size) using as few messages as possible"""
+        batch = self.batch()
+        futures = [batch.read(address, size) for address, size in requests]
+        batch.submit()
+        return [self.wait(future) for future in futures]
+
+    def write_many(self, writes: Sequence[Tuple[int, bytes]]) -> List[bool]:
+        batch = self.batch()
+        futures = [batch.write(address, data) for address, data in writes]
+        batch.submit()
+        return [bool(self.wait(future)) for future in futures]
+
+    def read_chunks(self, address: int, size: int, chunk_size: int = 0x100000,
+                    read_ahead: int = 2):
+        """
+        Yield (chunk address, bytes or None) for a large range, keeping read_ahead
+        chunks queued so the next transfer runs while the caller handles this one
+        """
+        pending: Deque[Tuple[int, Future]] = deque()
+        next_address = address
+        end = address + size
+        while next_address < end or pending:
+            while next_address < end and len(pending) <= read_ahead:
+                length = min(chunk_size, end - next_address)
+                batch = self.batch()
+                pending.append((next_address, batch.read(next_address, length)))
+                batch.submit()
+                next_address += length
+            chunk_address, future = pending.popleft()
+            yield chunk_address, self.wait(future)
+
+    def is_available(self) -> bool:
+        """True if a PINE server answers on this slot"""
+        return self.get_status() is not None
+
+    def get_status(self) -> Optional[int]:
+        """EMU_STATUS_RUNNING / PAUSED / SHUTDOWN, or None if unreachable"""
+        reply = self._call(bytes([MSG_STATUS]), 4)
+        return _HEADER.unpack_from(reply, 5)[0] if reply else None
+
+    def close(self):
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join(timeout=self.timeout)
+                self._thread = None
+            self._disconnect()
+
+    # ---------- I/O thread ----------
+
+    def _call(self, command: bytes, reply_size: int) -> Optional[bytes]:
+        """Send a single raw command and return its whole reply"""
+        message = _PineMessage()
+        message.commands.append(command)
+        message.request_size += len(command)
+        message.reply_size += reply_size
+
+        future = Future()
+        holder = _PendingRead(future, message.reply_size)
+        holder.parts = 1
+        message.parts.append((holder, 0, 0, message.reply_size))
+        self._enqueue(message)
+        return self.wait(future)
+
+    def _enqueue(self, message: _PineMessage):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._io_loop, name=f"pine-{self.slot}", daemon=True)
+                self._thread.start()
+        self._queue.put(message)
+
+    def _io_loop(self):
+        while True:
+            message = self._queue.get()
+            if message is None:
+                return
+            message.complete(self._receive() if self._send(message) else None)
+
+    def _send(self, message: _PineMessage) -> bool:
+        if self._socket is None and not self._connect():
+            return False
+        try:
+            self._socket.sendall(message.encode())
+            self.messages_sent += 1
+            return True
+        except OSError as e:
+            verbose_print(f"PINE send failed: {e}")
+            self._disconnect()
+            return False
+
+    def _receive(self) -> Optional[bytes]:
+        if self._socket is None:
+            return None
+        try:
+            header = self._receive_exact(4)
+            size = _HEADER.unpack(header)[0]
+            if size < _REPLY_HEADER.size or size > MAX_IPC_RETURN_SIZE:
+                raise OSError(f"bad reply size {size}")
+            return header + self._receive_exact(size - 4)
+        except OSError as e:
+            verbose_print(f"PINE receive failed: {e}")
+            self._disconnect()
+            return None
+
+    def _receive_exact(self, size: int) -> bytes:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = self._socket.recv_into(view[received:], size - received)
+            if count == 0:
+                raise OSError("connection closed")
+            received += count
+        return bytes(buffer)
+
+    def _connect(self) -> bool:
+        family, address = pine_socket_address(self.slot)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(address)
+        except OSError as e:
+            verbose_print(f"PINE: could not connect to slot {self.slot} ({address}): {e}")
+            sock.close()
+            return False
+        if family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket = sock
+        return True
+
+    def _disconnect(self):
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+
+_clients: Dict[int, PineClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_pine_client(slot: int = PINE_DEFAULT_SLOT) -> PineClient:
+    """Shared client for a PINE slot (created once)"""
+    with _clients_lock:
+        client = _clients.get(slot)
+        if client is None:
+            client = _clients[slot] = PineClient(slot)
+        return client
@@ -0,0 +1,233 @@
+"""
+PINE Stand-In Service
+A minimal PINE server over a fake EE RAM, speaking the same protocol as PCSX2,
+so PineClient can be tested and benchmarked without the emulator.
+
+Run directly to benchmark one-request-per-value against batched transfers:
+    python -m services.pine_standin_service [--latency-ms=0.1]
+"""
+
+import os
+import sys
+import time
+import socket
+import struct
+import argparse
+import threading
+from typing import List, Optional
+
+from services.pine_client_service import (
+    PINE_DEFAULT_SLOT, MAX_IPC_SIZE, RESULT_OK, RESULT_FAIL,
+    MSG_READ8, MSG_READ64, MSG_WRITE8, MSG_WRITE64, MSG_VERSION, MSG_STATUS,
+    EMU_STATUS_RUNNING, PineClient, pine_socket_address, encode_pine_commands
+)
+
+EE_RAM_SIZE = 0x2000000
+
+_ACCESS_WIDTHS = (1, 2, 4, 8)
+
+
+class PineStandInServer:
+    """
+    Serves reads/writes (8 to 64-bit), version and status on a PINE slot.
+    latency is added once per message to stand in for the round trip
+    through the emulator's IPC thread.
+    """
+
+    def __init__(self, slot: int = PINE_DEFAULT_SLOT, ram_size: int = EE_RAM_SIZE, latency: float = 0.0):
+        self.slot = slot
+        self.ram = bytearray(ram_size)
+        self.latency = latency
+        self.messages_handled = 0
+        self._server: Optional[socket.socket] = None
+        self._connections: List[socket.socket] = []
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> bool:
+        family, address = pine_socket_address(self.slot)
+        server = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            if family == socket.AF_UNIX:
+                if os.path.exists(address):
+                    os.unlink(address)
+            else:
+                server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind(address)
+            server.listen(4)
+        except OSError as e:
+            print(f"PINE stand-in: could not listen on {address}: {e}")
+            server.close()
+            return False
+
+        self._server = server
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, name="pine-standin", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._running = False
+        if self._server is not None:
+            family, address = pine_socket_address(self.slot)
+            try:
+                self._server.close()
+            except OSError:
+                pass
+            if family == socket.AF_UNIX and os.path.exists(address):
+                os.unlink(address)
+            self._server = None
+        for connection in self._connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._connections.clear()
+
+    # ---------- Protocol ----------
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            self._connections.append(connection)
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection: socket.socket):
+        with connection:
+            while self._running:
+                try:
+                    header = self._receive_exact(connection, 4)
+                    size = struct.unpack("<I", header)[0]
+                    if size < 4 or size > MAX_IPC_SIZE:
+                        return
+                    body = self._receive_exact(connection, size - 4)
+                except OSError:
+                    return
+
+                if self.latency:
+                    time.sleep(self.latency)
+                reply = self.handle_message(body)
+                self.messages_handled += 1
+                try:
+                    connection.sendall(struct.pack("<IB", len(reply) + 5, RESULT_OK) + reply
+                                       if reply is not None else struct.pack("<IB", 5, RESULT_FAIL))
+                except OSError:
+                    return
+
+    @staticmethod
+    def _receive_exact(connection: socket.socket, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+            if not chunk:
+                raise OSError("connection closed")
+            data += chunk
+        return bytes(data)
+
+    def handle_message(self, body: bytes) -> Optional[bytes]:
+        """Reply payload for one message's commands, or None to answer FAIL"""
+        ram = self.ram
+        bulk = self._contiguous_read64(body)
+        if bulk is not None:
+            address, size = bulk
+            return bytes(ram[address:address + size]) if address + size <= len(ram) else None
+
+        replies: List[bytes] = []
+        pos = 0
+        while pos < len(body):
+            opcode = body[pos]
+            if MSG_READ8 <= opcode <= MSG_READ64:
+                width = _ACCESS_WIDTHS[opcode - MSG_READ8]
+                address = struct.unpack_from("<I", body, pos + 1)[0]
+                if address + width > len(ram):
+                    return None
+                replies.append(bytes(ram[address:address + width]))
+                pos += 5
+            elif MSG_WRITE8 <= opcode <= MSG_WRITE64:
+                width = _ACCESS_WIDTHS[opcode - MSG_WRITE8]
+                address = struct.unpack_from("<I", body, pos + 1)[0]
+                if address + width > len(ram) or pos + 5 + width > len(body):
+                    return None
+                ram[address:address + width] = body[pos + 5:pos + 5 + width]
+                pos += 5 + width
+            elif opcode == MSG_VERSION:
+                version = b"PCSX2 PINE stand-in\x00"
+                replies.append(struct.pack("<I", len(version)) + version)
+                pos += 1
+            elif opcode == MSG_STATUS:
+                replies.append(struct.pack("<I", EMU_STATUS_RUNNING))
+                pos += 1
+            else:
+                return None
+        return b"".join(replies)
+
+    @staticmethod
+    def _contiguous_read64(body: bytes) -> Optional[tuple]:
+        """
+        (address, size) if the message is only 64-bit reads of consecutive
+        addresses (what bulk reads send), so it can be answered with one slice
+        """
+        count = len(body) // 5
+        if count < 2 or len(body) % 5 or body[0::5] != bytes([MSG_READ64]) * count:
+            return None
+        address = struct.unpack_from("<I", body, 1)[0]
+        expected = encode_pine_commands(MSG_READ64, address, 8, count)
+        return (address, count * 8) if body == expected else None
+
+
+def _benchmark(latency: float, slot: int):
+    server = PineStandInServer(slot=slot, latency=latency)
+    if not server.start():
+        return 1
+    server.ram[:] = os.urandom(len(server.ram))
+    client = PineClient(slot=slot)
+
+    def timed(label: str, func):
+        before = server.messages_handled
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{label:<44} {elapsed:>9.1f} ms {server.messages_handled - before:>8} messages")
+
+    try:
+        print(f"PINE stand-in on slot {slot}, {latency * 1000:.2f} ms per message\n")
+        watches = [(0x100000 + i * 0x40, 4) for i in range(2000)]
+        timed("2000 x 4-byte reads, one request each", lambda: [client.read_bytes(a, s) for a, s in watches])
+        timed("2000 x 4-byte reads, batched", lambda: client.read_many(watches))
+
+        sections = [(0x200000 + i * 0x1000, os.urandom(0x400)) for i in range(64)]
+        timed("64 x 1 KiB writes, one request each", lambda: [client.write_bytes(a, d) for a, d in sections])
+        timed("64 x 1 KiB writes, batched", lambda: client.write_many(sections))
+
+        def synchronous():
+            for offset in range(0, len(server.ram), 0x100000):
+                client.read_bytes(offset, 0x100000)
+
+        def pipelined():
+            for _ in client.read_chunks(0, len(server.ram)):
+                pass
+
+        timed("32 MiB in 1 MiB chunks, synchronous", synchronous)
+        timed("32 MiB in 1 MiB chunks, pipelined", pipelined)
+
+        data = client.read_bytes(0, len(server.ram))
+        print(f"\nFull read matches RAM: {data == bytes(server.ram)}")
+    finally:
+        client.close()
+        server.stop()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PineClient against the PINE stand-in server")
+    parser.add_argument("--latency-ms", type=float, default=0.1, help="Simulated per-message latency")
+    parser.add_argument("--slot", type=int, default=28999, help="PINE slot to serve on")
+    args = parser.parse_args()
+    return _benchmark(args.latency_ms / 1000, args.slot)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
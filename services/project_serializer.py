@@ -63,8 +63,11 @@ class ProjectSerializer:
             file_path: Path to the .modproj file
             show_loading: Whether to show loading indicator (default True)
         """
-        import dearpygui.dearpygui as dpg
-        from gui.gui_loading_indicator import LoadingIndicator
+        # GUI modules are only needed for the loading indicator; the CLI passes
+        # show_loading=False and never imports DearPyGui
+        if show_loading:
+            import dearpygui.dearpygui as dpg
+            from gui.gui_loading_indicator import LoadingIndicator
 
         try:
             if not os.path.exists(file_path):
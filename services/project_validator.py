@@ -1,8 +1,5 @@
 import os
 import sys
-import tkinter as tk
-from tkinter import filedialog
-from gui import gui_messagebox as messagebox
 from classes.project_data.project_data import ProjectData
 from classes.project_data.build_version import BuildVersion
 from functions.verbose_print import verbose_print
@@ -21,6 +18,8 @@ def _show_missing_game_files_dialog(title: str, message: str) -> str:
     Custom 3-button dialog for missing game files.
     Returns 'extract', 'select', or 'cancel'
     """
+    import tkinter as tk
+
     result = {'choice': 'cancel'}
 
     # Create hidden root if needed
@@ -149,6 +148,9 @@ class ProjectValidator:
     @staticmethod
     def _validate_single_file_mode(build_version: BuildVersion, build_name: str) -> bool:
         """Validate single file mode - check if the single file exists"""
+        from tkinter import filedialog
+        from gui import gui_messagebox as messagebox
+
         single_file_path = build_version.GetSingleFilePath()
 
         if not single_file_path:
@@ -234,6 +236,8 @@ class ProjectValidator:
     @staticmethod
     def _prompt_ps1_extraction(build_version: BuildVersion, build_name: str, project_data: ProjectData) -> bool:
         """Prompt user to extract PS1 BIN (must extract to generate XML, can't use existing folder)"""
+        from gui import gui_messagebox as messagebox
+
         response = messagebox.askyesno(
             "Missing PS1 Game Files",
             f"The game files for build version \"{build_name}\" could not be found.\n\n"
@@ -250,6 +254,9 @@ class ProjectValidator:
     @staticmethod
     def _extract_ps1_bin(build_version: BuildVersion, build_name: str, project_data: ProjectData) -> bool:
         """Extract PS1 BIN/CUE file"""
+        from tkinter import filedialog
+        from gui import gui_messagebox as messagebox
+
         original_file_path = filedialog.askopenfilename(
             title=f"Choose PS1 BIN/CUE File for '{build_name}' (use .cue for multi-bin games)",
             filetypes=[("PS1 Images", "*.bin;*.cue"), ("All Files", "*.*")]
@@ -315,6 +322,8 @@ class ProjectValidator:
     @staticmethod
     def _select_extracted_folder(build_version: BuildVersion, build_name: str, project_data: ProjectData = None) -> bool:
         """Select an already extracted game folder"""
+        from tkinter import filedialog
+
         folder_path = filedialog.askdirectory(
             title=f"Select Extracted Game Folder for '{build_name}'"
         )
@@ -345,6 +354,9 @@ class ProjectValidator:
     @staticmethod
     def _extract_iso(build_version: BuildVersion, build_name: str, platform: str, project_data: ProjectData) -> bool:
         """Extract ISO file for PS2/GC/Wii platforms"""
+        from tkinter import filedialog
+        from gui import gui_messagebox as messagebox
+
         # Determine file types based on platform
         if platform == "PS2":
             filetypes = [("PS2 ISO", "*.iso"), ("All Files", "*.*")]
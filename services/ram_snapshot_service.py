@@ -0,0 +1,198 @@
+"""
+RAM Snapshot Service
+Reads an emulator's main RAM once and searches that copy for any number of
+patterns, so the emulator tools don't re-read all of RAM for every search
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from functions.verbose_print import verbose_print
+from services.multi_pattern_scanner import MaskedPattern, MultiPatternScanner
+
+EMULATOR_RAM_SIZES = {
+    "Dolphin": 0x1800000,      # 24 MB for GameCube
+    "PCSX2": 0x2000000,        # 32 MB for PS2
+    "Duckstation": 0x200000,   # 2 MB for PS1
+}
+DEFAULT_RAM_SIZE = 0x2000000
+
+SNAPSHOT_CHUNK_SIZE = 0x100000
+
+# Chunks read at once from process memory (ReadProcessMemory / process_vm_readv
+# release the GIL, so the reads overlap)
+SNAPSHOT_READ_THREADS = 4
+
+# progress(chunks done, total chunks) -> False to cancel
+ProgressCallback = Callable[[int, int], bool]
+
+
+class RamSnapshot:
+    """
+    A copy of main RAM taken at one point in time. Chunks that couldn't be read
+    are zero-filled and listed in unread; matches touching them are dropped.
+    """
+
+    def __init__(self, emulator_name: str, main_ram: int, data: bytes, unread: List[Tuple[int, int]]):
+        self.emulator_name = emulator_name
+        self.main_ram = main_ram
+        self.data = data
+        self.unread = unread
+        self.taken_at = time.time()
+        self._results: Dict[Tuple[bytes, bytes], List[int]] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.time() - self.taken_at
+
+    def _is_readable(self, offset: int, size: int) -> bool:
+        return all(offset + size <= start or offset >= start + length for start, length in self.unread)
+
+    def read(self, offset: int, size: int) -> Optional[bytes]:
+        """Bytes at a RAM offset, or None if out of range or not read"""
+        if offset < 0 or offset + size > len(self.data) or not self._is_readable(offset, size):
+            return None
+        return self.data[offset:offset + size]
+
+    def search(self, patterns: Sequence[Union[bytes, MaskedPattern]]) -> List[List[int]]:
+        """
+        RAM offsets of every match of each pattern. Patterns not searched in
+        this snapshot before are found together in one scan.
+        """
+        masked = [pattern if isinstance(pattern, MaskedPattern) else MaskedPattern(f"pattern_{index}", pattern)
+                  for index, pattern in enumerate(patterns)]
+        keys = [(pattern.value, pattern.mask) for pattern in masked]
+
+        pending = {}
+        for key, pattern in zip(keys, masked):
+            if key not in self._results and key not in pending:
+                pending[key] = pattern
+
+        if pending:
+            scanner = MultiPatternScanner(list(pending.values()))
+            result = scanner.scan(self.data)
+            verbose_print(f"RAM snapshot: {result.stats}")
+            for index, (key, pattern) in enumerate(pending.items()):
+                self._results[key] = [offset for offset in result.matches.get(index, [])
+                                      if self._is_readable(offset, len(pattern))]
+
+        return [list(self._results[key]) for key in keys]
+
+    def find(self, pattern: Union[bytes, MaskedPattern]) -> List[int]:
+        """RAM offsets of every match of one pattern"""
+        return self.search([pattern])[0]
+
+
+class RamSnapshotService:
+    """Takes RAM snapshots and keeps the latest one per emulator until refreshed"""
+
+    _snapshots: Dict[str, RamSnapshot] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_snapshot(cls, emulator_name: str, handle, main_ram: int, refresh: bool = False,
+                     progress: Optional[ProgressCallback] = None) -> Optional[RamSnapshot]:
+        """
+        The cached snapshot for this emulator, taking one first if there is none,
+        it belongs to a different connection (main RAM moved), or refresh is set.
+        Returns None if cancelled through progress.
+        """
+        with cls._lock:
+            snapshot = cls._snapshots.get(emulator_name)
+        if snapshot is not None and not refresh and snapshot.main_ram == main_ram:
+            return snapshot
+
+        snapshot = cls.take_snapshot(emulator_name, handle, main_ram, progress)
+        if snapshot is not None:
+            with cls._lock:
+                cls._snapshots[emulator_name] = snapshot
+        return snapshot
+
+    @classmethod
+    def get_cached(cls, emulator_name: str) -> Optional[RamSnapshot]:
+        with cls._lock:
+            return cls._snapshots.get(emulator_name)
+
+    @classmethod
+    def invalidate(cls, emulator_name: Optional[str] = None):
+        """Drop the cached snapshot for one emulator, or all of them"""
+        with cls._lock:
+            if emulator_name is None:
+                cls._snapshots.clear()
+            else:
+                cls._snapshots.pop(emulator_name, None)
+
+    @classmethod
+    def take_snapshot(cls, emulator_name: str, handle, main_ram: int,
+                      progress: Optional[ProgressCallback] = None) -> Optional[RamSnapshot]:
+        """Read the emulator's whole main RAM. Returns None if cancelled."""
+        ram_size = EMULATOR_RAM_SIZES.get(emulator_name, DEFAULT_RAM_SIZE)
+        start = time.perf_counter()
+
+        chunks = None
+        if emulator_name == "PCSX2":
+            chunks = cls._read_pine(ram_size, progress)
+        if chunks is None:
+            chunks = cls._read_process(handle, main_ram, ram_size, progress)
+        if chunks is None:
+            return None
+
+        data = bytearray(ram_size)
+        unread = []
+        for offset, length, chunk in chunks:
+            if chunk is None or len(chunk) != length:
+                unread.append((offset, length))
+            else:
+                data[offset:offset + length] = chunk
+
+        snapshot = RamSnapshot(emulator_name, main_ram, bytes(data), sorted(unread))
+        verbose_print(f"RAM snapshot of {emulator_name}: {ram_size // 0x100000} MB in "
+                      f"{(time.perf_counter() - start) * 1000:.0f} ms, {len(unread)} unreadable chunk(s)")
+        return snapshot
+
+    @staticmethod
+    def _chunk_ranges(ram_size: int) -> List[Tuple[int, int]]:
+        return [(offset, min(SNAPSHOT_CHUNK_SIZE, ram_size - offset))
+                for offset in range(0, ram_size, SNAPSHOT_CHUNK_SIZE)]
+
+    @classmethod
+    def _read_pine(cls, ram_size: int, progress: Optional[ProgressCallback]):
+        """Chunks over PINE (next chunks in flight while one is stored), or None if unavailable"""
+        from services.pine_client_service import get_pine_client
+        client = get_pine_client()
+        if not client.is_available():
+            verbose_print("RAM snapshot: PINE not available, reading process memory")
+            return None
+
+        total = (ram_size + SNAPSHOT_CHUNK_SIZE - 1) // SNAPSHOT_CHUNK_SIZE
+        chunks = []
+        for offset, chunk in client.read_chunks(0, ram_size, SNAPSHOT_CHUNK_SIZE):
+            chunks.append((offset, min(SNAPSHOT_CHUNK_SIZE, ram_size - offset), chunk))
+            if progress and progress(len(chunks), total) is False:
+                return None
+        return chunks
+
+    @classmethod
+    def _read_process(cls, handle, main_ram: int, ram_size: int, progress: Optional[ProgressCallback]):
+        from services.memory_utils import read_process_memory
+
+        ranges = cls._chunk_ranges(ram_size)
+        chunks = []
+        with ThreadPoolExecutor(max_workers=SNAPSHOT_READ_THREADS) as pool:
+            futures = {pool.submit(read_process_memory, handle, main_ram + offset, length): (offset, length)
+                       for offset, length in ranges}
+            for future in as_completed(futures):
+                offset, length = futures[future]
+                chunks.append((offset, length, future.result()))
+                if progress and progress(len(chunks), len(ranges)) is False:
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+        return chunks
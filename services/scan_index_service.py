@@ -0,0 +1,167 @@
+"""
+Scan Index Service
+Persists scan results (strings, padding runs, pattern hits, section maps) per build,
+keyed by file content hash, so tools can skip rescanning unchanged game files
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from functions.verbose_print import verbose_print
+
+# Result categories stored in the index
+CATEGORY_STRINGS = "strings"
+CATEGORY_PADDING = "padding"
+CATEGORY_PATTERN_HITS = "pattern_hits"
+CATEGORY_SECTIONS = "sections"
+
+
+class ScanIndexService:
+    """
+    One JSON file per file content hash under .config/scan_index/<build>/,
+    holding {category: {params: result}}. A manifest remembers each path's
+    (mtime, size) -> hash, so checking an unchanged file doesn't read it.
+    """
+
+    INDEX_VERSION = 1
+    MANIFEST_NAME = "manifest.json"
+
+    _lock = threading.Lock()
+
+    def __init__(self, project_folder: str, build_name: str):
+        self.index_dir = os.path.join(project_folder, ".config", "scan_index", build_name)
+        self.manifest_path = os.path.join(self.index_dir, self.MANIFEST_NAME)
+        self.manifest: Dict[str, Dict] = self._load_json(self.manifest_path, {})
+        self._entries: Dict[str, Dict] = {}
+
+    @classmethod
+    def for_project(cls, project_data) -> Optional["ScanIndexService"]:
+        """Index for the project's current build, or None if the project has no folder yet"""
+        project_folder = project_data.GetProjectFolder()
+        build_name = project_data.GetCurrentBuildVersion().GetBuildName()
+        if not project_folder or not build_name:
+            return None
+        return cls(project_folder, build_name)
+
+    @staticmethod
+    def make_pattern_key(patterns: Iterable) -> str:
+        """Stable key for a set of MaskedPatterns, so edited pattern sets don't reuse stale hits"""
+        hasher = hashlib.sha256()
+        for pattern in patterns:
+            hasher.update(pattern.label.encode('utf-8', errors='replace'))
+            hasher.update(b'\x00')
+            hasher.update(pattern.value)
+            hasher.update(pattern.mask)
+        return hasher.hexdigest()[:16]
+
+    def get_file_hash(self, file_path: str) -> Optional[str]:
+        """Content hash of a file, only re-read when its mtime or size changed"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        path_key = os.path.abspath(file_path)
+        record = self.manifest.get(path_key)
+        if record and record.get("mtime_ns") == stat.st_mtime_ns and record.get("size") == stat.st_size:
+            return record["hash"]
+
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+        file_hash = hasher.hexdigest()
+
+        with self._lock:
+            # Merge into the manifest on disk, other instances may have added paths since we loaded it
+            self.manifest = self._load_json(self.manifest_path, {})
+            old_record = self.manifest.get(path_key)
+            self.manifest[path_key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": file_hash}
+            self._write_json_locked(self.manifest_path, self.manifest)
+
+            # Drop the results for the file's previous content once no path refers to it anymore
+            old_hash = old_record.get("hash") if old_record else None
+            if old_hash and old_hash != file_hash and \
+                    not any(record.get("hash") == old_hash for record in self.manifest.values()):
+                self._entries.pop(old_hash, None)
+                try:
+                    os.remove(self._entry_path(old_hash))
+                except OSError:
+                    pass
+        return file_hash
+
+    def get(self, file_path: str, category: str, params: str = "") -> Optional[Any]:
+        """Look up a stored result, or None if this file content hasn't been scanned with these params"""
+        file_hash = self.get_file_hash(file_path)
+        if file_hash is None:
+            return None
+
+        result = self._get_entry(file_hash).get(category, {}).get(params)
+        if result is not None:
+            verbose_print(f"Scan index hit: {os.path.basename(file_path)} [{category}]")
+        return result
+
+    def put(self, file_path: str, category: str, params: str, result: Any):
+        """Store a JSON-serializable result for the file's current content"""
+        file_hash = self.get_file_hash(file_path)
+        if file_hash is None:
+            return
+
+        with self._lock:
+            # Re-read the entry, another instance may have stored other results for this file meanwhile
+            entry = self._read_entry(file_hash)
+            entry.setdefault(category, {})[params] = result
+            self._entries[file_hash] = entry
+            self._write_json_locked(self._entry_path(file_hash), {"version": self.INDEX_VERSION, "results": entry})
+
+    def clear(self):
+        """Delete every stored result for this build"""
+        self.manifest = {}
+        self._entries = {}
+        with self._lock:
+            if not os.path.isdir(self.index_dir):
+                return
+            for name in os.listdir(self.index_dir):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.index_dir, name))
+                    except OSError:
+                        pass
+
+    def _entry_path(self, file_hash: str) -> str:
+        return os.path.join(self.index_dir, f"{file_hash}.json")
+
+    def _get_entry(self, file_hash: str) -> Dict:
+        if file_hash not in self._entries:
+            self._entries[file_hash] = self._read_entry(file_hash)
+        return self._entries[file_hash]
+
+    def _read_entry(self, file_hash: str) -> Dict:
+        data = self._load_json(self._entry_path(file_hash), {})
+        if data.get("version") != self.INDEX_VERSION:
+            return {}
+        return data.get("results", {})
+
+    @staticmethod
+    def _load_json(path: str, default):
+        if not os.path.exists(path):
+            return default
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return default
+
+    def _write_json_locked(self, path: str, data):
+        """Atomically replace a JSON file (caller holds _lock)"""
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Warning: Could not write scan index: {e}")
@@ -1,11 +1,28 @@
 # services/section_parser_service.py
 
 import os
-import subprocess
-from typing import List, Dict, Optional, Tuple
+import struct
+import bisect
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Iterable, Optional, Tuple
 from functions.verbose_print import verbose_print
+from services.scan_index_service import CATEGORY_SECTIONS
 from collections import deque
 
+DOL_HEADER_SIZE = 0x100
+DOL_TEXT_SECTION_COUNT = 7
+DOL_DATA_SECTION_COUNT = 11
+
+ELF_HEADER_SIZE = 0x34
+ELF_CLASS_32 = 1
+ELF_DATA_LITTLE_ENDIAN = 1
+ELF_SHF_ALLOC = 0x2
+ELF_PT_LOAD = 1
+ELF_PF_X = 0x1
+
+PSX_EXE_MAGIC = b"PS-X EXE"
+
 class SectionInfo:
     """Represents a single section in an executable"""
     def __init__(self, section_type: str, file_offset: int, mem_start: int, 
@@ -38,184 +55,247 @@ class SectionInfo:
                 f"diff=0x{self.offset_diff:X})")
 
 
+class SectionAddressIndex:
+    """
+    Sorted, bisect-backed lookup of a section map in both directions
+    (memory -> file and file -> memory).
+
+    Sections are split into disjoint ranges up front; where two sections
+    overlap, the one listed first owns the overlap, the same answer a linear
+    scan over the list gives.
+    """
+
+    MAX_CACHED_INDEXES = 16
+
+    # tuple of section ids -> (sections, index); holding the sections keeps their ids unique
+    _cache: "OrderedDict[Tuple[int, ...], Tuple[List[SectionInfo], SectionAddressIndex]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    def __init__(self, sections: List[SectionInfo]):
+        self.sections = list(sections)
+        self._mem_starts, self._mem_ends, self._mem_owners = self._build_ranges(
+            [(s.mem_start, s.mem_end) for s in self.sections]
+        )
+        self._file_starts, self._file_ends, self._file_owners = self._build_ranges(
+            [(s.file_offset, s.file_offset + s.size) for s in self.sections]
+        )
+
+    @classmethod
+    def for_sections(cls, sections: List[SectionInfo]) -> "SectionAddressIndex":
+        """Shared index for a section map, rebuilt only when the map's sections change"""
+        key = tuple(id(section) for section in sections)
+        with cls._cache_lock:
+            cached = cls._cache.get(key)
+            if cached is not None:
+                cls._cache.move_to_end(key)
+                return cached[1]
+
+        index = cls(sections)
+        with cls._cache_lock:
+            cls._cache[key] = (index.sections, index)
+            while len(cls._cache) > cls.MAX_CACHED_INDEXES:
+                cls._cache.popitem(last=False)
+        return index
+
+    def _build_ranges(self, ranges: List[Tuple[int, int]]) -> Tuple[List[int], List[int], List[SectionInfo]]:
+        """Disjoint (start, end, section) ranges sorted by start"""
+        bounds = sorted({value for start, end in ranges if end > start for value in (start, end)})
+
+        starts: List[int] = []
+        ends: List[int] = []
+        owners: List[SectionInfo] = []
+        for low, high in zip(bounds, bounds[1:]):
+            owner = next((self.sections[i] for i, (start, end) in enumerate(ranges)
+                          if start <= low and high <= end), None)
+            if owner is None:
+                continue
+            if owners and owners[-1] is owner and ends[-1] == low:
+                ends[-1] = high
+            else:
+                starts.append(low)
+                ends.append(high)
+                owners.append(owner)
+        return starts, ends, owners
+
+    @staticmethod
+    def _find(starts: List[int], ends: List[int], owners: List[SectionInfo], value: int) -> Optional[SectionInfo]:
+        i = bisect.bisect_right(starts, value) - 1
+        if i >= 0 and value < ends[i]:
+            return owners[i]
+        return None
+
+    def find_by_memory(self, memory_address: int) -> Optional[SectionInfo]:
+        """Section containing a memory address (no 0x80 prefix handling)"""
+        return self._find(self._mem_starts, self._mem_ends, self._mem_owners, memory_address)
+
+    def find_by_file_offset(self, file_offset: int) -> Optional[SectionInfo]:
+        """Section whose file range contains an offset"""
+        return self._find(self._file_starts, self._file_ends, self._file_owners, file_offset)
+
+    def find_many_by_file_offset(self, file_offsets: Iterable[int]) -> List[Optional[SectionInfo]]:
+        find, starts, ends, owners = self._find, self._file_starts, self._file_ends, self._file_owners
+        return [find(starts, ends, owners, offset) for offset in file_offsets]
+
+    def memory_to_file(self, memory_address: int) -> Optional[int]:
+        """File offset for a memory address, or None if no section holds it"""
+        # Handle addresses with 0x80 prefix
+        if memory_address >= 0x80000000:
+            memory_address = memory_address & 0x00FFFFFF
+        section = self.find_by_memory(memory_address)
+        return memory_address - section.offset_diff if section else None
+
+    def file_to_memory(self, file_offset: int) -> Optional[int]:
+        """Memory address (as stored in the section map) for a file offset"""
+        section = self.find_by_file_offset(file_offset)
+        return file_offset + section.offset_diff if section else None
+
+    def memory_to_file_many(self, memory_addresses: Iterable[int]) -> List[Optional[int]]:
+        return [self.memory_to_file(address) for address in memory_addresses]
+
+    def file_to_memory_many(self, file_offsets: Iterable[int]) -> List[Optional[int]]:
+        file_offsets = list(file_offsets)
+        return [offset + section.offset_diff if section else None
+                for offset, section in zip(file_offsets, self.find_many_by_file_offset(file_offsets))]
+
+
 class SectionParserService:
-    """Parse executable section information for accurate offset calculation"""
+    """
+    Parse executable section information for accurate offset calculation.
+    Headers are read directly (DOL, ELF, PS-EXE), so no external tools are needed.
+    """
+
+    # (path, platform) -> ((mtime_ns, size), sections)
+    _cache: Dict[Tuple[str, str], Tuple[Tuple[int, int], List[SectionInfo]]] = {}
+    _cache_lock = threading.Lock()
     
     @staticmethod
-    def parse_executable_sections(exe_path: str, platform: str) -> List[SectionInfo]:
+    def parse_executable_sections(exe_path: str, platform: str, scan_index=None) -> List[SectionInfo]:
         """
         Parse all sections from an executable file.
         Returns list of SectionInfo objects.
+        Results are kept in memory until the file changes. If a ScanIndexService
+        is given, they are also stored by the file's content hash across sessions.
         """
+        try:
+            stat = os.stat(exe_path)
+        except OSError:
+            return []
+        cache_key = (os.path.abspath(exe_path), platform)
+        file_state = (stat.st_mtime_ns, stat.st_size)
+
+        with SectionParserService._cache_lock:
+            cached = SectionParserService._cache.get(cache_key)
+        if cached is not None and cached[0] == file_state:
+            return list(cached[1])
+
+        sections = SectionParserService._parse_executable_sections(exe_path, platform, scan_index)
+        if sections:
+            with SectionParserService._cache_lock:
+                SectionParserService._cache[cache_key] = (file_state, sections)
+        return list(sections)
+
+    @staticmethod
+    def _parse_executable_sections(exe_path: str, platform: str, scan_index=None) -> List[SectionInfo]:
+        # Keyed separately from maps produced by the old doltool/objdump parsers
+        index_params = f"header:{platform}"
+        if scan_index is not None:
+            indexed = scan_index.get(exe_path, CATEGORY_SECTIONS, index_params)
+            if indexed is not None:
+                return [SectionInfo(*fields) for fields in indexed]
+
         if platform in ["Gamecube", "Wii"]:
-            return SectionParserService.parse_dol_sections(exe_path)
+            sections = SectionParserService.parse_dol_sections(exe_path)
         elif platform == "PS2":
-            return SectionParserService.parse_ps2_sections(exe_path)
+            sections = SectionParserService.parse_ps2_sections(exe_path)
         elif platform == "PS1":
-            return SectionParserService.parse_ps1_sections(exe_path)
+            sections = SectionParserService.parse_ps1_sections(exe_path)
         else:
             return []
+
+        if sections and scan_index is not None:
+            scan_index.put(exe_path, CATEGORY_SECTIONS, index_params, [
+                [s.section_type, s.file_offset, s.mem_start, s.mem_end, s.size] for s in sections
+            ])
+        return sections
     
     @staticmethod
     def parse_dol_sections(dol_path: str) -> List[SectionInfo]:
         """
-        Parse all sections from DOL file using doltool.
-        Returns list of SectionInfo objects.
+        Parse all sections from a DOL header (7 text + 11 data slots, unused slots are empty).
+        Returns list of SectionInfo objects, text sections first.
         """
-        tool_dir = os.getcwd()
-        doltool_path = os.path.join(tool_dir, "prereq", "doltool", "doltool.exe")
-        
-        if not os.path.exists(doltool_path):
-            print(f"Warning: doltool not found at {doltool_path}")
-            return []
-        
         try:
-            result = subprocess.run(
-                [doltool_path, "-i", dol_path],
-                shell=False,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=tool_dir,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                print(f"doltool failed: {result.stderr}")
+            with open(dol_path, 'rb') as f:
+                header = f.read(DOL_HEADER_SIZE)
+            if len(header) < DOL_HEADER_SIZE:
+                print(f"DOL header too short: {dol_path}")
                 return []
-            
+
+            offsets = struct.unpack_from(">18I", header, 0x00)
+            addresses = struct.unpack_from(">18I", header, 0x48)
+            sizes = struct.unpack_from(">18I", header, 0x90)
+
             sections = []
-            
-            # Parse each section line
-            # Format: "Text Section  1:  Offset=000004A0  Address=800034A0  Size=003B0B00"
-            for line in result.stdout.split('\n'):
-                line = line.strip()
-                
-                if 'Section' not in line or ':' not in line:
-                    continue
-                
-                try:
-                    # Split and parse
-                    parts = line.split()
-                    
-                    section_type = parts[0].lower()  # "Text" or "Data"
-                    
-                    # Extract hex values
-                    offset_hex = None
-                    address_hex = None
-                    size_hex = None
-                    
-                    for part in parts:
-                        if part.startswith('Offset='):
-                            offset_hex = part.split('=')[1]
-                        elif part.startswith('Address='):
-                            address_hex = part.split('=')[1]
-                        elif part.startswith('Size='):
-                            size_hex = part.split('=')[1]
-                    
-                    if not all([offset_hex, address_hex, size_hex]):
-                        continue
-                    
-                    file_offset = int(offset_hex, 16)
-                    mem_address = int(address_hex, 16)
-                    size = int(size_hex, 16)
-                    
-                    # Remove 0x80 prefix from memory address
-                    if address_hex.upper().startswith('80'):
-                        mem_address = int('0x' + address_hex[2:], 16)
-                    
-                    section = SectionInfo(
-                        section_type=section_type,
-                        file_offset=file_offset,
-                        mem_start=mem_address,
-                        mem_end=mem_address + size,
-                        size=size
-                    )
-                    
-                    sections.append(section)
-                    
-                except (ValueError, IndexError) as e:
-                    print(f"Could not parse DOL section line: {line}")
+            for index in range(DOL_TEXT_SECTION_COUNT + DOL_DATA_SECTION_COUNT):
+                if not sizes[index] or not offsets[index]:
                     continue
-            
+
+                mem_address = addresses[index]
+                # Remove 0x80 prefix from memory address
+                if mem_address >> 24 == 0x80:
+                    mem_address &= 0x00FFFFFF
+
+                sections.append(SectionInfo(
+                    section_type="text" if index < DOL_TEXT_SECTION_COUNT else "data",
+                    file_offset=offsets[index],
+                    mem_start=mem_address,
+                    mem_end=mem_address + sizes[index],
+                    size=sizes[index]
+                ))
+
             verbose_print(f"Parsed {len(sections)} DOL sections from {os.path.basename(dol_path)}")
             return sections
-            
-        except subprocess.TimeoutExpired:
-            print("doltool timed out")
-            return []
+
         except Exception as e:
             print(f"Error parsing DOL sections: {e}")
-            import traceback
-            traceback.print_exc()
             return []
     
     @staticmethod
     def parse_ps2_sections(elf_path: str) -> List[SectionInfo]:
-        """Parse all sections from PS2 ELF using ee-objdump"""
-        tool_dir = os.getcwd()
-        objdump_path = os.path.join(tool_dir, "prereq", "PS2ee", "bin", "ee-objdump.exe")
-        
-        if not os.path.exists(objdump_path):
-            print(f"Warning: ee-objdump not found at {objdump_path}")
-            return []
-        
+        """
+        Parse all sections from a PS2 ELF's section headers.
+        Stripped ELFs without section headers fall back to their PT_LOAD program headers.
+        """
         try:
-            result = subprocess.run(
-                [objdump_path, elf_path, "-x"],
-                shell=False,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=tool_dir,
-                timeout=10
-            )
-            
-            if "Idx Name" not in result.stdout:
-                print("Could not parse objdump output")
-                return []
-            
-            sections = []
-            
-            # Parse section table
-            lines = result.stdout.split("Idx Name")[1].split('\n')
-            
-            for line in lines[1:]:  # Skip header
-                line = line.strip()
-                if not line or line.startswith('Idx'):
-                    continue
-                
-                parts = line.split()
-                
-                #print("Before:")
-                print(parts)
-                # Deal with the situation where Name doesn't exist.
-                if len(parts) > 1 and parts[1][0].isnumeric(): # Check if the first character in the string is a number
-                    parts = ["No Section Name"] + parts # Shift entire list over
-                #print("After:")
-                print(parts)
-                # Format: Idx Name Size VMA LMA FileOff Algn
-                # or: Idx Name Size VMA FileOff Algn
-                if len(parts) >= 6:
-                    try:
-                        section_name = parts[1]
-                        print("NAME " + section_name)
-                        size = int(parts[2], 16)
-                        print("SIZE " + str(size))
-                        vma = int(parts[3], 16)
-
-                        # Determine file offset based on format
-                        if len(parts) >= 7:
-                            # Format with LMA: Idx Name Size VMA LMA FileOff Algn
-                            file_off = int(parts[5], 16)
-                        else:
-                            # Format without LMA: Idx Name Size VMA FileOff Algn
-                            file_off = int(parts[4], 16)
-                        
-                        # Skip zero-size sections
-                        if size == 0:
+            with open(elf_path, 'rb') as f:
+                ident = f.read(ELF_HEADER_SIZE)
+                if len(ident) < ELF_HEADER_SIZE or ident[:4] != b"\x7fELF" or ident[4] != ELF_CLASS_32:
+                    print(f"Not a 32-bit ELF: {elf_path}")
+                    return []
+
+                endian = "<" if ident[5] == ELF_DATA_LITTLE_ENDIAN else ">"
+                (e_phoff, e_shoff, _flags, _ehsize, e_phentsize, e_phnum,
+                 e_shentsize, e_shnum, e_shstrndx) = struct.unpack_from(endian + "IIIHHHHHH", ident, 0x1C)
+
+                sections = []
+                if e_shoff and e_shnum and e_shstrndx < e_shnum:
+                    f.seek(e_shoff)
+                    headers = [struct.unpack_from(endian + "10I", f.read(e_shentsize))
+                               for _ in range(e_shnum)]
+
+                    _, _, _, _, strtab_offset, strtab_size, _, _, _, _ = headers[e_shstrndx]
+                    f.seek(strtab_offset)
+                    names = f.read(strtab_size)
+
+                    for (sh_name, _type, sh_flags, sh_addr, sh_offset, sh_size,
+                         _link, _info, _align, _entsize) in headers[1:]:
+                        # Skip zero-size sections and ones that are never loaded (symbols, debug info)
+                        if sh_size == 0 or not sh_flags & ELF_SHF_ALLOC:
                             continue
-                        
+
+                        name_end = names.find(b"\x00", sh_name)
+                        section_name = names[sh_name:name_end if name_end >= 0 else None].decode('ascii', errors='replace')
+
                         # Determine section type from name
                         section_type = "unknown"
                         if ".text" in section_name:
@@ -224,49 +304,62 @@ class SectionParserService:
                             section_type = "data"
                         elif ".bss" in section_name:
                             section_type = "bss"
-                        
-                        section = SectionInfo(
+
+                        sections.append(SectionInfo(
                             section_type=section_type,
-                            file_offset=file_off,
-                            mem_start=vma,
-                            mem_end=vma + size,
-                            size=size
-                        )
-                        
-                        sections.append(section)
-                        
-                    except (ValueError, IndexError) as e:
-                        continue
-            
+                            file_offset=sh_offset,
+                            mem_start=sh_addr,
+                            mem_end=sh_addr + sh_size,
+                            size=sh_size
+                        ))
+
+                if not sections and e_phoff and e_phnum:
+                    f.seek(e_phoff)
+                    for _ in range(e_phnum):
+                        (p_type, p_offset, p_vaddr, _paddr, p_filesz,
+                         _memsz, p_flags, _align) = struct.unpack_from(endian + "8I", f.read(e_phentsize))
+                        if p_type != ELF_PT_LOAD or p_filesz == 0:
+                            continue
+                        sections.append(SectionInfo(
+                            section_type="text" if p_flags & ELF_PF_X else "data",
+                            file_offset=p_offset,
+                            mem_start=p_vaddr,
+                            mem_end=p_vaddr + p_filesz,
+                            size=p_filesz
+                        ))
+
             verbose_print(f"Parsed {len(sections)} PS2 sections from {os.path.basename(elf_path)}")
             return sections
-            
-        except subprocess.TimeoutExpired:
-            print("ee-objdump timed out")
-            return []
+
         except Exception as e:
             print(f"Error parsing PS2 sections: {e}")
-            import traceback
-            traceback.print_exc()
             return []
     
     @staticmethod
     def parse_ps1_sections(exe_path: str) -> List[SectionInfo]:
         """
         PS1 executables have a simple structure - one section starting at 0x800.
-        The file offset is always 0x800 bytes from the memory address.
+        The PS-EXE header gives the load address and text size; files without
+        one are treated as loading at 0x800.
         """
         try:
-            # PS1 executables are simple: everything after 0x800 header
             file_size = os.path.getsize(exe_path)
-            
-            # PS1 loads at 0x80000000, file starts at 0x800
+            with open(exe_path, 'rb') as f:
+                header = f.read(0x20)
+
+            mem_start = 0x800
+            size = file_size - 0x800
+            if header[:8] == PSX_EXE_MAGIC:
+                load_address, text_size = struct.unpack_from("<II", header, 0x18)
+                mem_start = load_address & 0x00FFFFFF
+                size = min(text_size, size) if text_size else size
+
             section = SectionInfo(
                 section_type="text",
                 file_offset=0x800,
-                mem_start=0x800,
-                mem_end=0x800 + (file_size - 0x800),
-                size=file_size - 0x800
+                mem_start=mem_start,
+                mem_end=mem_start + size,
+                size=size
             )
             
             return [section]
@@ -278,20 +371,10 @@ class SectionParserService:
     @staticmethod
     def find_section_for_address(sections: List[SectionInfo], memory_address: int) -> Optional[SectionInfo]:
         """Find the section containing the given memory address"""
-        for section in sections:
-            if section.contains_address(memory_address):
-                return section
-        return None
+        return SectionAddressIndex.for_sections(sections).find_by_memory(memory_address)
     
     @staticmethod
     def calculate_file_offset(sections: List[SectionInfo], memory_address: int) -> Optional[int]:
         """Calculate file offset for a memory address using section map"""
-        # IMPORTANT: Handle PS1/PS2 addresses that start with 0x80
-        # If address > 0x80000000, strip the 0x80 prefix to match section format
-        if memory_address >= 0x80000000:
-            memory_address = memory_address & 0x00FFFFFF  # Remove 0x80 prefix
-        
-        section = SectionParserService.find_section_for_address(sections, memory_address)
-        if section:
-            return section.calculate_file_offset(memory_address)
-        return None
\ No newline at end of file
+        # Strips the 0x80 prefix from PS1/GC/Wii addresses to match section format
+        return SectionAddressIndex.for_sections(sections).memory_to_file(memory_address)
\ No newline at end of file
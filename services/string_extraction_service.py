@@ -0,0 +1,219 @@
+"""
+String Extraction Service
+Finds null-terminated ASCII, Shift-JIS and UTF-16 strings in game files with compiled regexes
+"""
+
+import re
+import bisect
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Tuple
+
+from services.scan_index_service import CATEGORY_STRINGS
+
+# Encoding names stored on extracted strings
+ENCODING_ASCII = "ascii"
+ENCODING_SHIFT_JIS = "shift-jis"
+ENCODING_UTF16_LE = "utf-16"
+ENCODING_UTF16_BE = "utf-16-be"
+
+# Python codec for each encoding name (used to decode found strings and encode edits)
+PYTHON_CODECS = {
+    ENCODING_ASCII: "ascii",
+    ENCODING_SHIFT_JIS: "shift_jis",
+    ENCODING_UTF16_LE: "utf-16-le",
+    ENCODING_UTF16_BE: "utf-16-be",
+}
+
+# Printable ASCII plus tab, LF, CR
+_ASCII_CHAR = rb'[\x20-\x7e\t\n\r]'
+
+# Shift-JIS double-byte character, or half-width katakana
+_SHIFT_JIS_CHAR = rb'[\x81-\x9f\xe0-\xfc][\x40-\x7e\x80-\xfc]|[\xa1-\xdf]'
+
+# printf-style format specifiers: %s, %d, %5d, %.2f, %08x, %ld, %lld, %p, etc.
+PRINTF_FORMAT_PATTERN = re.compile(
+    r'%[-+ 0#]*(?:\d+|\*)?(?:\.(?:\d+|\*))?(?:hh|h|l|ll|j|z|t|L)?[sdioxXufFeEgGaAcpn%]'
+)
+
+DEBUG_KEYWORDS = (
+    'error', 'fail', 'warning', 'assert', 'debug', 'printf', 'log',
+    'exception', 'fatal', 'panic', 'abort', 'trace', 'interrupt', 'timeout'
+)
+
+# Bumped when extract() changes its results, so scan index entries from before are rescanned
+INDEX_RESULTS_REVISION = 2
+
+FILE_PATH_MARKERS = ('/', '\\', '.c', '.cpp', '.h', '.cc', '.cxx', '.hpp')
+
+
+def count_format_specifiers(text: str) -> int:
+    """Count printf format specifiers in text (excluding literal %%)"""
+    return sum(1 for spec in PRINTF_FORMAT_PATTERN.findall(text) if spec != '%%')
+
+
+def has_debug_keyword(text: str) -> bool:
+    """Check for error/debug/log keywords"""
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in DEBUG_KEYWORDS)
+
+
+def has_file_path(text: str) -> bool:
+    """Check for path separators or source file extensions"""
+    text_lower = text.lower()
+    return any(marker in text_lower for marker in FILE_PATH_MARKERS)
+
+
+@lru_cache(maxsize=32)
+def _compile_byte_string_pattern(min_length: int, include_shift_jis: bool) -> "re.Pattern":
+    """Null-terminated run of ASCII (and optionally Shift-JIS) characters"""
+    char = _ASCII_CHAR
+    if include_shift_jis:
+        char = b'(?:' + _ASCII_CHAR + b'|' + _SHIFT_JIS_CHAR + b')'
+    # The lookbehind only starts matches at the beginning of a run, which keeps
+    # unterminated runs linear instead of retrying from every byte inside them
+    return re.compile(b'(?<!' + _ASCII_CHAR + b')' + char + b'{%d,}\\x00' % max(1, min_length))
+
+
+@lru_cache(maxsize=32)
+def _compile_utf16_pattern(min_length: int, big_endian: bool) -> "re.Pattern":
+    """Double-null-terminated run of printable ASCII code units"""
+    unit = b'\\x00[\\x20-\\x7e]' if big_endian else b'[\\x20-\\x7e]\\x00'
+    return re.compile(b'(?<!' + unit + b')(?:' + unit + b'){%d,}\\x00\\x00' % max(1, min_length))
+
+
+class ExtractedString:
+    """A null-terminated string found in a file"""
+
+    def __init__(self, file_offset: int, text: str, length: int, encoding: str):
+        self.file_offset = file_offset
+        self.text = text
+        self.length = length  # Including null terminator
+        self.encoding = encoding
+
+    @property
+    def end_offset(self) -> int:
+        return self.file_offset + self.length
+
+    def __repr__(self):
+        return f"ExtractedString(offset=0x{self.file_offset:X}, encoding={self.encoding}, text={self.text!r})"
+
+
+class StringExtractionService:
+    """
+    Extracts strings from binary data.
+    ASCII and Shift-JIS share one regex pass; UTF-16 LE/BE each add one more.
+    File results are cached per content hash, so rescanning an unchanged file is instant.
+    """
+
+    MAX_CACHED_FILES = 8
+
+    # (file hash, min_length, include_utf16, include_shift_jis) -> strings
+    _cache: "OrderedDict[Tuple[str, int, bool, bool], List[ExtractedString]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    def extract_from_file(self, file_path: str, min_length: int = 4, include_utf16: bool = False,
+                          include_shift_jis: bool = False, scan_index=None) -> List[ExtractedString]:
+        """
+        Extract strings from a file, reusing cached results if its contents haven't changed.
+        With a ScanIndexService, results also persist across sessions.
+        """
+        data = None
+        if scan_index is not None:
+            file_hash = scan_index.get_file_hash(file_path)
+        else:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            file_hash = hashlib.sha256(data).hexdigest()
+
+        key = (file_hash, min_length, include_utf16, include_shift_jis)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return list(cached)
+
+        params = f"{min_length}:{int(include_utf16)}:{int(include_shift_jis)}:r{INDEX_RESULTS_REVISION}"
+        indexed = scan_index.get(file_path, CATEGORY_STRINGS, params) if scan_index is not None else None
+
+        if indexed is not None:
+            strings = [ExtractedString(*fields) for fields in indexed]
+        else:
+            if data is None:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            strings = self.extract(data, min_length, include_utf16, include_shift_jis)
+            if scan_index is not None:
+                scan_index.put(file_path, CATEGORY_STRINGS, params,
+                               [[s.file_offset, s.text, s.length, s.encoding] for s in strings])
+
+        with self._cache_lock:
+            self._cache[key] = strings
+            while len(self._cache) > self.MAX_CACHED_FILES:
+                self._cache.popitem(last=False)
+
+        return list(strings)
+
+    def extract(self, data: bytes, min_length: int = 4, include_utf16: bool = False,
+                include_shift_jis: bool = False) -> List[ExtractedString]:
+        """
+        Extract null-terminated strings from data.
+
+        Args:
+            data: Bytes to scan
+            min_length: Minimum length in characters (excluding the terminator)
+            include_utf16: Also find UTF-16 LE and BE strings
+            include_shift_jis: Allow Shift-JIS characters in byte strings
+
+        Returns:
+            Strings sorted by file offset
+        """
+        strings = []
+
+        for match in _compile_byte_string_pattern(min_length, include_shift_jis).finditer(data):
+            raw = match.group()[:-1]
+            if raw.isascii():
+                text = raw.decode('ascii')
+                encoding = ENCODING_ASCII
+            else:
+                text = raw.decode('shift_jis', errors='replace')
+                encoding = ENCODING_SHIFT_JIS
+            strings.append(ExtractedString(match.start(), text, len(raw) + 1, encoding))
+
+        if include_utf16:
+            utf16 = []
+            for big_endian, encoding in ((False, ENCODING_UTF16_LE), (True, ENCODING_UTF16_BE)):
+                for match in _compile_utf16_pattern(min_length, big_endian).finditer(data):
+                    raw = match.group()[:-2]
+                    text = raw.decode(PYTHON_CODECS[encoding], errors='ignore')
+                    utf16.append(ExtractedString(match.start(), text, len(raw) + 2, encoding))
+            strings.extend(self._drop_overlapping(utf16))
+
+        strings.sort(key=lambda s: s.file_offset)
+        return strings
+
+    @staticmethod
+    def _drop_overlapping(strings: List[ExtractedString]) -> List[ExtractedString]:
+        """
+        A UTF-16 string next to a null byte also matches the other byte order one
+        byte off (LE "H 00 e 00" after a 00 byte reads as BE "00 H 00 e"). Of
+        overlapping matches keep the 2-byte aligned one, then the longer one.
+        """
+        kept_starts: List[int] = []
+        kept: List[ExtractedString] = []
+        for string in sorted(strings, key=lambda s: (s.file_offset % 2, -s.length, s.file_offset)):
+            index = bisect.bisect_left(kept_starts, string.file_offset)
+            if index > 0 and kept[index - 1].end_offset > string.file_offset:
+                continue
+            if index < len(kept) and kept_starts[index] < string.end_offset:
+                continue
+            kept_starts.insert(index, string.file_offset)
+            kept.insert(index, string)
+        return kept
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._cache.clear()
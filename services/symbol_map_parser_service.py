@@ -2,7 +2,26 @@
 
 import os
 import re
-from typing import List, Dict, Optional, Tuple
+import json
+import bisect
+import hashlib
+import threading
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+from functions.verbose_print import verbose_print
+
+# Parsed symbols are cached next to the map as <map>.symbols.json
+SYMBOL_CACHE_SUFFIX = ".symbols.json"
+SYMBOL_CACHE_VERSION = 1
+
+# Symbol assignment format: "0x0000000080001234    game_symbol = 0x80001234"
+_ASSIGNMENT_LINE = re.compile(r'\s*0x([0-9a-fA-F]+)\s+(\w+)\s*=\s*0x([0-9a-fA-F]+)')
+# Mod code globals inside sections: heavily indented "address  name"
+_SECTION_SYMBOL_LINE = re.compile(r'\s{16,}0x([0-9a-fA-F]+)\s+(\w+)\s*$')
+# Output section header: ".bss    0x803f1c00"
+_SECTION_HEADER_LINE = re.compile(r'\s*(\.\w+)\s+0x[0-9a-fA-F]+')
+# GNU ld format (matched against stripped lines)
+_GNU_SECTION_LINE = re.compile(r'(\.\w+)')
+_GNU_SYMBOL_LINE = re.compile(r'0x([0-9a-fA-F]+)\s+0x([0-9a-fA-F]+)\s+(.+)')
 
 class Symbol:
     """Represents a symbol from the memory map"""
@@ -17,35 +36,107 @@ class Symbol:
         return f"Symbol({self.name} @ 0x{self.address:X}, size={self.size}, type={self.symbol_type})"
 
 
+class SymbolIndex:
+    """
+    Lookup tables over a parsed symbol list: case-folded name -> symbol,
+    and address-sorted arrays searched with bisect.
+    """
+
+    def __init__(self, symbols: List[Symbol]):
+        self.symbols = sorted(symbols, key=lambda s: s.address)
+        self._addresses = [s.address for s in self.symbols]
+
+        # First symbol (in address order) wins for duplicate names, as with a linear search
+        self._folded_names = [s.name.casefold() for s in self.symbols]
+        self._by_name: Dict[str, Symbol] = {}
+        for name, symbol in zip(reversed(self._folded_names), reversed(self.symbols)):
+            self._by_name[name] = symbol
+
+        # Sized symbols plus the running maximum of their end addresses,
+        # so the first symbol containing an address can be found with bisect
+        self._sized = [s for s in self.symbols if s.size > 0]
+        self._sized_starts = [s.address for s in self._sized]
+        self._sized_max_ends = []
+        max_end = None
+        for symbol in self._sized:
+            end = symbol.address + symbol.size
+            max_end = end if max_end is None else max(max_end, end)
+            self._sized_max_ends.append(max_end)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def find(self, name: str) -> Optional[Symbol]:
+        """Symbol by name (case-insensitive)"""
+        return self._by_name.get(name.casefold())
+
+    def at_address(self, address: int) -> List[Symbol]:
+        """All symbols starting exactly at an address"""
+        low = bisect.bisect_left(self._addresses, address)
+        high = bisect.bisect_right(self._addresses, address, low)
+        return self.symbols[low:high]
+
+    def containing(self, address: int) -> Optional[Symbol]:
+        """Lowest-addressed sized symbol whose range holds the address"""
+        candidates_end = bisect.bisect_right(self._sized_starts, address)
+        first = bisect.bisect_right(self._sized_max_ends, address, 0, candidates_end)
+        return self._sized[first] if first < candidates_end else None
+
+    def matching(self, text: str) -> List[Symbol]:
+        """Symbols whose name contains text (case-insensitive), in address order"""
+        text = text.casefold()
+        return [symbol for symbol, name in zip(self.symbols, self._folded_names) if text in name]
+
+
 class SymbolParserService:
     """Parses .map files to extract symbol information"""
+
+    # Parsed symbols and their index per map file, reused until the file changes
+    # abspath -> ((mtime_ns, size), symbols, index)
+    _cache: Dict[str, Tuple[Tuple[int, int], List[Symbol], SymbolIndex]] = {}
+    _cache_lock = threading.Lock()
     
     def __init__(self, map_file_path: str):
         self.map_file_path = map_file_path
         self.symbols: List[Symbol] = []
+        self.index = SymbolIndex([])
     
     def parse(self) -> List[Symbol]:
         """Parse the map file and return list of symbols"""
         if not os.path.exists(self.map_file_path):
             print(f"Map file not found: {self.map_file_path}")
             return []
+
+        stat = os.stat(self.map_file_path)
+        cache_key = os.path.abspath(self.map_file_path)
+        file_state = (stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None and cached[0] == file_state:
+            _, self.symbols, self.index = cached
+            print(f"Using {len(self.symbols)} already parsed symbols from map file")
+            return self.symbols
         
         try:
-            with open(self.map_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Try to detect map file format
-            if self._is_symbol_assignment_format(content):
-                print("Detected symbol assignment format (LOAD symbols)")
-                self.symbols = self._parse_symbol_assignments(content)
+            # A rebuild rewrites the map even when no symbol moved, so the
+            # on-disk cache is keyed by content rather than mtime
+            map_hash = self._hash_map_file()
+            symbols = self._load_symbol_cache(map_hash)
+            if symbols is not None:
+                print(f"Loaded {len(symbols)} symbols from map cache")
             else:
-                print("Detected GNU ld section format")
-                self.symbols = self._parse_gnu_map(content)
+                with open(self.map_file_path, 'r', encoding='utf-8') as f:
+                    symbols = list(self.iter_symbols(f))
+                self._write_symbol_cache(map_hash, symbols)
+                print(f"Parsed {len(symbols)} symbols from map file")
             
             # Sort by address
-            self.symbols.sort(key=lambda s: s.address)
+            symbols.sort(key=lambda s: s.address)
+            self.symbols = symbols
+            self.index = SymbolIndex(self.symbols)
+            with self._cache_lock:
+                self._cache[cache_key] = (file_state, self.symbols, self.index)
             
-            print(f"Parsed {len(self.symbols)} symbols from map file")
             return self.symbols
             
         except Exception as e:
@@ -53,181 +144,196 @@ class SymbolParserService:
             import traceback
             traceback.print_exc()
             return []
-    
-    def _is_symbol_assignment_format(self, content: str) -> bool:
-        """Check if map file uses symbol assignment format"""
-        # Look for lines like: "0x0000000080001234                game_symbol = 0x80001234"
-        pattern = r'^\s*0x[0-9a-fA-F]+\s+\w+\s*=\s*0x[0-9a-fA-F]+'
-        return bool(re.search(pattern, content, re.MULTILINE))
-    
-    def _parse_symbol_assignments(self, content: str) -> List[Symbol]:
+
+    def iter_symbols(self, lines: Iterable[str]) -> Iterator[Symbol]:
         """
-        Parse symbol assignment format map files.
-        Format 1: 0x0000000080001234                game_symbol = 0x80001234
-        Format 2:                0x00000000803f1cbc                has_pressed (within sections)
+        Parse map file lines in one pass, yielding symbols as they are found.
+
+        Two layouts are understood:
+        Symbol assignment format (used when any line looks like one):
+            0x0000000080001234                game_symbol = 0x80001234
+                           0x00000000803f1cbc                has_pressed (within sections)
+        GNU ld section format:
+            .section     0xADDRESS   0xSIZE symbol_name
+
+        Until the first assignment line is seen both layouts are tracked; after
+        it, assignment symbols are yielded as they are read. GNU format symbols
+        are only yielded at the end, once no assignment line turned up.
         """
-        symbols = []
+        assignment_format = False
+        pending_assignment_symbols: List[Symbol] = []
+        gnu_symbols: List[Symbol] = []
+        assignment_section = ""
+        gnu_section = ""
 
-        # Pattern 1: Symbol assignments (game symbols from LOAD)
-        # Group 1: address, Group 2: symbol name, Group 3: assigned address
-        assignment_pattern = r'^\s*0x([0-9a-fA-F]+)\s+(\w+)\s*=\s*0x([0-9a-fA-F]+)'
+        for line in lines:
+            stripped = line.strip()
+            if not stripped:
+                continue
 
-        # Pattern 2: Section symbols (mod code globals)
-        # Heavily indented lines with just address and symbol name
-        # Format:                0x00000000803f1cbc                has_pressed
-        section_symbol_pattern = r'^\s{16,}0x([0-9a-fA-F]+)\s+(\w+)\s*$'
+            if stripped[0] == '.':
+                # Detect section headers
+                if not assignment_format:
+                    section_match = _GNU_SECTION_LINE.match(stripped)
+                    if section_match:
+                        gnu_section = section_match.group(1)
 
-        lines = content.split('\n')
-        current_section = ""
+                # Track current section for context
+                section_match = _SECTION_HEADER_LINE.match(line)
+                if section_match:
+                    assignment_section = section_match.group(1)
+                continue
 
-        for line in lines:
-            # Track current section for context
-            section_match = re.match(r'^\s*(\.\w+)\s+0x[0-9a-fA-F]+', line)
-            if section_match:
-                current_section = section_match.group(1)
+            if not assignment_format:
+                gnu_symbol = self._match_gnu_symbol(stripped, gnu_section)
+                if gnu_symbol:
+                    gnu_symbols.append(gnu_symbol)
 
-            # Try to match symbol assignment format (game symbols)
-            match = re.match(assignment_pattern, line)
+            # Every other line we care about starts with an address
+            if not stripped.startswith('0x'):
+                continue
+
+            symbol = None
+            match = _ASSIGNMENT_LINE.match(line)
             if match:
-                # Use the assigned address (Group 3) as the actual address
-                address_str = match.group(3)
-                symbol_name = match.group(2)
-
-                # Skip internal linker symbols
-                if symbol_name.startswith('_'):
-                    # Keep it - underscore symbols are often important game variables
-                    pass
-
-                # Convert address
-                try:
-                    address = int(address_str, 16)
-
-                    # Skip zero addresses
-                    if address == 0:
-                        continue
-
-                    # Create symbol (size is unknown from this format)
-                    symbol = Symbol(
-                        name=symbol_name,
-                        address=address,
-                        size=0,  # Unknown in this format
-                        section="symbols",
-                        symbol_type="Game Symbol"
-                    )
-
-                    symbols.append(symbol)
-
-                except ValueError:
-                    continue
-
-            # Try to match section symbol format (mod code globals)
+                if not assignment_format:
+                    print("Detected symbol assignment format (LOAD symbols)")
+                    assignment_format = True
+                    gnu_symbols = []
+                    yield from pending_assignment_symbols
+                    pending_assignment_symbols = []
+
+                # Use the assigned address as the actual address; skip zero addresses
+                address = int(match.group(3), 16)
+                if address != 0:
+                    # Size is unknown in this format
+                    symbol = Symbol(match.group(2), address, 0, "symbols", "Game Symbol")
             else:
-                section_match = re.match(section_symbol_pattern, line)
-                if section_match:
-                    address_str = section_match.group(1)
-                    symbol_name = section_match.group(2)
+                match = _SECTION_SYMBOL_LINE.match(line)
+                if match:
+                    symbol = self._match_section_symbol(match, assignment_section)
 
-                    # Skip linker-generated symbols and section names
-                    if symbol_name.startswith('_') or symbol_name.startswith('.'):
-                        continue
+            if symbol is not None:
+                if assignment_format:
+                    yield symbol
+                else:
+                    pending_assignment_symbols.append(symbol)
 
-                    # Skip common linker symbols
-                    if symbol_name in ['PROVIDE', 'HIDDEN', 'KEEP', 'SORT']:
-                        continue
+        if not assignment_format:
+            print("Detected GNU ld section format")
+            yield from gnu_symbols
 
-                    # Skip .text section symbols (functions - user only wants data symbols)
-                    if current_section == ".text":
-                        continue
+    @staticmethod
+    def _match_section_symbol(match: "re.Match", current_section: str) -> Optional[Symbol]:
+        """Mod code global from a heavily indented 'address  name' line"""
+        symbol_name = match.group(2)
 
-                    try:
-                        address = int(address_str, 16)
+        # Skip linker-generated symbols, section names and common linker keywords
+        if symbol_name.startswith('_') or symbol_name.startswith('.'):
+            return None
+        if symbol_name in ('PROVIDE', 'HIDDEN', 'KEEP', 'SORT'):
+            return None
 
-                        # Skip zero addresses
-                        if address == 0:
-                            continue
+        # Skip .text section symbols (functions - user only wants data symbols)
+        if current_section == ".text":
+            return None
 
-                        # Create symbol with section info
-                        symbol = Symbol(
-                            name=symbol_name,
-                            address=address,
-                            size=0,  # Size usually on the section line, not symbol line
-                            section=current_section if current_section else "unknown",
-                            symbol_type="Mod Symbol"
-                        )
+        address = int(match.group(1), 16)
+        if address == 0:
+            return None
 
-                        symbols.append(symbol)
+        # Size is usually on the section line, not the symbol line
+        return Symbol(name=symbol_name, address=address, size=0,
+                      section=current_section if current_section else "unknown",
+                      symbol_type="Mod Symbol")
 
-                    except ValueError:
-                        continue
+    @staticmethod
+    def _match_gnu_symbol(stripped_line: str, current_section: str) -> Optional[Symbol]:
+        """Symbol from a GNU ld '0xADDRESS 0xSIZE name' line"""
+        addr_match = _GNU_SYMBOL_LINE.match(stripped_line)
+        if not addr_match:
+            return None
 
-        return symbols
-    
-    def _parse_gnu_map(self, content: str) -> List[Symbol]:
-        """Parse GNU ld format map file (original implementation)"""
-        symbols = []
-        
-        # Pattern: .section     0xADDRESS   0xSIZE symbol_name
-        lines = content.split('\n')
-        current_section = ""
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            
-            # Detect section headers
-            if line.startswith('.'):
-                section_match = re.match(r'^(\.\w+)', line)
-                if section_match:
-                    current_section = section_match.group(1)
-            
-            # Parse symbol lines (starts with address)
-            addr_match = re.match(r'^\s*0x([0-9a-fA-F]+)\s+0x([0-9a-fA-F]+)\s+(.+)', line)
-            if addr_match:
-                address = int(addr_match.group(1), 16)
-                size = int(addr_match.group(2), 16)
-                name_part = addr_match.group(3).strip()
-                
-                # Extract symbol name (before any file references)
-                symbol_name = name_part.split()[0] if name_part else ""
-                
-                # Skip if it's just a file reference
-                if symbol_name.endswith('.o') or '/' in symbol_name or '\\' in symbol_name:
-                    continue
-                
-                # Skip section markers
-                if symbol_name.startswith('.') or symbol_name == '*fill*':
-                    continue
-                
-                # Only include symbols in valid address ranges (skip 0x0)
-                if address == 0:
-                    continue
-                
-                symbol = Symbol(
-                    name=symbol_name,
-                    address=address,
-                    size=size,
-                    section=current_section
-                )
-                
-                symbols.append(symbol)
-        
-        return symbols
+        address = int(addr_match.group(1), 16)
+        size = int(addr_match.group(2), 16)
+        name_part = addr_match.group(3).strip()
+
+        # Extract symbol name (before any file references)
+        symbol_name = name_part.split()[0] if name_part else ""
+
+        # Skip file references, section markers and fill
+        if symbol_name.endswith('.o') or '/' in symbol_name or '\\' in symbol_name:
+            return None
+        if symbol_name.startswith('.') or symbol_name == '*fill*':
+            return None
+
+        # Only include symbols in valid address ranges (skip 0x0)
+        if address == 0:
+            return None
+
+        return Symbol(name=symbol_name, address=address, size=size, section=current_section)
+
+    # ==================== ON-DISK CACHE ====================
+
+    def _cache_file_path(self) -> str:
+        return f"{self.map_file_path}{SYMBOL_CACHE_SUFFIX}"
+
+    def _hash_map_file(self) -> str:
+        hasher = hashlib.sha256()
+        with open(self.map_file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    def _load_symbol_cache(self, map_hash: str) -> Optional[List[Symbol]]:
+        cache_path = self._cache_file_path()
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("version") != SYMBOL_CACHE_VERSION or cache.get("map_hash") != map_hash:
+                return None
+            return list(map(Symbol, cache["names"], cache["addresses"], cache["sizes"],
+                            map(cache["sections"].__getitem__, cache["section_ids"]),
+                            map(cache["types"].__getitem__, cache["type_ids"])))
+        except Exception as e:
+            verbose_print(f"Ignoring unreadable symbol cache: {e}")
+            return None
+
+    def _write_symbol_cache(self, map_hash: str, symbols: List[Symbol]):
+        cache_path = self._cache_file_path()
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            # Stored column-wise with section/type names pooled, which keeps the file small
+            sections = {}
+            types = {}
+            # json.dumps (unlike json.dump) encodes in one C call
+            content = json.dumps({
+                "version": SYMBOL_CACHE_VERSION,
+                "map_hash": map_hash,
+                "names": [s.name for s in symbols],
+                "addresses": [s.address for s in symbols],
+                "sizes": [s.size for s in symbols],
+                "section_ids": [sections.setdefault(s.section, len(sections)) for s in symbols],
+                "type_ids": [types.setdefault(s.symbol_type, len(types)) for s in symbols],
+                "sections": list(sections),
+                "types": list(types),
+            }, separators=(',', ':'))
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            print(f"Warning: Could not write symbol cache: {e}")
     
     def find_symbol(self, name: str) -> Optional[Symbol]:
         """Find symbol by name (case-insensitive)"""
-        name_lower = name.lower()
-        for symbol in self.symbols:
-            if symbol.name.lower() == name_lower:
-                return symbol
-        return None
+        return self.index.find(name)
     
     def find_symbols_at_address(self, address: int) -> List[Symbol]:
         """Find all symbols at a specific address"""
-        return [s for s in self.symbols if s.address == address]
+        return self.index.at_address(address)
     
     def find_symbol_containing_address(self, address: int) -> Optional[Symbol]:
         """Find the symbol that contains the given address"""
-        for symbol in self.symbols:
-            if symbol.size > 0:
-                if symbol.address <= address < symbol.address + symbol.size:
-                    return symbol
-        return None
\ No newline at end of file
+        return self.index.containing(address)
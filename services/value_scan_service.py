@@ -0,0 +1,382 @@
+"""
+Value Scan Service
+"First scan / next scan" search for game variables: snapshots main RAM and narrows
+a set of candidate addresses by comparing values between snapshots
+"""
+
+import sys
+import time
+import struct
+import operator
+from array import array
+from enum import Enum
+from collections import deque
+from itertools import compress, repeat
+from operator import itemgetter
+from typing import Callable, List, Optional, Tuple, Union
+
+from functions.verbose_print import verbose_print
+from services.codecave_monitor_service import diff_spans
+from services.memory_watch_service import DataType, KSEG0_BASE
+from services.ram_snapshot_service import RamSnapshot
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# array / numpy type code per scannable type; colors have no ordering to scan by
+_TYPE_CODES = {
+    DataType.BYTE_SIGNED: "b", DataType.BYTE_UNSIGNED: "B",
+    DataType.SHORT_SIGNED: "h", DataType.SHORT_UNSIGNED: "H",
+    DataType.INT_SIGNED: "i", DataType.INT_UNSIGNED: "I",
+    DataType.FLOAT: "f",
+}
+SCANNABLE_TYPES = list(_TYPE_CODES)
+
+
+class ScanCompare(Enum):
+    """How a scan keeps candidates"""
+    EXACT = "exact"            # Value equals the one entered
+    UNKNOWN = "unknown"        # First scan only: keep every address
+    CHANGED = "changed"        # Differs from the previous scan
+    UNCHANGED = "unchanged"
+    INCREASED = "increased"
+    DECREASED = "decreased"
+
+    @property
+    def needs_value(self) -> bool:
+        return self == ScanCompare.EXACT
+
+    @property
+    def needs_previous(self) -> bool:
+        return self not in (ScanCompare.EXACT, ScanCompare.UNKNOWN)
+
+
+# translate tables mapping the given byte to 1 and every other byte to 0
+_EQUAL_TABLES = [bytes(byte) + b"\x01" + bytes(255 - byte) for byte in range(256)]
+
+# Flags checked per block when collecting indices; blocks without a set flag are skipped
+FLAG_BLOCK_SIZE = 0x1000
+
+# Candidate sets at most 1/SPARSE_FRACTION of RAM are compared value by value
+SPARSE_FRACTION = 16
+
+def _and_flags(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "little") & int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def _or_flags(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "little") | int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+_OPERATORS = {
+    ScanCompare.EXACT: operator.eq,
+    ScanCompare.CHANGED: operator.ne,
+    ScanCompare.UNCHANGED: operator.eq,
+    ScanCompare.INCREASED: operator.gt,
+    ScanCompare.DECREASED: operator.lt,
+}
+
+
+class ScanHit:
+    """One remaining candidate"""
+
+    def __init__(self, offset: int, value: Union[int, float], previous: Optional[Union[int, float]]):
+        self.offset = offset  # Offset into main RAM
+        self.value = value
+        self.previous = previous
+
+    @property
+    def address(self) -> int:
+        """Address as entered in the memory watch / symbols file (0x80xxxxxx)"""
+        return KSEG0_BASE + self.offset
+
+    def __repr__(self):
+        return f"ScanHit(0x{self.address:08X}={self.value})"
+
+
+class ValueScanner:
+    """
+    Candidate addresses for one data type, narrowed scan by scan.
+
+    Values are only looked for at addresses aligned to their size, since the
+    consoles can't load misaligned values. None means every address is still
+    a candidate. With NumPy, candidates are a uint32 array of element indices
+    and comparisons run vectorized; without it they are one 0/1 flag byte per
+    element, narrowed on the raw bytes with translate and big-int AND/OR (see
+    _filter_array), so no pass builds a Python object per address.
+    """
+
+    def __init__(self, read_snapshot: Callable[[], Optional[RamSnapshot]], data_type: DataType,
+                 big_endian: bool):
+        if data_type not in _TYPE_CODES:
+            raise ValueError(f"Value scans don't support {data_type.value}")
+        self.read_snapshot = read_snapshot
+        self.data_type = data_type
+        self.big_endian = big_endian
+        self.size = data_type.size
+        self.code = _TYPE_CODES[data_type]
+
+        self.candidates = None  # Element indices (NumPy) or per-element flag bytes, or None for all
+        self._candidate_count = 0
+        self.snapshot: Optional[RamSnapshot] = None
+        self.values = None  # Typed view of self.snapshot
+        self.previous_values = None
+        self.scan_count = 0
+        self.last_scan_ms = 0.0
+
+    # ---------- Public API ----------
+
+    @property
+    def candidate_count(self) -> int:
+        return self._candidate_count
+
+    def reset(self):
+        self.candidates = None
+        self._candidate_count = 0
+        self.snapshot = None
+        self.values = None
+        self.previous_values = None
+        self.scan_count = 0
+
+    def first_scan(self, compare: ScanCompare, value=None) -> Optional[int]:
+        """Start over with a new snapshot. Returns the candidate count, or None on failure."""
+        if compare.needs_previous:
+            print(f"Value scan: '{compare.value}' needs a previous scan")
+            return None
+        self.reset()
+        return self._scan(compare, value)
+
+    def next_scan(self, compare: ScanCompare, value=None) -> Optional[int]:
+        """Narrow the candidates with a new snapshot. Returns the count, or None on failure."""
+        if self.values is None:
+            return self.first_scan(compare, value)
+        if compare == ScanCompare.UNKNOWN:
+            print("Value scan: 'unknown' only applies to the first scan")
+            return None
+        return self._scan(compare, value)
+
+    def results(self, limit: int = 200) -> List[ScanHit]:
+        """The first limit candidates with their current (and previous) values"""
+        if self.values is None:
+            return []
+        if self.candidates is None:
+            indices = range(min(limit, len(self.values)))
+        elif isinstance(self.candidates, bytes):
+            indices = self._flag_indices(self.candidates, limit)
+        else:
+            indices = [int(index) for index in self.candidates[:limit]]
+
+        hits = []
+        for index in indices:
+            previous = self._as_python(self.previous_values[index]) if self.previous_values is not None else None
+            hits.append(ScanHit(index * self.size, self._as_python(self.values[index]), previous))
+        return hits
+
+    def parse_value(self, text: str) -> Optional[Union[int, float]]:
+        """Value entered by the user, or None if it isn't valid for the data type"""
+        try:
+            if self.data_type == DataType.FLOAT:
+                return struct.unpack("f", struct.pack("f", float(text)))[0]
+            value = int(text.strip(), 0)
+        except (ValueError, OverflowError, struct.error):
+            return None
+        bits = self.size * 8
+        if self.data_type.is_signed:
+            low, high = -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+        else:
+            low, high = 0, (1 << bits) - 1
+        return value if low <= value <= high else None
+
+    # ---------- Scanning ----------
+
+    def _scan(self, compare: ScanCompare, value) -> Optional[int]:
+        if compare.needs_value and value is None:
+            print("Value scan: enter a value to search for")
+            return None
+
+        snapshot = self.read_snapshot()
+        if snapshot is None:
+            return None
+
+        start = time.perf_counter()
+        values = self._typed_values(snapshot.data)
+        previous_snapshot = self.snapshot
+        previous = self.values
+
+        if NUMPY_AVAILABLE:
+            candidates = self._filter_numpy(values, previous, compare, value)
+        else:
+            candidates = self._filter_array(snapshot, previous_snapshot, values, previous, compare, value)
+
+        if snapshot.unread:
+            candidates = self._drop_unread(candidates, snapshot, len(values))
+
+        self.candidates = candidates
+        if candidates is None:
+            self._candidate_count = len(values)
+        elif isinstance(candidates, bytes):
+            self._candidate_count = candidates.count(1)
+        else:
+            self._candidate_count = len(candidates)
+        self.previous_values = previous
+        self.values = values
+        self.snapshot = snapshot
+        self.scan_count += 1
+        self.last_scan_ms = (time.perf_counter() - start) * 1000
+
+        verbose_print(f"Value scan {self.scan_count} ({compare.value}, {self.data_type.value}): "
+                      f"{self.candidate_count} candidate(s) in {self.last_scan_ms:.1f} ms")
+        return self.candidate_count
+
+    def _typed_values(self, data: bytes):
+        if NUMPY_AVAILABLE:
+            dtype = np.dtype(self.code).newbyteorder(">" if self.big_endian else "<")
+            return np.frombuffer(data, dtype=dtype, count=len(data) // self.size)
+
+        values = array(self.code)
+        values.frombytes(data[:len(data) - len(data) % self.size])
+        if self.big_endian != (sys.byteorder == "big"):
+            values.byteswap()
+        return values
+
+    def _filter_numpy(self, values, previous, compare: ScanCompare, value):
+        if compare == ScanCompare.UNKNOWN:
+            return None
+
+        candidates = self.candidates
+        current = values if candidates is None else values[candidates]
+        if compare.needs_value:
+            mask = _OPERATORS[compare](current, np.array(value, dtype=values.dtype))
+        else:
+            mask = _OPERATORS[compare](current, previous if candidates is None else previous[candidates])
+
+        if candidates is None:
+            return np.flatnonzero(mask).astype(np.uint32)
+        return candidates[mask]
+
+    def _filter_array(self, snapshot: RamSnapshot, previous_snapshot: Optional[RamSnapshot],
+                      values, previous, compare: ScanCompare, value) -> Optional[bytes]:
+        """
+        Without NumPy the comparison works on the raw bytes and on 0/1 flags:
+        changes come from diff_spans (equal blocks are skipped with memcmp), an
+        exact value from translate over each byte lane. Python values are only
+        compared for changed elements or a small candidate set.
+        """
+        if compare == ScanCompare.UNKNOWN:
+            return None
+
+        count = len(values)
+        candidates = self.candidates
+
+        if compare == ScanCompare.EXACT:
+            if candidates is not None and self._candidate_count <= count // SPARSE_FRACTION:
+                indices = self._flag_indices(candidates)
+                return self._flags_from_indices(
+                    compress(indices, map(operator.eq, self._gather(values, indices), repeat(value))), count)
+            flags = self._equal_flags(snapshot.data, value, count)
+            return flags if candidates is None else _and_flags(flags, candidates)
+
+        spans = diff_spans(previous_snapshot.data, snapshot.data)
+        if compare == ScanCompare.UNCHANGED:
+            flags = bytearray(b"\x01") * count if candidates is None else bytearray(candidates)
+            for offset, length in spans:
+                first = offset // self.size
+                last = (offset + length - 1) // self.size + 1
+                flags[first:last] = bytes(last - first)
+            return bytes(flags)
+
+        changed = self._span_indices(spans)
+        if candidates is not None:
+            changed = array("I", compress(changed, map(candidates.__getitem__, changed)))
+        if compare != ScanCompare.CHANGED:
+            changed = compress(changed, map(_OPERATORS[compare], self._gather(values, changed),
+                                            self._gather(previous, changed)))
+        return self._flags_from_indices(changed, count)
+
+    def _span_indices(self, spans: List[Tuple[int, int]]) -> "array":
+        """Indices of the elements touched by (offset, length) byte runs"""
+        indices = array("I")
+        for offset, length in spans:
+            first = max(offset // self.size, indices[-1] + 1 if indices else 0)
+            indices.extend(range(first, (offset + length - 1) // self.size + 1))
+        return indices
+
+    def _equal_flags(self, data: bytes, value, count: int) -> bytes:
+        """1 for every element equal to value: each byte lane translated to 0/1, lanes ANDed"""
+        if self.data_type == DataType.FLOAT and value != value:
+            return bytes(count)  # NaN never compares equal
+        needles = [value]
+        if self.data_type == DataType.FLOAT and value == 0:
+            needles = [0.0, -0.0]  # Equal values with different bytes
+
+        data = data[:count * self.size]
+        flags = None
+        for needle in needles:
+            encoded = array(self.code, [needle])
+            if self.big_endian != (sys.byteorder == "big"):
+                encoded.byteswap()
+            needle_flags = None
+            for lane, byte in enumerate(encoded.tobytes()):
+                lane_flags = data[lane::self.size].translate(_EQUAL_TABLES[byte])
+                needle_flags = lane_flags if needle_flags is None else _and_flags(needle_flags, lane_flags)
+            flags = needle_flags if flags is None else _or_flags(flags, needle_flags)
+        return flags
+
+    @staticmethod
+    def _flag_indices(flags: bytes, limit: Optional[int] = None) -> "array":
+        """Indices of set flags (the first limit of them); blocks without one are skipped"""
+        indices = array("I")
+        for start in range(0, len(flags), FLAG_BLOCK_SIZE):
+            block = flags[start:start + FLAG_BLOCK_SIZE]
+            set_count = block.count(1)
+            if not set_count:
+                continue
+            if set_count * 4 < len(block):
+                position = block.find(1)
+                while position != -1:
+                    indices.append(start + position)
+                    position = block.find(1, position + 1)
+            else:
+                indices.extend(compress(range(start, start + len(block)), block))
+            if limit is not None and len(indices) >= limit:
+                return indices[:limit]
+        return indices
+
+    @staticmethod
+    def _flags_from_indices(indices, count: int) -> bytes:
+        flags = bytearray(count)
+        deque(map(flags.__setitem__, indices, repeat(1)), maxlen=0)
+        return bytes(flags)
+
+    @staticmethod
+    def _gather(values, indices) -> tuple:
+        if len(indices) == 0:
+            return ()
+        if len(indices) == 1:
+            return (values[indices[0]],)
+        return itemgetter(*indices)(values)
+
+    def _drop_unread(self, candidates, snapshot: RamSnapshot, count: int):
+        """Remove candidates inside chunks the snapshot couldn't read"""
+        if NUMPY_AVAILABLE:
+            indices = np.arange(count, dtype=np.uint32) if candidates is None else candidates
+            keep = np.ones(len(indices), dtype=bool)
+            offsets = indices.astype(np.int64) * self.size
+            for start, length in snapshot.unread:
+                keep &= (offsets + self.size <= start) | (offsets >= start + length)
+            return indices[keep]
+
+        flags = bytearray(b"\x01") * count if candidates is None else bytearray(candidates)
+        for start, length in snapshot.unread:
+            first = start // self.size
+            last = min(count, (start + length + self.size - 1) // self.size)
+            if first < last:
+                flags[first:last] = bytes(last - first)
+        return bytes(flags)
+
+    @staticmethod
+    def _as_python(value):
+        return value.item() if hasattr(value, "item") else value
@@ -1,6 +1,7 @@
 import os
 from typing import List, Dict, Optional, Tuple, NamedTuple
 from classes.project_data.project_data import ProjectData
+from services.patch_plan_service import PatchPlanService
 
 class PatchRegion(NamedTuple):
     """Stores info about a single applied patch"""
@@ -20,9 +21,6 @@ class VisualPatcherService:
     
     def __init__(self, project_data: ProjectData):
         self.project_data = project_data
-        self.bin_output_dir = os.path.join(
-            self.project_data.GetProjectFolder(), '.config', 'output', 'bin_files'
-        )
 
     def generate_diff(self, file_name: str) -> Tuple[Optional[bytearray], Optional[bytearray], List[PatchRegion]]:
         """
@@ -48,74 +46,24 @@ class VisualPatcherService:
             print(f"VisualPatcher: Error reading {file_name}: {e}")
             return None, None, []
             
-        patch_regions = []
+        # 2. Apply all patches from the same plan used by ISOService.patch_executable
+        plan = PatchPlanService(self.project_data).build_plan()
+        applied, warnings = plan.apply_to_buffer(file_name, patched_data)
+        for warning in plan.warnings + warnings:
+            print(f"VisualPatcher: {warning}")
 
-        # 2. Apply all patches, similar to ISOService.patch_executable
-        all_targets = [
-            (current_build.GetEnabledCodeCaves(), "Codecave"),
-            (current_build.GetEnabledHooks(), "Hook"),
-            (current_build.GetEnabledBinaryPatches(), "Binary Patch")
+        patch_regions = [
+            PatchRegion(
+                name=entry.name,
+                type=entry.patch_type,
+                offset=entry.file_offset,
+                size=entry.size,
+                original_bytes=bytes(original_data[entry.file_offset:entry.end_offset]),
+                patched_bytes=entry.data,
+                allocated_size=entry.allocated_size
+            )
+            for entry in applied
         ]
 
-        for targets, target_type in all_targets:
-            for target in targets:
-                # Check if this patch targets this file
-                if target.GetInjectionFile() != file_name:
-                    continue
-                
-                # Check for new file type (not supported in this view)
-                if target.IsNewFile():
-                    continue
-
-                # Get binary patch data
-                bin_file = os.path.join(self.bin_output_dir, f"{target.GetName()}.bin")
-                if not os.path.exists(bin_file):
-                    print(f"VisualPatcher: Skipping {target.GetName()} (no .bin file)")
-                    continue
-                
-                with open(bin_file, 'rb') as f:
-                    patch_data = f.read()
-                
-                # Get file offset
-                file_address_str = target.GetInjectionFileAddress()
-                if not file_address_str:
-                    print(f"VisualPatcher: Skipping {target.GetName()} (no file address)")
-                    continue
-
-                try:
-                    file_address = int(file_address_str, 16)
-                except ValueError:
-                    print(f"VisualPatcher: Skipping {target.GetName()} (invalid address)")
-                    continue
-                
-                # Validate bounds
-                patch_size = len(patch_data)
-                if file_address < 0 or (file_address + patch_size) > len(patched_data):
-                    print(f"VisualPatcher: Skipping {target.GetName()} (out of bounds)")
-                    continue
-
-                # Store patch info *before* applying
-                original_chunk = original_data[file_address : file_address + patch_size]
-                
-                # Get the allocated cave size from the target
-                try:
-                    allocated_size = target.GetSizeAsInt() if target.GetSize() else patch_size
-                except (ValueError, AttributeError):
-                    allocated_size = patch_size
-                
-                region = PatchRegion(
-                    name=target.GetName(),
-                    type=target_type,
-                    offset=file_address,
-                    size=patch_size,
-                    original_bytes=original_chunk,
-                    patched_bytes=patch_data,
-                    allocated_size=allocated_size
-                )
-                patch_regions.append(region)
-
-                # Apply patch to the in-memory copy
-                patched_data[file_address : file_address + patch_size] = patch_data
-        
         print(f"VisualPatcher: Applied {len(patch_regions)} patch(es) to in-memory copy.")
         return original_data, patched_data, patch_regions
\ No newline at end of file
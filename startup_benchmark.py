@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures cold start of the command-line interface using `python -X importtime`:
+`main.py --version` (everything a CLI command imports before it runs) and the
+real `list-builds` and `info` commands on a throwaway project.
+
+Fails (exit code 1) if the CLI imports any GUI module, or if a command is slower
+than a saved baseline by more than the allowed tolerance. In CI mode a missing
+baseline is a failure too.
+
+Usage:
+    python startup_benchmark.py                      Report and check against the baseline
+    python startup_benchmark.py --save-baseline      Record the current timings as the baseline
+    python startup_benchmark.py --runs=10            Number of cold starts to take the median of
+    python startup_benchmark.py --tolerance=0.25     Allowed slowdown over the baseline (fraction)
+    python startup_benchmark.py --baseline=<file>    Baseline file (default: startup_baseline.json)
+    python startup_benchmark.py --ci                 Fail if there is no baseline (default when $CI is set)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(APP_DIR, "startup_baseline.json")
+
+# Modules only the GUI needs; importing any of them on the CLI path is a failure
+GUI_MODULE_PREFIXES = ("dearpygui", "tkinter", "_tkinter", "gui", "dpg", "tk", "theme_editor")
+
+# Extra slack on top of the tolerance so tiny baselines don't fail on noise
+SLACK_MS = 20.0
+
+# Commands to time; PROJECT is replaced by the throwaway project's .modproj path
+PROJECT = "<project>"
+COMMANDS = {
+    "version": ["--version"],
+    "list-builds": ["list-builds", PROJECT],
+    "info": ["info", PROJECT],
+}
+
+
+def make_sample_project(folder: str) -> str:
+    """Save a fresh default project into folder, returns its .modproj path"""
+    from classes.project_data.project_data import ProjectData
+    from services.project_serializer import ProjectSerializer
+
+    project_data = ProjectData()
+    project_data.SetProjectName("StartupBenchmark")
+    project_data.project_folder = folder
+    project_data.SetDefaultNewProjectData()
+
+    project_file = os.path.join(folder, f"StartupBenchmark{ProjectSerializer.PROJECT_FILE_EXTENSION}")
+    if not ProjectSerializer.save_project(project_data, project_file):
+        raise RuntimeError("Could not create the sample project")
+    return project_file
+
+
+def run_cold_start(args: List[str], cwd: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    Run one CLI command in a fresh interpreter.
+    Returns (wall ms, [(module, self us, cumulative us)] in import order).
+    """
+    cmd = [sys.executable, "-X", "importtime", os.path.join(APP_DIR, "main.py")] + args
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"`{' '.join(args)}` exited with {result.returncode}:\n"
+                           f"{(result.stdout + result.stderr)[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        # "import time:      self [us] |      cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return wall_ms, imports
+
+
+def is_gui_module(name: str) -> bool:
+    return any(name == prefix or name.startswith(prefix + ".") for prefix in GUI_MODULE_PREFIXES)
+
+
+def measure_command(args: List[str], cwd: str, runs: int) -> Dict:
+    walls = []
+    import_totals = []
+    imports = []
+    for _ in range(runs):
+        wall_ms, imports = run_cold_start(args, cwd)
+        walls.append(wall_ms)
+        import_totals.append(sum(self_us for _, self_us, _ in imports) / 1000)
+
+    return {
+        "wall_ms": round(statistics.median(walls), 2),
+        "import_ms": round(statistics.median(import_totals), 2),
+        "module_count": len(imports),
+        "imports": imports,
+    }
+
+
+def measure(runs: int) -> Dict:
+    project_dir = tempfile.mkdtemp(prefix="cgmu_startup_")
+    try:
+        project_file = make_sample_project(project_dir)
+        # Run from the project folder, so the recent projects list it writes to is thrown away too
+        commands = {
+            name: measure_command([project_file if arg == PROJECT else arg for arg in args], project_dir, runs)
+            for name, args in COMMANDS.items()
+        }
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+    return {"python": sys.version.split()[0], "commands": commands}
+
+
+def format_report(result: Dict, top: int = 15) -> str:
+    lines = ["Cold CLI startup (median):"]
+    for name, command in result["commands"].items():
+        lines.append(f"  {name:<12} {command['wall_ms']:>8.1f} ms wall, {command['import_ms']:>8.1f} ms importing "
+                     f"{command['module_count']} modules")
+
+    # Module breakdown of the command that imports the most
+    name, command = max(result["commands"].items(), key=lambda item: item[1]["import_ms"])
+    lines += [
+        "",
+        f"Slowest imports ({name}):",
+        f"{'Module':<50} {'Self ms':>9} {'Cumulative ms':>14}",
+    ]
+    for module, self_us, cumulative_us in sorted(command["imports"], key=lambda entry: -entry[2])[:top]:
+        lines.append(f"{module:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+    return "\n".join(lines)
+
+
+def load_baseline(baseline_path: str) -> Optional[Dict]:
+    """Per-command baseline timings, or None if there is no usable baseline"""
+    if not os.path.exists(baseline_path):
+        return None
+    try:
+        with open(baseline_path, "r") as f:
+            return json.load(f).get("commands")
+    except Exception as e:
+        print(f"Warning: Could not read baseline {baseline_path}: {e}")
+        return None
+
+
+def check(result: Dict, baseline_path: str, tolerance: float, require_baseline: bool) -> List[str]:
+    """Problems with this measurement; empty if it passes"""
+    problems = [f"GUI module imported by `{name}`: {module}"
+                for name, command in result["commands"].items()
+                for module, _, _ in command["imports"] if is_gui_module(module)]
+
+    baseline = load_baseline(baseline_path)
+    if baseline is None:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to record one")
+        if require_baseline:
+            problems.append(f"no baseline to compare against ({baseline_path})")
+        return problems
+
+    for name, command in result["commands"].items():
+        if name not in baseline:
+            print(f"{name:<12} not in the baseline")
+            if require_baseline:
+                problems.append(f"`{name}` has no baseline; re-run with --save-baseline")
+            continue
+        for key in ("wall_ms", "import_ms"):
+            limit = baseline[name][key] * (1 + tolerance) + SLACK_MS
+            status = "OK" if command[key] <= limit else "REGRESSED"
+            print(f"{name:<12} {key:<10} {command[key]:>9.1f} ms  "
+                  f"(baseline {baseline[name][key]:.1f} ms, limit {limit:.1f} ms)  {status}")
+            if command[key] > limit:
+                problems.append(f"`{name}` {key} {command[key]:.1f} ms exceeds {limit:.1f} ms")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold CLI startup")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to take the median of")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown over the baseline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the baseline")
+    parser.add_argument("--ci", action="store_true", default=bool(os.environ.get("CI")),
+                        help="Fail if there is no baseline to compare against")
+    args = parser.parse_args()
+
+    try:
+        result = measure(max(1, args.runs))
+    except RuntimeError as e:
+        print(f"Startup benchmark failed: {e}")
+        return 1
+
+    print(format_report(result))
+    print("")
+
+    if args.save_baseline:
+        baseline = {
+            "python": result["python"],
+            "commands": {name: {key: value for key, value in command.items() if key != "imports"}
+                         for name, command in result["commands"].items()},
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+
+    problems = check(result, args.baseline, args.tolerance, args.ci)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Memory backend tests against a local dummy "emulator": a child process holding
+fake guest RAM in a /dev/shm mapping named and sized like Dolphin's, so process
+discovery, RAM lookup and batched reads/writes are checked without a real
+emulator running (Linux only).
+
+    python -m pytest tests/test_memory_backend.py
+"""
+
+import os
+import sys
+import mmap
+import ctypes
+import subprocess
+from array import array
+
+# The dummy child runs this file directly, without the conftest path setup
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from services.memory_backend_service import LINUX_RAM_REGIONS, get_memory_backend
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"),
+                                reason="needs Linux (/dev/shm and /proc)")
+
+# Process name (argv[0]) the dummy emulator runs under, so find_pid can tell it apart
+DUMMY_PROCESS_NAME = "cgmu-test-emu"
+
+# RAM layout the dummy pretends to have (matches LINUX_RAM_REGIONS["Dolphin"])
+DUMMY_EMULATOR = "Dolphin"
+DUMMY_RAM_SIZE = LINUX_RAM_REGIONS[DUMMY_EMULATOR][1][0]
+
+# The first page is never mapped, so reads and writes there must fail
+UNMAPPED_ADDRESS = 0x10
+
+
+def dummy_ram_pattern(offset: int, size: int) -> bytes:
+    """Contents the dummy fills its RAM with: each 4-byte word holds its own offset"""
+    first = offset - offset % 4
+    words = array("I", range(first, offset + size + 4, 4))
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words.tobytes()[offset - first:offset - first + size]
+
+
+def _run_dummy(shm_path: str):
+    """Child side: map the RAM file, fill it, report its address, then wait to be told to exit"""
+    with open(shm_path, "r+b") as f:
+        ram = mmap.mmap(f.fileno(), DUMMY_RAM_SIZE, mmap.MAP_SHARED)
+    ram[:] = dummy_ram_pattern(0, DUMMY_RAM_SIZE)
+    address = ctypes.addressof(ctypes.c_char.from_buffer(ram))
+    print(f"0x{address:X}", flush=True)
+    sys.stdin.readline()
+
+
+class DummyEmulator:
+    """Child process holding a fake RAM buffer in a /dev/shm mapping"""
+
+    def __init__(self):
+        self.shm_path = f"/dev/shm/dolphin-emu.test.{os.getpid()}"
+        self.process = None
+        self.ram_address = None  # As reported by the child
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def start(self):
+        with open(self.shm_path, "wb") as f:
+            f.truncate(DUMMY_RAM_SIZE)
+        self.process = subprocess.Popen(
+            [DUMMY_PROCESS_NAME, os.path.abspath(__file__), "--dummy", self.shm_path],
+            executable=sys.executable, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        self.ram_address = int(self.process.stdout.readline(), 16)
+
+    def read_shared(self, offset: int, size: int) -> bytes:
+        """Read the RAM straight from the /dev/shm file (independent of the backend)"""
+        with open(self.shm_path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.process.stdin.write("\n")
+                self.process.stdin.flush()
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if os.path.exists(self.shm_path):
+            os.remove(self.shm_path)
+
+
+@pytest.fixture
+def backend():
+    return get_memory_backend()
+
+
+@pytest.fixture
+def dummy():
+    emulator = DummyEmulator()
+    emulator.start()
+    yield emulator
+    emulator.stop()
+
+
+@pytest.fixture
+def handle(backend, dummy):
+    process = backend.open_process(dummy.pid)
+    assert process is not None
+    yield process
+    backend.close_process(process)
+
+
+def test_find_pid(backend, dummy):
+    assert backend.find_pid(DUMMY_PROCESS_NAME) == dummy.pid
+    assert backend.find_pid("cgmu-no-such-process") is None
+
+
+def test_find_emulator_ram(backend, dummy):
+    assert backend.find_emulator_ram(dummy.pid, DUMMY_EMULATOR) == dummy.ram_address
+
+
+def test_read_many(backend, dummy, handle):
+    requests = [(0x0, 16), (0x123457, 7), (DUMMY_RAM_SIZE - 32, 32), (0x400000, 0x100000)]
+    read = backend.read_many(handle, [(dummy.ram_address + offset, size) for offset, size in requests])
+    assert read == [dummy_ram_pattern(offset, size) for offset, size in requests]
+
+
+def test_read_many_fails_only_unmapped_request(backend, dummy, handle):
+    ram = dummy.ram_address
+    read = backend.read_many(handle, [(ram + 0x100, 8), (UNMAPPED_ADDRESS, 8), (ram + 0x200, 8)])
+    assert read == [dummy_ram_pattern(0x100, 8), None, dummy_ram_pattern(0x200, 8)]
+
+
+def test_read_many_small_reads(backend, dummy, handle):
+    offsets = range(0, 0x40000, 0x40)
+    read = backend.read_many(handle, [(dummy.ram_address + offset, 4) for offset in offsets])
+    assert read == [dummy_ram_pattern(offset, 4) for offset in offsets]
+
+
+def test_write_many(backend, dummy, handle):
+    ram = dummy.ram_address
+    written = backend.write_many(handle, [(ram + 0x1000, b"\xDE\xAD\xBE\xEF"),
+                                          (UNMAPPED_ADDRESS, b"\x01\x02"),
+                                          (ram + 0x1800001, b"\x11\x22\x33")])
+    assert written == [True, False, True]
+    assert dummy.read_shared(0x1000, 4) == b"\xDE\xAD\xBE\xEF"
+    assert dummy.read_shared(0x1800001, 3) == b"\x11\x22\x33"
+    # Neighbouring bytes are untouched
+    assert dummy.read_shared(0xFFC, 4) == dummy_ram_pattern(0xFFC, 4)
+    assert dummy.read_shared(0x1004, 4) == dummy_ram_pattern(0x1004, 4)
+
+
+def test_is_process_alive(backend, dummy, handle):
+    assert backend.is_process_alive(handle)
+    dummy.stop()
+    assert not backend.is_process_alive(handle)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--dummy":
+        _run_dummy(sys.argv[2])
+    else:
+        sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,28 @@
+import pytest
+
+from services.padding_scanner_service import PaddingScannerService
+
+NOP = PaddingScannerService.FILL_PATTERNS["NOP (PowerPC 0x60000000)"]
+CHUNK = PaddingScannerService.CHUNK_SIZE
+
+
+def _runs(data: bytes, fill: bytes, min_size: int = 64, alignment: int = 1):
+    return [(run.file_offset, run.size) for run in
+            PaddingScannerService().scan_data(data, min_size, fill, alignment)]
+
+
+@pytest.mark.parametrize("lead", [CHUNK - 100, CHUNK - 64, CHUNK - 1, CHUNK])
+def test_byte_fill_across_chunk_boundary_is_one_run(lead):
+    data = b'\x11' * lead + b'\x00' * 400 + b'\x11' * 16
+    assert _runs(data, b'\x00') == [(lead, 400)]
+
+
+@pytest.mark.parametrize("lead", range(CHUNK - 52, CHUNK - 44))
+def test_word_fill_across_chunk_boundary_is_one_run_at_any_phase(lead):
+    data = b'\x11' * lead + NOP * 100 + b'\x11' * 16
+    assert _runs(data, NOP) == [(lead, 400)]
+
+
+def test_alignment_trims_run_ends():
+    data = b'\x11' * 6 + b'\x00' * 80 + b'\x11' * 4
+    assert _runs(data, b'\x00', alignment=4) == [(8, 76)]
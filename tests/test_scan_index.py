@@ -0,0 +1,66 @@
+import os
+
+from services.scan_index_service import ScanIndexService, CATEGORY_STRINGS, CATEGORY_PADDING
+
+
+def _write(path, data: bytes, mtime_ns: int):
+    with open(path, 'wb') as f:
+        f.write(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _entry_files(index: ScanIndexService):
+    return sorted(name for name in os.listdir(index.index_dir) if name != ScanIndexService.MANIFEST_NAME)
+
+
+def test_put_keeps_results_stored_by_other_instances(tmp_path):
+    game_file = tmp_path / "SLUS_000.00"
+    _write(game_file, b"\x00" * 64, 1_000_000_000)
+
+    first = ScanIndexService(str(tmp_path), "Build")
+    second = ScanIndexService(str(tmp_path), "Build")
+    assert first.get(str(game_file), CATEGORY_STRINGS) is None
+    assert second.get(str(game_file), CATEGORY_PADDING) is None
+
+    first.put(str(game_file), CATEGORY_STRINGS, "p", [1])
+    second.put(str(game_file), CATEGORY_PADDING, "p", [2])
+
+    fresh = ScanIndexService(str(tmp_path), "Build")
+    assert fresh.get(str(game_file), CATEGORY_STRINGS, "p") == [1]
+    assert fresh.get(str(game_file), CATEGORY_PADDING, "p") == [2]
+
+
+def test_changed_file_drops_previous_results(tmp_path):
+    game_file = tmp_path / "SLUS_000.00"
+    index = ScanIndexService(str(tmp_path), "Build")
+
+    _write(game_file, b"old", 1_000_000_000)
+    index.put(str(game_file), CATEGORY_STRINGS, "p", [1])
+    _write(game_file, b"new", 2_000_000_000)
+    index.put(str(game_file), CATEGORY_STRINGS, "p", [2])
+
+    assert _entry_files(index) == [f"{index.get_file_hash(str(game_file))}.json"]
+
+
+def test_shared_content_survives_other_path_changing(tmp_path):
+    first_file, second_file = tmp_path / "A.BIN", tmp_path / "B.BIN"
+    _write(first_file, b"same", 1_000_000_000)
+    _write(second_file, b"same", 1_000_000_000)
+    index = ScanIndexService(str(tmp_path), "Build")
+    index.put(str(first_file), CATEGORY_STRINGS, "p", [1])
+    assert index.get(str(second_file), CATEGORY_STRINGS, "p") == [1]
+
+    _write(first_file, b"changed", 2_000_000_000)
+    index.get_file_hash(str(first_file))
+    assert ScanIndexService(str(tmp_path), "Build").get(str(second_file), CATEGORY_STRINGS, "p") == [1]
+
+
+def test_clear_removes_index_files(tmp_path):
+    game_file = tmp_path / "SLUS_000.00"
+    _write(game_file, b"data", 1_000_000_000)
+    index = ScanIndexService(str(tmp_path), "Build")
+    index.put(str(game_file), CATEGORY_STRINGS, "p", [1])
+
+    index.clear()
+    assert os.listdir(index.index_dir) == []
+    assert ScanIndexService(str(tmp_path), "Build").get(str(game_file), CATEGORY_STRINGS, "p") is None
@@ -0,0 +1,29 @@
+from services.string_extraction_service import (
+    StringExtractionService, ENCODING_ASCII, ENCODING_UTF16_LE, ENCODING_UTF16_BE
+)
+
+
+def _found(data: bytes):
+    strings = StringExtractionService().extract(data, min_length=4, include_utf16=True)
+    return [(s.file_offset, s.encoding, s.text) for s in strings]
+
+
+def test_utf16_le_after_null_is_not_also_reported_as_be():
+    data = b'\0' * 4 + 'Hello'.encode('utf-16-le') + b'\0' * 4
+    assert _found(data) == [(4, ENCODING_UTF16_LE, 'Hello')]
+
+
+def test_utf16_be_before_nulls_is_not_also_reported_as_le():
+    data = b'\0' * 4 + 'Hello'.encode('utf-16-be') + b'\0' * 4
+    assert _found(data) == [(4, ENCODING_UTF16_BE, 'Hello')]
+
+
+def test_mixed_byte_orders_and_ascii():
+    data = (b'\0' * 4 + 'Hello'.encode('utf-16-le') + b'\0' * 4
+            + 'World'.encode('utf-16-be') + b'\0' * 2
+            + b'ascii text\0\0')
+    assert _found(data) == [
+        (4, ENCODING_UTF16_LE, 'Hello'),
+        (18, ENCODING_UTF16_BE, 'World'),
+        (30, ENCODING_ASCII, 'ascii text'),
+    ]